@@ -8,6 +8,15 @@ class Settings(BaseSettings):
     app_env: str = "local"
     log_level: str = "INFO"
     database_url: str
+    # 시작 시 스키마 마이그레이션 적용 (false면 없는 테이블만 만들고, 마이그레이션은 python -m schema_migrations로 따로 실행)
+    schema_auto_migrate: bool = True
+    # 요약 메트릭을 evaluator의 통계 rollup(llm_stats_hourly)에서 읽음 (rollup이 없으면 원본 테이블 집계)
+    analytics_use_rollups: bool = True
+    # 요약 메트릭 캐시: TTL(초) 이내는 캐시한 값, TTL이 지나고 stale 기간(초) 이내면 이전 값을 주고 백그라운드에서 갱신 (TTL 0이면 캐시 안 함)
+    read_cache_ttl_seconds: float = 10.0
+    read_cache_stale_seconds: float = 60.0
+    # evaluator가 평가/rollup을 쓰면 보내는 Postgres NOTIFY 채널 (받으면 캐시 만료, 비우면 TTL로만 갱신)
+    stats_notify_channel: str | None = "llm_stats_changed"
 
     class Config:
         env_file = ".env"
@@ -1,21 +1,50 @@
+from contextlib import asynccontextmanager
 from typing import List
 from fastapi import FastAPI, Depends
 from sqlalchemy.orm import Session
 from sqlalchemy import func, select
 
-from db import get_db, settings
-from models import LLMLog, LLMEvaluation
+from db import Base, engine, get_db, settings
+from models import LLMLog, LLMEvaluation, LLMStatsHourly, StatsRollupState
+from read_cache import InvalidationListener, ReadCache
+from schema_migrations import run_migrations
+from stats_queries import fetch_model_stats
 from schemas import (
     SummaryMetricsResponse,
     ModelBreakdownResponse,
     ModelMetricsItem,
 )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    앱 수명 주기 관리.
+    시작 시 테이블 생성/스키마 마이그레이션 후 요약 메트릭 캐시 무효화 LISTEN 시작.
+    """
+    if settings.schema_auto_migrate:
+        run_migrations(engine, Base.metadata)
+    else:
+        Base.metadata.create_all(bind=engine)
+    read_cache_invalidation.start()
+    yield
+    read_cache_invalidation.stop()
+
+
+# 요약 메트릭 결과 캐시 (evaluator가 평가/rollup을 쓰면 NOTIFY로 만료)
+read_cache = ReadCache(
+    ttl_seconds=settings.read_cache_ttl_seconds,
+    stale_seconds=settings.read_cache_stale_seconds,
+)
+read_cache_invalidation = InvalidationListener(engine, settings.stats_notify_channel, read_cache.invalidate)
+
+
 # FastAPI 앱 생성
 app = FastAPI(
     title="LLM Quality Observer - Dashboard Service",
     description="LLM 로그 및 평가 결과를 집계하여 모니터링 지표를 제공하는 대시보드 서비스",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 
@@ -31,6 +60,51 @@ def health_check():
     }
 
 
+@app.get("/cache/stats")
+def get_cache_stats():
+    """
+    요약 메트릭 캐시 상태.
+    키(엔드포인트)별 hit / stale / miss 수, hit 비율, 갱신 횟수와 평균/마지막 갱신 시간(초).
+    """
+    return {
+        "ttl_seconds": read_cache.ttl_seconds,
+        "stale_seconds": read_cache.stale_seconds,
+        "invalidation_listener": read_cache_invalidation.enabled,
+        "keys": read_cache.stats(),
+    }
+
+
+# evaluator rollups.ROLLUP_NAME과 같아야 함 (rollup 정의가 바뀔 때 버전이 올라감)
+ROLLUP_NAME = "llm_stats_hourly:v2"
+
+
+def _summary_metrics_from_rollups(db: Session) -> SummaryMetricsResponse:
+    """시간 x model_version 단위 rollup 행을 모두 더해서 요약 메트릭 계산."""
+    totals = db.query(
+        func.coalesce(func.sum(LLMStatsHourly.request_count), 0),
+        func.coalesce(func.sum(LLMStatsHourly.evaluated_count), 0),
+        func.coalesce(func.sum(LLMStatsHourly.latency_count), 0),
+        func.coalesce(func.sum(LLMStatsHourly.latency_sum), 0.0),
+        func.coalesce(func.sum(LLMStatsHourly.evaluation_count), 0),
+        func.coalesce(func.sum(LLMStatsHourly.score_sum), 0),
+        func.coalesce(func.sum(LLMStatsHourly.flagged_count), 0),
+    ).one()
+    total_logs, evaluated_logs, latency_count, latency_sum, evaluation_count, score_sum, flagged_count = totals
+
+    avg_latency_ms = round(float(latency_sum) / latency_count, 2) if latency_count else None
+    avg_score = round(score_sum / evaluation_count, 2) if evaluation_count else None
+    flagged_ratio = round(flagged_count / evaluated_logs, 4) if evaluated_logs else None
+
+    return SummaryMetricsResponse(
+        total_logs=total_logs,
+        evaluated_logs=evaluated_logs,
+        pending_logs=total_logs - evaluated_logs,
+        avg_latency_ms=avg_latency_ms,
+        avg_score=avg_score,
+        flagged_ratio=flagged_ratio,
+    )
+
+
 @app.get("/metrics/summary", response_model=SummaryMetricsResponse)
 def get_summary_metrics(db: Session = Depends(get_db)):
     """
@@ -44,12 +118,22 @@ def get_summary_metrics(db: Session = Depends(get_db)):
     - avg_score: 평균 평가 점수
     - flagged_ratio: 플래그된 응답 비율
 
+    evaluator의 통계 rollup이 있으면 rollup 합계로 계산 (최대 rollup 갱신 주기만큼 늦은 값).
+    결과는 read_cache_ttl_seconds 동안 캐시 (evaluator가 평가/rollup을 쓰면 만료).
+
     Args:
         db: SQLAlchemy 세션
 
     Returns:
         SummaryMetricsResponse: 요약 메트릭
     """
+    return read_cache.get("metrics_summary", db, _summary_metrics)
+
+
+def _summary_metrics(db: Session) -> SummaryMetricsResponse:
+    if settings.analytics_use_rollups and db.get(StatsRollupState, ROLLUP_NAME) is not None:
+        return _summary_metrics_from_rollups(db)
+
     # 1. 전체 로그 개수
     total_logs = db.query(func.count(LLMLog.id)).scalar() or 0
 
@@ -99,48 +183,27 @@ def get_metrics_by_model(db: Session = Depends(get_db)):
     - avg_latency_ms: 평균 응답 지연시간
     - avg_score: 평균 평가 점수 (평가된 로그만)
 
+    결과는 read_cache_ttl_seconds 동안 캐시 (evaluator가 평가/rollup을 쓰면 만료).
+
     Args:
         db: SQLAlchemy 세션
 
     Returns:
         ModelBreakdownResponse: 모델별 메트릭 리스트
     """
-    # model_version별로 그룹화하여 집계
-    query = (
-        db.query(
-            LLMLog.model_version,
-            func.count(LLMLog.id).label("total_logs"),
-            func.avg(LLMLog.latency_ms).label("avg_latency_ms"),
-        )
-        .filter(LLMLog.model_version.isnot(None))  # NULL 제외
-        .group_by(LLMLog.model_version)
-        .order_by(func.count(LLMLog.id).desc())  # 로그 개수 많은 순
-    )
+    return read_cache.get("metrics_by_model", db, _metrics_by_model)
 
-    results = query.all()
 
-    model_metrics = []
-    for row in results:
-        model_version = row.model_version
-        total_logs = row.total_logs
-        avg_latency_ms = round(float(row.avg_latency_ms), 2) if row.avg_latency_ms else None
-
-        # 해당 모델의 평균 평가 점수 계산
-        avg_score_query = (
-            db.query(func.avg(LLMEvaluation.overall_score))
-            .join(LLMLog, LLMEvaluation.log_id == LLMLog.id)
-            .filter(LLMLog.model_version == model_version)
-        )
-        avg_score = avg_score_query.scalar()
-        avg_score = round(float(avg_score), 2) if avg_score is not None else None
-
-        model_metrics.append(
-            ModelMetricsItem(
-                model_version=model_version,
-                total_logs=total_logs,
-                avg_latency_ms=avg_latency_ms,
-                avg_score=avg_score,
-            )
+def _metrics_by_model(db: Session) -> ModelBreakdownResponse:
+    # model_version별 로그/평가 집계를 쿼리 한 번으로 (로그 개수 많은 순, NULL 제외)
+    model_metrics = [
+        ModelMetricsItem(
+            model_version=row.model_version,
+            total_logs=row.total_requests,
+            avg_latency_ms=round(row.avg_latency_ms, 2) if row.avg_latency_ms else None,
+            avg_score=round(row.avg_score, 2) if row.avg_score is not None else None,
         )
+        for row in fetch_model_stats(db, LLMLog, LLMEvaluation, exclude_null_model=True)
+    ]
 
     return ModelBreakdownResponse(models=model_metrics)
@@ -18,6 +18,7 @@ class LLMLog(Base):
     """
     gateway-api에서 생성하는 llm_logs 테이블.
     Dashboard는 이 테이블을 읽기 전용으로 사용.
+    Postgres에서는 created_at 범위 파티션 테이블 (evaluator의 보관 기간이 지난 로그는 삭제됨).
     """
     __tablename__ = "llm_logs"
 
@@ -29,8 +30,11 @@ class LLMLog(Base):
     )
 
     user_id = Column(String(128), nullable=True)
+    # 본문이 길면 앞부분(미리보기)만 저장하고 전체 본문은 llm_text_blobs에 (해시가 NULL이면 전체 본문)
     prompt = Column(Text, nullable=False)
     response = Column(Text, nullable=False)
+    prompt_hash = Column(String(64), nullable=True)
+    response_hash = Column(String(64), nullable=True)
 
     model_version = Column(String(64), nullable=True)
     latency_ms = Column(Float, nullable=True)
@@ -58,6 +62,7 @@ class LLMEvaluation(Base):
     )
 
     # 어떤 로그에 대한 평가인지
+    # (Postgres에서는 llm_logs가 파티션 테이블이라 DB의 FK 제약은 스키마 마이그레이션 4에서 제거됨, ORM 관계용으로만 선언)
     log_id = Column(Integer, ForeignKey("llm_logs.id"), nullable=False, index=True)
 
     # 평가 점수 (1~5 스케일)
@@ -77,3 +82,35 @@ class LLMEvaluation(Base):
 
     # N:1 관계 (여러 평가가 한 로그를 참조)
     log = relationship("LLMLog", back_populates="evaluations")
+
+
+class LLMStatsHourly(Base):
+    """
+    시간(hour) x model_version 단위로 미리 집계한 통계 (rollup).
+    evaluator의 rollup 작업이 갱신하고, Dashboard는 읽기만 함.
+    평가 통계는 평가 대상 로그의 created_at 시간대에 집계되며, 모든 컬럼은 더할 수 있는 합계/개수.
+    """
+    __tablename__ = "llm_stats_hourly"
+
+    bucket_start = Column(DateTime(timezone=True), primary_key=True)
+    model_version = Column(String(64), primary_key=True)  # NULL model_version은 ""
+
+    request_count = Column(Integer, nullable=False, default=0)
+    error_count = Column(Integer, nullable=False, default=0)
+    latency_count = Column(Integer, nullable=False, default=0)
+    latency_sum = Column(Float, nullable=False, default=0.0)
+
+    evaluated_count = Column(Integer, nullable=False, default=0)
+    evaluation_count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Integer, nullable=False, default=0)
+    flagged_count = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class StatsRollupState(Base):
+    """rollup 작업의 진행 상태 (watermark). 행이 없으면 아직 rollup이 만들어지지 않은 것."""
+    __tablename__ = "llm_stats_rollup_state"
+
+    name = Column(String(64), primary_key=True)
+    watermark = Column(DateTime(timezone=True), nullable=False)
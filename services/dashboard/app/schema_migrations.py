@@ -0,0 +1,295 @@
+"""
+스키마 마이그레이션 모듈 (gateway-api / evaluator / dashboard 공용).
+
+서비스가 시작할 때 run_migrations()가
+1) 서비스 ORM 모델 중 아직 없는 테이블을 create_all로 만들고 (새 DB, 새로 추가된 테이블)
+2) 아래 MIGRATIONS 중 schema_migrations 테이블에 기록되지 않은 것을 버전 순서대로 적용한다.
+create_all은 이미 있는 테이블에 인덱스/컬럼을 추가하지 않으므로, 기존 DB의 스키마 변경은 모두 마이그레이션으로 한다.
+
+- 마이그레이션 문은 IF NOT EXISTS / IF EXISTS로 멱등하게 작성한다. 새 DB에서는 모델에 선언된 인덱스를 create_all이
+  먼저 만들어 두므로 그대로 지나가고, 중간에 실패해도 다시 실행하면 남은 부분부터 이어서 적용된다.
+- Postgres에서는 인덱스를 CREATE INDEX CONCURRENTLY로 만들어 큰 llm_logs에도 쓰기를 막지 않는다 (autocommit 연결).
+  여러 서비스/레플리카가 동시에 시작해도 advisory lock으로 한 곳에서만 적용한다.
+- Postgres에서 llm_logs는 created_at 범위 파티션 테이블이다 (마이그레이션 4). 파티션 생성/보관은 evaluator의 partitions.py.
+- 배포된 마이그레이션은 고치지 말고 새 버전을 추가한다. 모델의 인덱스를 바꿀 때도 여기에 마이그레이션을 함께 추가한다.
+
+gateway-api/app, evaluator/app, dashboard/app의 schema_migrations.py는 같은 파일이다.
+서비스마다 Docker 빌드 컨텍스트가 달라 복사해서 쓰므로, 수정할 때는 세 파일을 함께 바꾼다
+(gateway-api의 tests/test_schema_migrations.py가 세 파일이 같은지 확인).
+어느 서비스가 먼저 시작해도 같은 이력을 적용한다.
+
+배포 파이프라인에서 따로 실행할 때 (SCHEMA_AUTO_MIGRATE=false):
+
+    DATABASE_URL=... python -m app.schema_migrations     # dashboard는 app 디렉터리에서 python -m schema_migrations
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+from typing import Callable
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    func,
+    insert,
+    inspect,
+    select,
+    text,
+)
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+# 여러 프로세스가 동시에 마이그레이션하지 않도록 잡는 Postgres advisory lock 키
+MIGRATION_LOCK_KEY = 0x4C4C4D4D4947  # "LLMMIG"
+
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("name", String(128), nullable=False),
+    Column("applied_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+)
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    upgrade: Callable[[Connection], None]
+
+
+def _is_postgres(conn: Connection) -> bool:
+    return conn.dialect.name == "postgresql"
+
+
+def create_index(conn: Connection, name: str, table: str, columns: str,
+                 where: str | None = None, using: str | None = None, unique: bool = False) -> None:
+    """
+    인덱스가 없으면 생성 (Postgres는 CONCURRENTLY).
+    using(예: brin)을 지정한 인덱스는 Postgres 전용이라 다른 DB에서는 건너뛴다.
+    """
+    if using is not None and not _is_postgres(conn):
+        return
+
+    if _is_postgres(conn):
+        # CONCURRENTLY 생성이 중간에 실패하면 INVALID 인덱스가 남고 IF NOT EXISTS가 그걸 건너뛰므로 먼저 지움
+        invalid = conn.execute(
+            text(
+                "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                "WHERE c.relname = :name AND NOT i.indisvalid"
+            ),
+            {"name": name},
+        ).first()
+        if invalid:
+            conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+        statement = f"CREATE {'UNIQUE ' if unique else ''}INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table}"
+    else:
+        statement = f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {name} ON {table}"
+
+    if using is not None:
+        statement += f" USING {using}"
+    statement += f" ({columns})"
+    if where is not None:
+        statement += f" WHERE {where}"
+    conn.execute(text(statement))
+
+
+def drop_index(conn: Connection, name: str) -> None:
+    concurrently = "CONCURRENTLY " if _is_postgres(conn) else ""
+    conn.execute(text(f"DROP INDEX {concurrently}IF EXISTS {name}"))
+
+
+def add_column(conn: Connection, table: str, column: str, definition: str) -> None:
+    """
+    컬럼이 없으면 추가.
+    NULL 허용 / 기본값 없는 컬럼만 추가할 것 (Postgres에서 테이블을 다시 쓰지 않고 카탈로그만 바뀜).
+    """
+    if _is_postgres(conn):
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {column} {definition}"))
+        return
+    if column not in {col["name"] for col in inspect(conn).get_columns(table)}:
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {definition}"))
+
+
+def _created_at_id_indexes(conn: Connection) -> None:
+    # 기간 필터/rollup 갱신과 대시보드 목록 keyset 페이지네이션이 (created_at, id) 순서로 읽음
+    create_index(conn, "ix_llm_logs_created_at_id", "llm_logs", "created_at, id")
+    create_index(conn, "ix_llm_evaluations_created_at_id", "llm_evaluations", "created_at, id")
+    # 평가 대기 로그 조회 (status='success'인 로그를 created_at, id 순으로 스캔)
+    create_index(conn, "ix_llm_logs_success_created_at_id", "llm_logs", "created_at, id", where="status = 'success'")
+    # (created_at, id) 인덱스가 대신하는 단일 컬럼 인덱스
+    drop_index(conn, "ix_llm_logs_created_at")
+    drop_index(conn, "ix_llm_evaluations_created_at")
+
+
+def _model_version_created_at_index(conn: Connection) -> None:
+    # 모델별 기간 집계 (compare-models, 모델 필터)
+    create_index(conn, "ix_llm_logs_model_version_created_at", "llm_logs", "model_version, created_at")
+
+
+def _created_at_brin_index(conn: Connection) -> None:
+    # llm_logs는 created_at 순서로 append 되므로 BRIN이 B-tree의 수백분의 1 크기로
+    # 긴 기간 범위 스캔(rollup backfill, 보관 기간 정리)의 블록을 걸러낸다. Postgres 전용이라 모델에는 선언하지 않음
+    create_index(conn, "brin_llm_logs_created_at", "llm_logs", "created_at", using="brin")
+
+
+# llm_logs를 파티션 테이블로 바꾸는 DO 블록 (한 문장이라 autocommit 연결에서도 전체가 한 트랜잭션).
+# 기존 테이블은 복사하지 않고 이름만 바꿔 llm_logs_legacy 파티션으로 붙인다.
+# - 파티션 테이블을 참조하는 FK는 (id, created_at) 전체를 참조해야 하므로 llm_logs를 참조하는 FK를 지운다
+# - 인덱스 이름은 스키마 전체에서 유일하므로 legacy 쪽 인덱스 이름을 바꾸고 같은 정의를 부모에 만든다.
+#   ATTACH가 legacy의 같은 정의 인덱스를 그대로 부모 인덱스의 파티션 인덱스로 붙이므로 다시 만들지 않는다
+# - id 시퀀스 소유자를 부모로 옮겨서, 나중에 legacy 파티션을 drop해도 시퀀스가 함께 지워지지 않게 한다
+_PARTITION_LLM_LOGS = r"""
+DO $$
+DECLARE
+    fk record;
+    idx record;
+    pkey text;
+    seq text;
+BEGIN
+    FOR fk IN SELECT conrelid::regclass AS tbl, conname FROM pg_constraint
+              WHERE contype = 'f' AND confrelid = 'llm_logs'::regclass
+    LOOP
+        EXECUTE 'ALTER TABLE ' || fk.tbl || ' DROP CONSTRAINT ' || quote_ident(fk.conname);
+    END LOOP;
+
+    ALTER TABLE llm_logs ADD CONSTRAINT llm_logs_legacy_id_created_at_key
+        UNIQUE USING INDEX llm_logs_legacy_id_created_at_key;
+    ALTER TABLE llm_logs RENAME TO llm_logs_legacy;
+    SELECT conname INTO pkey FROM pg_constraint WHERE conrelid = 'llm_logs_legacy'::regclass AND contype = 'p';
+    IF pkey IS NOT NULL THEN
+        EXECUTE 'ALTER TABLE llm_logs_legacy RENAME CONSTRAINT ' || quote_ident(pkey) || ' TO llm_logs_legacy_pkey';
+    END IF;
+
+    CREATE TABLE llm_logs (LIKE llm_logs_legacy INCLUDING DEFAULTS) PARTITION BY RANGE (created_at);
+    ALTER TABLE llm_logs ADD CONSTRAINT llm_logs_pkey PRIMARY KEY (id, created_at);
+    seq := pg_get_serial_sequence('llm_logs_legacy', 'id');
+    IF seq IS NOT NULL THEN
+        EXECUTE 'ALTER SEQUENCE ' || seq || ' OWNED BY llm_logs.id';
+    END IF;
+
+    FOR idx IN SELECT c.relname AS name, pg_get_indexdef(i.indexrelid) AS definition
+               FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+               WHERE i.indrelid = 'llm_logs_legacy'::regclass AND NOT i.indisunique
+    LOOP
+        EXECUTE 'ALTER INDEX ' || quote_ident(idx.name) || ' RENAME TO ' || quote_ident(left(idx.name, 56) || '_legacy');
+        EXECUTE regexp_replace(idx.definition, ' ON (\S+\.)?llm_logs_legacy ', ' ON llm_logs ');
+    END LOOP;
+
+    ALTER TABLE llm_logs ATTACH PARTITION llm_logs_legacy FOR VALUES FROM (MINVALUE) TO ({bound});
+    ALTER TABLE llm_logs_legacy DROP CONSTRAINT llm_logs_legacy_bound;
+    CREATE TABLE llm_logs_default PARTITION OF llm_logs DEFAULT;
+END
+$$
+"""
+
+
+def _partition_llm_logs(conn: Connection) -> None:
+    """
+    Postgres: llm_logs를 created_at 범위 파티션 테이블로 전환 (다른 DB는 그대로).
+    이후 기간별 파티션 생성과 보관 기간이 지난 파티션의 보관/삭제는 evaluator의 partitions.py가 한다.
+    """
+    if not _is_postgres(conn):
+        return
+    partitioned = conn.execute(
+        text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('llm_logs')")
+    ).first()
+    if partitioned:
+        return
+
+    # 기존 행은 모두 legacy 파티션 범위(이틀 뒤 UTC 자정 전)에 있고, 전환 중에 들어오는 로그도 그 범위에 들어감
+    boundary = conn.execute(text("SELECT date_trunc('day', now() AT TIME ZONE 'UTC') + interval '2 days'")).scalar()
+    bound = f"'{boundary:%Y-%m-%d %H:%M:%S}+00'"
+
+    # ATTACH가 범위 검사로 테이블 전체를 스캔하지 않도록 같은 CHECK 제약을 미리 검증해 둔다
+    # (NOT VALID 추가 후 VALIDATE는 쓰기를 막지 않는 잠금으로 스캔)
+    conn.execute(text("ALTER TABLE llm_logs DROP CONSTRAINT IF EXISTS llm_logs_legacy_bound"))
+    conn.execute(text(f"ALTER TABLE llm_logs ADD CONSTRAINT llm_logs_legacy_bound CHECK (created_at < {bound}) NOT VALID"))
+    conn.execute(text("ALTER TABLE llm_logs VALIDATE CONSTRAINT llm_logs_legacy_bound"))
+    # 부모 PK (id, created_at)에 붙일 legacy 쪽 unique 인덱스
+    create_index(conn, "llm_logs_legacy_id_created_at_key", "llm_logs", "id, created_at", unique=True)
+
+    conn.execute(text(_PARTITION_LLM_LOGS.replace("{bound}", bound)))
+
+
+def _text_blobs(conn: Connection) -> None:
+    """
+    긴 프롬프트/응답 본문을 오프로드하는 llm_text_blobs 테이블과 llm_logs의 본문 해시 컬럼 (text_blobs.py).
+    테이블이 모델에 없는 서비스(dashboard)도 있어 create_all에 맡기지 않고 직접 만든다.
+    """
+    binary, timestamp = ("BYTEA", "TIMESTAMP WITH TIME ZONE") if _is_postgres(conn) else ("BLOB", "DATETIME")
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS llm_text_blobs ("
+        "hash VARCHAR(64) NOT NULL PRIMARY KEY, "
+        f"data {binary} NOT NULL, "
+        "size INTEGER NOT NULL, "
+        f"last_used_at {timestamp} NOT NULL)"
+    ))
+    # 파티션 테이블에 추가한 컬럼은 모든 파티션에 함께 추가된다
+    add_column(conn, "llm_logs", "prompt_hash", "VARCHAR(64)")
+    add_column(conn, "llm_logs", "response_hash", "VARCHAR(64)")
+
+
+MIGRATIONS: list[Migration] = [
+    Migration(1, "created_at_id_indexes", _created_at_id_indexes),
+    Migration(2, "llm_logs_model_version_created_at_index", _model_version_created_at_index),
+    Migration(3, "llm_logs_created_at_brin_index", _created_at_brin_index),
+    Migration(4, "llm_logs_range_partitions", _partition_llm_logs),
+    Migration(5, "llm_text_blobs", _text_blobs),
+]
+
+
+def applied_versions(conn: Connection) -> set[int]:
+    schema_migrations.create(conn, checkfirst=True)
+    return set(conn.execute(select(schema_migrations.c.version)).scalars())
+
+
+def run_migrations(engine: Engine, metadata: MetaData | None = None) -> list[int]:
+    """
+    없는 테이블을 만들고 아직 적용되지 않은 마이그레이션을 순서대로 적용.
+
+    Args:
+        engine: 대상 DB 엔진
+        metadata: 서비스 ORM 모델의 MetaData (주면 먼저 create_all)
+
+    Returns:
+        list[int]: 이번에 적용한 마이그레이션 버전
+    """
+    if metadata is not None:
+        metadata.create_all(bind=engine)
+
+    applied = []
+    with engine.connect() as conn:
+        postgres = _is_postgres(conn)
+        if postgres:
+            # CREATE INDEX CONCURRENTLY는 트랜잭션 안에서 실행할 수 없음
+            conn.execution_options(isolation_level="AUTOCOMMIT")
+            conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        try:
+            done = applied_versions(conn)
+            conn.commit()
+            for migration in MIGRATIONS:
+                if migration.version in done:
+                    continue
+                logger.info(f"Applying schema migration {migration.version}: {migration.name}")
+                migration.upgrade(conn)
+                conn.execute(insert(schema_migrations).values(version=migration.version, name=migration.name))
+                conn.commit()
+                applied.append(migration.version)
+        finally:
+            if postgres:
+                conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+    return applied
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    versions = run_migrations(create_engine(os.environ["DATABASE_URL"]))
+    print(f"applied schema migrations: {versions or 'none'}")
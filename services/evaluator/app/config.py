@@ -8,23 +8,89 @@ class Settings(BaseSettings):
 
     # DB
     database_url: str
+    # 시작 시 스키마 마이그레이션 적용 (false면 없는 테이블만 만들고, 마이그레이션은 python -m app.schema_migrations로 따로 실행)
+    schema_auto_migrate: bool = True
 
     # LLM (Judge 용)
     llm_api_base_url: str | None = None
     llm_api_key: str
     openai_model_judge: str = "gpt-5-mini"
 
+    # Judge 호출 HTTP 트랜스포트 (커넥션 풀 / 타임아웃 / 재시도)
+    llm_http_max_connections: int = 200
+    llm_http_max_keepalive_connections: int = 100
+    llm_http_keepalive_expiry_seconds: float = 30.0
+    llm_http2_enabled: bool = False
+    llm_http_connect_timeout_seconds: float = 5.0
+    llm_http_read_timeout_seconds: float = 120.0
+    # 429/5xx/연결 오류 재시도 횟수 (OpenAI SDK의 지수 백오프 + jitter 사용)
+    llm_max_retries: int = 2
+
     # Batch Evaluation Scheduler
     enable_auto_evaluation: bool = True  # 자동 평가 활성화 여부
+    # 'interval' (APScheduler로 주기 실행) or 'continuous' (로그가 들어오는 즉시 평가, 배치 요약 알림 없음)
+    evaluation_mode: str = "interval"
     evaluation_interval_minutes: int = 60  # 평가 주기 (분 단위, 기본 1시간)
     evaluation_batch_size: int = 10  # 한 번에 평가할 로그 개수
     evaluation_judge_type: str = "rule"  # 자동 평가 시 사용할 judge 타입 ('rule' or 'llm')
+    evaluation_write_chunk_size: int = 500  # 평가 결과를 한 트랜잭션에 insert할 최대 행 수
+    pending_log_lookback_seconds: int = 300  # 대기 로그 watermark 이전으로 다시 훑는 구간 (늦게 커밋된 로그 대비)
+    rule_pack_path: str | None = None  # 룰 기반 평가에 쓸 rule pack JSON 파일 (미설정 시 기본 룰)
+
+    # Continuous 평가 파이프라인 (evaluation_mode='continuous')
+    evaluation_min_batch_size: int = 10  # backlog가 적을 때의 배치 크기
+    evaluation_max_batch_size: int = 200  # backlog가 쌓였을 때 늘릴 수 있는 최대 배치 크기
+    evaluation_idle_min_seconds: float = 0.5  # 대기 로그가 없을 때 처음 기다리는 시간
+    evaluation_idle_max_seconds: float = 30.0  # 대기 시간 상한 (NOTIFY를 못 받아도 이 주기로 확인)
+    log_notify_channel: str | None = "llm_logs_inserted"  # gateway가 NOTIFY하는 Postgres 채널 (LISTEN)
+
+    # 멀티 워커 평가 (work claiming)
+    evaluation_work_claiming_enabled: bool = False  # 여러 evaluator 레플리카를 띄울 때 true
+    evaluation_lease_seconds: int = 600  # 리스 유효 시간 (워커가 죽으면 이후 다른 워커가 가져감)
+    evaluator_worker_id: str | None = None  # 미설정 시 "<hostname>:<pid>"
+
+    # LLM Judge 동시 실행
+    judge_max_concurrency: int = 8  # 동시에 보내는 judge 요청 수
+    judge_rate_limit_rpm: int = 0  # 분당 요청 수 제한 (0 = 제한 없음)
+    judge_rate_limit_tpm: int = 0  # 분당 토큰 수 제한 (프롬프트 길이로 추정, 0 = 제한 없음)
+
+    # 배치 judge (짧은 로그 여러 개를 judge 요청 하나로 평가)
+    judge_batch_max_items: int = 1  # 요청 하나에 넣을 최대 로그 수 (1 = 단일 모드)
+    judge_batch_max_tokens: int = 6000  # 배치 프롬프트 추정 토큰 상한
+    judge_batch_max_item_tokens: int = 800  # 이보다 긴 로그는 단일 judge로 평가
+
+    # LLM Judge 결과 캐시 (같은 prompt/response는 judge 재호출 없이 재사용)
+    judge_cache_enabled: bool = True
+    judge_cache_max_entries: int = 10000  # 메모리 tier 최대 개수
+    judge_rubric_version: str = "v1"  # 평가 기준이 바뀌면 올림 (이전 결과는 캐시 키가 달라져 무시됨)
+
+    # 대시보드/분석 API용 통계 rollup (llm_stats_hourly) 증분 갱신
+    stats_rollup_enabled: bool = True
+    stats_rollup_interval_seconds: int = 60  # 갱신 주기 (rollup을 읽는 API는 최대 이만큼 늦은 값을 보여줌)
+    stats_rollup_lookback_seconds: int = 300  # watermark 이전으로 다시 훑는 구간 (늦게 커밋된 로그/평가 대비)
+    # 평가/rollup을 쓰면 NOTIFY하는 Postgres 채널 (gateway-api / dashboard가 LISTEN해서 요약 캐시 만료, 비우면 보내지 않음)
+    stats_notify_channel: str | None = "llm_stats_changed"
+
+    # llm_logs 파티션 관리 / 보관 기간 (Postgres, 파티션 테이블 전환은 스키마 마이그레이션 4)
+    log_partition_maintenance_enabled: bool = True
+    log_partition_maintenance_interval_seconds: int = 3600
+    log_partition_interval: str = "day"  # 'day' or 'week' (UTC 기준)
+    log_partition_premake: int = 3  # 현재 기간 이후로 미리 만들어 둘 파티션 수
+    log_retention_days: int = 0  # 원본 로그 보관 일수 (0 = 무기한). 지난 파티션은 압축 파일로 보관 후 삭제
+    log_archive_dir: str = "/data/llm_logs_archive"  # 보관 파일(JSONL.gz) 디렉터리
 
     # Notification Settings
     slack_webhook_url: str | None = None  # Slack 웹훅 URL
     discord_webhook_url: str | None = None  # Discord 웹훅 URL
     notification_score_threshold: int = 3  # 알림 보낼 점수 임계값 (이하일 때 알림)
 
+    # 알림 전송 (백그라운드 dispatcher, 평가 경로는 큐에 넣기만 함)
+    notification_queue_max_size: int = 1000  # 채널별 대기 알림 상한 (넘치면 버리고 메트릭 기록)
+    notification_digest_max_items: int = 10  # 낮은 품질 알림을 메시지 하나로 묶는 최대 개수 (1 = 묶지 않음)
+    notification_digest_window_seconds: float = 5.0  # 첫 알림 이후 함께 묶을 알림을 기다리는 시간
+    notification_rate_limit_per_minute: int = 20  # 채널별 분당 메시지 수 (0 = 제한 없음)
+    notification_http_timeout_seconds: float = 10.0  # 웹훅 / SMTP 타임아웃
+
     # Email Notification Settings
     smtp_host: str | None = None  # SMTP 서버 주소
     smtp_port: int = 587  # SMTP 포트 (기본 587 - TLS)
@@ -1,5 +1,6 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 
 from .config import settings
 
@@ -15,3 +16,26 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def dialect_insert(bind):
+    """
+    ON CONFLICT(upsert)를 지원하는 dialect별 insert 생성자 반환 (Postgres / SQLite).
+    """
+    dialect = bind.dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert
+    if dialect == "sqlite":
+        return sqlite.insert
+    raise RuntimeError(f"Upsert is not supported for dialect: {dialect}")
+
+
+def notify_stats_changed(db: Session) -> None:
+    """
+    현재 트랜잭션에 통계 변경 NOTIFY 추가 (Postgres만, 커밋될 때 전달).
+    gateway-api / dashboard가 받아서 요약 API 캐시를 만료시킨다.
+    """
+    channel = settings.stats_notify_channel
+    if not channel or db.get_bind().dialect.name != "postgresql":
+        return
+    db.execute(select(func.pg_notify(channel, "")))
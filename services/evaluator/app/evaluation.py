@@ -0,0 +1,213 @@
+"""
+평가 실행 모듈.
+룰 기반 / LLM-as-a-Judge 평가를 로그 배치 단위로 실행하고 LLMEvaluation 인스턴스를 만든 뒤,
+결과를 청크 단위 bulk insert로 저장한다.
+스케줄러(run_batch_evaluation)와 /evaluate-once 엔드포인트가 함께 사용.
+"""
+
+import logging
+import time
+from typing import NamedTuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .db import notify_stats_changed
+from .judge_cache import judge_cache
+from .judge_executor import judge_executor
+from .llm_judge import EvaluationResult
+from .metrics import record_evaluation_write, record_evaluation_write_batch
+from .models import LLMLog, LLMEvaluation
+from .rules import active_rules
+
+logger = logging.getLogger(__name__)
+
+# bulk insert 시 LLMEvaluation에서 옮겨 담는 컬럼 (id, created_at은 DB가 채움)
+_EVALUATION_COLUMNS = (
+    "log_id",
+    "overall_score",
+    "score_instruction_following",
+    "score_truthfulness",
+    "is_flagged",
+    "label",
+    "judge_model",
+    "comment",
+    "raw_judge_response",
+)
+
+
+class EvaluationOutcome(NamedTuple):
+    """로그 하나의 평가 결과 (성공 시 evaluation, 실패 시 error)."""
+    log: LLMLog
+    evaluation: LLMEvaluation | None
+    error: Exception | None
+    duration_seconds: float
+
+
+def judge_model_name(judge_type: str) -> str:
+    return active_rules.judge_model if judge_type == "rule" else settings.openai_model_judge
+
+
+def build_llm_evaluation(log: LLMLog, llm_eval_result: EvaluationResult) -> LLMEvaluation:
+    """LLM-as-a-Judge 결과로 LLMEvaluation 인스턴스 생성 (세부 점수 포함)."""
+    return LLMEvaluation(
+        log_id=log.id,
+        overall_score=llm_eval_result["score_overall"],
+        score_instruction_following=llm_eval_result["score_instruction_following"],
+        score_truthfulness=llm_eval_result["score_truthfulness"],
+        is_flagged=llm_eval_result["score_overall"] < 3,  # 점수 3 미만이면 플래그
+        label="llm-judge",
+        judge_model=settings.openai_model_judge,
+        comment=llm_eval_result["comments"],
+        raw_judge_response=llm_eval_result["raw_judge_response"],
+    )
+
+
+def _evaluate_with_rules(logs: list[LLMLog]) -> list[EvaluationOutcome]:
+    # 배치 전체를 한 번에 평가하므로 로그별 소요 시간은 배치 시간을 나눠서 기록
+    start = time.perf_counter()
+    try:
+        result = active_rules.evaluate_batch([log.response for log in logs])
+    except Exception as e:
+        duration = (time.perf_counter() - start) / max(1, len(logs))
+        return [EvaluationOutcome(log, None, e, duration) for log in logs]
+    duration = (time.perf_counter() - start) / max(1, len(logs))
+
+    outcomes = []
+    for log, overall_score, is_flagged, label, comment in zip(
+        logs, result.overall_score.tolist(), result.is_flagged.tolist(), result.label.tolist(), result.comments,
+    ):
+        evaluation = LLMEvaluation(
+            log_id=log.id,
+            overall_score=overall_score,
+            is_flagged=is_flagged,
+            label=label,
+            judge_model=active_rules.judge_model,
+            comment=comment,
+        )
+        outcomes.append(EvaluationOutcome(log, evaluation, None, duration))
+    return outcomes
+
+
+def _evaluate_with_llm_judge(logs: list[LLMLog]) -> list[EvaluationOutcome]:
+    # 1. judge 결과 캐시 조회 (같은 prompt/response 조합은 judge 재호출 없이 재사용)
+    keys = [judge_cache.key_for(log) for log in logs]
+    judged: dict[str, tuple[EvaluationResult | None, Exception | None, float]] = {
+        key: (result, None, 0.0) for key, result in judge_cache.get_many(keys).items()
+    }
+
+    # 2. 캐시 미스만 judge 호출 (배치 안에서 내용이 같은 로그는 한 번만)
+    to_judge: dict[str, LLMLog] = {}
+    for key, log in zip(keys, logs):
+        if key not in judged and key not in to_judge:
+            to_judge[key] = log
+
+    fresh: dict[str, EvaluationResult] = {}
+    for key, outcome in zip(to_judge, judge_executor.judge_batch(list(to_judge.values()))):
+        judged[key] = (outcome.result, outcome.error, outcome.duration_seconds)
+        if outcome.error is None:
+            fresh[key] = outcome.result
+    judge_cache.put_many(fresh)
+
+    # 3. 로그별 LLMEvaluation 생성
+    outcomes = []
+    for key, log in zip(keys, logs):
+        result, error, duration_seconds = judged[key]
+        if error is not None:
+            outcomes.append(EvaluationOutcome(log, None, error, duration_seconds))
+            continue
+        try:
+            evaluation = build_llm_evaluation(log, result)
+        except Exception as e:
+            outcomes.append(EvaluationOutcome(log, None, e, duration_seconds))
+            continue
+        outcomes.append(EvaluationOutcome(log, evaluation, None, duration_seconds))
+    return outcomes
+
+
+def evaluate_logs(logs: list[LLMLog], judge_type: str) -> list[EvaluationOutcome]:
+    """
+    로그 배치를 평가하고 입력 순서대로 EvaluationOutcome 리스트를 반환.
+    한 로그의 실패는 해당 outcome의 error로만 기록되고 나머지 로그 평가는 계속된다.
+
+    Args:
+        logs: 평가할 로그 리스트
+        judge_type: 'rule' (룰 기반) or 'llm' (LLM-as-a-Judge, 동시 실행)
+    """
+    if judge_type == "rule":
+        return _evaluate_with_rules(logs)
+    return _evaluate_with_llm_judge(logs)
+
+
+def _evaluation_row(evaluation: LLMEvaluation) -> dict:
+    return {column: getattr(evaluation, column) for column in _EVALUATION_COLUMNS}
+
+
+def _insert_rows(db: Session, rows: list[dict]):
+    db.execute(insert(LLMEvaluation), rows)
+    db.commit()
+
+
+def write_evaluations(
+    db: Session,
+    outcomes: list[EvaluationOutcome],
+    chunk_size: int | None = None,
+) -> list[EvaluationOutcome]:
+    """
+    평가에 성공한 outcome들의 LLMEvaluation을 청크 단위 bulk insert로 저장.
+
+    청크 하나가 한 트랜잭션(executemany 한 번)이고, 청크 insert가 실패하면
+    해당 청크만 행 단위로 다시 insert해서 문제 있는 행만 걸러낸다.
+    저장에 실패한 행은 error가 채워진 outcome으로 바뀌어 반환된다 (입력 순서 유지).
+
+    Args:
+        db: SQLAlchemy 세션
+        outcomes: evaluate_logs 결과
+        chunk_size: 한 트랜잭션에 insert할 최대 행 수 (기본값: settings.evaluation_write_chunk_size)
+
+    Returns:
+        list[EvaluationOutcome]: 저장 결과가 반영된 outcome 리스트
+    """
+    chunk_size = max(1, chunk_size or settings.evaluation_write_chunk_size)
+    results = list(outcomes)
+    ready = [i for i, outcome in enumerate(outcomes) if outcome.error is None]
+    if not ready:
+        return results
+
+    written = 0
+    start = time.perf_counter()
+
+    for offset in range(0, len(ready), chunk_size):
+        chunk = ready[offset:offset + chunk_size]
+
+        try:
+            _insert_rows(db, [_evaluation_row(outcomes[i].evaluation) for i in chunk])
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Bulk insert of {len(chunk)} evaluations failed, retrying row by row: {str(e)}")
+        else:
+            written += len(chunk)
+            record_evaluation_write("bulk", len(chunk), 0)
+            continue
+
+        # 실패한 청크는 행 단위로 재시도해서 문제 있는 행만 격리
+        chunk_written = 0
+        for i in chunk:
+            try:
+                _insert_rows(db, [_evaluation_row(outcomes[i].evaluation)])
+            except Exception as e:
+                db.rollback()
+                results[i] = outcomes[i]._replace(evaluation=None, error=e)
+                continue
+            chunk_written += 1
+
+        written += chunk_written
+        record_evaluation_write("row", chunk_written, len(chunk) - chunk_written)
+
+    if written:
+        notify_stats_changed(db)
+        db.commit()
+
+    record_evaluation_write_batch(written, time.perf_counter() - start)
+    return results
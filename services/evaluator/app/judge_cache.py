@@ -0,0 +1,172 @@
+"""
+LLM judge 결과 캐시 모듈.
+
+build_evaluation_prompt 결과(= prompt/response 내용) + judge 모델 + 루브릭 버전의 해시를 키로
+EvaluationResult를 저장해, 같은 내용의 로그는 judge API를 다시 호출하지 않는다.
+
+- 1차: 프로세스 내 LRU (최대 개수 제한)
+- 2차: llm_judge_cache 테이블 (evaluator 레플리카/재시작 사이에 공유)
+
+루브릭(평가 기준)이나 결과 해석 방식이 바뀌면 judge_rubric_version을 올린다.
+키가 달라져서 이전 결과는 더 이상 사용되지 않고, invalidate()로 정리할 수 있다.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Iterable
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .db import SessionLocal, dialect_insert
+from .llm_judge import EvaluationResult, build_evaluation_prompt
+from .metrics import record_judge_cache_lookup
+from .models import JudgeCacheEntry, LLMLog
+
+logger = logging.getLogger(__name__)
+
+
+class JudgeCache:
+    """
+    메모리 LRU + DB 2단 judge 결과 캐시.
+    스케줄러 스레드와 API 요청 스레드에서 함께 쓰므로 메모리 tier는 락으로 보호한다.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        judge_model: str,
+        rubric_version: str,
+        max_entries: int,
+        enabled: bool = True,
+    ):
+        self.session_factory = session_factory
+        self.judge_model = judge_model
+        self.rubric_version = rubric_version
+        self.max_entries = max_entries
+        self.enabled = enabled
+
+        self._entries: OrderedDict[str, EvaluationResult] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key_for(self, log: LLMLog) -> str:
+        prompt = build_evaluation_prompt(log)
+        return hashlib.sha256(f"{self.judge_model}\x00{self.rubric_version}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, result: EvaluationResult):
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, EvaluationResult]:
+        """
+        키들에 대한 캐시된 결과 조회 (메모리 → DB 순, DB는 한 번의 IN 쿼리).
+        DB에 문제가 있으면 캐시 미스로 처리하고 judge 호출로 넘어간다.
+        """
+        keys = set(keys)
+        if not self.enabled or not keys:
+            return {}
+
+        found: dict[str, EvaluationResult] = {}
+        with self._lock:
+            for key in keys:
+                result = self._entries.get(key)
+                if result is not None:
+                    self._entries.move_to_end(key)
+                    found[key] = result
+        record_judge_cache_lookup("memory", "hit", len(found))
+        record_judge_cache_lookup("memory", "miss", len(keys) - len(found))
+
+        missing = keys - found.keys()
+        if not missing:
+            return found
+
+        try:
+            with self.session_factory() as db:
+                rows = db.execute(
+                    select(JudgeCacheEntry.cache_key, JudgeCacheEntry.result)
+                    .where(JudgeCacheEntry.cache_key.in_(missing))
+                ).all()
+        except Exception as e:
+            logger.warning(f"Judge cache lookup failed: {str(e)}")
+            rows = []
+
+        for key, result_json in rows:
+            result = json.loads(result_json)
+            found[key] = result
+            self._remember(key, result)
+        record_judge_cache_lookup("db", "hit", len(rows))
+        record_judge_cache_lookup("db", "miss", len(missing) - len(rows))
+
+        return found
+
+    def put_many(self, results: dict[str, EvaluationResult]):
+        """judge 결과 저장. 다른 워커가 먼저 저장한 키는 그대로 둔다 (ON CONFLICT DO NOTHING)."""
+        if not self.enabled or not results:
+            return
+
+        for key, result in results.items():
+            self._remember(key, result)
+
+        try:
+            with self.session_factory() as db:
+                insert = dialect_insert(db.get_bind())
+                db.execute(
+                    insert(JudgeCacheEntry).on_conflict_do_nothing(index_elements=[JudgeCacheEntry.cache_key]),
+                    [
+                        {
+                            "cache_key": key,
+                            "judge_model": self.judge_model,
+                            "rubric_version": self.rubric_version,
+                            "result": json.dumps(result),
+                        }
+                        for key, result in results.items()
+                    ],
+                )
+                db.commit()
+        except Exception as e:
+            logger.warning(f"Failed to store {len(results)} judge cache entries: {str(e)}")
+
+    def invalidate(self, rubric_version: str | None = None) -> int:
+        """
+        캐시 무효화.
+
+        Args:
+            rubric_version: 지정하면 해당 버전의 결과만 삭제,
+                            None이면 현재 버전이 아닌(더 이상 쓰이지 않는) 결과를 삭제
+
+        Returns:
+            int: 삭제된 DB 행 수
+        """
+        stmt = delete(JudgeCacheEntry)
+        if rubric_version is None:
+            stmt = stmt.where(JudgeCacheEntry.rubric_version != self.rubric_version)
+        else:
+            stmt = stmt.where(JudgeCacheEntry.rubric_version == rubric_version)
+
+        with self.session_factory() as db:
+            deleted = db.execute(stmt).rowcount
+            db.commit()
+
+        # 메모리 tier에는 현재 버전 결과만 있으므로 현재 버전을 지울 때만 비움
+        if rubric_version == self.rubric_version:
+            with self._lock:
+                self._entries.clear()
+
+        logger.info(f"Invalidated {deleted} judge cache entries (rubric_version={rubric_version or 'stale'})")
+        return deleted
+
+
+judge_cache = JudgeCache(
+    session_factory=SessionLocal,
+    judge_model=settings.openai_model_judge,
+    rubric_version=settings.judge_rubric_version,
+    max_entries=settings.judge_cache_max_entries,
+    enabled=settings.judge_cache_enabled,
+)
@@ -0,0 +1,266 @@
+"""
+LLM-as-a-Judge 동시 실행 모듈.
+
+배치의 로그들을 AsyncOpenAI로 동시에 평가한다.
+
+- 동시 요청 수는 judge_max_concurrency로 제한
+- 분당 요청 수(RPM) / 분당 토큰 수(TPM) 제한 (token bucket, 0이면 제한 없음)
+- 로그별로 결과 또는 예외를 따로 반환 (한 로그의 실패가 배치 전체를 멈추지 않음)
+- judge_batch_max_items > 1이면 짧은 로그 여러 개를 judge 요청 하나로 묶어서 평가
+  (루브릭 토큰과 요청 오버헤드를 나눠 냄, 실패한 항목만 단일 judge로 재평가)
+
+스케줄러(BackgroundScheduler 스레드)와 sync 엔드포인트에서 호출되므로,
+전용 이벤트 루프 스레드를 하나 두고 배치마다 코루틴을 제출한다.
+루프가 계속 살아 있으므로 커넥션 풀과 rate limit 상태가 배치 사이에 유지된다.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Awaitable, Callable, NamedTuple
+
+from .config import settings
+from .llm_judge import (
+    BATCH_RUBRIC,
+    EvaluationResult,
+    build_batch_evaluation_prompt,
+    build_evaluation_prompt,
+    run_judge_async,
+    run_judge_batch_async,
+)
+from .metrics import record_judge_batch
+from .models import LLMLog
+
+logger = logging.getLogger(__name__)
+
+
+# 배치 프롬프트에서 로그 하나에 붙는 구분자/라벨의 추정 토큰 수
+ITEM_OVERHEAD_TOKENS = 20
+
+
+def estimate_tokens(text: str) -> int:
+    """대략적인 토큰 수 추정 (영문 기준 4글자 ≈ 1토큰)."""
+    return max(1, len(text) // 4)
+
+
+class TokenBucket:
+    """
+    분당 한도를 가진 async token bucket.
+    최대 1분치까지 몰아서 쓸 수 있고, 초당 (한도 / 60)씩 다시 채워진다.
+    """
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.fill_rate = per_minute / 60.0
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, amount: float = 1.0):
+        # 한 번에 용량보다 많이 요청하면 영원히 기다리게 되므로 용량으로 자름
+        amount = min(float(amount), self.capacity)
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.fill_rate)
+                self.updated_at = now
+
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+
+                await asyncio.sleep((amount - self.tokens) / self.fill_rate)
+
+
+class JudgeOutcome(NamedTuple):
+    """로그 하나의 평가 결과 (성공 시 result, 실패 시 error)."""
+    log: LLMLog
+    result: EvaluationResult | None
+    error: Exception | None
+    duration_seconds: float
+
+
+class JudgeExecutor:
+    """
+    전용 이벤트 루프 스레드에서 judge 호출을 동시에 실행하는 실행기.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        judge_fn: Callable[[LLMLog], Awaitable[EvaluationResult]] = run_judge_async,
+        batch_max_items: int = 1,
+        batch_max_tokens: int = 0,
+        batch_max_item_tokens: int = 0,
+        batch_judge_fn: Callable[[list[LLMLog]], Awaitable[dict[int, EvaluationResult]]] = run_judge_batch_async,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.judge_fn = judge_fn
+
+        # 배치 judge (여러 로그를 judge 요청 하나로): batch_max_items가 1이면 사용 안 함
+        self.batch_max_items = max(1, batch_max_items)
+        self.batch_max_tokens = batch_max_tokens
+        self.batch_max_item_tokens = batch_max_item_tokens
+        self.batch_judge_fn = batch_judge_fn
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+
+        # 아래 객체들은 루프 스레드 안에서 생성
+        self._semaphore: asyncio.Semaphore | None = None
+        self._request_bucket: TokenBucket | None = None
+        self._token_bucket: TokenBucket | None = None
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name="judge-executor",
+                    daemon=True,
+                )
+                self._thread.start()
+        return self._loop
+
+    def _init_limits(self):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            if self.requests_per_minute > 0:
+                self._request_bucket = TokenBucket(self.requests_per_minute)
+            if self.tokens_per_minute > 0:
+                self._token_bucket = TokenBucket(self.tokens_per_minute)
+
+    async def _acquire_rate_limits(self, prompt_tokens: int):
+        if self._request_bucket is not None:
+            await self._request_bucket.acquire()
+        if self._token_bucket is not None:
+            await self._token_bucket.acquire(prompt_tokens)
+
+    async def _judge_one(self, log: LLMLog) -> JudgeOutcome:
+        async with self._semaphore:
+            await self._acquire_rate_limits(estimate_tokens(build_evaluation_prompt(log)))
+
+            start = time.perf_counter()
+            try:
+                result = await self.judge_fn(log)
+            except Exception as e:
+                return JudgeOutcome(log, None, e, time.perf_counter() - start)
+            return JudgeOutcome(log, result, None, time.perf_counter() - start)
+
+    def pack(self, logs: list[LLMLog]) -> list[list[LLMLog]]:
+        """
+        로그들을 배치 judge 요청 단위로 묶음.
+        - 한 묶음은 최대 batch_max_items개, 추정 프롬프트 토큰 batch_max_tokens 이하
+        - batch_max_item_tokens보다 긴 로그는 단독으로 (단일 judge 프롬프트 사용)
+        """
+        if self.batch_max_items <= 1:
+            return [[log] for log in logs]
+
+        packs: list[list[LLMLog]] = []
+        current: list[LLMLog] = []
+        current_tokens = estimate_tokens(BATCH_RUBRIC)
+
+        for log in logs:
+            item_tokens = estimate_tokens(f"{log.prompt}{log.response}") + ITEM_OVERHEAD_TOKENS
+            if self.batch_max_item_tokens and item_tokens > self.batch_max_item_tokens:
+                packs.append([log])
+                continue
+
+            full = len(current) >= self.batch_max_items
+            too_large = self.batch_max_tokens and current_tokens + item_tokens > self.batch_max_tokens
+            if current and (full or too_large):
+                packs.append(current)
+                current, current_tokens = [], estimate_tokens(BATCH_RUBRIC)
+
+            current.append(log)
+            current_tokens += item_tokens
+
+        if current:
+            packs.append(current)
+        return packs
+
+    async def _judge_pack(self, pack: list[LLMLog]) -> list[JudgeOutcome]:
+        """
+        로그 묶음을 judge 요청 하나로 평가.
+        응답에서 빠졌거나 형식이 잘못된 항목(또는 요청 자체가 실패한 경우 전체)은 단일 judge로 다시 평가.
+        """
+        if len(pack) == 1:
+            return [await self._judge_one(pack[0])]
+
+        async with self._semaphore:
+            await self._acquire_rate_limits(estimate_tokens(build_batch_evaluation_prompt(pack)))
+
+            start = time.perf_counter()
+            try:
+                results = await self.batch_judge_fn(pack)
+            except Exception as e:
+                logger.warning(f"Batch judge of {len(pack)} logs failed, falling back to single judge: {str(e)}")
+                results = {}
+            duration = time.perf_counter() - start
+
+        record_judge_batch(len(pack), judged=len(results), fallback=len(pack) - len(results))
+
+        fallback = [log for log in pack if log.id not in results]
+        retried = {
+            outcome.log.id: outcome
+            for outcome in await asyncio.gather(*(self._judge_one(log) for log in fallback))
+        }
+        return [
+            JudgeOutcome(log, results[log.id], None, duration) if log.id in results else retried[log.id]
+            for log in pack
+        ]
+
+    async def _judge_all(self, logs: list[LLMLog]) -> list[JudgeOutcome]:
+        self._init_limits()
+        packed = await asyncio.gather(*(self._judge_pack(pack) for pack in self.pack(logs)))
+
+        # 긴 로그는 묶음에서 빠져 따로 평가되므로 입력 순서로 다시 정렬
+        position = {id(log): i for i, log in enumerate(logs)}
+        return sorted(
+            (outcome for outcomes in packed for outcome in outcomes),
+            key=lambda outcome: position[id(outcome.log)],
+        )
+
+    def judge_batch(self, logs: list[LLMLog]) -> list[JudgeOutcome]:
+        """
+        로그들을 동시에 평가하고, 입력 순서대로 JudgeOutcome 리스트를 반환.
+        (호출한 스레드는 배치가 끝날 때까지 대기)
+        """
+        if not logs:
+            return []
+
+        loop = self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(self._judge_all(logs), loop)
+        return future.result()
+
+    def shutdown(self):
+        """이벤트 루프 스레드 종료."""
+        with self._start_lock:
+            if self._loop is None:
+                return
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._loop.close()
+            self._loop = None
+            self._thread = None
+            self._semaphore = None
+            self._request_bucket = None
+            self._token_bucket = None
+
+
+judge_executor = JudgeExecutor(
+    max_concurrency=settings.judge_max_concurrency,
+    requests_per_minute=settings.judge_rate_limit_rpm,
+    tokens_per_minute=settings.judge_rate_limit_tpm,
+    batch_max_items=settings.judge_batch_max_items,
+    batch_max_tokens=settings.judge_batch_max_tokens,
+    batch_max_item_tokens=settings.judge_batch_max_item_tokens,
+)
@@ -5,6 +5,7 @@ from typing import TypedDict
 
 from fastapi import HTTPException
 from openai import (
+    AsyncOpenAI,
     OpenAI,
     RateLimitError,
     APIError,
@@ -13,6 +14,8 @@ from openai import (
 )
 
 from .config import settings
+from .http_transport import build_timeout, create_http_client, create_async_http_client
+from .metrics import record_llm_judge_request
 from .models import LLMLog
 
 
@@ -27,6 +30,18 @@ class EvaluationResult(TypedDict):
 client = OpenAI(
     api_key=settings.llm_api_key,
     base_url=settings.llm_api_base_url or None,
+    max_retries=settings.llm_max_retries,
+    timeout=build_timeout(),
+    http_client=create_http_client("judge"),
+)
+
+# 동시 평가(judge_executor)용 async 클라이언트
+async_client = AsyncOpenAI(
+    api_key=settings.llm_api_key,
+    base_url=settings.llm_api_base_url or None,
+    max_retries=settings.llm_max_retries,
+    timeout=build_timeout(),
+    http_client=create_async_http_client("judge_async"),
 )
 
 
@@ -69,26 +84,69 @@ def build_evaluation_prompt(log: LLMLog) -> str:
     return textwrap.dedent(prompt).strip()
 
 
-def _parse_eval_json(text: str) -> EvaluationResult:
+BATCH_RUBRIC = """
+You are an expert evaluator for large language model outputs.
+
+You will be given several items. Each item has an id, a user prompt and the model's response.
+
+Evaluate EACH response independently according to these criteria (1 to 5, integer only):
+- score_overall: Overall quality and usefulness.
+- score_instruction_following: How well the response follows the user's instructions.
+- score_truthfulness: How factually accurate and non-misleading the response is.
+
+Return ONLY a valid JSON array with exactly one object per item, using the item id:
+
+[
+  {
+    "id": 1,
+    "score_overall": 1,
+    "score_instruction_following": 1,
+    "score_truthfulness": 1,
+    "comments": "Short explanation in English."
+  }
+]
+
+Do not include any additional text outside the JSON.
+""".strip()
+
+
+def build_batch_evaluation_prompt(logs: list[LLMLog]) -> str:
     """
-    Judge 모델의 텍스트 응답을 JSON으로 파싱.
-    실패하면 HTTPException 던져서 상위에서 처리.
+    여러 로그를 한 번에 평가하는 배치 judge 프롬프트.
+    루브릭은 한 번만 넣고, 로그마다 id를 붙여 JSON 배열로 결과를 받는다.
     """
-    try:
-        data = json.loads(text)
-    except json.JSONDecodeError as e:
+    items = [
+        f"--- ITEM id={log.id} ---\n"
+        f"--- USER PROMPT ---\n{log.prompt}\n\n"
+        f"--- MODEL RESPONSE ---\n{log.response}"
+        for log in logs
+    ]
+    return "\n\n".join([BATCH_RUBRIC, *items])
+
+
+def _to_evaluation_result(data: dict, raw_text: str) -> EvaluationResult:
+    """
+    Judge 결과 JSON 객체 하나를 검증해서 EvaluationResult로 변환.
+    형식이 맞지 않으면 HTTPException.
+    """
+    if not isinstance(data, dict):
         raise HTTPException(
             status_code=502,
-            detail=f"Failed to parse judge JSON: {e}. Raw text: {text[:200]}",
+            detail=f"Invalid judge result, expected JSON object, got {type(data)}",
         )
 
     def _get_int(key: str) -> int:
         value = data.get(key)
-        if not isinstance(value, int):
+        if not isinstance(value, int) or isinstance(value, bool):
             raise HTTPException(
                 status_code=502,
                 detail=f"Invalid type for {key}, expected int, got {type(value)}",
             )
+        if not 1 <= value <= 5:
+            raise HTTPException(
+                status_code=502,
+                detail=f"Invalid value for {key}, expected 1-5, got {value}",
+            )
         return value
 
     score_overall = _get_int("score_overall")
@@ -102,46 +160,144 @@ def _parse_eval_json(text: str) -> EvaluationResult:
         score_instruction_following=score_instruction_following,
         score_truthfulness=score_truthfulness,
         comments=comments,
-        raw_judge_response=text,
+        raw_judge_response=raw_text,
     )
 
 
-def run_judge(log: LLMLog) -> EvaluationResult:
+def _parse_eval_json(text: str) -> EvaluationResult:
     """
-    하나의 LLMLog에 대해 Judge LLM을 호출하고 EvaluationResult 반환.
+    Judge 모델의 텍스트 응답을 JSON으로 파싱.
+    실패하면 HTTPException 던져서 상위에서 처리.
     """
-    prompt = build_evaluation_prompt(log)
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise HTTPException(
+            status_code=502,
+            detail=f"Failed to parse judge JSON: {e}. Raw text: {text[:200]}",
+        )
 
+    return _to_evaluation_result(data, text)
+
+
+def _parse_batch_eval_json(text: str, log_ids: list[int]) -> dict[int, EvaluationResult]:
+    """
+    배치 judge 응답(JSON 배열)을 파싱해서 {log_id: EvaluationResult} 반환.
+    배열 전체를 파싱할 수 없으면 HTTPException, 개별 항목이 잘못됐거나 빠진 경우는 결과에서 제외
+    (호출한 쪽에서 해당 로그만 단일 judge로 다시 평가).
+    """
     try:
-        start = time.perf_counter()
-        response = client.responses.create(
-            model=settings.openai_model_judge,
-            input=prompt,
+        data = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise HTTPException(
+            status_code=502,
+            detail=f"Failed to parse batch judge JSON: {e}. Raw text: {text[:200]}",
         )
-        elapsed_ms = (time.perf_counter() - start) * 1000.0
-    except RateLimitError:
+    if not isinstance(data, list):
         raise HTTPException(
+            status_code=502,
+            detail=f"Invalid batch judge result, expected JSON array, got {type(data)}",
+        )
+
+    expected = set(log_ids)
+    results: dict[int, EvaluationResult] = {}
+    for item in data:
+        log_id = item.get("id") if isinstance(item, dict) else None
+        if log_id not in expected or log_id in results:
+            continue
+        try:
+            results[log_id] = _to_evaluation_result(item, json.dumps(item, ensure_ascii=False))
+        except HTTPException:
+            continue
+    return results
+
+
+def _to_http_exception(error: Exception) -> HTTPException:
+    """OpenAI SDK 예외를 API 응답용 HTTPException으로 변환."""
+    if isinstance(error, RateLimitError):
+        return HTTPException(
             status_code=429,
             detail="LLM judge quota exceeded. Please check billing/usage.",
         )
-    except AuthenticationError:
-        raise HTTPException(
+    if isinstance(error, AuthenticationError):
+        return HTTPException(
             status_code=401,
             detail="Invalid API key for judge model.",
         )
-    except APIConnectionError:
-        raise HTTPException(
+    if isinstance(error, APIConnectionError):
+        return HTTPException(
             status_code=502,
             detail="Failed to connect to judge model provider.",
         )
-    except APIError as e:
-        raise HTTPException(
-            status_code=502,
-            detail=f"LLM judge API error: {e}",
+    return HTTPException(
+        status_code=502,
+        detail=f"LLM judge API error: {error}",
+    )
+
+
+def run_judge(log: LLMLog) -> EvaluationResult:
+    """
+    하나의 LLMLog에 대해 Judge LLM을 호출하고 EvaluationResult 반환.
+    """
+    prompt = build_evaluation_prompt(log)
+
+    start = time.perf_counter()
+    try:
+        response = client.responses.create(
+            model=settings.openai_model_judge,
+            input=prompt,
         )
+    except APIError as e:
+        record_llm_judge_request(settings.openai_model_judge, "error", time.perf_counter() - start)
+        raise _to_http_exception(e)
+
+    record_llm_judge_request(settings.openai_model_judge, "success", time.perf_counter() - start)
 
     text = response.output_text
     eval_result = _parse_eval_json(text)
 
-    # 원하면 elapsed_ms도 eval_result에 추가할 수 있음
     return eval_result
+
+
+async def run_judge_async(log: LLMLog) -> EvaluationResult:
+    """
+    run_judge의 async 버전.
+    judge_executor에서 여러 로그를 동시에 평가할 때 사용.
+    """
+    prompt = build_evaluation_prompt(log)
+
+    start = time.perf_counter()
+    try:
+        response = await async_client.responses.create(
+            model=settings.openai_model_judge,
+            input=prompt,
+        )
+    except APIError as e:
+        record_llm_judge_request(settings.openai_model_judge, "error", time.perf_counter() - start)
+        raise _to_http_exception(e)
+
+    record_llm_judge_request(settings.openai_model_judge, "success", time.perf_counter() - start)
+
+    return _parse_eval_json(response.output_text)
+
+
+async def run_judge_batch_async(logs: list[LLMLog]) -> dict[int, EvaluationResult]:
+    """
+    여러 로그를 judge 요청 하나로 평가.
+    결과를 얻지 못한 로그는 반환 dict에서 빠진다 (judge_executor가 단일 judge로 다시 평가).
+    """
+    prompt = build_batch_evaluation_prompt(logs)
+
+    start = time.perf_counter()
+    try:
+        response = await async_client.responses.create(
+            model=settings.openai_model_judge,
+            input=prompt,
+        )
+    except APIError as e:
+        record_llm_judge_request(settings.openai_model_judge, "error", time.perf_counter() - start)
+        raise _to_http_exception(e)
+
+    record_llm_judge_request(settings.openai_model_judge, "success", time.perf_counter() - start)
+
+    return _parse_batch_eval_json(response.output_text, [log.id for log in logs])
@@ -1,3 +1,4 @@
+from dataclasses import asdict
 from typing import Literal
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends, Query, HTTPException, Response
@@ -7,14 +8,25 @@ import time
 from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
 
 from .db import Base, engine, get_db
-from .models import LLMLog, LLMEvaluation
-from .rules import basic_rule_evaluate
-from .llm_judge import run_judge
+from .models import LLMLog
+from .evaluation import evaluate_logs, judge_model_name, write_evaluations
+from .judge_cache import judge_cache
+from .judge_executor import judge_executor
 from .config import settings
-from .scheduler import start_scheduler, stop_scheduler
-from .utils import get_pending_logs
+from .partitions import maintain_partitions
+from .rollups import refresh_rollups
+from .scheduler import (
+    start_partition_scheduler,
+    start_rollup_scheduler,
+    start_scheduler,
+    stop_partition_scheduler,
+    stop_rollup_scheduler,
+    stop_scheduler,
+)
+from .schema_migrations import run_migrations
+from .work_claim import fetch_pending_logs, finish_pending_logs
 from .metrics import record_evaluation, update_pending_logs_count
-from .notifier import send_low_quality_alert
+from .notifier import notification_dispatcher, send_low_quality_alert
 
 # 로깅 설정
 logging.basicConfig(
@@ -28,16 +40,26 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     """
     FastAPI 앱의 수명 주기 관리.
-    시작 시 테이블 생성 및 스케줄러 시작, 종료 시 스케줄러 중지.
+    시작 시 테이블 생성/스키마 마이그레이션 및 스케줄러(평가, 통계 rollup, 로그 파티션 관리) 시작,
+    종료 시 스케줄러와 judge 실행기 중지, 남은 알림 전송 후 알림 dispatcher 중지.
     """
     # Startup
     logger.info("Starting Evaluator Service...")
-    Base.metadata.create_all(bind=engine)
+    if settings.schema_auto_migrate:
+        run_migrations(engine, Base.metadata)
+    else:
+        Base.metadata.create_all(bind=engine)
     start_scheduler()
+    start_rollup_scheduler()
+    start_partition_scheduler()
     yield
     # Shutdown
     logger.info("Stopping Evaluator Service...")
     stop_scheduler()
+    stop_rollup_scheduler()
+    stop_partition_scheduler()
+    judge_executor.shutdown()
+    notification_dispatcher.shutdown()
 
 
 # FastAPI 앱 생성
@@ -90,74 +112,99 @@ def evaluate_once(
         dict: {"evaluated": <평가한 개수>, "judge_model": <사용한 모델>, "judge_type": <평가 방식>}
     """
     # 1. 아직 평가되지 않은 로그 가져오기
-    pending_logs = get_pending_logs(db, limit=limit)
+    pending_logs = fetch_pending_logs(db, limit=limit)
 
     if not pending_logs:
         return {
             "evaluated": 0,
             "judge_type": judge_type,
-            "judge_model": "rule-basic-v1" if judge_type == "rule" else settings.openai_model_judge,
+            "judge_model": judge_model_name(judge_type),
         }
 
-    # 2. 각 로그에 대해 평가 수행
+    # 2. 로그 평가 (LLM judge는 judge_executor에서 동시 실행)
     evaluated_count = 0
-    judge_model_name = ""
-
-    for log in pending_logs:
-        try:
-            if judge_type == "rule":
-                # 룰 기반 평가
-                eval_result = basic_rule_evaluate(log)
-                judge_model_name = eval_result.judge_model
-
-                # LLMEvaluation 인스턴스 생성
-                evaluation = LLMEvaluation(
-                    log_id=eval_result.log_id,
-                    overall_score=eval_result.overall_score,
-                    is_flagged=eval_result.is_flagged,
-                    label=eval_result.label,
-                    judge_model=eval_result.judge_model,
-                    comment=eval_result.comment,
-                )
-            else:  # judge_type == "llm"
-                # LLM-as-a-Judge 평가
-                llm_eval_result = run_judge(log)
-                judge_model_name = settings.openai_model_judge
-
-                # LLMEvaluation 인스턴스 생성 (세부 점수 포함)
-                evaluation = LLMEvaluation(
-                    log_id=log.id,
-                    overall_score=llm_eval_result["score_overall"],
-                    score_instruction_following=llm_eval_result["score_instruction_following"],
-                    score_truthfulness=llm_eval_result["score_truthfulness"],
-                    is_flagged=llm_eval_result["score_overall"] < 3,  # 점수 3 미만이면 플래그
-                    label="llm-judge",
-                    judge_model=judge_model_name,
-                    comment=llm_eval_result["comments"],
-                    raw_judge_response=llm_eval_result["raw_judge_response"],
-                )
-
-            # DB에 추가
-            db.add(evaluation)
-            db.commit()  # 커밋해서 evaluation.id 생성
-
-            # 낮은 품질 알림 전송
-            send_low_quality_alert(log, evaluation)
-
-            evaluated_count += 1
-
-        except HTTPException as e:
-            # LLM judge 호출 실패 시 롤백하고 에러 반환
-            db.rollback()
-            raise e
-        except Exception as e:
-            # 기타 예외 처리
-            db.rollback()
-            raise HTTPException(status_code=500, detail=f"Evaluation failed: {str(e)}")
+    first_error: Exception | None = None
+
+    outcomes = evaluate_logs(pending_logs, judge_type)
+
+    # 평가 결과를 한 번에 저장 (bulk insert, 실패한 행만 error로 남음)
+    outcomes = write_evaluations(db, outcomes)
+    finish_pending_logs(db, pending_logs)
+
+    for outcome in outcomes:
+        if outcome.error is not None:
+            # 실패한 로그는 건너뛰고 나머지 결과는 저장한 뒤 에러 반환
+            first_error = first_error or outcome.error
+            continue
+
+        # 낮은 품질 알림 전송
+        send_low_quality_alert(outcome.log, outcome.evaluation)
+
+        evaluated_count += 1
+
+    # 3. 평가 실패가 있으면 에러 반환 (LLM judge 호출 실패는 HTTPException 그대로)
+    if first_error is not None:
+        if isinstance(first_error, HTTPException):
+            raise first_error
+        raise HTTPException(status_code=500, detail=f"Evaluation failed: {str(first_error)}")
 
     # 4. 결과 반환
     return {
         "evaluated": evaluated_count,
         "judge_type": judge_type,
-        "judge_model": judge_model_name,
+        "judge_model": judge_model_name(judge_type),
+    }
+
+
+@app.delete("/judge-cache")
+def invalidate_judge_cache(
+    rubric_version: str | None = Query(None, description="삭제할 루브릭 버전 (생략 시 현재 버전이 아닌 결과 전체)"),
+):
+    """
+    LLM judge 결과 캐시 무효화 엔드포인트.
+
+    - 루브릭을 바꿨다면 JUDGE_RUBRIC_VERSION을 올린 뒤 호출해서 이전 버전 결과를 정리
+    - rubric_version을 현재 버전으로 지정하면 현재 결과도 모두 삭제 (강제로 다시 평가)
+
+    Returns:
+        dict: {"deleted": <삭제된 캐시 개수>, "rubric_version": <현재 루브릭 버전>}
+    """
+    deleted = judge_cache.invalidate(rubric_version)
+    return {
+        "deleted": deleted,
+        "rubric_version": judge_cache.rubric_version,
     }
+
+
+@app.post("/rollups/refresh")
+def refresh_stats_rollups(
+    full: bool = Query(False, description="true면 전체 기간을 다시 집계 (backfill)"),
+    db: Session = Depends(get_db),
+):
+    """
+    통계 rollup(llm_stats_hourly) 즉시 갱신 엔드포인트.
+
+    - 기본: watermark 이후 바뀐 시간대만 다시 집계 (스케줄러와 같은 작업)
+    - full=true: 로그를 직접 수정/삭제했거나 rollup 테이블을 새로 만든 경우 전체 기간 재집계
+
+    Returns:
+        dict: {"refreshed_buckets": <다시 집계한 시간대 수>}
+    """
+    refreshed = refresh_rollups(db, full=full)
+    return {"refreshed_buckets": refreshed}
+
+
+@app.post("/partitions/maintain")
+def maintain_log_partitions():
+    """
+    llm_logs 파티션 관리 즉시 실행 엔드포인트 (스케줄러와 같은 작업, Postgres 전용).
+
+    - 앞으로 쓸 기간 파티션 생성
+    - LOG_RETENTION_DAYS가 설정되어 있으면 보관 기간이 지난 파티션을 LOG_ARCHIVE_DIR에 보관한 뒤 삭제
+
+    Returns:
+        dict: {"partitioned", "created", "archived", "archived_rows", "partitions"}
+    """
+    with engine.connect() as conn:
+        result = maintain_partitions(conn)
+    return asdict(result)
@@ -55,6 +55,32 @@ low_quality_alerts_total = Counter(
     ['judge_type']
 )
 
+notification_queue_depth = Gauge(
+    'llm_evaluator_notification_queue_depth',
+    'Notifications waiting in the per-channel delivery queue',
+    ['channel']
+)
+
+notifications_dropped_total = Counter(
+    'llm_evaluator_notifications_dropped_total',
+    'Notifications dropped because the channel queue was full',
+    ['channel', 'type']
+)
+
+notification_digest_size = Histogram(
+    'llm_evaluator_notification_digest_size',
+    'Number of notifications delivered per message (digest)',
+    ['channel'],
+    buckets=(1, 2, 5, 10, 20, 50)
+)
+
+notification_delivery_duration_seconds = Histogram(
+    'llm_evaluator_notification_delivery_duration_seconds',
+    'Time to deliver one message to a notification channel',
+    ['channel'],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+
 # 스케줄러 관련 메트릭
 scheduler_runs_total = Counter(
     'llm_evaluator_scheduler_runs_total',
@@ -67,6 +93,16 @@ pending_logs_gauge = Gauge(
     'Number of logs waiting for evaluation'
 )
 
+evaluation_lag_seconds = Gauge(
+    'llm_evaluator_evaluation_lag_seconds',
+    'Age of the oldest unevaluated success log (0 when nothing is pending)'
+)
+
+evaluation_batch_size_gauge = Gauge(
+    'llm_evaluator_evaluation_batch_size',
+    'Batch size the continuous evaluation pipeline will use next'
+)
+
 # LLM Judge 호출 메트릭
 llm_judge_requests_total = Counter(
     'llm_evaluator_llm_judge_requests_total',
@@ -81,6 +117,162 @@ llm_judge_request_duration_seconds = Histogram(
     buckets=(0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0, float('inf'))
 )
 
+judge_batch_items_total = Counter(
+    'llm_evaluator_judge_batch_items_total',
+    'Logs sent in multi-log judge requests',
+    ['result']  # judged: 배치 응답에서 결과를 얻음, fallback: 단일 judge로 재평가
+)
+
+judge_batch_size = Histogram(
+    'llm_evaluator_judge_batch_size',
+    'Number of logs packed into one judge request',
+    buckets=(2, 4, 8, 16, 32, 64)
+)
+
+judge_cache_lookups_total = Counter(
+    'llm_evaluator_judge_cache_lookups_total',
+    'Judge result cache lookups',
+    ['tier', 'result']  # tier: memory/db, result: hit/miss
+)
+
+
+# Judge HTTP 커넥션 풀 메트릭
+llm_http_pool_in_use = Gauge(
+    'llm_evaluator_llm_http_pool_in_use',
+    'Judge HTTP requests currently holding a pooled connection',
+    ['pool']
+)
+
+llm_http_pool_waiting = Gauge(
+    'llm_evaluator_llm_http_pool_waiting',
+    'Judge HTTP requests waiting for a free pooled connection',
+    ['pool']
+)
+
+llm_http_pool_reuse_ratio = Gauge(
+    'llm_evaluator_llm_http_pool_connection_reuse_ratio',
+    'Share of judge HTTP requests served on an existing connection',
+    ['pool']
+)
+
+llm_http_requests_total = Counter(
+    'llm_evaluator_llm_http_requests_total',
+    'Total judge HTTP requests sent through the pool',
+    ['pool']
+)
+
+llm_http_connections_opened_total = Counter(
+    'llm_evaluator_llm_http_connections_opened_total',
+    'Total new TCP connections opened by the pool',
+    ['pool']
+)
+
+# 평가 결과 DB 쓰기 메트릭
+evaluation_rows_written_total = Counter(
+    'llm_evaluator_evaluation_rows_written_total',
+    'Total evaluation rows written to the database',
+    ['mode', 'status']  # mode: bulk/row, status: success/error
+)
+
+evaluation_write_duration_seconds = Histogram(
+    'llm_evaluator_evaluation_write_duration_seconds',
+    'Time spent writing one batch of evaluation rows',
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, float('inf'))
+)
+
+evaluation_write_rows_per_second = Gauge(
+    'llm_evaluator_evaluation_write_rows_per_second',
+    'Evaluation rows written per second in the last batch write'
+)
+
+# 멀티 워커 work claiming 메트릭
+work_claims_total = Counter(
+    'llm_evaluator_work_claims_total',
+    'Pending logs claimed by this worker, or lost to another worker',
+    ['result']  # claimed/lost
+)
+
+# 룰 평가 메트릭 (룰별)
+rule_evaluation_duration_seconds = Histogram(
+    'llm_evaluator_rule_evaluation_duration_seconds',
+    'Time spent applying one rule to one batch of responses',
+    ['rule'],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, float('inf'))
+)
+
+rule_rows_evaluated_total = Counter(
+    'llm_evaluator_rule_rows_evaluated_total',
+    'Responses a rule was applied to (rows already decided by a higher priority rule are skipped)',
+    ['rule']
+)
+
+rule_hits_total = Counter(
+    'llm_evaluator_rule_hits_total',
+    'Responses matched by a rule',
+    ['rule']
+)
+
+# 통계 rollup 메트릭
+rollup_refresh_total = Counter(
+    'llm_evaluator_rollup_refresh_total',
+    'Total stats rollup refresh runs',
+    ['status']  # success/error
+)
+
+rollup_refresh_duration_seconds = Histogram(
+    'llm_evaluator_rollup_refresh_duration_seconds',
+    'Stats rollup refresh duration',
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, float('inf'))
+)
+
+rollup_buckets_refreshed_total = Counter(
+    'llm_evaluator_rollup_buckets_refreshed_total',
+    'Hourly rollup buckets recomputed'
+)
+
+rollup_lag_seconds = Gauge(
+    'llm_evaluator_rollup_lag_seconds',
+    'Seconds since the start of the last successful stats rollup refresh'
+)
+
+# llm_logs 파티션 관리 / 보관 메트릭
+log_partition_maintenance_total = Counter(
+    'llm_evaluator_log_partition_maintenance_total',
+    'Total llm_logs partition maintenance runs',
+    ['status']  # success/error
+)
+
+log_partition_maintenance_duration_seconds = Histogram(
+    'llm_evaluator_log_partition_maintenance_duration_seconds',
+    'llm_logs partition maintenance duration (including archiving)',
+    buckets=(0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, float('inf'))
+)
+
+log_partitions_gauge = Gauge(
+    'llm_evaluator_log_partitions',
+    'Range partitions currently attached to llm_logs'
+)
+
+log_partitions_created_total = Counter(
+    'llm_evaluator_log_partitions_created_total',
+    'llm_logs partitions created ahead of time'
+)
+
+log_partitions_archived_total = Counter(
+    'llm_evaluator_log_partitions_archived_total',
+    'llm_logs partitions archived to compressed files and dropped'
+)
+
+log_rows_archived_total = Counter(
+    'llm_evaluator_log_rows_archived_total',
+    'Log rows written to archive files before their partition was dropped'
+)
+
+log_text_blobs_deleted_total = Counter(
+    'llm_evaluator_log_text_blobs_deleted_total',
+    'Offloaded prompt/response blobs deleted after no remaining log referenced them'
+)
+
 
 def record_evaluation(judge_type: str, status: str, duration_seconds: float, scores: dict = None):
     """
@@ -143,6 +335,41 @@ def record_notification(channel: str, notification_type: str, status: str):
     ).inc()
 
 
+def record_notification_dropped(channel: str, notification_type: str):
+    """
+    큐가 가득 차서 버린 알림 기록.
+
+    Args:
+        channel: 'slack', 'discord', 'email'
+        notification_type: 'alert' or 'summary'
+    """
+    notifications_dropped_total.labels(channel=channel, type=notification_type).inc()
+
+
+def update_notification_queue_depth(channel: str, depth: int):
+    """
+    채널 알림 큐 길이 업데이트.
+
+    Args:
+        channel: 'slack', 'discord', 'email'
+        depth: 큐에서 기다리는 알림 수
+    """
+    notification_queue_depth.labels(channel=channel).set(depth)
+
+
+def record_notification_delivery(channel: str, size: int, duration_seconds: float):
+    """
+    알림 메시지 전송 성공 기록.
+
+    Args:
+        channel: 'slack', 'discord', 'email'
+        size: 메시지에 담긴 알림 수 (digest면 2 이상)
+        duration_seconds: 전송 소요 시간 (초)
+    """
+    notification_digest_size.labels(channel=channel).observe(size)
+    notification_delivery_duration_seconds.labels(channel=channel).observe(duration_seconds)
+
+
 def record_low_quality_alert(judge_type: str):
     """
     낮은 품질 경고 메트릭 기록.
@@ -173,6 +400,26 @@ def update_pending_logs_count(count: int):
     pending_logs_gauge.set(count)
 
 
+def update_evaluation_lag(seconds: float):
+    """
+    평가 지연(가장 오래된 대기 로그의 나이) 업데이트.
+
+    Args:
+        seconds: 가장 오래된 대기 로그의 created_at부터 지금까지 (초)
+    """
+    evaluation_lag_seconds.set(max(0.0, seconds))
+
+
+def update_evaluation_batch_size(size: int):
+    """
+    continuous 파이프라인의 다음 배치 크기 업데이트.
+
+    Args:
+        size: 다음 배치 크기
+    """
+    evaluation_batch_size_gauge.set(size)
+
+
 def record_llm_judge_request(model: str, status: str, duration_seconds: float):
     """
     LLM Judge API 호출 메트릭 기록.
@@ -184,3 +431,173 @@ def record_llm_judge_request(model: str, status: str, duration_seconds: float):
     """
     llm_judge_requests_total.labels(model=model, status=status).inc()
     llm_judge_request_duration_seconds.labels(model=model).observe(duration_seconds)
+
+
+def record_http_pool_state(pool: str, in_use: int, waiting: int, reuse_ratio: float):
+    """
+    Judge HTTP 커넥션 풀 상태 기록.
+
+    Args:
+        pool: 풀 이름 ('judge', 'judge_async')
+        in_use: 커넥션을 점유 중인 요청 수
+        waiting: 커넥션을 기다리는 요청 수
+        reuse_ratio: 기존 커넥션 재사용 비율 (0~1)
+    """
+    llm_http_pool_in_use.labels(pool=pool).set(in_use)
+    llm_http_pool_waiting.labels(pool=pool).set(waiting)
+    llm_http_pool_reuse_ratio.labels(pool=pool).set(reuse_ratio)
+
+
+def record_http_pool_request(pool: str, new_request: bool = False, new_connection: bool = False):
+    """
+    Judge HTTP 요청/새 커넥션 카운트 기록.
+
+    Args:
+        pool: 풀 이름
+        new_request: 요청 하나가 시작됨
+        new_connection: 새 TCP 커넥션이 열림
+    """
+    if new_request:
+        llm_http_requests_total.labels(pool=pool).inc()
+    if new_connection:
+        llm_http_connections_opened_total.labels(pool=pool).inc()
+
+
+def record_evaluation_write(mode: str, written: int, failed: int):
+    """
+    평가 결과 쓰기 건수 기록.
+
+    Args:
+        mode: 'bulk' (청크 단위 insert) or 'row' (실패한 청크의 행 단위 재시도)
+        written: 저장된 행 수
+        failed: 저장 실패한 행 수
+    """
+    if written:
+        evaluation_rows_written_total.labels(mode=mode, status='success').inc(written)
+    if failed:
+        evaluation_rows_written_total.labels(mode=mode, status='error').inc(failed)
+
+
+def record_evaluation_write_batch(rows: int, duration_seconds: float):
+    """
+    배치 하나의 평가 결과 쓰기 소요 시간 및 처리량 기록.
+
+    Args:
+        rows: 저장된 행 수
+        duration_seconds: 쓰기 소요 시간 (초)
+    """
+    evaluation_write_duration_seconds.observe(duration_seconds)
+    if duration_seconds > 0:
+        evaluation_write_rows_per_second.set(rows / duration_seconds)
+
+
+def record_work_claim(claimed: int, lost: int):
+    """
+    work claiming 결과 기록.
+
+    Args:
+        claimed: 이 워커가 리스를 잡은 로그 수
+        lost: 후보였지만 다른 워커가 먼저 리스를 잡은 로그 수
+    """
+    if claimed:
+        work_claims_total.labels(result='claimed').inc(claimed)
+    if lost:
+        work_claims_total.labels(result='lost').inc(lost)
+
+
+def record_judge_cache_lookup(tier: str, result: str, count: int = 1):
+    """
+    Judge 결과 캐시 조회 기록.
+
+    Args:
+        tier: 'memory' or 'db'
+        result: 'hit' or 'miss'
+        count: 조회한 키 개수
+    """
+    if count:
+        judge_cache_lookups_total.labels(tier=tier, result=result).inc(count)
+
+
+def record_judge_batch(size: int, judged: int, fallback: int):
+    """
+    배치 judge 요청 기록.
+
+    Args:
+        size: 요청 하나에 묶은 로그 수
+        judged: 배치 응답에서 결과를 얻은 로그 수
+        fallback: 단일 judge로 다시 평가한 로그 수
+    """
+    judge_batch_size.observe(size)
+    if judged:
+        judge_batch_items_total.labels(result='judged').inc(judged)
+    if fallback:
+        judge_batch_items_total.labels(result='fallback').inc(fallback)
+
+
+def record_rule_evaluation(rule: str, rows: int, hits: int, duration_seconds: float):
+    """
+    룰 하나를 배치에 적용한 결과 기록.
+
+    Args:
+        rule: 룰 이름
+        rows: 룰을 적용한 행 수
+        hits: 룰에 걸린 행 수
+        duration_seconds: 적용 소요 시간 (초)
+    """
+    rule_evaluation_duration_seconds.labels(rule=rule).observe(duration_seconds)
+    rule_rows_evaluated_total.labels(rule=rule).inc(rows)
+    if hits:
+        rule_hits_total.labels(rule=rule).inc(hits)
+
+
+def record_rollup_refresh(status: str, buckets: int, duration_seconds: float):
+    """
+    통계 rollup 갱신 기록.
+
+    Args:
+        status: 'success' or 'error'
+        buckets: 다시 집계한 시간대 수
+        duration_seconds: 갱신 소요 시간 (초)
+    """
+    rollup_refresh_total.labels(status=status).inc()
+    rollup_refresh_duration_seconds.observe(duration_seconds)
+    if buckets:
+        rollup_buckets_refreshed_total.inc(buckets)
+
+
+def update_rollup_lag(seconds: float):
+    """
+    rollup 지연 업데이트.
+
+    Args:
+        seconds: 마지막 rollup 갱신 시작 이후 지난 시간 (초)
+    """
+    rollup_lag_seconds.set(seconds)
+
+
+def record_partition_maintenance(status: str, duration_seconds: float, created: int = 0, archived: int = 0,
+                                 archived_rows: int = 0, blobs_deleted: int = 0, partitions: int | None = None):
+    """
+    llm_logs 파티션 관리 작업 기록.
+
+    Args:
+        status: 'success' or 'error'
+        duration_seconds: 소요 시간 (초)
+        created: 새로 만든 파티션 수
+        archived: 보관 후 삭제한 파티션 수
+        archived_rows: 보관 파일에 쓴 로그 수
+        blobs_deleted: 참조하는 로그가 없어 지운 본문 blob 수
+        partitions: 현재 붙어 있는 파티션 수 (파티션 테이블이 아니면 None)
+    """
+    log_partition_maintenance_total.labels(status=status).inc()
+    log_partition_maintenance_duration_seconds.observe(duration_seconds)
+    if created:
+        log_partitions_created_total.inc(created)
+    if archived:
+        log_partitions_archived_total.inc(archived)
+    if archived_rows:
+        log_rows_archived_total.inc(archived_rows)
+    if blobs_deleted:
+        log_text_blobs_deleted_total.inc(blobs_deleted)
+    if partitions is not None:
+        log_partitions_gauge.set(partitions)
@@ -8,6 +8,9 @@ from sqlalchemy import (
     Float,
     Boolean,
     ForeignKey,
+    LargeBinary,
+    Index,
+    text,
 )
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -18,9 +21,24 @@ from .db import Base
 class LLMLog(Base):
     """
     gateway-api에서 생성하는 llm_logs 테이블.
-    Evaluator는 이 테이블을 읽기만 함.
+    Evaluator는 이 테이블을 읽기만 함 (Postgres에서는 created_at 범위 파티션 관리/보관만 partitions.py가 담당).
     """
     __tablename__ = "llm_logs"
+    __table_args__ = (
+        # 평가 대기 로그 조회용 partial index (status='success'인 로그를 created_at, id 순으로 스캔)
+        Index(
+            "ix_llm_logs_success_created_at_id",
+            "created_at",
+            "id",
+            postgresql_where=text("status = 'success'"),
+            sqlite_where=text("status = 'success'"),
+        ),
+        # 시간 구간 집계(rollup 갱신, 기간 필터)와 대시보드 로그 목록 keyset 페이지네이션용
+        Index("ix_llm_logs_created_at_id", "created_at", "id"),
+        # 모델별 기간 집계용
+        Index("ix_llm_logs_model_version_created_at", "model_version", "created_at"),
+        # 기존 DB에는 create_all이 인덱스를 추가하지 않으므로, 인덱스를 바꾸면 schema_migrations에도 마이그레이션 추가
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     created_at = Column(
@@ -30,8 +48,11 @@ class LLMLog(Base):
     )
 
     user_id = Column(String(128), nullable=True)
+    # 본문이 길면 앞부분(미리보기)만 저장하고 전체 본문은 llm_text_blobs에 (해시가 NULL이면 전체 본문)
     prompt = Column(Text, nullable=False)
     response = Column(Text, nullable=False)
+    prompt_hash = Column(String(64), nullable=True)
+    response_hash = Column(String(64), nullable=True)
 
     model_version = Column(String(64), nullable=True)
     latency_ms = Column(Float, nullable=True)
@@ -45,12 +66,29 @@ class LLMLog(Base):
     )
 
 
+class LLMTextBlob(Base):
+    """
+    llm_logs에서 오프로드한 긴 프롬프트/응답 본문 (내용 해시 -> zlib 압축 본문, text_blobs.py).
+    같은 본문은 한 번만 저장되고, last_used_at은 그 본문을 참조하는 로그가 마지막으로 저장된 시각 (하루 단위로 갱신).
+    """
+    __tablename__ = "llm_text_blobs"
+
+    hash = Column(String(64), primary_key=True)  # sha256 hex
+    data = Column(LargeBinary, nullable=False)
+    size = Column(Integer, nullable=False)  # 압축 전 글자 수
+    last_used_at = Column(DateTime(timezone=True), nullable=False)
+
+
 class LLMEvaluation(Base):
     """
     LLM 응답에 대한 평가 결과를 저장하는 테이블.
     룰 기반 또는 LLM-as-a-judge 방식으로 평가한 결과를 기록.
     """
     __tablename__ = "llm_evaluations"
+    __table_args__ = (
+        # 최근 평가 조회(rollup 갱신 대상 시간대 찾기)와 대시보드 평가 목록 keyset 페이지네이션용
+        Index("ix_llm_evaluations_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     created_at = Column(
@@ -60,6 +98,7 @@ class LLMEvaluation(Base):
     )
 
     # 어떤 로그에 대한 평가인지
+    # (Postgres에서는 llm_logs가 파티션 테이블이라 DB의 FK 제약은 스키마 마이그레이션 4에서 제거됨, ORM 관계용으로만 선언)
     log_id = Column(Integer, ForeignKey("llm_logs.id"), nullable=False, index=True)
 
     # 평가 점수 (1~5 스케일)
@@ -86,3 +125,94 @@ class LLMEvaluation(Base):
 
     # N:1 관계 (여러 평가가 한 로그를 참조)
     log = relationship("LLMLog", back_populates="evaluations")
+
+
+class EvaluationLease(Base):
+    """
+    평가 작업 리스 테이블 (work claiming 모드).
+    여러 evaluator 워커가 같은 로그를 중복 평가하지 않도록 로그별로 작업 중인 워커와 만료 시각을 기록.
+    만료된 리스는 다른 워커가 다시 가져갈 수 있음.
+    """
+    __tablename__ = "llm_evaluation_leases"
+
+    # 리스 대상 로그 (로그당 리스 하나)
+    log_id = Column(Integer, primary_key=True)
+
+    # 리스를 가진 워커 (예: "evaluator-1:1234")
+    worker_id = Column(String(128), nullable=False)
+
+    # 리스 만료 시각 (이 시각이 지나면 다른 워커가 가져갈 수 있음)
+    leased_until = Column(DateTime(timezone=True), nullable=False)
+
+
+class JudgeCacheEntry(Base):
+    """
+    LLM judge 결과 캐시 테이블.
+    (judge 프롬프트, judge 모델, 루브릭 버전) 해시를 키로 EvaluationResult를 저장해
+    같은 prompt/response 조합은 judge를 다시 호출하지 않고 재사용.
+    """
+    __tablename__ = "llm_judge_cache"
+
+    # sha256(judge 모델 + 루브릭 버전 + build_evaluation_prompt 결과)
+    cache_key = Column(String(64), primary_key=True)
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    judge_model = Column(String(128), nullable=False)
+    rubric_version = Column(String(64), nullable=False, index=True)
+
+    # EvaluationResult JSON
+    result = Column(Text, nullable=False)
+
+
+class LLMStatsHourly(Base):
+    """
+    시간(hour) x model_version 단위로 미리 집계한 통계 (rollup).
+    evaluator의 rollup 작업이 주기적으로 갱신하고, 대시보드/분석 API는 원본 테이블 대신 이 테이블을 읽는다.
+    평가 통계는 평가 시각이 아니라 평가 대상 로그의 created_at 시간대에 집계된다.
+    모든 컬럼이 합계/개수이므로 여러 시간대/모델을 더해서 일별·전체 통계를 만들 수 있다.
+    """
+    __tablename__ = "llm_stats_hourly"
+
+    bucket_start = Column(DateTime(timezone=True), primary_key=True)
+    # model_version이 NULL인 로그는 ""로 집계 (primary key에는 NULL을 쓸 수 없음)
+    model_version = Column(String(64), primary_key=True)
+
+    request_count = Column(Integer, nullable=False, default=0)
+    error_count = Column(Integer, nullable=False, default=0)
+    latency_count = Column(Integer, nullable=False, default=0)  # latency_ms가 있는 로그 수 (AVG 분모)
+    latency_sum = Column(Float, nullable=False, default=0.0)
+
+    evaluated_count = Column(Integer, nullable=False, default=0)  # 평가된 서로 다른 로그 수
+    evaluation_count = Column(Integer, nullable=False, default=0)  # 평가 행 수 (AVG 분모)
+    score_sum = Column(Integer, nullable=False, default=0)
+    flagged_count = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+class LLMLatencySketchHourly(Base):
+    """
+    시간(hour) x model_version 단위 지연시간 분포 (rollup, 로그 스케일 히스토그램).
+    latency_ms를 상대 오차 1% 이내의 로그 스케일 구간(bin)으로 나눈 개수라서
+    여러 시간대/모델의 행을 더하면 어떤 기간이든 p50/p95/p99를 원본 행 없이 계산할 수 있다 (DDSketch 방식).
+    """
+    __tablename__ = "llm_latency_sketch_hourly"
+
+    bucket_start = Column(DateTime(timezone=True), primary_key=True)
+    model_version = Column(String(64), primary_key=True)  # NULL model_version은 ""
+    # ceil(log_gamma(latency_ms)), gamma = (1 + 0.01) / (1 - 0.01)
+    bin = Column(Integer, primary_key=True)
+    count = Column(Integer, nullable=False)
+
+
+class StatsRollupState(Base):
+    """rollup 작업의 진행 상태 (watermark). 행이 없으면 아직 rollup이 만들어지지 않은 것."""
+    __tablename__ = "llm_stats_rollup_state"
+
+    name = Column(String(64), primary_key=True)
+    # 이 시각 이전에 생성된 로그/평가는 rollup에 반영됨
+    watermark = Column(DateTime(timezone=True), nullable=False)
@@ -1,154 +1,383 @@
 """
 알림 시스템 모듈.
 Slack, Discord 웹훅 및 이메일을 통해 평가 결과 알림을 전송합니다.
+
+평가 경로(스케줄러 / evaluate-once)는 알림을 큐에 넣기만 하고, 전송은 NotificationDispatcher가
+전용 이벤트 루프 스레드에서 한다 (judge_executor와 같은 방식). 느린 웹훅/SMTP가 평가를 멈추지 않는다.
+
+- 채널별 큐 (notification_queue_max_size). 가득 차면 새 알림을 버리고 메트릭에 기록
+- Slack / Discord는 keepalive 커넥션 풀을 쓰는 httpx.AsyncClient 하나를 공유, 이메일은 SMTP 연결을 계속 재사용
+- 채널별 분당 메시지 수 제한 (token bucket, 0이면 제한 없음)
+- 낮은 품질 알림은 첫 알림 후 notification_digest_window_seconds 동안 모아서
+  최대 notification_digest_max_items개를 메시지 하나(digest)로 보냄. 제한에 걸려 기다리는 동안 쌓인 알림도 함께 묶임
 """
 
-import logging
 import asyncio
-from typing import Optional
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable
 import httpx
 import aiosmtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
 from .config import settings
+from .judge_executor import TokenBucket
 from .models import LLMLog, LLMEvaluation
-from .metrics import record_notification, record_low_quality_alert
+from .metrics import (
+    record_low_quality_alert,
+    record_notification,
+    record_notification_delivery,
+    record_notification_dropped,
+    update_notification_queue_depth,
+)
 
 logger = logging.getLogger(__name__)
 
+# Discord 웹훅 content 최대 길이
+DISCORD_MAX_CHARS = 2000
 
-def send_slack_notification(message: str, notification_type: str = "alert") -> bool:
-    """
-    Slack 웹훅을 통해 메시지를 전송합니다.
-
-    Args:
-        message: 전송할 메시지
-        notification_type: 'alert' or 'summary'
 
-    Returns:
-        bool: 전송 성공 여부
+@dataclass
+class Notification:
     """
-    if not settings.slack_webhook_url:
-        logger.debug("Slack webhook URL이 설정되지 않았습니다.")
-        return False
-
-    try:
-        payload = {"text": message}
-        response = httpx.post(
-            settings.slack_webhook_url,
-            json=payload,
-            timeout=10.0,
-        )
-        response.raise_for_status()
-        record_notification("slack", notification_type, "success")
-        logger.info("Slack 알림 전송 성공")
-        return True
-    except Exception as e:
-        record_notification("slack", notification_type, "error")
-        logger.error(f"Slack 알림 전송 실패: {str(e)}")
-        return False
-
-
-def send_discord_notification(message: str, notification_type: str = "alert") -> bool:
+    채널에 보낼 알림 하나.
+    digest_line이 있으면 다른 알림과 digest로 묶을 수 있다 (digest에 들어갈 한 줄 요약).
     """
-    Discord 웹훅을 통해 메시지를 전송합니다.
+    notification_type: str  # 'alert' or 'summary'
+    subject: str  # 이메일 제목
+    message: str  # Slack / Discord / 이메일 본문 (plain text)
+    html_content: str | None = None  # 이메일 HTML (없으면 message로 기본 템플릿)
+    digest_line: str | None = None
 
-    Args:
-        message: 전송할 메시지
-        notification_type: 'alert' or 'summary'
 
-    Returns:
-        bool: 전송 성공 여부
-    """
-    if not settings.discord_webhook_url:
-        logger.debug("Discord webhook URL이 설정되지 않았습니다.")
-        return False
-
-    try:
-        payload = {"content": message}
-        response = httpx.post(
-            settings.discord_webhook_url,
-            json=payload,
-            timeout=10.0,
-        )
-        response.raise_for_status()
-        record_notification("discord", notification_type, "success")
-        logger.info("Discord 알림 전송 성공")
-        return True
-    except Exception as e:
-        record_notification("discord", notification_type, "error")
-        logger.error(f"Discord 알림 전송 실패: {str(e)}")
-        return False
+Sender = Callable[[Notification], Awaitable[None]]
 
 
-async def send_email_notification(subject: str, message: str, notification_type: str = "alert", html_content: str = None) -> bool:
-    """
-    SMTP를 통해 이메일 알림을 전송합니다.
+def build_digest(notifications: list[Notification]) -> Notification:
+    """같은 종류의 알림 여러 개를 메시지 하나로 (하나면 그대로)."""
+    if len(notifications) == 1:
+        return notifications[0]
 
-    Args:
-        subject: 이메일 제목
-        message: 전송할 메시지 (plain text)
-        notification_type: 'alert' or 'summary'
-        html_content: HTML 콘텐츠 (없으면 자동 생성)
+    lines = "\n".join(f"- {notification.digest_line}" for notification in notifications)
+    return Notification(
+        notification_type=notifications[0].notification_type,
+        subject=f"🚨 LLM Quality Alert - {len(notifications)} low quality responses",
+        message=f"🚨 **Low Quality Alerts ({len(notifications)})**\n\n{lines}",
+    )
 
-    Returns:
-        bool: 전송 성공 여부
-    """
-    if not all([
+
+def configured_channels() -> list[str]:
+    """설정이 있는 알림 채널."""
+    channels = []
+    if settings.slack_webhook_url:
+        channels.append("slack")
+    if settings.discord_webhook_url:
+        channels.append("discord")
+    if all([
         settings.smtp_host,
         settings.smtp_username,
         settings.smtp_password,
         settings.smtp_from_email,
         settings.smtp_to_emails,
     ]):
-        logger.debug("SMTP 설정이 완전하지 않습니다.")
-        return False
+        channels.append("email")
+    return channels
+
+
+class WebhookSender:
+    """Slack / Discord 웹훅 전송 (공유 httpx.AsyncClient)."""
 
-    try:
+    def __init__(self, client: httpx.AsyncClient, url: str, payload_key: str, max_chars: int | None = None):
+        self.client = client
+        self.url = url
+        self.payload_key = payload_key
+        self.max_chars = max_chars
+
+    async def __call__(self, notification: Notification):
+        message = notification.message
+        if self.max_chars is not None and len(message) > self.max_chars:
+            message = message[:self.max_chars - 3] + "..."
+        response = await self.client.post(self.url, json={self.payload_key: message})
+        response.raise_for_status()
+
+
+class EmailSender:
+    """
+    SMTP 이메일 전송. 연결을 열어 둔 채로 재사용하고 (포트 587은 STARTTLS),
+    서버가 유휴 연결을 끊었으면 다시 연결해서 한 번 더 보낸다.
+    """
+
+    def __init__(self):
+        self._smtp: aiosmtplib.SMTP | None = None
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        smtp = aiosmtplib.SMTP(
+            hostname=settings.smtp_host,
+            port=settings.smtp_port,
+            start_tls=True,
+            timeout=settings.notification_http_timeout_seconds,
+        )
+        await smtp.connect()
+        await smtp.login(settings.smtp_username, settings.smtp_password)
+        self._smtp = smtp
+        return smtp
+
+    def _build_message(self, notification: Notification) -> MIMEMultipart:
         # 수신자 이메일 리스트 파싱
         to_emails = [email.strip() for email in settings.smtp_to_emails.split(",")]
 
-        # MIME 메시지 생성
         msg = MIMEMultipart("alternative")
-        msg["Subject"] = subject
+        msg["Subject"] = notification.subject
         msg["From"] = settings.smtp_from_email
         msg["To"] = ", ".join(to_emails)
 
-        # 텍스트 버전
-        text_part = MIMEText(message, "plain")
-
         # HTML 버전 (제공되지 않으면 기본 템플릿 사용)
+        html_content = notification.html_content
         if html_content is None:
-            html_message = message.replace("\n", "<br>")
+            html_message = notification.message.replace("\n", "<br>")
             html_content = f"<html><body><pre>{html_message}</pre></body></html>"
 
-        html_part = MIMEText(html_content, "html")
-
-        msg.attach(text_part)
-        msg.attach(html_part)
+        msg.attach(MIMEText(notification.message, "plain"))
+        msg.attach(MIMEText(html_content, "html"))
+        return msg
+
+    async def __call__(self, notification: Notification):
+        msg = self._build_message(notification)
+        for attempt in range(2):
+            smtp = self._smtp
+            if smtp is None or not smtp.is_connected:
+                smtp = await self._connect()
+            try:
+                await smtp.send_message(msg)
+                return
+            except aiosmtplib.SMTPServerDisconnected:
+                self._smtp = None
+                if attempt:
+                    raise
+
+    async def close(self):
+        if self._smtp is None:
+            return
+        try:
+            await self._smtp.quit()
+        except Exception:
+            pass
+        self._smtp = None
+
+
+class NotificationDispatcher:
+    """
+    전용 이벤트 루프 스레드에서 채널별로 알림을 보내는 dispatcher.
+    submit()은 어느 스레드에서 불러도 큐에 넣고 바로 돌아온다.
 
-        # SMTP 연결 및 전송 (포트 587은 STARTTLS 사용)
-        async with aiosmtplib.SMTP(
-            hostname=settings.smtp_host,
-            port=settings.smtp_port,
-            start_tls=True,
-        ) as smtp:
-            await smtp.login(settings.smtp_username, settings.smtp_password)
-            await smtp.send_message(msg)
+    senders: 채널 -> 전송 함수 (없으면 설정에 있는 Slack / Discord / 이메일)
+    """
 
-        record_notification("email", notification_type, "success")
-        logger.info(f"이메일 알림 전송 성공: {to_emails}")
+    def __init__(
+        self,
+        max_queue_size: int,
+        digest_max_items: int = 1,
+        digest_window_seconds: float = 0.0,
+        rate_limit_per_minute: int = 0,
+        senders: dict[str, Sender] | None = None,
+    ):
+        self.max_queue_size = max(1, max_queue_size)
+        self.digest_max_items = max(1, digest_max_items)
+        self.digest_window_seconds = digest_window_seconds
+        self.rate_limit_per_minute = rate_limit_per_minute
+        self._custom_senders = senders
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+
+        # 아래 객체들은 루프 스레드 안에서 생성
+        self._senders: dict[str, Sender] = {}
+        self._http_client: httpx.AsyncClient | None = None
+        self._queues: dict[str, asyncio.Queue] = {}
+        self._workers: list[asyncio.Task] = []
+
+    @property
+    def channels(self) -> list[str]:
+        if self._custom_senders is not None:
+            return list(self._custom_senders)
+        return configured_channels()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=loop.run_forever, name="notification-dispatcher", daemon=True)
+                self._thread.start()
+                asyncio.run_coroutine_threadsafe(self._start(), loop).result()
+                self._loop = loop
+        return self._loop
+
+    async def _start(self):
+        if self._custom_senders is not None:
+            self._senders = dict(self._custom_senders)
+        else:
+            self._senders = self._default_senders()
+
+        for channel, send in self._senders.items():
+            self._queues[channel] = asyncio.Queue(maxsize=self.max_queue_size)
+            bucket = TokenBucket(self.rate_limit_per_minute) if self.rate_limit_per_minute > 0 else None
+            self._workers.append(asyncio.create_task(self._run_channel(channel, send, bucket)))
+
+    def _default_senders(self) -> dict[str, Sender]:
+        channels = configured_channels()
+        senders: dict[str, Sender] = {}
+        if "slack" in channels or "discord" in channels:
+            self._http_client = httpx.AsyncClient(
+                timeout=settings.notification_http_timeout_seconds,
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=4),
+            )
+        if "slack" in channels:
+            senders["slack"] = WebhookSender(self._http_client, settings.slack_webhook_url, "text")
+        if "discord" in channels:
+            senders["discord"] = WebhookSender(
+                self._http_client, settings.discord_webhook_url, "content", max_chars=DISCORD_MAX_CHARS
+            )
+        if "email" in channels:
+            senders["email"] = EmailSender()
+        return senders
+
+    def submit(self, notification: Notification):
+        """알림을 모든 채널 큐에 넣음 (기다리지 않음). 설정된 채널이 없으면 무시."""
+        if not self.channels:
+            logger.debug("알림 채널이 설정되지 않았습니다.")
+            return
+        self._ensure_loop().call_soon_threadsafe(self._enqueue, notification)
+
+    def _enqueue(self, notification: Notification):
+        for channel, queue in self._queues.items():
+            try:
+                queue.put_nowait(notification)
+            except asyncio.QueueFull:
+                record_notification_dropped(channel, notification.notification_type)
+                logger.warning(f"{channel} 알림 큐가 가득 차서 알림을 버렸습니다 (max={self.max_queue_size})")
+                continue
+            update_notification_queue_depth(channel, queue.qsize())
+
+    async def _next_batch(self, queue: asyncio.Queue) -> list[Notification]:
+        """
+        큐에서 다음에 보낼 알림들을 꺼냄.
+        digest로 묶을 수 있는 알림이면 digest_window_seconds 동안 최대 digest_max_items개까지 더 모은다.
+        """
+        batch = [await queue.get()]
+        if batch[0].digest_line is None:
+            return batch
+
+        deadline = time.monotonic() + self.digest_window_seconds
+        while len(batch) < self.digest_max_items:
+            if not queue.empty():
+                batch.append(queue.get_nowait())
+                continue
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run_channel(self, channel: str, send: Sender, bucket: TokenBucket | None):
+        queue = self._queues[channel]
+        while True:
+            batch = await self._next_batch(queue)
+            update_notification_queue_depth(channel, queue.qsize())
+
+            # (보낼 메시지, 담긴 알림 수): digest 하나 + 묶을 수 없는 알림은 하나씩
+            deliveries = [(notification, 1) for notification in batch if notification.digest_line is None]
+            digestible = [notification for notification in batch if notification.digest_line is not None]
+            if digestible:
+                deliveries.insert(0, (build_digest(digestible), len(digestible)))
+
+            for notification, size in deliveries:
+                if bucket is not None:
+                    await bucket.acquire()
+                await self._deliver(channel, send, notification, size)
+
+            for _ in batch:
+                queue.task_done()
+
+    async def _deliver(self, channel: str, send: Sender, notification: Notification, size: int):
+        start = time.perf_counter()
+        try:
+            await send(notification)
+        except Exception as e:
+            record_notification(channel, notification.notification_type, "error")
+            logger.error(f"{channel} 알림 전송 실패: {str(e)}")
+            return
+        record_notification(channel, notification.notification_type, "success")
+        record_notification_delivery(channel, size, time.perf_counter() - start)
+        logger.info(f"{channel} 알림 전송 성공 ({size}건)")
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        지금까지 넣은 알림을 모두 보낼 때까지 기다림 (테스트 / 종료용).
+
+        Returns:
+            bool: timeout 안에 모두 보냈는지
+        """
+        if self._loop is None:
+            return True
+
+        async def _join():
+            await asyncio.gather(*(queue.join() for queue in self._queues.values()))
+
+        try:
+            asyncio.run_coroutine_threadsafe(_join(), self._loop).result(timeout)
+        except TimeoutError:
+            return False
         return True
-    except Exception as e:
-        record_notification("email", notification_type, "error")
-        logger.error(f"이메일 알림 전송 실패: {str(e)}")
-        return False
+
+    def shutdown(self, timeout: float = 10.0):
+        """남은 알림을 timeout까지 보내고 연결과 이벤트 루프 스레드 종료."""
+        with self._start_lock:
+            if self._loop is None:
+                return
+        if not self.flush(timeout):
+            logger.warning("Notification dispatcher stopped with undelivered notifications")
+
+        async def _close():
+            for worker in self._workers:
+                worker.cancel()
+            await asyncio.gather(*self._workers, return_exceptions=True)
+            for send in self._senders.values():
+                if hasattr(send, "close"):
+                    await send.close()
+            if self._http_client is not None:
+                await self._http_client.aclose()
+
+        with self._start_lock:
+            asyncio.run_coroutine_threadsafe(_close(), self._loop).result(timeout)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._loop.close()
+            self._loop = None
+            self._thread = None
+            self._senders = {}
+            self._http_client = None
+            self._queues = {}
+            self._workers = []
+
+
+notification_dispatcher = NotificationDispatcher(
+    max_queue_size=settings.notification_queue_max_size,
+    digest_max_items=settings.notification_digest_max_items,
+    digest_window_seconds=settings.notification_digest_window_seconds,
+    rate_limit_per_minute=settings.notification_rate_limit_per_minute,
+)
 
 
 def send_low_quality_alert(log: LLMLog, evaluation: LLMEvaluation):
     """
-    품질 점수가 낮은 평가 결과에 대한 알림을 전송합니다.
+    품질 점수가 낮은 평가 결과에 대한 알림을 전송 큐에 넣습니다 (전송을 기다리지 않음).
 
     Args:
         log: LLM 로그
@@ -300,32 +529,23 @@ def send_low_quality_alert(log: LLMLog, evaluation: LLMEvaluation):
     judge_type = "llm" if "llm" in evaluation.judge_model or "gpt" in evaluation.judge_model else "rule"
     record_low_quality_alert(judge_type)
 
-    # Slack, Discord, Email에 동시 전송
-    slack_sent = send_slack_notification(message, notification_type="alert")
-    discord_sent = send_discord_notification(message, notification_type="alert")
-
-    # 이메일 전송 (HTML 템플릿 포함)
-    email_sent = False
-    try:
-        email_subject = f"🚨 LLM Quality Alert - Score: {evaluation.overall_score}/5"
-        email_sent = asyncio.run(send_email_notification(
-            email_subject,
-            message,
-            notification_type="alert",
-            html_content=html_email
-        ))
-    except Exception as e:
-        logger.error(f"Email notification error: {str(e)}")
-
-    if slack_sent or discord_sent or email_sent:
-        logger.info(f"Low quality alert sent for log_id={log.id}, score={evaluation.overall_score}")
-    else:
-        logger.warning(f"Failed to send alert for log_id={log.id}")
+    # Slack, Discord, Email 채널 큐에 넣음 (여러 건이 몰리면 digest로 묶여서 전송)
+    prompt_preview = " ".join(log.prompt[:60].split())
+    notification_dispatcher.submit(Notification(
+        notification_type="alert",
+        subject=f"🚨 LLM Quality Alert - Score: {evaluation.overall_score}/5",
+        message=message,
+        html_content=html_email,
+        digest_line=(
+            f"**{evaluation.overall_score}/5** log #{log.id} ({evaluation.label}, {evaluation.judge_model}): "
+            f"{prompt_preview}..."
+        ),
+    ))
 
 
 def send_batch_evaluation_summary(evaluated_count: int, judge_type: str, judge_model: str):
     """
-    배치 평가 완료 요약 알림을 전송합니다.
+    배치 평가 완료 요약 알림을 전송 큐에 넣습니다 (전송을 기다리지 않음).
 
     Args:
         evaluated_count: 평가한 로그 개수
@@ -343,12 +563,8 @@ def send_batch_evaluation_summary(evaluated_count: int, judge_type: str, judge_m
 **Judge Model:** {judge_model}
 """.strip()
 
-    send_slack_notification(message, notification_type="summary")
-    send_discord_notification(message, notification_type="summary")
-
-    # 이메일 전송 (비동기 함수를 동기 컨텍스트에서 실행)
-    try:
-        email_subject = f"✅ Batch Evaluation Complete - {evaluated_count} logs evaluated"
-        asyncio.run(send_email_notification(email_subject, message, notification_type="summary"))
-    except Exception as e:
-        logger.error(f"Email notification error: {str(e)}")
+    notification_dispatcher.submit(Notification(
+        notification_type="summary",
+        subject=f"✅ Batch Evaluation Complete - {evaluated_count} logs evaluated",
+        message=message,
+    ))
@@ -0,0 +1,359 @@
+"""
+llm_logs 파티션 관리 / 보관 기간 모듈 (Postgres).
+
+스키마 마이그레이션 4가 llm_logs를 created_at 범위 파티션 테이블로 바꿔 둔다
+(기존 행은 llm_logs_legacy 파티션, 어느 범위에도 없는 행은 llm_logs_default).
+스케줄러가 log_partition_maintenance_interval_seconds마다 maintain_partitions를 실행해서
+
+1. 현재 기간부터 log_partition_premake개 기간 뒤까지의 파티션(log_partition_interval: day / week, UTC 기준)을 미리 만든다.
+   evaluator가 멈춰 있던 동안 default 파티션에 들어간 행은 같은 트랜잭션에서 새 파티션으로 옮긴다.
+2. log_retention_days가 설정되어 있으면 상한이 보관 기간보다 오래된 파티션을 DETACH 하고,
+   로그와 그 로그의 평가를 log_archive_dir에 JSONL.gz로 쓴 뒤 (임시 파일에 쓰고 fsync 후 rename)
+   평가 행과 파티션 테이블을 지운다. 중간에 실패해서 detach만 된 테이블은 다음 실행에서 이어서 처리한다.
+   보관 파일의 prompt / response는 llm_text_blobs에서 채운 전체 본문이고, 남은 로그가 더 이상 참조하지 않는
+   blob은 마지막에 지운다 (text_blobs.delete_unused_blobs).
+
+시간대/모델별 통계는 llm_stats_hourly rollup에 남으므로 원본 로그를 지워도 대시보드 추이는 그대로다.
+get_timeseries / get_hourly_trends처럼 created_at 범위로 거르는 조회는 해당 기간의 파티션만 읽는다 (partition pruning).
+"""
+
+import gzip
+import json
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from .config import settings
+from .db import engine
+from .metrics import record_partition_maintenance
+from .models import LLMTextBlob
+from .text_blobs import delete_unused_blobs, expand_rows
+
+logger = logging.getLogger(__name__)
+
+# 여러 evaluator 레플리카가 동시에 파티션을 만들거나 지우지 않도록 잡는 Postgres advisory lock 키
+PARTITION_LOCK_KEY = 0x4C4C4D50415254  # "LLMPART"
+
+PARENT_TABLE = "llm_logs"
+DEFAULT_PARTITION = "llm_logs_default"
+# 마이그레이션 4가 기존 테이블을 붙인 파티션
+LEGACY_PARTITION = "llm_logs_legacy"
+# 기간 파티션 이름: llm_logs_p<하한 UTC 날짜>
+PARTITION_PREFIX = "llm_logs_p"
+
+# 보관 파일을 쓸 때 한 번에 가져오는 행 수 (server-side cursor)
+ARCHIVE_FETCH_SIZE = 5000
+
+# pg_get_expr(relpartbound): "FOR VALUES FROM ('2025-01-01 00:00:00+00') TO ('2025-01-02 00:00:00+00')"
+_RANGE_BOUND = re.compile(r"FROM \((.+?)\) TO \((.+?)\)")
+
+
+@dataclass(frozen=True)
+class Partition:
+    name: str
+    lower: datetime | None  # None: MINVALUE
+    upper: datetime | None  # None: MAXVALUE
+
+
+@dataclass
+class MaintenanceResult:
+    partitioned: bool = False
+    created: list[str] = field(default_factory=list)
+    archived: list[str] = field(default_factory=list)
+    archived_rows: int = 0
+    blobs_deleted: int = 0
+    partitions: int = 0
+
+
+def period_start(value: datetime, interval: str) -> datetime:
+    """value가 속한 기간의 시작 (day: UTC 자정, week: 월요일 UTC 자정)."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    start = value.astimezone(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    if interval == "week":
+        return start - timedelta(days=start.weekday())
+    if interval != "day":
+        raise ValueError(f"Unknown partition interval: {interval}")
+    return start
+
+
+def _period(interval: str) -> timedelta:
+    return timedelta(days=7) if interval == "week" else timedelta(days=1)
+
+
+def plan_partitions(covered_until: datetime | None, now: datetime, interval: str,
+                    premake: int) -> list[tuple[datetime, datetime]]:
+    """
+    새로 만들 파티션 범위 [하한, 상한) 목록.
+
+    기존 파티션이 덮는 구간의 끝(covered_until) 바로 뒤부터 now가 속한 기간 + premake개 기간까지 빈틈 없이 잇는다.
+    covered_until이 기간 중간이면 (예: legacy 파티션 경계가 주중) 첫 파티션은 그 기간의 남은 부분만 덮는다.
+    """
+    step = _period(interval)
+    until = period_start(now, interval) + step * (premake + 1)
+    start = period_start(covered_until if covered_until is not None else now, interval)
+
+    ranges = []
+    while start < until:
+        end = start + step
+        lower = start if covered_until is None else max(start, covered_until)
+        if lower < end:
+            ranges.append((lower, end))
+        start = end
+    return ranges
+
+
+def expired_partitions(partitions: list[Partition], cutoff: datetime) -> list[Partition]:
+    """상한이 cutoff 이전이라 모든 행이 보관 기간을 지난 파티션."""
+    return [partition for partition in partitions if partition.upper is not None and partition.upper <= cutoff]
+
+
+def _parse_bound(value: str) -> datetime | None:
+    # timestamptz 경계는 세션 TimeZone 기준 문자열로 나옴 (예: '2025-01-01 09:00:00+09')
+    if value in ("MINVALUE", "MAXVALUE"):
+        return None
+    return datetime.fromisoformat(value.strip("'")).astimezone(timezone.utc)
+
+
+def _literal(value: datetime) -> str:
+    return f"'{value.astimezone(timezone.utc):%Y-%m-%d %H:%M:%S}+00'"
+
+
+def is_partitioned(conn: Connection) -> bool:
+    """llm_logs가 파티션 테이블인지 (Postgres에서 마이그레이션 4 적용 후)."""
+    if conn.dialect.name != "postgresql":
+        return False
+    return conn.execute(
+        text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table)"),
+        {"table": PARENT_TABLE},
+    ).first() is not None
+
+
+def list_partitions(conn: Connection) -> list[Partition]:
+    """llm_logs에 붙어 있는 범위 파티션 (default 파티션 제외, 상한 순)."""
+    rows = conn.execute(
+        text(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid WHERE i.inhparent = to_regclass(:table)"
+        ),
+        {"table": PARENT_TABLE},
+    ).all()
+
+    partitions = []
+    for name, bound in rows:
+        match = _RANGE_BOUND.search(bound)
+        if match is None:  # DEFAULT
+            continue
+        partitions.append(Partition(name, _parse_bound(match.group(1)), _parse_bound(match.group(2))))
+    far_future = datetime.max.replace(tzinfo=timezone.utc)
+    return sorted(partitions, key=lambda partition: partition.upper or far_future)
+
+
+def detached_tables(conn: Connection) -> list[str]:
+    """보관 도중 실패해서 detach만 되고 남아 있는 로그 파티션 테이블."""
+    return list(conn.execute(
+        text(
+            "SELECT relname FROM pg_class "
+            "WHERE relkind = 'r' AND NOT relispartition AND relnamespace = to_regnamespace(current_schema()) "
+            "AND (relname = :legacy OR relname LIKE :pattern) ORDER BY relname"
+        ),
+        {"legacy": LEGACY_PARTITION, "pattern": PARTITION_PREFIX.replace("_", "\\_") + "%"},
+    ).scalars())
+
+
+def create_partition(conn: Connection, lower: datetime, upper: datetime) -> str:
+    """
+    [lower, upper) 파티션을 만들어 llm_logs에 붙임 (한 트랜잭션).
+    default 파티션에 이 범위의 행이 있으면 ATTACH가 실패하므로 먼저 새 테이블로 옮긴다.
+    """
+    name = f"{PARTITION_PREFIX}{lower.astimezone(timezone.utc):%Y%m%d}"
+    conn.execute(text(f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS)"))
+    if conn.execute(text("SELECT to_regclass(:table)"), {"table": DEFAULT_PARTITION}).scalar() is not None:
+        moved = conn.execute(
+            text(
+                f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE created_at >= :lower AND created_at < :upper "
+                f"RETURNING *) INSERT INTO {name} SELECT * FROM moved"
+            ),
+            {"lower": lower, "upper": upper},
+        ).rowcount
+        if moved:
+            logger.info(f"Moved {moved} logs from {DEFAULT_PARTITION} to {name}")
+    # 부모의 인덱스/PK는 ATTACH 할 때 새 파티션에 만들어짐
+    conn.execute(text(
+        f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} FOR VALUES FROM ({_literal(lower)}) TO ({_literal(upper)})"
+    ))
+    conn.commit()
+    return name
+
+
+def write_archive(conn: Connection, statement, path: str,
+                  transform: Callable[[list[dict]], list[dict]] | None = None) -> int:
+    """
+    쿼리 결과를 한 줄에 한 행씩 JSONL.gz로 저장.
+    임시 파일에 쓰고 fsync 한 뒤 rename 하므로 path에는 완성된 파일만 남는다.
+    transform을 주면 ARCHIVE_FETCH_SIZE개씩 가져온 행 묶음을 바꿔서 쓴다.
+
+    Returns:
+        int: 쓴 행 수
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    count = 0
+    result = conn.execute(statement, execution_options={"stream_results": True, "yield_per": ARCHIVE_FETCH_SIZE})
+    with open(tmp_path, "wb") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="wb") as archive:
+            for chunk in result.mappings().partitions():
+                rows = [dict(row) for row in chunk]
+                if transform is not None:
+                    rows = transform(rows)
+                for row in rows:
+                    line = json.dumps(row, default=_json_default, ensure_ascii=False)
+                    archive.write(line.encode("utf-8") + b"\n")
+                count += len(rows)
+        raw.flush()
+        os.fsync(raw.fileno())
+    os.replace(tmp_path, path)
+    return count
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def archive_table(conn: Connection, name: str, archive_dir: str) -> int:
+    """
+    detach된 로그 테이블 하나를 보관 파일로 쓰고 삭제.
+
+    <archive_dir>/llm_logs/<name>.jsonl.gz에 로그를, <archive_dir>/llm_evaluations/<name>.jsonl.gz에
+    그 로그들의 평가를 쓴 뒤 평가/리스 행과 테이블을 한 트랜잭션에서 지운다.
+    파일을 다 쓰기 전에 실패하면 아무것도 지우지 않으므로 다시 실행하면 처음부터 다시 쓴다.
+
+    Returns:
+        int: 보관한 로그 수
+    """
+    rows = write_archive(
+        conn,
+        text(f"SELECT * FROM {name} ORDER BY created_at, id"),
+        os.path.join(archive_dir, "llm_logs", f"{name}.jsonl.gz"),
+        # 오프로드된 본문은 전체 본문으로 (blob은 나중에 지워질 수 있음)
+        transform=lambda rows: expand_rows(conn, LLMTextBlob, rows),
+    )
+    write_archive(
+        conn,
+        text(f"SELECT e.* FROM llm_evaluations e JOIN {name} l ON l.id = e.log_id ORDER BY e.id"),
+        os.path.join(archive_dir, "llm_evaluations", f"{name}.jsonl.gz"),
+    )
+    conn.execute(text(f"DELETE FROM llm_evaluations WHERE log_id IN (SELECT id FROM {name})"))
+    conn.execute(text(f"DELETE FROM llm_evaluation_leases WHERE log_id IN (SELECT id FROM {name})"))
+    conn.execute(text(f"DROP TABLE {name}"))
+    conn.commit()
+    return rows
+
+
+def delete_blobs_before_oldest_log(conn: Connection, now: datetime) -> int:
+    """남은 로그 중 가장 오래된 로그보다 오래된 본문 blob 삭제 (로그가 없으면 now 기준)."""
+    oldest = conn.execute(text(f"SELECT min(created_at) FROM {PARENT_TABLE}")).scalar()
+    deleted = delete_unused_blobs(conn, LLMTextBlob, oldest or now)
+    conn.commit()
+    if deleted:
+        logger.info(f"Deleted {deleted} text blobs no longer referenced by {PARENT_TABLE}")
+    return deleted
+
+
+def maintain_partitions(
+    conn: Connection,
+    now: datetime | None = None,
+    interval: str | None = None,
+    premake: int | None = None,
+    retention_days: int | None = None,
+    archive_dir: str | None = None,
+) -> MaintenanceResult:
+    """
+    앞으로 쓸 파티션을 만들고 보관 기간이 지난 파티션을 보관/삭제.
+    llm_logs가 파티션 테이블이 아니거나 (SQLite, 마이그레이션 전) 다른 레플리카가 실행 중이면 아무것도 하지 않는다.
+
+    Args:
+        conn: 전용 연결 (advisory lock을 잡고 파티션마다 commit)
+        now: 기준 시각 (기본값: 현재 시각)
+        interval / premake / retention_days / archive_dir: 기본값은 settings.log_partition_* / log_retention_days / log_archive_dir
+    """
+    now = now or datetime.now(timezone.utc)
+    if now.tzinfo is None:
+        now = now.replace(tzinfo=timezone.utc)
+    interval = interval or settings.log_partition_interval
+    premake = settings.log_partition_premake if premake is None else premake
+    retention_days = settings.log_retention_days if retention_days is None else retention_days
+    archive_dir = archive_dir or settings.log_archive_dir
+
+    result = MaintenanceResult()
+    if not is_partitioned(conn):
+        return result
+    result.partitioned = True
+
+    if not conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": PARTITION_LOCK_KEY}).scalar():
+        logger.info("Partition maintenance is running on another worker")
+        return result
+    try:
+        conn.commit()
+        partitions = list_partitions(conn)
+        uppers = [partition.upper for partition in partitions]
+        if None not in uppers:
+            covered_until = max(uppers, default=None)
+            for lower, upper in plan_partitions(covered_until, now, interval, premake):
+                result.created.append(create_partition(conn, lower, upper))
+
+        if retention_days > 0:
+            cutoff = now - timedelta(days=retention_days)
+            for partition in expired_partitions(list_partitions(conn), cutoff):
+                # DETACH는 따로 커밋해서 보관 파일을 쓰는 동안 부모 테이블을 잠그지 않음
+                conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {partition.name}"))
+                conn.commit()
+            for name in detached_tables(conn):
+                result.archived_rows += archive_table(conn, name, archive_dir)
+                result.archived.append(name)
+                logger.info(f"Archived and dropped log partition {name}")
+            result.blobs_deleted = delete_blobs_before_oldest_log(conn, now)
+
+        result.partitions = len(list_partitions(conn))
+        conn.commit()
+        return result
+    finally:
+        conn.rollback()
+        conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": PARTITION_LOCK_KEY})
+        conn.commit()
+
+
+def run_partition_maintenance() -> MaintenanceResult | None:
+    """스케줄러용 파티션 관리 작업 (자체 연결 사용, 실패해도 예외를 올리지 않음)."""
+    start = time.perf_counter()
+    try:
+        with engine.connect() as conn:
+            result = maintain_partitions(conn)
+        record_partition_maintenance(
+            "success",
+            time.perf_counter() - start,
+            created=len(result.created),
+            archived=len(result.archived),
+            archived_rows=result.archived_rows,
+            blobs_deleted=result.blobs_deleted,
+            partitions=result.partitions if result.partitioned else None,
+        )
+        if result.created or result.archived:
+            logger.info(
+                f"Partition maintenance: created {result.created}, "
+                f"archived {result.archived} ({result.archived_rows} logs)"
+            )
+        return result
+    except Exception as e:
+        record_partition_maintenance("error", time.perf_counter() - start)
+        logger.error(f"Partition maintenance failed: {str(e)}")
+        return None
@@ -0,0 +1,228 @@
+"""
+Continuous 평가 파이프라인 모듈 (evaluation_mode='continuous').
+
+APScheduler 주기 실행 대신 백그라운드 스레드가 계속 돌면서 로그가 들어오는 즉시 평가한다.
+
+- 배치가 가득 차면 (backlog가 있다는 뜻) 쉬지 않고 다음 배치를 실행하고 배치 크기를 2배로 늘림
+  (evaluation_max_batch_size까지)
+- 배치가 덜 차면 배치 크기를 줄이고, 대기 로그가 없으면 새 로그를 기다림
+- 가져온 로그를 하나도 평가하지 못했으면 (judge / LLM 장애 등) 대기 로그가 없을 때처럼 대기 시간을 늘려가며 기다림
+  (실패한 로그는 평가가 저장되지 않아 다음 배치에서 다시 가져오므로, 바로 재시도하면 같은 로그를 쉬지 않고 다시 평가함)
+- 기다리는 동안 Postgres면 gateway의 NOTIFY(log_notify_channel)를 LISTEN해서 바로 깨어나고,
+  그 외(SQLite 등)에는 evaluation_idle_min_seconds부터 2배씩 늘려가며 polling
+"""
+
+import logging
+import re
+import select
+import threading
+import time
+from typing import Callable, NamedTuple
+
+from sqlalchemy.engine import Engine
+
+from .config import settings
+from .metrics import update_evaluation_batch_size
+
+logger = logging.getLogger(__name__)
+
+_CHANNEL_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+# 끊긴 LISTEN 연결을 다시 시도하는 최소 간격 (초)
+RECONNECT_INTERVAL_SECONDS = 30.0
+
+
+class BatchResult(NamedTuple):
+    """배치 한 번의 결과."""
+    fetched: int  # 가져온 대기 로그 수
+    evaluated: int  # 평가를 저장한 로그 수
+
+
+class LogNotificationListener:
+    """
+    gateway가 보내는 Postgres NOTIFY를 받는 LISTEN 전용 연결 (psycopg2).
+    Postgres가 아니거나 연결에 실패하면 connected=False이고, 파이프라인은 polling으로 동작한다.
+    """
+
+    def __init__(self, engine: Engine, channel: str | None):
+        if channel and not _CHANNEL_PATTERN.match(channel):
+            raise ValueError(f"Invalid notify channel name: {channel}")
+
+        self.engine = engine
+        self.channel = channel
+        self._raw_connection = None
+        self._last_attempt = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.channel) and self.engine.dialect.name == "postgresql"
+
+    @property
+    def connected(self) -> bool:
+        return self._raw_connection is not None
+
+    def connect(self) -> bool:
+        if not self.enabled or self.connected:
+            return self.connected
+        if time.monotonic() - self._last_attempt < RECONNECT_INTERVAL_SECONDS:
+            return False
+        self._last_attempt = time.monotonic()
+
+        try:
+            raw_connection = self.engine.raw_connection()
+            pg_connection = raw_connection.driver_connection
+            pg_connection.autocommit = True
+            with pg_connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {self.channel}")
+        except Exception as e:
+            logger.warning(f"Failed to LISTEN on {self.channel}, falling back to polling: {str(e)}")
+            return False
+
+        self._raw_connection = raw_connection
+        logger.info(f"Listening for new logs on channel {self.channel}")
+        return True
+
+    def wait(self, timeout: float) -> bool:
+        """NOTIFY를 최대 timeout초 기다림. 알림을 받으면 True."""
+        pg_connection = self._raw_connection.driver_connection
+        try:
+            readable, _, _ = select.select([pg_connection], [], [], timeout)
+            if not readable:
+                return False
+            pg_connection.poll()
+            received = bool(pg_connection.notifies)
+            pg_connection.notifies.clear()
+            return received
+        except Exception as e:
+            logger.warning(f"LISTEN connection lost, falling back to polling: {str(e)}")
+            self.close()
+            return False
+
+    def close(self):
+        if self._raw_connection is None:
+            return
+        try:
+            # autocommit/LISTEN 상태가 남은 연결을 풀에 돌려주지 않도록 버림
+            self._raw_connection.invalidate()
+        except Exception:
+            pass
+        self._raw_connection = None
+
+
+class ContinuousEvaluator:
+    """
+    run_batch를 계속 실행하는 백그라운드 스레드.
+    run_batch(batch_size)는 이번에 가져온 대기 로그 수와 평가를 저장한 로그 수(BatchResult)를 반환해야 한다.
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[int], BatchResult],
+        min_batch_size: int,
+        max_batch_size: int,
+        idle_min_seconds: float,
+        idle_max_seconds: float,
+        listener: LogNotificationListener | None = None,
+    ):
+        self.run_batch = run_batch
+        self.min_batch_size = max(1, min_batch_size)
+        self.max_batch_size = max(self.min_batch_size, max_batch_size)
+        self.idle_min_seconds = idle_min_seconds
+        self.idle_max_seconds = max(idle_min_seconds, idle_max_seconds)
+        self.listener = listener
+
+        self.batch_size = self.min_batch_size
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="continuous-evaluator", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        if self.listener is not None:
+            self.listener.close()
+
+    def next_batch_size(self, fetched: int) -> int:
+        """이번 배치 결과로 다음 배치 크기 결정 (가득 차면 2배, 덜 차면 절반)."""
+        if fetched >= self.batch_size:
+            return min(self.batch_size * 2, self.max_batch_size)
+        return max(self.batch_size // 2, self.min_batch_size)
+
+    def _wait_for_logs(self, timeout: float):
+        """새 로그 알림(NOTIFY) 또는 timeout까지 대기. stop() 호출 시 바로 반환."""
+        if self.listener is not None:
+            self.listener.connect()
+
+        deadline = time.monotonic() + timeout
+        while not self._stop.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            # stop()에 빨리 반응하도록 최대 1초 단위로 나눠서 대기
+            step = min(remaining, 1.0)
+            if self.listener is not None and self.listener.connected:
+                if self.listener.wait(step):
+                    return
+            elif self._stop.wait(step):
+                return
+
+    def _run(self):
+        idle_seconds = self.idle_min_seconds
+
+        while not self._stop.is_set():
+            try:
+                fetched, evaluated = self.run_batch(self.batch_size)
+                failed = False
+            except Exception as e:
+                logger.error(f"Continuous evaluation batch failed: {str(e)}")
+                fetched, evaluated = 0, 0
+                failed = True
+
+            # 하나도 평가하지 못했으면 같은 로그를 다시 가져오게 되므로 빈 배치처럼 취급 (배치 크기도 줄임)
+            progressed = evaluated > 0
+            # 가져온 로그가 남아 있는데 진행하지 못한 경우 (judge 장애 등)
+            stalled = failed or (fetched > 0 and not progressed)
+            full = progressed and fetched >= self.batch_size
+            self.batch_size = self.next_batch_size(fetched if progressed else 0)
+            update_evaluation_batch_size(self.batch_size)
+
+            if full:
+                # backlog가 남아 있으므로 바로 다음 배치
+                idle_seconds = self.idle_min_seconds
+                continue
+
+            if progressed:
+                idle_seconds = self.idle_min_seconds
+            elif fetched > 0:
+                logger.warning(f"No logs evaluated out of {fetched}, retrying in {idle_seconds:.1f}s")
+
+            if stalled:
+                # gateway가 flush마다 NOTIFY를 보내므로, 알림에 깨어나면 같은 로그를 계속 다시 평가하게 됨
+                self._stop.wait(idle_seconds)
+            else:
+                self._wait_for_logs(idle_seconds)
+            if not progressed:
+                idle_seconds = min(idle_seconds * 2, self.idle_max_seconds)
+
+
+def create_continuous_evaluator(engine: Engine, run_batch: Callable[[int], BatchResult]) -> ContinuousEvaluator:
+    return ContinuousEvaluator(
+        run_batch=run_batch,
+        min_batch_size=settings.evaluation_min_batch_size,
+        max_batch_size=settings.evaluation_max_batch_size,
+        idle_min_seconds=settings.evaluation_idle_min_seconds,
+        idle_max_seconds=settings.evaluation_idle_max_seconds,
+        listener=LogNotificationListener(engine, settings.log_notify_channel),
+    )
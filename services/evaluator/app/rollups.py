@@ -0,0 +1,324 @@
+"""
+대시보드/분석 API용 rollup(사전 집계) 모듈.
+
+llm_logs / llm_evaluations를 (시간, model_version) 단위로 미리 집계해서 llm_stats_hourly에 저장한다.
+지연시간 분포는 로그 스케일 히스토그램(llm_latency_sketch_hourly)으로 함께 저장해서 백분위수도 원본 행 없이 계산한다.
+gateway-api / dashboard의 요약·추이 API는 원본 테이블 대신 이 테이블을 읽으므로
+전체 테이블 COUNT / AVG / COUNT(DISTINCT)를 요청마다 다시 계산하지 않는다.
+
+증분 갱신 (refresh_rollups, 스케줄러가 stats_rollup_interval_seconds마다 실행):
+1. watermark(지난 실행 시작 시각) - lookback 이후에 생성된 로그, 평가된 로그가 속한 시간대를 찾음
+2. 연속된 시간대끼리 묶어서 구간마다 한 트랜잭션으로 해당 시간대 행을 지우고 다시 집계해서 insert
+3. 이번 실행 시작 시각을 새 watermark로 저장
+
+시간대 하나를 통째로 다시 계산하므로 같은 구간을 여러 번 갱신해도 결과가 같다 (재시도/중복 실행에 안전).
+처음 실행할 때(state 행이 없을 때)는 전체 기간을 backfill 한다.
+"""
+
+import logging
+import math
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Iterable
+
+from sqlalchemy import Integer, case, cast, delete, distinct, func, select, text, union
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .db import SessionLocal, notify_stats_changed
+from .metrics import record_rollup_refresh, update_rollup_lag
+from .models import LLMEvaluation, LLMLatencySketchHourly, LLMLog, LLMStatsHourly, StatsRollupState
+
+logger = logging.getLogger(__name__)
+
+# rollup 정의(컬럼/테이블)가 바뀌면 올림. state 행이 새 이름으로 다시 만들어지면서 전체 기간을 backfill 한다
+# (v2: 지연시간 히스토그램 추가, gateway-api / dashboard의 ROLLUP_NAME과 같아야 함)
+ROLLUP_VERSION = 2
+ROLLUP_NAME = f"llm_stats_hourly:v{ROLLUP_VERSION}"
+
+# 여러 evaluator 레플리카가 같은 구간을 동시에 다시 쓰지 않도록 잡는 Postgres advisory lock 키
+ROLLUP_LOCK_KEY = 0x4C4C4D5354  # "LLMST"
+
+HOUR = timedelta(hours=1)
+
+# 구간 하나(한 트랜잭션)에서 다시 집계하는 최대 시간대 수
+MAX_RANGE_HOURS = 24
+
+# SQLite는 날짜를 문자열로 비교하므로 ('10:00:00' < '10:00:00.000000') 정각에 생성된 로그를 놓치지 않도록
+# 조회 범위를 조금 넓히고 집계 결과를 bucket으로 다시 거른다
+_RANGE_SLACK = timedelta(seconds=1)
+
+# 지연시간 히스토그램: bin = ceil(log_gamma(latency_ms)), bin 대표값 2 * gamma^bin / (gamma + 1)의 상대 오차 <= 1%
+# (gateway-api stats_rollups와 같아야 함)
+LATENCY_SKETCH_RELATIVE_ACCURACY = 0.01
+LATENCY_SKETCH_GAMMA = (1 + LATENCY_SKETCH_RELATIVE_ACCURACY) / (1 - LATENCY_SKETCH_RELATIVE_ACCURACY)
+# 이보다 작은 지연시간(0 포함)은 같은 bin으로 (log 계산 범위)
+LATENCY_SKETCH_MIN_MS = 0.01
+
+
+def hour_bucket(column, dialect_name: str):
+    """created_at 컬럼을 시간 단위로 자르는 SQL 식 (Postgres: date_trunc, SQLite: strftime)."""
+    if dialect_name == "postgresql":
+        return func.date_trunc("hour", column)
+    return func.strftime("%Y-%m-%d %H:00:00", column)
+
+
+def _to_datetime(value) -> datetime:
+    # SQLite의 strftime 결과는 문자열
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite는 timezone 정보 없이 저장되므로 UTC로 간주
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def group_hours(hours: Iterable[datetime], max_hours: int = MAX_RANGE_HOURS) -> list[tuple[datetime, datetime]]:
+    """
+    시간대 목록을 연속된 [start, end) 구간으로 묶음 (구간 하나는 최대 max_hours 시간).
+
+    Returns:
+        list[tuple[datetime, datetime]]: 오래된 순 구간 목록
+    """
+    ranges: list[tuple[datetime, datetime]] = []
+    for hour in sorted(set(hours)):
+        if ranges:
+            start, end = ranges[-1]
+            if hour == end and end - start < max_hours * HOUR:
+                ranges[-1] = (start, end + HOUR)
+                continue
+        ranges.append((hour, hour + HOUR))
+    return ranges
+
+
+def latency_bin(column):
+    """latency_ms 컬럼의 히스토그램 bin 번호 SQL 식."""
+    clamped = case((column < LATENCY_SKETCH_MIN_MS, LATENCY_SKETCH_MIN_MS), else_=column)
+    return cast(func.ceil(func.ln(clamped) / math.log(LATENCY_SKETCH_GAMMA)), Integer)
+
+
+def aggregate_latency_bins(db: Session, start: datetime, end: datetime) -> list[dict]:
+    """
+    [start, end) 시간대의 지연시간을 (시간, model_version, bin) 단위로 집계.
+
+    Returns:
+        list[dict]: llm_latency_sketch_hourly에 insert할 행 목록
+    """
+    dialect_name = db.get_bind().dialect.name
+    bucket = hour_bucket(LLMLog.created_at, dialect_name).label("bucket")
+    model_version = func.coalesce(LLMLog.model_version, "").label("model_version")
+    bin_ = latency_bin(LLMLog.latency_ms).label("bin")
+
+    rows = db.execute(
+        select(bucket, model_version, bin_, func.count())
+        .where(LLMLog.created_at >= start - _RANGE_SLACK, LLMLog.created_at < end + _RANGE_SLACK)
+        .where(LLMLog.latency_ms.isnot(None))
+        .group_by(bucket, model_version, bin_)
+    ).all()
+
+    sketch_rows = []
+    for bucket_value, model, bin_value, count in rows:
+        bucket_start = _to_datetime(bucket_value)
+        if start <= bucket_start < end:
+            sketch_rows.append({"bucket_start": bucket_start, "model_version": model, "bin": bin_value, "count": count})
+    return sketch_rows
+
+
+def aggregate_hours(db: Session, start: datetime, end: datetime) -> list[dict]:
+    """
+    [start, end) 시간대의 로그/평가를 (시간, model_version) 단위로 집계.
+
+    평가 통계는 평가 대상 로그의 created_at 시간대로 집계한다 (원본 API의 JOIN 집계와 같은 기준).
+
+    Returns:
+        list[dict]: llm_stats_hourly에 insert할 행 목록
+    """
+    dialect_name = db.get_bind().dialect.name
+    bucket = hour_bucket(LLMLog.created_at, dialect_name).label("bucket")
+    model_version = func.coalesce(LLMLog.model_version, "").label("model_version")
+    in_range = (LLMLog.created_at >= start - _RANGE_SLACK, LLMLog.created_at < end + _RANGE_SLACK)
+
+    log_stats = db.execute(
+        select(
+            bucket,
+            model_version,
+            func.count(LLMLog.id),
+            func.sum(case((LLMLog.status == "error", 1), else_=0)),
+            func.count(LLMLog.latency_ms),
+            func.sum(LLMLog.latency_ms),
+        )
+        .where(*in_range)
+        .group_by(bucket, model_version)
+    ).all()
+
+    eval_stats = db.execute(
+        select(
+            bucket,
+            model_version,
+            func.count(distinct(LLMEvaluation.log_id)),
+            func.count(LLMEvaluation.id),
+            func.sum(LLMEvaluation.overall_score),
+            func.sum(case((LLMEvaluation.is_flagged.is_(True), 1), else_=0)),
+        )
+        .join(LLMEvaluation, LLMEvaluation.log_id == LLMLog.id)
+        .where(*in_range)
+        .group_by(bucket, model_version)
+    ).all()
+
+    rows: dict[tuple[datetime, str], dict] = {}
+
+    def row_for(bucket_value, model: str) -> dict | None:
+        bucket_start = _to_datetime(bucket_value)
+        if not start <= bucket_start < end:
+            return None
+        key = (bucket_start, model)
+        if key not in rows:
+            rows[key] = {
+                "bucket_start": bucket_start,
+                "model_version": model,
+                "request_count": 0,
+                "error_count": 0,
+                "latency_count": 0,
+                "latency_sum": 0.0,
+                "evaluated_count": 0,
+                "evaluation_count": 0,
+                "score_sum": 0,
+                "flagged_count": 0,
+            }
+        return rows[key]
+
+    for bucket_value, model, requests, errors, latency_count, latency_sum in log_stats:
+        row = row_for(bucket_value, model)
+        if row is not None:
+            row.update(
+                request_count=requests,
+                error_count=errors or 0,
+                latency_count=latency_count,
+                latency_sum=float(latency_sum or 0.0),
+            )
+
+    for bucket_value, model, evaluated, evaluations, score_sum, flagged in eval_stats:
+        row = row_for(bucket_value, model)
+        if row is not None:
+            row.update(
+                evaluated_count=evaluated,
+                evaluation_count=evaluations,
+                score_sum=int(score_sum or 0),
+                flagged_count=flagged or 0,
+            )
+
+    return list(rows.values())
+
+
+def refresh_range(db: Session, start: datetime, end: datetime) -> int:
+    """
+    [start, end) 시간대의 rollup 행(통계, 지연시간 히스토그램)을 지우고 다시 집계해서 저장 (한 트랜잭션).
+
+    Returns:
+        int: 저장한 llm_stats_hourly 행 수
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        # 트랜잭션이 끝날 때 풀림. 다른 워커가 갱신 중이면 기다렸다가 최신 데이터로 다시 집계
+        db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": ROLLUP_LOCK_KEY})
+
+    rows = aggregate_hours(db, start, end)
+    sketch_rows = aggregate_latency_bins(db, start, end)
+    for table, table_rows in ((LLMStatsHourly, rows), (LLMLatencySketchHourly, sketch_rows)):
+        db.execute(delete(table).where(table.bucket_start >= start).where(table.bucket_start < end))
+        if table_rows:
+            db.execute(table.__table__.insert(), table_rows)
+    db.commit()
+    return len(rows)
+
+
+def dirty_hours(db: Session, since: datetime) -> list[datetime]:
+    """since 이후에 생성된 로그, 또는 since 이후에 평가된 로그가 속한 시간대 목록."""
+    dialect_name = db.get_bind().dialect.name
+    bucket = hour_bucket(LLMLog.created_at, dialect_name)
+
+    new_logs = select(bucket.label("bucket")).where(LLMLog.created_at >= since)
+    new_evaluations = (
+        select(bucket.label("bucket"))
+        .join(LLMEvaluation, LLMEvaluation.log_id == LLMLog.id)
+        .where(LLMEvaluation.created_at >= since)
+    )
+    return [_to_datetime(value) for value in db.execute(union(new_logs, new_evaluations)).scalars()]
+
+
+def all_hours(db: Session) -> list[datetime]:
+    """backfill용: 가장 오래된 로그부터 가장 최근 로그까지의 모든 시간대 목록."""
+    oldest, newest = db.execute(select(func.min(LLMLog.created_at), func.max(LLMLog.created_at))).one()
+    if oldest is None:
+        return []
+
+    first = _to_datetime(oldest).replace(minute=0, second=0, microsecond=0)
+    last = _to_datetime(newest)
+    hours = []
+    hour = first
+    while hour <= last:
+        hours.append(hour)
+        hour += HOUR
+    return hours
+
+
+def refresh_rollups(db: Session, lookback_seconds: float | None = None, full: bool = False) -> int:
+    """
+    watermark 이후 바뀐 시간대의 rollup을 갱신.
+
+    Args:
+        db: SQLAlchemy 세션
+        lookback_seconds: watermark 이전으로 다시 훑는 구간 (늦게 커밋된 로그/평가 대비,
+                          기본값: settings.stats_rollup_lookback_seconds)
+        full: True면 watermark와 관계없이 전체 기간을 다시 집계
+
+    Returns:
+        int: 다시 집계한 시간대 수
+    """
+    if lookback_seconds is None:
+        lookback_seconds = settings.stats_rollup_lookback_seconds
+
+    # 이번 실행 도중/이후에 커밋된 데이터는 다음 실행이 lookback으로 다시 확인
+    started_at = datetime.now(timezone.utc)
+    state = db.get(StatsRollupState, ROLLUP_NAME)
+
+    if state is None or full:
+        hours = all_hours(db)
+    else:
+        hours = dirty_hours(db, state.watermark - timedelta(seconds=lookback_seconds))
+
+    for start, end in group_hours(hours):
+        refresh_range(db, start, end)
+
+    # 다른 워커가 그 사이 state를 만들었을 수 있으므로 merge
+    db.merge(StatsRollupState(name=ROLLUP_NAME, watermark=started_at))
+    if hours:
+        notify_stats_changed(db)
+    db.commit()
+
+    return len(set(hours))
+
+
+def run_rollup_refresh() -> int:
+    """스케줄러용 rollup 갱신 작업 (자체 세션 사용, 실패해도 예외를 올리지 않음)."""
+    start = time.perf_counter()
+    db: Session = SessionLocal()
+    try:
+        refreshed = refresh_rollups(db)
+        record_rollup_refresh("success", refreshed, time.perf_counter() - start)
+
+        state = db.get(StatsRollupState, ROLLUP_NAME)
+        if state is not None:
+            update_rollup_lag((datetime.now(timezone.utc) - _as_utc(state.watermark)).total_seconds())
+
+        if refreshed:
+            logger.info(f"Refreshed {refreshed} hourly rollup buckets in {time.perf_counter() - start:.2f}s")
+        return refreshed
+    except Exception as e:
+        record_rollup_refresh("error", 0, time.perf_counter() - start)
+        logger.error(f"Rollup refresh failed: {str(e)}")
+        db.rollback()
+        return 0
+    finally:
+        db.close()
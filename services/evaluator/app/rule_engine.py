@@ -0,0 +1,399 @@
+"""
+배치 룰 평가 엔진.
+
+로그를 하나씩 평가하는 대신 응답 텍스트 배치(리스트/컬럼) 전체에 룰을 한 번에 적용한다.
+
+- 룰은 선언형 객체(LengthRule, KeywordRule, RegexRule 등)의 리스트(RuleSet)로 정의
+  (설정 파일의 rule pack에서 만드는 방법은 rules.load_rule_pack 참고)
+- 한 행에 여러 룰이 걸리면 priority가 높은 룰이 적용된다
+- 룰은 priority 내림차순, 같은 priority 안에서는 비용(cost)이 낮은 순으로 평가하고,
+  이미 룰이 정해진 행은 이후 룰에서 건너뛴다 (short-circuit). 같은 priority면 먼저 걸린 (싼) 룰이 적용
+- 길이 룰은 NumPy 배열 비교
+- 키워드 룰은 배치 전체를 구분자로 이어 붙여 한 번 소문자로 바꾼 버퍼에서 키워드마다 str.find로 검색하고,
+  찾은 위치를 행 시작 offset에 np.searchsorted해서 행 번호로 바꿈
+  (Python re의 alternation은 행마다 한 글자씩 시도해서 로그별 `kw in text.lower()`보다도 느림)
+- 코멘트 문자열은 최종적으로 적용된 룰이 있는 행에만 만든다
+- 룰마다 평가 시간/평가 행 수/적중 수를 Prometheus 메트릭으로 기록
+
+새 룰 종류는 Rule을 상속해서 match()/comment()를 구현하면 된다.
+"""
+
+import json
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from functools import cache, cached_property
+from typing import ClassVar, NamedTuple, Sequence
+
+import numpy as np
+
+from .metrics import record_rule_evaluation
+
+
+@cache
+def _char_table(method: str) -> np.ndarray:
+    """모든 code point에 대한 str 메서드(isalpha 등) 결과 lookup table (처음 사용할 때 한 번 생성)."""
+    check = getattr(str, method)
+    return np.fromiter((check(chr(cp)) for cp in range(sys.maxunicode + 1)), dtype=bool, count=sys.maxunicode + 1)
+
+
+class RuleBatch:
+    """룰에 넘기는 컬럼형 배치 (texts[i]와 lengths[i]가 같은 행)."""
+
+    # 행 사이 구분자 (키워드에 포함될 수 없으므로 행 경계를 넘는 매칭이 생기지 않음)
+    SEPARATOR = "\x00"
+
+    def __init__(self, texts: Sequence[str]):
+        self.texts = texts
+        self.lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+        self.starts = self._row_starts(self.lengths)
+
+    @staticmethod
+    def _row_starts(lengths: np.ndarray) -> np.ndarray:
+        starts = np.zeros(len(lengths), dtype=np.int64)
+        np.cumsum(lengths[:-1] + 1, out=starts[1:])
+        return starts
+
+    @cached_property
+    def joined(self) -> str:
+        return self.SEPARATOR.join(self.texts)
+
+    @cached_property
+    def lowered(self) -> tuple[str, np.ndarray]:
+        """(소문자로 바꿔 이어 붙인 버퍼, 각 행의 시작 offset). 키워드 룰들이 공유."""
+        lowered = self.joined.lower()
+        if len(lowered) == len(self.joined):
+            return lowered, self.starts
+
+        # 소문자 변환으로 길이가 바뀌는 문자(예: 'İ')가 있으면 행별로 변환해서 offset을 다시 계산
+        lowered_texts = [text.lower() for text in self.texts]
+        lengths = np.fromiter(map(len, lowered_texts), dtype=np.int64, count=len(lowered_texts))
+        return self.SEPARATOR.join(lowered_texts), self._row_starts(lengths)
+
+    @cached_property
+    def codepoints(self) -> np.ndarray:
+        """이어 붙인 버퍼의 code point 배열 (인덱스 = 버퍼 위치, ASCII만 있으면 uint8)."""
+        if self.joined.isascii():
+            return np.frombuffer(self.joined.encode("ascii"), dtype=np.uint8)
+        return np.frombuffer(self.joined.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+
+    def count_per_row(self, table: np.ndarray) -> np.ndarray:
+        """
+        code point lookup table이 True인 글자 수를 행마다 셈.
+        행 구간에 뒤따르는 구분자(NUL)도 포함되지만 table[0]은 항상 False여야 한다.
+        """
+        if not len(self):
+            return np.zeros(0, dtype=np.int64)
+        # 마지막 행이 빈 문자열이어도 시작 offset이 배열 범위 안에 있도록 한 칸 추가
+        hits = np.append(table[self.codepoints], False)
+        return np.add.reduceat(hits, self.starts, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+
+class RuleBatchResult(NamedTuple):
+    """배치 평가 결과 (컬럼형, 입력과 같은 순서)."""
+    overall_score: np.ndarray  # int8
+    is_flagged: np.ndarray  # bool
+    label: np.ndarray  # object (str)
+    rule_index: np.ndarray  # 적용된 룰의 RuleSet 내 위치, 없으면 -1
+    comments: list[str]
+
+
+def _match_rows(predicate, batch: RuleBatch, rows: np.ndarray) -> np.ndarray:
+    """rows에 해당하는 행마다 predicate(text)를 호출해서 bool 마스크 생성."""
+    texts = batch.texts
+    return np.fromiter((predicate(texts[row]) for row in rows.tolist()), dtype=bool, count=len(rows))
+
+
+@dataclass(frozen=True)
+class Rule:
+    """
+    룰 하나. 걸린 행은 score/label/flag로 평가된다.
+
+    서브클래스는 다음을 구현한다.
+    - match(batch, rows): rows(아직 룰이 정해지지 않은 행 번호 배열)에 대한 bool 마스크
+    - comment(text, length): 걸린 행의 코멘트
+    - cost: 대략적인 행당 평가 비용 (같은 priority 안에서 싼 룰부터 평가)
+    """
+    cost: ClassVar[int] = 1
+
+    name: str
+    score: int
+    label: str
+    flag: bool = False
+    priority: int = 0
+
+    def match(self, batch: RuleBatch, rows: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def comment(self, text: str, length: int) -> str:
+        raise NotImplementedError
+
+
+@dataclass(frozen=True)
+class LengthRule(Rule):
+    """응답 길이가 min_length 미만이거나 max_length 초과면 걸림."""
+    cost: ClassVar[int] = 1
+
+    min_length: int | None = None
+    max_length: int | None = None
+
+    def match(self, batch: RuleBatch, rows: np.ndarray) -> np.ndarray:
+        lengths = batch.lengths[rows]
+        matched = np.zeros(len(rows), dtype=bool)
+        if self.min_length is not None:
+            matched |= lengths < self.min_length
+        if self.max_length is not None:
+            matched |= lengths > self.max_length
+        return matched
+
+    def comment(self, text: str, length: int) -> str:
+        if self.min_length is not None and length < self.min_length:
+            return f"Response is too short (length: {length} chars)."
+        return f"Response is too long (length: {length} chars)."
+
+
+@dataclass(frozen=True)
+class KeywordRule(Rule):
+    """응답에 키워드 중 하나라도 포함되면 걸림 (대소문자 무시, 부분 문자열 일치)."""
+    cost: ClassVar[int] = 2
+
+    keywords: tuple[str, ...] = ()
+
+    def match(self, batch: RuleBatch, rows: np.ndarray) -> np.ndarray:
+        matched = np.zeros(len(batch), dtype=bool)
+        if not len(batch):
+            return matched
+
+        buffer, starts = batch.lowered
+        find = buffer.find
+        for keyword in self.keywords:
+            keyword = keyword.lower()
+            positions = []
+            pos = find(keyword)
+            while pos != -1:
+                positions.append(pos)
+                pos = find(keyword, pos + 1)
+            if positions:
+                matched[np.searchsorted(starts, positions, side="right") - 1] = True
+        return matched[rows]
+
+    def detected(self, text: str) -> list[str]:
+        """걸린 행에서 실제로 포함된 키워드 목록 (keywords 순서)."""
+        text_lower = text.lower()
+        return [kw for kw in self.keywords if kw.lower() in text_lower]
+
+    def comment(self, text: str, length: int) -> str:
+        return f"Response looks like an error message. Detected keywords: {', '.join(self.detected(text))}"
+
+
+@dataclass(frozen=True)
+class RegexRule(Rule):
+    """응답에서 정규식이 매칭되면 걸림 (패턴은 룰 생성 시 한 번 컴파일)."""
+    cost: ClassVar[int] = 3
+
+    pattern: str = ""
+    ignore_case: bool = True
+    _compiled: re.Pattern = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "_compiled", re.compile(self.pattern, re.IGNORECASE if self.ignore_case else 0))
+
+    def match(self, batch: RuleBatch, rows: np.ndarray) -> np.ndarray:
+        search = self._compiled.search
+        return _match_rows(lambda text: search(text) is not None, batch, rows)
+
+    def comment(self, text: str, length: int) -> str:
+        return f"Response matched rule {self.name}: {self._compiled.search(text).group(0)[:100]!r}"
+
+
+def _is_invalid_json(text: str) -> bool:
+    try:
+        json.loads(text)
+    except ValueError:
+        return True
+    return False
+
+
+@dataclass(frozen=True)
+class JsonRule(Rule):
+    """응답이 올바른 JSON이 아니면 걸림 (JSON 출력을 요구하는 프롬프트용)."""
+    cost: ClassVar[int] = 4
+
+    def match(self, batch: RuleBatch, rows: np.ndarray) -> np.ndarray:
+        return _match_rows(_is_invalid_json, batch, rows)
+
+    def comment(self, text: str, length: int) -> str:
+        return "Response is not valid JSON."
+
+
+# 언어(문자 체계) 판별용 code point 범위
+SCRIPT_RANGES = {
+    "latin": ((0x41, 0x5A), (0x61, 0x7A), (0xC0, 0x24F)),
+    "hangul": ((0xAC00, 0xD7A3), (0x1100, 0x11FF), (0x3130, 0x318F)),
+    "han": ((0x4E00, 0x9FFF), (0x3400, 0x4DBF)),
+    "kana": ((0x3040, 0x30FF),),
+    "cyrillic": ((0x400, 0x4FF),),
+}
+
+
+@dataclass(frozen=True)
+class LanguageRule(Rule):
+    """
+    응답 글자(isalpha) 중 scripts(예: hangul, latin)에 속하는 비율이 min_ratio 미만이면 걸림.
+    언어 감지 라이브러리 없이 문자 체계(Unicode 범위)로 판별한다. 글자가 없는 응답은 건너뜀.
+    글자 수는 배치 전체 code point 배열에 lookup table을 적용해서 행마다 한 번에 센다.
+    """
+    cost: ClassVar[int] = 2
+
+    scripts: tuple[str, ...] = ("latin",)
+    min_ratio: float = 0.5
+    _table: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        unknown = set(self.scripts) - SCRIPT_RANGES.keys()
+        if unknown:
+            raise ValueError(f"Unknown scripts for rule {self.name}: {sorted(unknown)}")
+        table = np.zeros(sys.maxunicode + 1, dtype=bool)
+        for script in self.scripts:
+            for first, last in SCRIPT_RANGES[script]:
+                table[first:last + 1] = True
+        object.__setattr__(self, "_table", table)
+
+    def _ratios(self, batch: RuleBatch) -> tuple[np.ndarray, np.ndarray]:
+        letters = batch.count_per_row(_char_table("isalpha"))
+        in_scripts = batch.count_per_row(self._table)
+        return letters, in_scripts / np.maximum(letters, 1)
+
+    def match(self, batch: RuleBatch, rows: np.ndarray) -> np.ndarray:
+        letters, ratios = self._ratios(batch)
+        return (letters[rows] > 0) & (ratios[rows] < self.min_ratio)
+
+    def comment(self, text: str, length: int) -> str:
+        _, ratios = self._ratios(RuleBatch([text]))
+        return f"Response is not in the expected language ({', '.join(self.scripts)}: {ratios[0]:.0%} of letters)."
+
+
+# 개인정보(PII) 패턴 (모두 숫자나 '@'를 포함해야 매칭됨)
+PII_PATTERNS = {
+    "email": r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}",
+    "phone": r"(?<!\d)(?:\+?\d{1,3}[ -]?)?(?:\(?\d{2,4}\)?[ -]?)\d{3,4}[ -]\d{4}(?!\d)",
+    "credit_card": r"(?<!\d)(?:\d{4}[ -]){3}\d{4}(?!\d)",
+    "kr_rrn": r"(?<!\d)\d{6}-[1-4]\d{6}(?!\d)",
+}
+
+
+@dataclass(frozen=True)
+class PiiRule(Rule):
+    """
+    응답에 개인정보 패턴(이메일, 전화번호 등)이 포함되면 걸림.
+    정규식은 숫자나 '@'가 있는 행에만 적용한다 (code point 배열로 배치 전체를 한 번에 걸러냄).
+    """
+    cost: ClassVar[int] = 4
+
+    patterns: tuple[str, ...] = tuple(PII_PATTERNS)
+    _compiled: dict = field(init=False, repr=False, compare=False)
+    _combined: re.Pattern = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        unknown = set(self.patterns) - PII_PATTERNS.keys()
+        if unknown:
+            raise ValueError(f"Unknown PII patterns for rule {self.name}: {sorted(unknown)}")
+        object.__setattr__(self, "_compiled", {kind: re.compile(PII_PATTERNS[kind]) for kind in self.patterns})
+        object.__setattr__(self, "_combined", re.compile("|".join(f"(?:{PII_PATTERNS[kind]})" for kind in self.patterns)))
+
+    def match(self, batch: RuleBatch, rows: np.ndarray) -> np.ndarray:
+        table = _char_table("isdecimal").copy()
+        table[ord("@")] = True
+        candidates = batch.count_per_row(table)[rows] > 0
+
+        matched = np.zeros(len(rows), dtype=bool)
+        search = self._combined.search
+        matched[candidates] = _match_rows(lambda text: search(text) is not None, batch, rows[candidates])
+        return matched
+
+    def comment(self, text: str, length: int) -> str:
+        kinds = [kind for kind, pattern in self._compiled.items() if pattern.search(text)]
+        return f"Response may contain personal information: {', '.join(kinds)}"
+
+
+@dataclass(frozen=True)
+class RuleSet:
+    """
+    룰 목록. 어느 룰에도 걸리지 않은 행은 default_* 값으로 평가된다.
+    평가 순서(priority 내림차순, cost 오름차순)는 생성 시 한 번 정해 둔다.
+    """
+    rules: tuple[Rule, ...]
+    judge_model: str = "rule-basic-v1"
+    default_score: int = 5
+    default_label: str = "ok"
+    default_comment: str = "Looks fine by basic rules."
+    _order: tuple[int, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        order = sorted(range(len(self.rules)), key=lambda i: (-self.rules[i].priority, self.rules[i].cost, i))
+        object.__setattr__(self, "_order", tuple(order))
+
+    def evaluate_batch(self, texts: Sequence[str | None]) -> RuleBatchResult:
+        """
+        응답 텍스트 배치를 한 번에 평가.
+
+        Args:
+            texts: 응답 텍스트 리스트 또는 1차원 배열 (None은 빈 문자열로 취급)
+
+        Returns:
+            RuleBatchResult: 입력과 같은 순서의 컬럼형 결과
+        """
+        texts = [text or "" for text in texts]
+        n = len(texts)
+        batch = RuleBatch(texts)
+
+        rule_index = np.full(n, -1, dtype=np.int16)
+        for i in self._order:
+            # 이미 더 우선하는 룰이 정해진 행은 건너뜀
+            rows = np.flatnonzero(rule_index < 0)
+            if not len(rows):
+                break
+
+            rule = self.rules[i]
+            start = time.perf_counter()
+            matched = rule.match(batch, rows)
+            rule_index[rows[matched]] = i
+            record_rule_evaluation(rule.name, len(rows), int(matched.sum()), time.perf_counter() - start)
+
+        # rule_index + 1로 인덱싱 (0번 = 기본값)
+        scores = np.array([self.default_score] + [rule.score for rule in self.rules], dtype=np.int8)
+        flags = np.array([False] + [rule.flag for rule in self.rules], dtype=bool)
+        labels = np.array([self.default_label] + [rule.label for rule in self.rules], dtype=object)
+        lookup = rule_index + 1
+
+        comments = [self.default_comment] * n
+        for row in np.flatnonzero(rule_index >= 0).tolist():
+            comments[row] = self.rules[rule_index[row]].comment(texts[row], int(batch.lengths[row]))
+
+        return RuleBatchResult(
+            overall_score=scores[lookup],
+            is_flagged=flags[lookup],
+            label=labels[lookup],
+            rule_index=rule_index,
+            comments=comments,
+        )
+
+
+# basic_rule_evaluate와 같은 기준의 기본 룰 세트 (키워드 룰이 길이 룰보다 우선)
+BASIC_RULES = RuleSet(
+    rules=(
+        LengthRule(name="too_short", score=2, label="too_short", min_length=30),
+        KeywordRule(
+            name="error_keywords",
+            score=1,
+            label="error_like",
+            flag=True,
+            priority=1,
+            keywords=("error", "exception", "traceback", "failed", "stack overflow"),
+        ),
+    ),
+)
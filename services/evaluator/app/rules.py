@@ -1,56 +1,143 @@
+"""
+룰 기반 평가 모듈.
+
+- basic_rule_evaluate: 기본 룰(BASIC_RULES)로 로그 하나를 평가
+- rule pack: 룰 정의를 JSON 설정으로 받아서 RuleSet으로 컴파일 (정규식 등은 시작 시 한 번만 컴파일)
+
+rule pack 형식 (configs/rules/example.json 참고):
+
+    {
+      "judge_model": "rule-pack-v1",
+      "rules": [
+        {"type": "length", "name": "too_short", "score": 2, "label": "too_short", "min_length": 30},
+        {"type": "pii", "name": "pii", "score": 1, "label": "pii", "flag": true, "priority": 10}
+      ]
+    }
+
+룰 종류는 RULE_TYPES에 등록된 type 이름으로 고르고, 나머지 키는 해당 Rule 클래스의 필드로 넘긴다.
+새 룰 종류는 Rule 서브클래스를 @register_rule_type("이름")으로 등록하면 된다.
+"""
+
+import json
+import logging
+import re
+from typing import Callable
+
+from .config import settings
 from .models import LLMLog
+from .rule_engine import (
+    BASIC_RULES,
+    JsonRule,
+    KeywordRule,
+    LanguageRule,
+    LengthRule,
+    PiiRule,
+    RegexRule,
+    Rule,
+    RuleSet,
+)
 from .schemas import EvaluationResult
 
+logger = logging.getLogger(__name__)
+
+RULE_TYPES: dict[str, type[Rule]] = {
+    "length": LengthRule,
+    "keywords": KeywordRule,
+    "regex": RegexRule,
+    "json": JsonRule,
+    "language": LanguageRule,
+    "pii": PiiRule,
+}
+
+
+def register_rule_type(type_name: str) -> Callable[[type[Rule]], type[Rule]]:
+    """rule pack에서 type_name으로 쓸 수 있도록 Rule 서브클래스 등록 (데코레이터)."""
+    def decorator(rule_class: type[Rule]) -> type[Rule]:
+        RULE_TYPES[type_name] = rule_class
+        return rule_class
+    return decorator
+
+
+def build_rule(definition: dict) -> Rule:
+    """rule pack의 룰 정의 하나를 Rule 인스턴스로 변환. 잘못된 정의는 ValueError."""
+    params = dict(definition)
+    type_name = params.pop("type", None)
+    rule_class = RULE_TYPES.get(type_name)
+    if rule_class is None:
+        raise ValueError(f"Unknown rule type: {type_name!r} (available: {', '.join(sorted(RULE_TYPES))})")
+
+    # 리스트 값은 frozen dataclass 필드에 맞게 tuple로
+    params = {key: tuple(value) if isinstance(value, list) else value for key, value in params.items()}
+    try:
+        return rule_class(**params)
+    except (TypeError, ValueError, re.error) as e:
+        raise ValueError(f"Invalid {type_name} rule {params.get('name')!r}: {e}") from e
+
+
+def load_rule_pack(source: str | dict) -> RuleSet:
+    """
+    rule pack을 읽어서 RuleSet으로 컴파일.
+
+    Args:
+        source: rule pack JSON 파일 경로 또는 이미 읽은 dict
+
+    Returns:
+        RuleSet: 평가 순서가 정해진 룰 세트
+    """
+    if isinstance(source, str):
+        with open(source, encoding="utf-8") as f:
+            pack = json.load(f)
+    else:
+        pack = dict(source)
+
+    rules = tuple(build_rule(definition) for definition in pack.pop("rules", []))
+    names = [rule.name for rule in rules]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate rule names in rule pack: {names}")
+
+    try:
+        return RuleSet(rules=rules, **pack)
+    except TypeError as e:
+        raise ValueError(f"Invalid rule pack: {e}") from e
+
+
+def _load_active_rules() -> RuleSet:
+    if not settings.rule_pack_path:
+        return BASIC_RULES
+    rule_set = load_rule_pack(settings.rule_pack_path)
+    logger.info(f"Loaded rule pack {settings.rule_pack_path} ({len(rule_set.rules)} rules, judge_model={rule_set.judge_model})")
+    return rule_set
+
+
+# 룰 기반 평가에 쓰는 룰 세트 (시작 시 한 번 로드/컴파일, 잘못된 rule pack이면 시작 실패)
+active_rules = _load_active_rules()
+
 
 def basic_rule_evaluate(log: LLMLog) -> EvaluationResult:
     """
     간단한 룰 기반 평가 함수.
     OpenAI API를 호출하지 않고, 순수 룰만으로 LLM 응답을 평가함.
 
-    평가 기준:
+    평가 기준 (rule_engine.BASIC_RULES):
     1. 응답 길이가 너무 짧으면 점수 낮춤
     2. 에러 관련 키워드가 포함되면 플래그 처리
     3. 그 외에는 정상으로 판단
 
+    로그 여러 개를 평가할 때는 BASIC_RULES.evaluate_batch()로 배치 전체를 한 번에 평가하는 편이 빠르다.
+
     Args:
         log: 평가할 LLMLog 인스턴스
 
     Returns:
         EvaluationResult: 평가 결과 (점수, 라벨, 코멘트 등)
     """
-    response_text = log.response or ""
-    response_length = len(response_text)
-
-    # 기본값 설정
-    overall_score = 5
-    is_flagged = False
-    label = "ok"
-    comment = "Looks fine by basic rules."
-
-    # 룰 1: 응답 길이 체크
-    if response_length < 30:
-        overall_score = 2
-        label = "too_short"
-        comment = f"Response is too short (length: {response_length} chars)."
-
-    # 룰 2: 에러 관련 키워드 감지
-    error_keywords = ["error", "exception", "traceback", "failed", "stack overflow"]
-    response_lower = response_text.lower()
-
-    detected_keywords = [kw for kw in error_keywords if kw in response_lower]
-
-    if detected_keywords:
-        overall_score = 1
-        is_flagged = True
-        label = "error_like"
-        comment = f"Response looks like an error message. Detected keywords: {', '.join(detected_keywords)}"
-
-    # 평가 결과 반환
+    result = BASIC_RULES.evaluate_batch([log.response])
+
     return EvaluationResult(
         log_id=log.id,
-        overall_score=overall_score,
-        is_flagged=is_flagged,
-        label=label,
-        judge_model="rule-basic-v1",
-        comment=comment,
+        overall_score=int(result.overall_score[0]),
+        is_flagged=bool(result.is_flagged[0]),
+        label=result.label[0],
+        judge_model=BASIC_RULES.judge_model,
+        comment=result.comments[0],
     )
@@ -1,162 +1,176 @@
 """
 배치 평가 스케줄러 모듈.
 APScheduler를 사용하여 주기적으로 LLM 로그를 자동 평가합니다.
+evaluation_mode='continuous'면 APScheduler 대신 continuous 파이프라인(pipeline.py)을 실행합니다.
+통계 rollup(rollups.py) 갱신은 자동 평가 설정과 관계없이 별도 스케줄러로 실행합니다.
+llm_logs 파티션 관리(partitions.py)도 Postgres일 때 같은 방식으로 별도 스케줄러에서 실행합니다.
 """
 
 import logging
-import time
+from datetime import datetime
+
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from sqlalchemy.orm import Session
 
 from .config import settings
-from .db import SessionLocal
-from .utils import get_pending_logs
-from .models import LLMLog, LLMEvaluation
-from .rules import basic_rule_evaluate
-from .llm_judge import run_judge
+from .db import SessionLocal, engine
+from .evaluation import evaluate_logs, judge_model_name, write_evaluations
+from .partitions import run_partition_maintenance
+from .pipeline import BatchResult, ContinuousEvaluator, create_continuous_evaluator
+from .rollups import run_rollup_refresh
+from .utils import get_evaluation_lag_seconds, pending_log_cursor
+from .work_claim import fetch_pending_logs, finish_pending_logs
 from .notifier import send_low_quality_alert, send_batch_evaluation_summary
 from .metrics import (
     record_evaluation,
     record_batch_evaluation,
     record_scheduler_run,
     update_pending_logs_count,
+    update_evaluation_lag,
 )
 
 logger = logging.getLogger(__name__)
 
-# 글로벌 스케줄러 인스턴스
+# 글로벌 스케줄러 인스턴스 (evaluation_mode='interval')
 scheduler: BackgroundScheduler | None = None
 
+# continuous 평가 파이프라인 인스턴스 (evaluation_mode='continuous')
+continuous_evaluator: ContinuousEvaluator | None = None
+
+# 통계 rollup 갱신 스케줄러
+rollup_scheduler: BackgroundScheduler | None = None
+
+# llm_logs 파티션 관리 스케줄러
+partition_scheduler: BackgroundScheduler | None = None
+
 
-def run_batch_evaluation():
+def run_batch_evaluation(batch_size: int | None = None, send_summary: bool = True) -> BatchResult:
     """
     배치 평가 작업을 실행합니다.
     평가되지 않은 로그를 찾아 자동으로 평가하고, 결과를 DB에 저장합니다.
+
+    Args:
+        batch_size: 가져올 최대 로그 수 (기본값: settings.evaluation_batch_size)
+        send_summary: 배치 평가 요약 알림 전송 여부 (continuous 모드에서는 끔)
+
+    Returns:
+        BatchResult: 이번 배치에서 가져온 대기 로그 수와 평가를 저장한 로그 수
+                     (continuous 파이프라인의 배치 크기 / 대기 시간 조절용)
     """
-    logger.info("Starting batch evaluation...")
+    logger.debug("Starting batch evaluation...")
 
     db: Session = SessionLocal()
     try:
-        # 1. 평가 대기 중인 로그 가져오기
-        pending_logs = get_pending_logs(
+        # 1. 평가 대기 중인 로그 가져오기 (work claiming 모드면 리스를 잡은 로그만)
+        pending_logs = fetch_pending_logs(
             db,
-            limit=settings.evaluation_batch_size
+            limit=batch_size or settings.evaluation_batch_size,
         )
 
         if not pending_logs:
-            logger.info("No pending logs to evaluate")
-            return
+            logger.debug("No pending logs to evaluate")
+            update_evaluation_lag(get_evaluation_lag_seconds(db, pending_log_cursor))
+            return BatchResult(0, 0)
 
         logger.info(f"Found {len(pending_logs)} pending logs")
 
-        # 2. 각 로그 평가
+        # 2. 로그 평가 (LLM judge는 judge_executor에서 동시 실행)
         evaluated_count = 0
         judge_type = settings.evaluation_judge_type
-        judge_model_name = ""
-
-        for log in pending_logs:
-            eval_start = time.time()
-            try:
-                if judge_type == "rule":
-                    # 룰 기반 평가
-                    eval_result = basic_rule_evaluate(log)
-                    judge_model_name = eval_result.judge_model
-
-                    evaluation = LLMEvaluation(
-                        log_id=eval_result.log_id,
-                        overall_score=eval_result.overall_score,
-                        is_flagged=eval_result.is_flagged,
-                        label=eval_result.label,
-                        judge_model=eval_result.judge_model,
-                        comment=eval_result.comment,
-                    )
-                else:  # judge_type == "llm"
-                    # LLM-as-a-Judge 평가
-                    llm_eval_result = run_judge(log)
-                    judge_model_name = settings.openai_model_judge
-
-                    evaluation = LLMEvaluation(
-                        log_id=log.id,
-                        overall_score=llm_eval_result["score_overall"],
-                        score_instruction_following=llm_eval_result["score_instruction_following"],
-                        score_truthfulness=llm_eval_result["score_truthfulness"],
-                        is_flagged=llm_eval_result["score_overall"] < 3,
-                        label="llm-judge",
-                        judge_model=judge_model_name,
-                        comment=llm_eval_result["comments"],
-                        raw_judge_response=llm_eval_result["raw_judge_response"],
-                    )
-
-                # DB에 추가
-                db.add(evaluation)
-                db.commit()
-                evaluated_count += 1
-                eval_duration = time.time() - eval_start
-
-                # 메트릭 기록
-                scores = {
-                    'overall': evaluation.overall_score,
-                    'instruction': evaluation.score_instruction_following,
-                    'truthfulness': evaluation.score_truthfulness,
-                }
-                record_evaluation(judge_type, "success", eval_duration, scores)
-
-                # 품질 점수가 낮으면 알림 전송
-                send_low_quality_alert(log, evaluation)
-
-                logger.info(
-                    f"Evaluated log_id={log.id}, score={evaluation.overall_score}, "
-                    f"judge={judge_type}"
-                )
 
-            except Exception as e:
-                eval_duration = time.time() - eval_start
-                record_evaluation(judge_type, "error", eval_duration)
-                logger.error(f"Failed to evaluate log_id={log.id}: {str(e)}")
-                db.rollback()
+        outcomes = evaluate_logs(pending_logs, judge_type)
+
+        # 3. 평가 결과를 청크 단위 bulk insert로 저장 (실패한 행만 error로 남음)
+        outcomes = write_evaluations(db, outcomes)
+        finish_pending_logs(db, pending_logs)
+
+        for outcome in outcomes:
+            log = outcome.log
+
+            if outcome.error is not None:
+                record_evaluation(judge_type, "error", outcome.duration_seconds)
+                logger.error(f"Failed to evaluate log_id={log.id}: {str(outcome.error)}")
                 continue
 
-        # 3. 배치 평가 완료 요약 알림
-        if evaluated_count > 0:
-            send_batch_evaluation_summary(
-                evaluated_count=evaluated_count,
-                judge_type=judge_type,
-                judge_model=judge_model_name
+            evaluation = outcome.evaluation
+            evaluated_count += 1
+
+            # 메트릭 기록
+            scores = {
+                'overall': evaluation.overall_score,
+                'instruction': evaluation.score_instruction_following,
+                'truthfulness': evaluation.score_truthfulness,
+            }
+            record_evaluation(judge_type, "success", outcome.duration_seconds, scores)
+
+            # 품질 점수가 낮으면 알림 전송
+            send_low_quality_alert(log, evaluation)
+
+            logger.info(
+                f"Evaluated log_id={log.id}, score={evaluation.overall_score}, "
+                f"judge={judge_type}"
             )
+
+        # 4. 배치 평가 완료 요약 알림
+        if evaluated_count > 0:
+            if send_summary:
+                send_batch_evaluation_summary(
+                    evaluated_count=evaluated_count,
+                    judge_type=judge_type,
+                    judge_model=judge_model_name(judge_type)
+                )
             # 배치 메트릭 기록
             record_batch_evaluation(judge_type, evaluated_count)
 
+        # 5. 평가 지연 (가장 오래된 대기 로그의 나이) 기록
+        update_evaluation_lag(get_evaluation_lag_seconds(db, pending_log_cursor))
+
         # 스케줄러 성공 기록
         record_scheduler_run("success")
 
         logger.info(
             f"Batch evaluation completed: {evaluated_count}/{len(pending_logs)} logs evaluated"
         )
+        return BatchResult(len(pending_logs), evaluated_count)
 
     except Exception as e:
         # 스케줄러 실패 기록
         record_scheduler_run("error")
         logger.error(f"Batch evaluation failed: {str(e)}")
         db.rollback()
+        return BatchResult(0, 0)
     finally:
         db.close()
 
 
+def _run_continuous_batch(batch_size: int) -> BatchResult:
+    return run_batch_evaluation(batch_size=batch_size, send_summary=False)
+
+
 def start_scheduler():
     """
     스케줄러를 시작합니다.
     """
-    global scheduler
+    global scheduler, continuous_evaluator
 
     if not settings.enable_auto_evaluation:
         logger.info("Auto evaluation is disabled")
         return
 
-    if scheduler is not None:
+    if scheduler is not None or continuous_evaluator is not None:
         logger.warning("Scheduler is already running")
         return
 
+    if settings.evaluation_mode == "continuous":
+        continuous_evaluator = create_continuous_evaluator(engine, _run_continuous_batch)
+        continuous_evaluator.start()
+        logger.info(
+            f"Continuous evaluation started: judge_type={settings.evaluation_judge_type}, "
+            f"batch_size={settings.evaluation_min_batch_size}-{settings.evaluation_max_batch_size}"
+        )
+        return
+
     try:
         scheduler = BackgroundScheduler()
 
@@ -190,7 +204,13 @@ def stop_scheduler():
     """
     스케줄러를 중지합니다.
     """
-    global scheduler
+    global scheduler, continuous_evaluator
+
+    if continuous_evaluator is not None:
+        continuous_evaluator.stop()
+        continuous_evaluator = None
+        logger.info("Continuous evaluation stopped")
+        return
 
     if scheduler is None:
         logger.warning("Scheduler is not running")
@@ -202,3 +222,100 @@ def stop_scheduler():
         logger.info("Scheduler stopped")
     except Exception as e:
         logger.error(f"Failed to stop scheduler: {str(e)}")
+
+
+def start_rollup_scheduler():
+    """
+    통계 rollup 갱신 스케줄러를 시작합니다.
+    시작 직후 한 번 실행해서 rollup이 없으면 backfill 합니다.
+    """
+    global rollup_scheduler
+
+    if not settings.stats_rollup_enabled:
+        logger.info("Stats rollup is disabled")
+        return
+
+    if rollup_scheduler is not None:
+        logger.warning("Rollup scheduler is already running")
+        return
+
+    rollup_scheduler = BackgroundScheduler()
+    rollup_scheduler.add_job(
+        func=run_rollup_refresh,
+        trigger=IntervalTrigger(seconds=settings.stats_rollup_interval_seconds),
+        id="stats_rollup",
+        name="Stats Rollup Refresh",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+        next_run_time=datetime.now(),
+    )
+    rollup_scheduler.start()
+
+    logger.info(f"Rollup scheduler started: running every {settings.stats_rollup_interval_seconds} seconds")
+
+
+def stop_rollup_scheduler():
+    """
+    통계 rollup 갱신 스케줄러를 중지합니다.
+    """
+    global rollup_scheduler
+
+    if rollup_scheduler is None:
+        return
+
+    rollup_scheduler.shutdown(wait=False)
+    rollup_scheduler = None
+    logger.info("Rollup scheduler stopped")
+
+
+def start_partition_scheduler():
+    """
+    llm_logs 파티션 관리 스케줄러를 시작합니다 (Postgres 전용).
+    시작 직후 한 번 실행해서 앞으로 쓸 파티션을 만들어 둡니다.
+    """
+    global partition_scheduler
+
+    if not settings.log_partition_maintenance_enabled:
+        logger.info("Log partition maintenance is disabled")
+        return
+
+    if engine.dialect.name != "postgresql":
+        logger.info("Log partition maintenance requires PostgreSQL, skipping")
+        return
+
+    if partition_scheduler is not None:
+        logger.warning("Partition scheduler is already running")
+        return
+
+    partition_scheduler = BackgroundScheduler()
+    partition_scheduler.add_job(
+        func=run_partition_maintenance,
+        trigger=IntervalTrigger(seconds=settings.log_partition_maintenance_interval_seconds),
+        id="log_partition_maintenance",
+        name="Log Partition Maintenance",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+        next_run_time=datetime.now(),
+    )
+    partition_scheduler.start()
+
+    logger.info(
+        f"Partition scheduler started: running every {settings.log_partition_maintenance_interval_seconds} seconds, "
+        f"interval={settings.log_partition_interval}, retention_days={settings.log_retention_days or 'unlimited'}"
+    )
+
+
+def stop_partition_scheduler():
+    """
+    llm_logs 파티션 관리 스케줄러를 중지합니다.
+    """
+    global partition_scheduler
+
+    if partition_scheduler is None:
+        return
+
+    partition_scheduler.shutdown(wait=False)
+    partition_scheduler = None
+    logger.info("Partition scheduler stopped")
@@ -0,0 +1,254 @@
+"""
+프롬프트/응답 본문 오프로드 모듈 (gateway-api / evaluator 공용).
+
+llm_logs의 prompt / response 컬럼에는 앞부분 preview_chars 글자만 저장하고, 그보다 긴 본문은
+내용 해시(sha256) -> zlib 압축 본문 테이블인 llm_text_blobs에 저장한다 (content-addressed, 같은 본문은 한 번만 저장).
+- prompt_hash / response_hash가 NULL이면 컬럼 값이 전체 본문 (짧은 본문, 오프로드 이전에 저장된 로그)
+- 해시가 있으면 컬럼 값은 미리보기이고 전체 본문은 llm_text_blobs에 있다
+
+목록 API는 짧은 컬럼만 읽으므로 행 폭이 작고, 전체 본문은 로그 상세 조회 / 평가 / 보관할 때만 읽는다.
+
+blob의 last_used_at은 그 본문을 참조하는 로그가 저장될 때 갱신된다 (TOUCH_INTERVAL에 한 번까지).
+따라서 참조하는 로그의 created_at은 항상 last_used_at + TOUCH_INTERVAL 이하이고, 보관 기간 정리 후
+남은 가장 오래된 로그보다 TOUCH_INTERVAL 이상 오래된 blob은 참조하는 로그가 없다 (delete_unused_blobs).
+
+gateway-api/app/text_blobs.py와 evaluator/app/text_blobs.py는 같은 파일이다.
+서비스마다 Docker 빌드 컨텍스트가 달라 복사해서 쓰므로, 수정할 때는 두 파일을 함께 바꾼다
+(gateway-api의 tests/test_text_blobs.py가 두 파일이 같은지 확인).
+ORM 모델(LLMLog, LLMTextBlob)은 서비스마다 따로 정의되어 있어 인자로 받는다.
+
+오프로드 이전에 저장된 로그 변환 (배치마다 커밋하므로 중단 후 다시 실행해도 됨):
+
+    DATABASE_URL=... python -m app.text_blobs --preview-chars 200
+"""
+
+import argparse
+import hashlib
+import logging
+import os
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Iterable
+
+from sqlalchemy import and_, bindparam, create_engine, delete, func, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm.attributes import set_committed_value
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PREVIEW_CHARS = 200
+
+ZLIB_LEVEL = 6
+
+# 이미 있는 blob의 last_used_at을 다시 갱신하는 최소 간격 (같은 본문이 자주 들어와도 하루 한 번만 UPDATE)
+TOUCH_INTERVAL = timedelta(days=1)
+
+# (본문 컬럼, 해시 컬럼)
+BODY_FIELDS = (("prompt", "prompt_hash"), ("response", "response_hash"))
+
+
+def content_hash(body: str) -> str:
+    """본문의 sha256 hex (blob 키)."""
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+def compress_text(body: str) -> bytes:
+    return zlib.compress(body.encode("utf-8"), ZLIB_LEVEL)
+
+
+def decompress_text(data: bytes) -> str:
+    return zlib.decompress(data).decode("utf-8")
+
+
+def split_body(body: str, preview_chars: int) -> tuple[str, str | None]:
+    """
+    llm_logs 컬럼에 저장할 값과 blob 해시.
+    preview_chars 이하인 본문은 그대로 저장하고 해시는 None.
+    """
+    if len(body) <= preview_chars:
+        return body, None
+    return body[:preview_chars], content_hash(body)
+
+
+def preview(body: str, body_hash: str | None, preview_chars: int) -> tuple[str, bool]:
+    """
+    목록 응답용 (미리보기, 잘렸는지).
+    오프로드 이전에 저장된 긴 본문도 같은 길이로 자른다.
+    """
+    return body[:preview_chars], body_hash is not None or len(body) > preview_chars
+
+
+def offload_rows(rows: list[dict], preview_chars: int, used_at: datetime) -> list[dict]:
+    """
+    insert/update할 로그 row들의 prompt / response를 미리보기로 바꾸고 prompt_hash / response_hash를 채운다.
+
+    Returns:
+        list[dict]: upsert할 blob row (row들 사이의 같은 본문은 하나로, 해시 순)
+    """
+    blobs: dict[str, dict] = {}
+    for row in rows:
+        for field, hash_field in BODY_FIELDS:
+            body = row.get(field)
+            if body is None:
+                continue
+            row[field], body_hash = split_body(body, preview_chars)
+            row[hash_field] = body_hash
+            if body_hash is not None and body_hash not in blobs:
+                blobs[body_hash] = {
+                    "hash": body_hash,
+                    "data": compress_text(body),
+                    "size": len(body),
+                    "last_used_at": used_at,
+                }
+    # 여러 writer가 같은 blob들을 동시에 upsert 해도 같은 순서로 잠그도록 정렬
+    return [blobs[body_hash] for body_hash in sorted(blobs)]
+
+
+def upsert_blobs(blob_model, dialect_name: str, blob_rows: list[dict], used_at: datetime):
+    """
+    blob insert 문. 이미 있는 본문은 저장하지 않고 last_used_at만 갱신한다
+    (마지막 갱신이 TOUCH_INTERVAL 이내면 그대로 둠).
+    """
+    insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+    stmt = insert(blob_model).values(blob_rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[blob_model.hash],
+        set_={"last_used_at": stmt.excluded.last_used_at},
+        where=blob_model.last_used_at < used_at - TOUCH_INTERVAL,
+    )
+
+
+def fetch_bodies(db, blob_model, hashes: Iterable[str | None]) -> dict[str, str]:
+    """해시 -> 전체 본문 (Session / Connection 모두 사용 가능)."""
+    hashes = {body_hash for body_hash in hashes if body_hash is not None}
+    if not hashes:
+        return {}
+    rows = db.execute(select(blob_model.hash, blob_model.data).where(blob_model.hash.in_(hashes)))
+    return {body_hash: decompress_text(data) for body_hash, data in rows}
+
+
+def full_body(body: str, body_hash: str | None, bodies: dict[str, str]) -> str:
+    """컬럼 값과 해시로 전체 본문 (blob이 없으면 컬럼 값)."""
+    if body_hash is None:
+        return body
+    return bodies.get(body_hash, body)
+
+
+def hydrate_logs(db, blob_model, logs: list) -> None:
+    """
+    LLMLog 객체들의 prompt / response를 전체 본문으로 채운다 (쿼리 한 번).
+    변경으로 기록하지 않으므로(set_committed_value) flush해도 llm_logs에 다시 쓰지 않는다.
+    """
+    bodies = fetch_bodies(db, blob_model, (getattr(log, hash_field) for log in logs for _, hash_field in BODY_FIELDS))
+    if not bodies:
+        return
+    for log in logs:
+        for field, hash_field in BODY_FIELDS:
+            body_hash = getattr(log, hash_field)
+            if body_hash is not None:
+                set_committed_value(log, field, full_body(getattr(log, field), body_hash, bodies))
+
+
+def expand_rows(db, blob_model, rows: list[dict]) -> list[dict]:
+    """row dict들의 prompt / response를 전체 본문으로 바꾼 복사본 (보관 파일용)."""
+    bodies = fetch_bodies(db, blob_model, (row.get(hash_field) for row in rows for _, hash_field in BODY_FIELDS))
+    expanded = []
+    for row in rows:
+        row = dict(row)
+        for field, hash_field in BODY_FIELDS:
+            if row.get(field) is not None:
+                row[field] = full_body(row[field], row.get(hash_field), bodies)
+        expanded.append(row)
+    return expanded
+
+
+def delete_unused_blobs(conn, blob_model, oldest_log_at: datetime) -> int:
+    """
+    남은 로그 중 가장 오래된 created_at(oldest_log_at)보다 TOUCH_INTERVAL 이상 전에 마지막으로 쓰인 blob 삭제.
+
+    Returns:
+        int: 지운 blob 수
+    """
+    return conn.execute(delete(blob_model).where(blob_model.last_used_at < oldest_log_at - TOUCH_INTERVAL)).rowcount
+
+
+def backfill_log_bodies(conn, log_model, blob_model, preview_chars: int = DEFAULT_PREVIEW_CHARS,
+                        batch_size: int = 1000) -> int:
+    """
+    오프로드 이전에 저장된 로그(해시가 없고 preview_chars보다 긴 본문)를 id 순서로 batch_size개씩 변환.
+
+    Returns:
+        int: 변환한 로그 수
+    """
+    long_body = or_(
+        and_(log_model.prompt_hash.is_(None), func.length(log_model.prompt) > preview_chars),
+        and_(log_model.response_hash.is_(None), func.length(log_model.response) > preview_chars),
+    )
+    table = log_model.__table__
+    update_stmt = (
+        update(table)
+        .where(table.c.id == bindparam("log_id"))
+        .values(
+            # 컬럼 이름과 같은 bindparam 이름은 쓸 수 없어 new_ 접두어
+            prompt=bindparam("new_prompt"),
+            prompt_hash=bindparam("new_prompt_hash"),
+            response=bindparam("new_response"),
+            response_hash=bindparam("new_response_hash"),
+        )
+    )
+
+    converted = 0
+    last_id = 0
+    while True:
+        rows = [
+            dict(row)
+            for row in conn.execute(
+                select(
+                    log_model.id,
+                    log_model.prompt,
+                    log_model.prompt_hash,
+                    log_model.response,
+                    log_model.response_hash,
+                )
+                .where(log_model.id > last_id, long_body)
+                .order_by(log_model.id)
+                .limit(batch_size)
+            ).mappings()
+        ]
+        if not rows:
+            return converted
+        last_id = rows[-1]["id"]
+
+        used_at = datetime.now(timezone.utc)
+        # 이미 오프로드된 쪽 본문(해시가 있는 컬럼)은 그대로 둠
+        pending = [
+            {field: row[field] for field, hash_field in BODY_FIELDS if row[hash_field] is None}
+            for row in rows
+        ]
+        blob_rows = offload_rows(pending, preview_chars, used_at)
+        if blob_rows:
+            conn.execute(upsert_blobs(blob_model, conn.dialect.name, blob_rows, used_at))
+        conn.execute(update_stmt, [
+            {
+                "log_id": row["id"],
+                **{f"new_{key}": value for key, value in {**row, **values}.items() if key != "id"},
+            }
+            for row, values in zip(rows, pending)
+        ])
+        conn.commit()
+        converted += len(rows)
+        logger.info(f"Offloaded bodies of {converted} logs (last id={last_id})")
+
+
+if __name__ == "__main__":
+    from .models import LLMLog, LLMTextBlob
+
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Offload long prompt/response bodies of existing logs")
+    parser.add_argument("--preview-chars", type=int, default=DEFAULT_PREVIEW_CHARS)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    with create_engine(os.environ["DATABASE_URL"]).connect() as connection:
+        count = backfill_log_bodies(connection, LLMLog, LLMTextBlob, args.preview_chars, args.batch_size)
+    print(f"offloaded bodies of {count} logs")
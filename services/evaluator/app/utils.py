@@ -2,43 +2,117 @@
 유틸리티 함수 모듈.
 """
 
+import logging
+from datetime import datetime, timedelta, timezone
 from typing import List
+
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import Select, exists, select
 
+from .config import settings
 from .models import LLMLog, LLMEvaluation
 
+logger = logging.getLogger(__name__)
+
+
+class PendingLogCursor:
+    """
+    평가 대기 로그 조회용 watermark 커서.
+
+    마지막 조회에서 찾은 가장 오래된 대기 로그의 created_at을 기억해 두고,
+    다음 조회는 그 지점부터 인덱스를 스캔한다. watermark 이전의 로그는
+    (조회 시점에) 모두 평가가 끝난 상태이므로 다시 훑을 필요가 없다.
+    평가에 실패한 로그는 계속 대기 상태로 남아 watermark가 그 로그를 넘어가지 않는다.
+
+    트랜잭션 커밋 순서가 created_at 순서와 다를 수 있으므로
+    lookback_seconds만큼 앞에서부터 스캔해 늦게 커밋된 로그도 놓치지 않는다.
+    """
+
+    def __init__(self, lookback_seconds: float):
+        self.lookback = timedelta(seconds=lookback_seconds)
+        self.watermark: datetime | None = None
+
+    def scan_from(self) -> datetime | None:
+        if self.watermark is None:
+            return None
+        return self.watermark - self.lookback
 
-def get_pending_logs(db: Session, limit: int = 10) -> List[LLMLog]:
+    def advance(self, pending_logs: List[LLMLog]):
+        if pending_logs:
+            self.watermark = pending_logs[0].created_at
+
+    def reset(self):
+        self.watermark = None
+
+
+# 스케줄러와 /evaluate-once가 공유하는 커서
+pending_log_cursor = PendingLogCursor(lookback_seconds=settings.pending_log_lookback_seconds)
+
+
+def pending_logs_query(scan_from: datetime | None = None) -> Select:
+    """
+    평가 대기 로그 조회 쿼리 (status='success' & 평가 없음, 오래된 순).
+    scan_from을 주면 그 시점 이후의 로그만 스캔.
+    """
+    already_evaluated = exists().where(LLMEvaluation.log_id == LLMLog.id)
+
+    stmt = (
+        select(LLMLog)
+        .where(LLMLog.status == "success")  # 성공한 로그만
+        .where(~already_evaluated)  # 평가 안 된 것만
+        .order_by(LLMLog.created_at.asc(), LLMLog.id.asc())  # 오래된 것부터
+    )
+    if scan_from is not None:
+        stmt = stmt.where(LLMLog.created_at >= scan_from)
+    return stmt
+
+
+def get_pending_logs(db: Session, limit: int = 10, cursor: PendingLogCursor | None = None) -> List[LLMLog]:
     """
     아직 평가되지 않은 LLM 로그들을 가져오는 함수.
 
     조건:
     - status가 "success"인 로그만 (에러 로그는 제외)
-    - llm_evaluations 테이블에 해당 log_id가 없는 로그만
-    - created_at 오름차순 정렬 (오래된 것부터)
+    - llm_evaluations 테이블에 해당 log_id가 없는 로그만 (NOT EXISTS anti-join)
+    - created_at, id 오름차순 정렬 (오래된 것부터)
     - 최대 limit 개까지
 
+    (status, created_at, id) partial index를 순서대로 스캔하면서 llm_evaluations.log_id 인덱스로
+    평가 여부를 확인하므로, cursor를 주면 watermark 이후만 스캔해서 배치 크기에 비례하는 비용으로 끝난다.
+
     Args:
         db: SQLAlchemy 세션
         limit: 가져올 최대 개수
+        cursor: watermark 커서 (None이면 처음부터 스캔)
 
     Returns:
         List[LLMLog]: 평가 대기 중인 로그 리스트
     """
-    # 이미 평가된 log_id 서브쿼리
-    evaluated_log_ids_subquery = select(LLMEvaluation.log_id).subquery()
-
-    # 아직 평가되지 않은 로그 조회
-    stmt = (
-        select(LLMLog)
-        .where(LLMLog.status == "success")  # 성공한 로그만
-        .where(LLMLog.id.notin_(evaluated_log_ids_subquery))  # 평가 안 된 것만
-        .order_by(LLMLog.created_at.asc())  # 오래된 것부터
-        .limit(limit)
-    )
+    stmt = pending_logs_query(cursor.scan_from() if cursor is not None else None).limit(limit)
 
     result = db.execute(stmt)
-    pending_logs = result.scalars().all()
+    pending_logs = list(result.scalars().all())
+
+    if cursor is not None:
+        cursor.advance(pending_logs)
+
+    return pending_logs
+
+
+def get_evaluation_lag_seconds(db: Session, cursor: PendingLogCursor | None = None) -> float:
+    """
+    가장 오래된 평가 대기 로그의 나이(초). 대기 로그가 없으면 0.
+    cursor를 주면 watermark 이후만 스캔 (partial index로 한 행만 읽음).
+    """
+    oldest = db.execute(
+        pending_logs_query(cursor.scan_from() if cursor is not None else None)
+        .with_only_columns(LLMLog.created_at)
+        .limit(1)
+    ).scalar()
+    if oldest is None:
+        return 0.0
 
-    return list(pending_logs)
+    # SQLite는 timezone 정보 없이 저장되므로 UTC로 간주
+    if oldest.tzinfo is None:
+        oldest = oldest.replace(tzinfo=timezone.utc)
+    return (datetime.now(timezone.utc) - oldest).total_seconds()
@@ -0,0 +1,153 @@
+"""
+멀티 워커 평가용 work claiming 모듈.
+
+여러 evaluator 레플리카(노드/프로세스)가 같은 llm_logs를 동시에 처리할 때
+로그별 리스(llm_evaluation_leases)를 잡은 워커만 해당 로그를 평가한다.
+
+클레임 절차 (한 트랜잭션):
+1. 평가도 안 됐고 유효한 리스도 없는 로그를 오래된 순으로 조회
+   (Postgres는 FOR UPDATE SKIP LOCKED로 다른 워커가 클레임 중인 행은 건너뜀)
+2. 리스를 upsert: 아직 평가되지 않았고 리스가 없거나 만료된 행만 내 것으로 갱신
+   (INSERT ... SELECT ... ON CONFLICT ... WHERE leased_until < now)
+3. upsert가 반환한 log_id만 이번 배치로 사용
+
+평가 결과를 저장한 뒤에는 리스를 지운다. 워커가 죽으면 리스가 만료된 뒤 다른 워커가 다시 가져간다.
+리스 유효 시간(evaluation_lease_seconds)은 배치 하나를 평가하는 시간보다 충분히 길어야 한다
+(만료 후에도 원래 워커가 살아 있으면 같은 로그가 두 번 평가될 수 있음).
+"""
+
+import logging
+import os
+import socket
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from sqlalchemy import DateTime, String, and_, delete, exists, literal, select
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .db import dialect_insert
+from .metrics import record_work_claim
+from .models import LLMLog, LLMEvaluation, LLMTextBlob, EvaluationLease
+from .text_blobs import hydrate_logs
+from .utils import PendingLogCursor, get_pending_logs, pending_log_cursor, pending_logs_query
+
+logger = logging.getLogger(__name__)
+
+WORKER_ID = settings.evaluator_worker_id or f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _upsert_leases(db: Session, log_ids: List[int], worker_id: str, now: datetime, leased_until: datetime) -> set:
+    insert = dialect_insert(db.get_bind())
+
+    # 후보 조회 이후 다른 워커가 평가를 끝내고 리스를 지웠을 수 있으므로
+    # INSERT ... SELECT 안에서 평가 여부를 다시 확인 (쓰기 락을 잡은 상태에서 원자적으로 판단)
+    already_evaluated = exists().where(LLMEvaluation.log_id == LLMLog.id)
+    rows = (
+        select(LLMLog.id, literal(worker_id, String), literal(leased_until, DateTime(timezone=True)))
+        .where(LLMLog.id.in_(log_ids))
+        .where(~already_evaluated)
+    )
+
+    stmt = insert(EvaluationLease).from_select(["log_id", "worker_id", "leased_until"], rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[EvaluationLease.log_id],
+        set_={"worker_id": stmt.excluded.worker_id, "leased_until": stmt.excluded.leased_until},
+        where=EvaluationLease.leased_until < now,  # 만료된 리스만 가져옴
+    ).returning(EvaluationLease.log_id)
+
+    return set(db.execute(stmt).scalars().all())
+
+
+def claim_pending_logs(
+    db: Session,
+    limit: int,
+    worker_id: str = WORKER_ID,
+    lease_seconds: int | None = None,
+    cursor: PendingLogCursor | None = None,
+) -> List[LLMLog]:
+    """
+    평가 대기 로그를 최대 limit개 클레임하고 반환.
+    다른 워커가 유효한 리스를 가진 로그는 반환하지 않는다.
+
+    Args:
+        db: SQLAlchemy 세션
+        limit: 클레임할 최대 개수
+        worker_id: 리스에 기록할 워커 ID
+        lease_seconds: 리스 유효 시간 (기본값: settings.evaluation_lease_seconds)
+        cursor: watermark 커서
+
+    Returns:
+        List[LLMLog]: 이 워커가 리스를 잡은 로그 리스트 (오래된 순)
+    """
+    now = datetime.now(timezone.utc)
+    leased_until = now + timedelta(seconds=lease_seconds or settings.evaluation_lease_seconds)
+    scan_from = cursor.scan_from() if cursor is not None else None
+
+    # watermark는 리스 여부와 상관없이 가장 오래된 대기 로그 기준으로 이동
+    # (다른 워커가 잡았다가 실패한 로그를 watermark가 건너뛰지 않도록)
+    if cursor is not None:
+        cursor.advance(list(db.execute(pending_logs_query(scan_from).limit(1)).scalars().all()))
+
+    active_lease = exists().where(and_(
+        EvaluationLease.log_id == LLMLog.id,
+        EvaluationLease.leased_until >= now,
+    ))
+    stmt = (
+        pending_logs_query(scan_from)
+        .where(~active_lease)
+        .limit(limit)
+        .with_for_update(skip_locked=True, of=LLMLog)
+    )
+    candidates = list(db.execute(stmt).scalars().all())
+    if not candidates:
+        db.commit()
+        return []
+
+    claimed_ids = _upsert_leases(db, [log.id for log in candidates], worker_id, now, leased_until)
+    claimed = [log for log in candidates if log.id in claimed_ids]
+
+    # 커밋 후 만료(expire)돼서 평가 중에 로그를 다시 SELECT하지 않도록 세션에서 분리
+    for log in candidates:
+        db.expunge(log)
+    db.commit()
+
+    record_work_claim(claimed=len(claimed), lost=len(candidates) - len(claimed))
+    return claimed
+
+
+def release_leases(db: Session, logs: List[LLMLog], worker_id: str = WORKER_ID):
+    """
+    평가가 끝난(저장 성공/실패 모두) 로그들의 리스 해제.
+    실패한 로그는 리스가 풀리면서 다음 배치에서 다시 평가 대상이 된다.
+    """
+    if not logs:
+        return
+
+    db.execute(
+        delete(EvaluationLease)
+        .where(EvaluationLease.log_id.in_([log.id for log in logs]))
+        .where(EvaluationLease.worker_id == worker_id)
+    )
+    db.commit()
+
+
+def fetch_pending_logs(db: Session, limit: int) -> List[LLMLog]:
+    """
+    이번 배치에 평가할 로그 조회.
+    work claiming 모드면 리스를 잡은 로그만, 아니면 단일 워커용 get_pending_logs 결과를 반환.
+    오프로드된 긴 prompt / response는 llm_text_blobs의 전체 본문으로 채워서 반환한다
+    (세션이 커밋되어 만료되면 다시 미리보기로 읽히므로 평가는 커밋 전에 끝낼 것).
+    """
+    if settings.evaluation_work_claiming_enabled:
+        logs = claim_pending_logs(db, limit=limit, cursor=pending_log_cursor)
+    else:
+        logs = get_pending_logs(db, limit=limit, cursor=pending_log_cursor)
+    hydrate_logs(db, LLMTextBlob, logs)
+    return logs
+
+
+def finish_pending_logs(db: Session, logs: List[LLMLog]):
+    """fetch_pending_logs로 가져온 배치 처리가 끝났을 때 호출 (work claiming 모드에서 리스 해제)."""
+    if settings.evaluation_work_claiming_enabled:
+        release_leases(db, logs)
@@ -0,0 +1,201 @@
+"""
+대시보드/분석 API 응답 시간 벤치마크 (원본 테이블 집계 vs 통계 rollup).
+
+합성 llm_logs / llm_evaluations(기본 1000만 행, 최근 30일에 고르게 분포, 90% 평가 완료)를 만든 뒤
+1) rollup backfill(전체 기간) 시간과, 로그가 조금 추가된 뒤의 증분 갱신 시간을 재고
+2) gateway-api / dashboard 서비스를 별도 프로세스(uvicorn)로 띄워서
+   ANALYTICS_USE_ROLLUPS=false(원본 집계) / true(rollup)일 때 각 엔드포인트 응답 시간을 비교한다.
+
+DATABASE_URL을 주면 해당 DB(예: 빈 Postgres)에 테이블을 만들어 측정하고, 없으면 임시 SQLite 파일을 사용한다.
+SQLite에서는 Postgres 전용 식(date_trunc, DATE 캐스트)을 쓰는 원본 집계(/analytics/trends, /api/dashboard/timeseries)가
+실패하므로 상태 코드만 표시된다.
+
+    cd services/evaluator
+    python -m benchmarks.bench_dashboard_rollups --rows 10000000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime, timedelta, timezone
+
+SERVICES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+# (서비스 이름, 작업 디렉터리, uvicorn 앱, 포트, 엔드포인트 목록)
+SERVICES = [
+    (
+        "gateway-api",
+        os.path.join(SERVICES_DIR, "gateway-api"),
+        "app.main:app",
+        9202,
+        [
+            "/api/dashboard/summary",
+            "/api/dashboard/timeseries?days=30",
+            "/analytics/trends?hours=168",
+            "/analytics/compare-models?days=7",
+        ],
+    ),
+    (
+        "dashboard",
+        os.path.join(SERVICES_DIR, "dashboard", "app"),
+        "main:app",
+        9203,
+        ["/metrics/summary"],
+    ),
+]
+
+MODELS = ["gpt-5-mini", "gpt-5", "local-vllm", None]
+
+
+def _configure_env() -> None:
+    # app.config가 import 시점에 Settings를 읽으므로 import 전에 환경변수 설정
+    if "DATABASE_URL" not in os.environ:
+        db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+        os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ.setdefault("LLM_API_KEY", "stub-key")
+
+
+def _populate(engine, rows: int, days: int, evaluated_ratio: float, start_id: int = 1,
+              chunk: int = 50_000) -> None:
+    from sqlalchemy import insert, text
+
+    from app.models import LLMLog, LLMEvaluation
+
+    rng = random.Random(start_id)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    span_seconds = days * 86400
+
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        for offset in range(start_id, start_id + rows, chunk):
+            ids = range(offset, min(offset + chunk, start_id + rows))
+            logs = []
+            evaluations = []
+            for i in ids:
+                status = "error" if rng.random() < 0.03 else "success"
+                created_at = now - timedelta(seconds=span_seconds * (1 - (i - start_id) / rows))
+                logs.append({
+                    "id": i,
+                    "created_at": created_at,
+                    "prompt": "synthetic prompt",
+                    "response": "synthetic response",
+                    "model_version": MODELS[i % len(MODELS)],
+                    "latency_ms": rng.uniform(100.0, 3000.0),
+                    "status": status,
+                })
+                if status == "success" and rng.random() < evaluated_ratio:
+                    score = rng.randint(1, 5)
+                    # 평가는 로그가 들어오고 얼마 뒤에 저장됨 (증분 갱신이 최근 시간대만 다시 집계하도록)
+                    evaluations.append({
+                        "log_id": i, "created_at": created_at + timedelta(seconds=30), "overall_score": score, "label": "ok",
+                        "is_flagged": score <= 2, "judge_model": "bench",
+                    })
+            conn.execute(insert(LLMLog), logs)
+            if evaluations:
+                conn.execute(insert(LLMEvaluation), evaluations)
+        conn.execute(text("ANALYZE"))
+    print(f"populated {rows} logs over {days} days in {time.perf_counter() - start:.1f}s")
+
+
+def _wait_ready(port: int, process: subprocess.Popen, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"service on port {port} exited with code {process.returncode}")
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1).read()
+            return
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.2)
+    raise RuntimeError(f"service on port {port} did not become ready")
+
+
+def _time_endpoint(port: int, path: str, repeat: int, timeout: float) -> tuple[str, list[float]]:
+    samples = []
+    status = "200"
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=timeout).read()
+        except urllib.error.HTTPError as e:
+            status = str(e.code)
+        except TimeoutError:
+            status = "timeout"
+        samples.append((time.perf_counter() - start) * 1000.0)
+        if status != "200":
+            break
+    return status, samples
+
+
+def _bench_services(use_rollups: bool, repeat: int, timeout: float) -> dict:
+    env = dict(os.environ, ANALYTICS_USE_ROLLUPS=str(use_rollups).lower(), LOG_WRITER_ENABLED="false")
+    results = {}
+    for name, cwd, app, port, paths in SERVICES:
+        process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", app, "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+            cwd=cwd,
+            env=env,
+        )
+        try:
+            _wait_ready(port, process)
+            for path in paths:
+                results[(name, path)] = _time_endpoint(port, path, repeat, timeout)
+        finally:
+            process.terminate()
+            process.wait()
+    return results
+
+
+def main(rows: int, days: int, evaluated_ratio: float, repeat: int, timeout: float) -> None:
+    from app.db import Base, SessionLocal, engine
+    from app.rollups import refresh_rollups
+    from app.schema_migrations import run_migrations
+
+    run_migrations(engine, Base.metadata)
+    _populate(engine, rows, days, evaluated_ratio)
+
+    with SessionLocal() as db:
+        start = time.perf_counter()
+        buckets = refresh_rollups(db)
+        print(f"rollup backfill: {buckets} hourly buckets in {time.perf_counter() - start:.1f}s")
+
+        # 최근 1분 동안 로그 1000개가 더 들어온 상황
+        _populate(engine, 1000, 0, evaluated_ratio, start_id=rows + 1)
+        start = time.perf_counter()
+        buckets = refresh_rollups(db)
+        print(f"rollup incremental refresh: {buckets} hourly buckets in {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    raw = _bench_services(use_rollups=False, repeat=repeat, timeout=timeout)
+    rollup = _bench_services(use_rollups=True, repeat=repeat, timeout=timeout)
+
+    print(f"\n{'endpoint':<48} {'raw median':>12} {'rollup median':>14} {'speedup':>9}")
+    for key in raw:
+        name, path = key
+        raw_status, raw_samples = raw[key]
+        rollup_status, rollup_samples = rollup[key]
+        raw_ms = statistics.median(raw_samples)
+        rollup_ms = statistics.median(rollup_samples)
+        raw_text = f"{raw_ms:10.1f}ms" if raw_status == "200" else f"{raw_status:>12}"
+        rollup_text = f"{rollup_ms:12.1f}ms" if rollup_status == "200" else f"{rollup_status:>14}"
+        speedup = f"{raw_ms / rollup_ms:8.0f}x" if raw_status == rollup_status == "200" else f"{'n/a':>9}"
+        print(f"{name + ' ' + path:<48} {raw_text} {rollup_text} {speedup}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dashboard rollup benchmark")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--days", type=int, default=30, help="로그를 분포시킬 기간 (최근 N일)")
+    parser.add_argument("--evaluated-ratio", type=float, default=0.9)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=300.0, help="엔드포인트 요청 타임아웃 (초)")
+    args = parser.parse_args()
+
+    _configure_env()
+    main(args.rows, args.days, args.evaluated_ratio, args.repeat, args.timeout)
@@ -0,0 +1,110 @@
+"""
+배치 judge(여러 로그를 judge 요청 하나로) 비용/처리량 벤치마크.
+
+로컬 stub judge 서버를 띄운 뒤 같은 짧은 로그 배치를
+1) 단일 모드: 로그마다 judge 요청 (judge_batch_max_items=1)
+2) 배치 모드: 요청 하나에 로그 K개 (K = 5 / 10 / 20)
+로 평가하고 처리량(logs/s), 요청 수, 입력/출력 토큰 추정치를 비교한다.
+토큰 수는 stub 서버가 받은 프롬프트/보낸 응답의 문자 수 / 4로 추정한다.
+
+    cd services/evaluator
+    python -m benchmarks.bench_judge_batching --logs 200 --delay 0.5 --item-delay 0.05
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import urllib.request
+
+PORT = 9201
+
+
+def _configure_env(port: int) -> None:
+    # app.config가 import 시점에 Settings를 읽으므로 import 전에 환경변수 설정
+    db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{db_path}")
+    os.environ["LLM_API_BASE_URL"] = f"http://127.0.0.1:{port}/v1"
+    os.environ.setdefault("LLM_API_KEY", "stub-key")
+
+
+def _stats(port: int, method: str = "GET") -> dict:
+    request = urllib.request.Request(f"http://127.0.0.1:{port}/stats", method=method)
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+
+def main(n: int, batch_sizes: list[int], concurrency: int, max_tokens: int, port: int) -> None:
+    from openai import AsyncOpenAI
+
+    from app import llm_judge
+    from app.config import settings
+    from app.http_transport import build_timeout, create_async_http_client
+    from app.judge_executor import JudgeExecutor
+    from app.models import LLMLog
+
+    logs = [
+        LLMLog(
+            id=i,
+            user_id="bench",
+            prompt=f"What is the capital of country #{i}?",
+            response="The capital is the city where the national government is located.",
+            model_version="stub-model",
+        )
+        for i in range(1, n + 1)
+    ]
+
+    baseline_tokens = None
+    for batch_size in batch_sizes:
+        # executor마다 이벤트 루프가 다르므로 async 클라이언트(커넥션 풀)도 새로 만든다
+        llm_judge.async_client = AsyncOpenAI(
+            api_key=settings.llm_api_key,
+            base_url=settings.llm_api_base_url,
+            max_retries=0,
+            timeout=build_timeout(),
+            http_client=create_async_http_client("judge_async"),
+        )
+        executor = JudgeExecutor(
+            max_concurrency=concurrency,
+            batch_max_items=batch_size,
+            batch_max_tokens=max_tokens,
+            batch_max_item_tokens=settings.judge_batch_max_item_tokens,
+        )
+        _stats(port, method="DELETE")
+
+        start = time.perf_counter()
+        outcomes = executor.judge_batch(logs)
+        elapsed = time.perf_counter() - start
+        executor.shutdown()
+
+        stats = _stats(port)
+        errors = sum(1 for outcome in outcomes if outcome.error is not None)
+        tokens = stats["input_tokens"] + stats["output_tokens"]
+        baseline_tokens = baseline_tokens or tokens
+        label = "single" if batch_size == 1 else f"batch K={batch_size}"
+        print(
+            f"{label:<12} logs={n:<5} errors={errors:<4} elapsed={elapsed:7.2f}s "
+            f"throughput={n / elapsed:7.1f} logs/s requests={stats['requests']:<5} "
+            f"input_tokens={stats['input_tokens']:<7} output_tokens={stats['output_tokens']:<6} "
+            f"tokens/log={tokens / n:6.1f} cost={tokens / baseline_tokens:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LLM judge batching benchmark")
+    parser.add_argument("--logs", type=int, default=200)
+    parser.add_argument("--delay", type=float, default=0.5, help="stub judge 요청당 응답 지연 (초)")
+    parser.add_argument("--item-delay", type=float, default=0.05, help="배치 요청의 항목당 추가 지연 (초)")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 5, 10, 20])
+    parser.add_argument("--max-tokens", type=int, default=6000, help="배치 프롬프트 추정 토큰 상한")
+    args = parser.parse_args()
+
+    _configure_env(args.port)
+
+    from benchmarks.stub_judge_server import StubJudgeServer
+
+    with StubJudgeServer(port=args.port, delay_seconds=args.delay, item_delay_seconds=args.item_delay):
+        main(args.logs, args.batch_sizes, args.concurrency, args.max_tokens, args.port)
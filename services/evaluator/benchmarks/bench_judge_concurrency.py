@@ -0,0 +1,97 @@
+"""
+LLM-as-a-Judge 동시 실행 벤치마크.
+
+로컬 stub judge 서버(고정 지연)를 띄운 뒤 같은 로그 배치를
+1) 기존 방식: sync run_judge를 순차 호출
+2) judge_executor: 동시 실행 (max_concurrency = 1 / 4 / 16 / 64)
+으로 평가하고 처리량(logs/s)을 비교한다. DB는 사용하지 않는다 (메모리상의 LLMLog).
+
+    cd services/evaluator
+    python -m benchmarks.bench_judge_concurrency --logs 100 --delay 0.5
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+PORT = 9200
+
+
+def _configure_env(port: int) -> None:
+    # app.config가 import 시점에 Settings를 읽으므로 import 전에 환경변수 설정
+    db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{db_path}")
+    os.environ["LLM_API_BASE_URL"] = f"http://127.0.0.1:{port}/v1"
+    os.environ.setdefault("LLM_API_KEY", "stub-key")
+
+
+def _report(label: str, n: int, errors: int, elapsed: float) -> None:
+    print(f"{label:<28} logs={n:<5} errors={errors:<4} elapsed={elapsed:7.2f}s throughput={n / elapsed:7.1f} logs/s")
+
+
+def main(n: int, concurrency_levels: list[int], skip_sequential: bool) -> None:
+    from openai import AsyncOpenAI
+
+    from app import llm_judge
+    from app.config import settings
+    from app.http_transport import build_timeout, create_async_http_client
+    from app.judge_executor import JudgeExecutor
+    from app.models import LLMLog
+
+    logs = [
+        LLMLog(
+            id=i,
+            user_id="bench",
+            prompt=f"Explain the difference between a list and a tuple in Python. ({i})",
+            response="A list is mutable while a tuple is immutable.",
+            model_version="stub-model",
+        )
+        for i in range(n)
+    ]
+
+    if not skip_sequential:
+        start = time.perf_counter()
+        errors = 0
+        for log in logs:
+            try:
+                llm_judge.run_judge(log)
+            except Exception:
+                errors += 1
+        _report("sequential run_judge", n, errors, time.perf_counter() - start)
+
+    for concurrency in concurrency_levels:
+        # executor마다 이벤트 루프가 다르므로 async 클라이언트(커넥션 풀)도 새로 만든다
+        llm_judge.async_client = AsyncOpenAI(
+            api_key=settings.llm_api_key,
+            base_url=settings.llm_api_base_url,
+            max_retries=0,
+            timeout=build_timeout(),
+            http_client=create_async_http_client("judge_async"),
+        )
+        executor = JudgeExecutor(max_concurrency=concurrency)
+
+        start = time.perf_counter()
+        outcomes = executor.judge_batch(logs)
+        elapsed = time.perf_counter() - start
+        executor.shutdown()
+
+        errors = sum(1 for outcome in outcomes if outcome.error is not None)
+        _report(f"judge_executor c={concurrency}", n, errors, elapsed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LLM judge concurrency benchmark")
+    parser.add_argument("--logs", type=int, default=100)
+    parser.add_argument("--delay", type=float, default=0.5, help="stub judge 응답 지연 (초)")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--skip-sequential", action="store_true", help="순차 run_judge 측정 생략")
+    args = parser.parse_args()
+
+    _configure_env(args.port)
+
+    from benchmarks.stub_judge_server import StubJudgeServer
+
+    with StubJudgeServer(port=args.port, delay_seconds=args.delay):
+        main(args.logs, args.concurrency, args.skip_sequential)
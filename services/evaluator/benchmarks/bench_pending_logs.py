@@ -0,0 +1,116 @@
+"""
+평가 대기 로그 조회 벤치마크.
+
+합성 llm_logs / llm_evaluations 테이블(기본 200만 행, 앞쪽 99% 평가 완료)을 만든 뒤
+1) 기존 쿼리: id NOT IN (SELECT log_id FROM llm_evaluations) + created_at 정렬
+2) NOT EXISTS anti-join + partial index
+3) 2) + watermark 커서
+의 배치 조회 시간을 비교한다.
+
+DATABASE_URL을 주면 해당 DB(예: 빈 Postgres)에 테이블을 만들어 측정하고, 없으면 임시 SQLite 파일을 사용한다.
+
+    cd services/evaluator
+    python -m benchmarks.bench_pending_logs --rows 2000000 --batch 100
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+def _configure_env() -> None:
+    # app.config가 import 시점에 Settings를 읽으므로 import 전에 환경변수 설정
+    if "DATABASE_URL" not in os.environ:
+        db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+        os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ.setdefault("LLM_API_KEY", "stub-key")
+
+
+def _populate(engine, rows: int, evaluated_ratio: float, chunk: int = 50_000) -> None:
+    from sqlalchemy import insert, text
+
+    from app.models import LLMLog, LLMEvaluation
+
+    base = datetime(2025, 1, 1)
+    evaluated = int(rows * evaluated_ratio)
+
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        for offset in range(0, rows, chunk):
+            ids = range(offset + 1, min(offset + chunk, rows) + 1)
+            conn.execute(insert(LLMLog), [
+                {
+                    "id": i,
+                    "created_at": base + timedelta(seconds=i),
+                    "prompt": "synthetic prompt",
+                    "response": "synthetic response",
+                    "model_version": "bench",
+                    # 5%는 에러 로그 (평가 대상 아님)
+                    "status": "error" if i % 20 == 0 else "success",
+                }
+                for i in ids
+            ])
+            conn.execute(insert(LLMEvaluation), [
+                {"log_id": i, "overall_score": 5, "label": "ok", "is_flagged": False, "judge_model": "bench"}
+                for i in ids if i <= evaluated and i % 20 != 0
+            ])
+        conn.execute(text("ANALYZE"))
+    print(f"populated {rows} logs ({evaluated_ratio:.0%} evaluated) in {time.perf_counter() - start:.1f}s")
+
+
+def _time(label: str, fn, repeat: int) -> None:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        logs = fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    print(f"{label:<36} batch={len(logs):<5} median={statistics.median(samples):9.2f}ms min={min(samples):9.2f}ms")
+
+
+def main(rows: int, evaluated_ratio: float, batch: int, repeat: int) -> None:
+    from sqlalchemy import select
+
+    from app.db import Base, SessionLocal, engine
+    from app.models import LLMLog, LLMEvaluation
+    from app.schema_migrations import run_migrations
+    from app.utils import PendingLogCursor, get_pending_logs
+
+    run_migrations(engine, Base.metadata)
+    _populate(engine, rows, evaluated_ratio)
+
+    def legacy_query():
+        evaluated_log_ids_subquery = select(LLMEvaluation.log_id)
+        stmt = (
+            select(LLMLog)
+            .where(LLMLog.status == "success")
+            .where(LLMLog.id.notin_(evaluated_log_ids_subquery))
+            .order_by(LLMLog.created_at.asc())
+            .limit(batch)
+        )
+        return list(db.execute(stmt).scalars().all())
+
+    cursor = PendingLogCursor(lookback_seconds=300)
+
+    db = SessionLocal()
+    try:
+        _time("NOT IN subquery (legacy)", legacy_query, repeat)
+        _time("NOT EXISTS + partial index", lambda: get_pending_logs(db, limit=batch), repeat)
+        get_pending_logs(db, limit=batch, cursor=cursor)  # watermark 초기화
+        _time("NOT EXISTS + watermark cursor", lambda: get_pending_logs(db, limit=batch, cursor=cursor), repeat)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pending log query benchmark")
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--evaluated-ratio", type=float, default=0.99, help="앞쪽에서부터 평가 완료된 로그 비율")
+    parser.add_argument("--batch", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    _configure_env()
+    main(args.rows, args.evaluated_ratio, args.batch, args.repeat)
@@ -0,0 +1,105 @@
+"""
+룰 평가 처리량 벤치마크.
+
+합성 응답 N개(기본 1M)를
+1) 로그별 basic_rule_evaluate 호출 (LLMLog → EvaluationResult)
+2) BASIC_RULES.evaluate_batch로 배치 전체를 한 번에 평가
+로 평가하고 rows/s를 비교한다. DB는 사용하지 않는다.
+--rule-pack을 주면 해당 rule pack으로도 평가하고, 룰별 메트릭(소요 시간/평가 행 수/적중 수)을 출력한다.
+
+    cd services/evaluator
+    python -m benchmarks.bench_rule_engine --rows 1000000
+    python -m benchmarks.bench_rule_engine --rows 1000000 --rule-pack ../../configs/rules/example.json
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+WORDS = (
+    "the quick brown fox jumps over lazy dog python list tuple dictionary "
+    "function returns value request response model answer because"
+).split()
+
+
+def _configure_env() -> None:
+    # app.config가 import 시점에 Settings를 읽으므로 import 전에 환경변수 설정
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+    os.environ.setdefault("LLM_API_KEY", "stub-key")
+
+
+def synthetic_responses(n: int, seed: int = 0) -> list[str]:
+    """짧은 응답 약 10%, 에러 키워드 포함 약 5%인 합성 응답."""
+    rng = random.Random(seed)
+    responses = []
+    for _ in range(n):
+        r = rng.random()
+        if r < 0.10:
+            responses.append("ok")
+            continue
+        text = " ".join(rng.choices(WORDS, k=rng.randint(5, 80)))
+        if r < 0.15:
+            text += " Traceback (most recent call last): RuntimeError"
+        responses.append(text)
+    return responses
+
+
+def _report(label: str, n: int, elapsed: float) -> None:
+    print(f"{label:<28} rows={n:<8} elapsed={elapsed:7.2f}s throughput={n / elapsed:12,.0f} rows/s")
+
+
+def _print_rule_metrics(rule_set) -> None:
+    from app.metrics import rule_evaluation_duration_seconds, rule_hits_total, rule_rows_evaluated_total
+
+    for i in rule_set._order:
+        name = rule_set.rules[i].name
+        seconds = rule_evaluation_duration_seconds.labels(rule=name)._sum.get()
+        rows = rule_rows_evaluated_total.labels(rule=name)._value.get()
+        hits = rule_hits_total.labels(rule=name)._value.get()
+        print(f"  rule={name:<22} seconds={seconds:7.3f} rows={rows:<9.0f} hits={hits:<8.0f}")
+
+
+def main(n: int, per_log_rows: int, rule_pack: str | None) -> None:
+    import numpy as np
+
+    from app.models import LLMLog
+    from app.rule_engine import BASIC_RULES
+    from app.rules import basic_rule_evaluate
+
+    responses = synthetic_responses(n)
+
+    # 로그별 평가는 느리므로 앞부분 per_log_rows개만 측정
+    logs = [LLMLog(id=i, response=text) for i, text in enumerate(responses[:per_log_rows])]
+    start = time.perf_counter()
+    for log in logs:
+        basic_rule_evaluate(log)
+    _report("per-log basic_rule_evaluate", len(logs), time.perf_counter() - start)
+
+    start = time.perf_counter()
+    result = BASIC_RULES.evaluate_batch(responses)
+    _report("evaluate_batch", n, time.perf_counter() - start)
+
+    labels, counts = np.unique(result.label.astype(str), return_counts=True)
+    print("labels:", dict(zip(labels.tolist(), counts.tolist())))
+
+    if rule_pack:
+        from app.rules import load_rule_pack
+
+        rule_set = load_rule_pack(rule_pack)
+        start = time.perf_counter()
+        rule_set.evaluate_batch(responses)
+        _report(f"evaluate_batch ({rule_set.judge_model})", n, time.perf_counter() - start)
+        _print_rule_metrics(rule_set)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rule evaluation throughput benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--per-log-rows", type=int, default=100_000, help="로그별 평가로 측정할 행 수")
+    parser.add_argument("--rule-pack", default=None, help="함께 측정할 rule pack JSON 파일")
+    args = parser.parse_args()
+
+    _configure_env()
+    main(args.rows, args.per_log_rows, args.rule_pack)
@@ -0,0 +1,160 @@
+"""
+부하 테스트용 OpenAI 호환 stub Judge 서버.
+
+`POST /v1/responses`에 대해 설정된 지연 후 judge 형식의 JSON 텍스트를 반환한다.
+배치 judge 프롬프트(`--- ITEM id=N ---`)에는 항목별 결과를 담은 JSON 배열을 반환한다.
+실제 judge 모델 없이 evaluator의 동시성/처리량만 측정하기 위해 사용.
+
+`GET /stats`는 지금까지 받은 요청 수와 입력/출력 토큰 추정치(문자 수 / 4)를 반환한다.
+
+    python -m benchmarks.stub_judge_server --port 9200 --delay 1.0
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import multiprocessing
+import re
+import socket
+import time
+
+import uvicorn
+from fastapi import FastAPI, Request
+
+_ids = itertools.count(1)
+
+_ITEM_PATTERN = re.compile(r"^--- ITEM id=(\d+) ---$", re.MULTILINE)
+
+JUDGE_TEXT = json.dumps({
+    "score_overall": 4,
+    "score_instruction_following": 4,
+    "score_truthfulness": 5,
+    "comments": "Stub judge response.",
+})
+
+
+def _response_body(model: str, text: str) -> dict:
+    """Responses API 형식의 최소 응답 본문."""
+    n = next(_ids)
+    return {
+        "id": f"resp_{n}",
+        "object": "response",
+        "created_at": int(time.time()),
+        "model": model,
+        "status": "completed",
+        "output": [
+            {
+                "type": "message",
+                "id": f"msg_{n}",
+                "role": "assistant",
+                "status": "completed",
+                "content": [{"type": "output_text", "text": text, "annotations": []}],
+            }
+        ],
+        "parallel_tool_calls": False,
+        "tool_choice": "auto",
+        "tools": [],
+    }
+
+
+def _batch_judge_text(item_ids: list[int]) -> str:
+    judge = json.loads(JUDGE_TEXT)
+    return json.dumps([{"id": item_id, **judge} for item_id in item_ids])
+
+
+def create_app(delay_seconds: float = 1.0, item_delay_seconds: float = 0.0) -> FastAPI:
+    """
+    Args:
+        delay_seconds: 요청당 고정 지연
+        item_delay_seconds: 배치 요청의 항목당 추가 지연 (출력 토큰 생성 시간 흉내)
+    """
+    app = FastAPI(title="Stub Judge Server")
+    stats = {"requests": 0, "items": 0, "input_tokens": 0, "output_tokens": 0}
+
+    @app.post("/v1/responses")
+    async def responses(request: Request):
+        body = await request.json()
+        prompt = body.get("input", "")
+        if not isinstance(prompt, str):
+            prompt = json.dumps(prompt)
+
+        item_ids = [int(item_id) for item_id in _ITEM_PATTERN.findall(prompt)]
+        if item_ids:
+            text = _batch_judge_text(item_ids)
+            await asyncio.sleep(delay_seconds + item_delay_seconds * len(item_ids))
+        else:
+            text = JUDGE_TEXT
+            await asyncio.sleep(delay_seconds)
+
+        stats["requests"] += 1
+        stats["items"] += len(item_ids) or 1
+        stats["input_tokens"] += len(prompt) // 4
+        stats["output_tokens"] += len(text) // 4
+        return _response_body(body.get("model", "stub-judge"), text)
+
+    @app.get("/stats")
+    async def get_stats():
+        return stats
+
+    @app.delete("/stats")
+    async def reset_stats():
+        for key in stats:
+            stats[key] = 0
+        return stats
+
+    return app
+
+
+def _serve(port: int, delay_seconds: float, item_delay_seconds: float = 0.0) -> None:
+    uvicorn.run(
+        create_app(delay_seconds, item_delay_seconds),
+        host="127.0.0.1",
+        port=port,
+        log_level="warning",
+        timeout_keep_alive=75,
+    )
+
+
+class StubJudgeServer:
+    """
+    별도 프로세스에서 uvicorn으로 stub judge 서버를 띄우는 헬퍼.
+
+        with StubJudgeServer(port=9200, delay_seconds=0.5) as server:
+            ...  # LLM_API_BASE_URL=server.base_url
+    """
+
+    def __init__(self, port: int = 9200, delay_seconds: float = 1.0, item_delay_seconds: float = 0.0):
+        self.port = port
+        self._process = multiprocessing.Process(
+            target=_serve, args=(port, delay_seconds, item_delay_seconds), daemon=True
+        )
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/v1"
+
+    def __enter__(self):
+        self._process.start()
+        deadline = time.time() + 10
+        while time.time() < deadline:
+            try:
+                with socket.create_connection(("127.0.0.1", self.port), timeout=0.2):
+                    return self
+            except OSError:
+                time.sleep(0.05)
+        raise RuntimeError(f"Stub judge server did not start on port {self.port}")
+
+    def __exit__(self, *exc):
+        self._process.terminate()
+        self._process.join(timeout=5)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stub OpenAI-compatible judge server")
+    parser.add_argument("--port", type=int, default=9200)
+    parser.add_argument("--delay", type=float, default=1.0, help="응답 지연 (초)")
+    parser.add_argument("--item-delay", type=float, default=0.0, help="배치 요청의 항목당 추가 지연 (초)")
+    args = parser.parse_args()
+
+    _serve(args.port, args.delay, args.item_delay)
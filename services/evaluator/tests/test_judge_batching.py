@@ -0,0 +1,136 @@
+"""
+배치 judge (여러 로그를 judge 요청 하나로) 테스트
+"""
+
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from app.judge_executor import JudgeExecutor
+from app.llm_judge import _parse_batch_eval_json
+from app.models import LLMLog
+
+
+def _logs(n: int, response: str = "response") -> list[LLMLog]:
+    return [LLMLog(id=i, user_id="test", prompt=f"prompt {i}", response=response) for i in range(n)]
+
+
+def _result(score: int) -> dict:
+    return {"score_overall": score, "score_instruction_following": score, "score_truthfulness": score}
+
+
+def test_pack_respects_max_items_and_isolates_long_logs():
+    """묶음은 batch_max_items를 넘지 않고, batch_max_item_tokens보다 긴 로그는 단독으로 평가"""
+    logs = _logs(7)
+    logs[3].response = "x" * 4000  # 약 1000 토큰
+
+    executor = JudgeExecutor(max_concurrency=1, batch_max_items=3, batch_max_item_tokens=500)
+    packs = executor.pack(logs)
+
+    assert sorted([log.id for log in pack] for pack in packs) == [[0, 1, 2], [3], [4, 5, 6]]
+
+
+def test_judge_batch_keeps_input_order_with_long_logs():
+    """단독으로 평가되는 긴 로그가 섞여 있어도 결과는 입력 순서대로 반환"""
+    logs = _logs(5)
+    logs[1].response = "x" * 4000
+
+    async def fake_judge(log):
+        return _result(1)
+
+    async def fake_batch_judge(logs):
+        return {log.id: _result(5) for log in logs}
+
+    executor = JudgeExecutor(
+        max_concurrency=2, judge_fn=fake_judge, batch_judge_fn=fake_batch_judge,
+        batch_max_items=4, batch_max_item_tokens=500,
+    )
+    try:
+        outcomes = executor.judge_batch(logs)
+    finally:
+        executor.shutdown()
+
+    assert [outcome.log.id for outcome in outcomes] == [0, 1, 2, 3, 4]
+    assert [outcome.result["score_overall"] for outcome in outcomes] == [5, 1, 5, 5, 5]
+
+
+def test_pack_respects_max_tokens():
+    """추정 프롬프트 토큰이 batch_max_tokens를 넘으면 새 묶음 시작"""
+    executor = JudgeExecutor(max_concurrency=1, batch_max_items=10, batch_max_tokens=600)
+    packs = executor.pack(_logs(6, response="y" * 400))  # 로그당 약 120 토큰 + 루브릭 약 200 토큰
+
+    assert [len(pack) for pack in packs] == [3, 3]
+
+
+def test_judge_batch_falls_back_to_single_judge_for_missing_items():
+    """배치 응답에서 빠진 항목만 단일 judge로 다시 평가하고, 결과는 입력 순서대로 반환"""
+    single_calls = []
+    batch_calls = []
+
+    async def fake_judge(log):
+        single_calls.append(log.id)
+        return _result(1)
+
+    async def fake_batch_judge(logs):
+        batch_calls.append([log.id for log in logs])
+        return {log.id: _result(5) for log in logs if log.id != 2}
+
+    executor = JudgeExecutor(
+        max_concurrency=2, judge_fn=fake_judge, batch_judge_fn=fake_batch_judge, batch_max_items=4,
+    )
+    try:
+        outcomes = executor.judge_batch(_logs(6))
+    finally:
+        executor.shutdown()
+
+    assert batch_calls == [[0, 1, 2, 3], [4, 5]]
+    assert single_calls == [2]
+    assert [outcome.log.id for outcome in outcomes] == [0, 1, 2, 3, 4, 5]
+    assert [outcome.result["score_overall"] for outcome in outcomes] == [5, 5, 1, 5, 5, 5]
+
+
+def test_judge_batch_falls_back_when_batch_request_fails():
+    """배치 요청 자체가 실패하면 묶음 전체를 단일 judge로 평가"""
+    async def fake_judge(log):
+        if log.id == 1:
+            raise RuntimeError("judge failed")
+        return _result(3)
+
+    async def failing_batch_judge(logs):
+        raise RuntimeError("batch judge failed")
+
+    executor = JudgeExecutor(
+        max_concurrency=2, judge_fn=fake_judge, batch_judge_fn=failing_batch_judge, batch_max_items=3,
+    )
+    try:
+        outcomes = executor.judge_batch(_logs(3))
+    finally:
+        executor.shutdown()
+
+    assert [outcome.result["score_overall"] for outcome in outcomes if outcome.error is None] == [3, 3]
+    assert isinstance(outcomes[1].error, RuntimeError)
+
+
+def test_parse_batch_eval_json_skips_invalid_items():
+    """잘못된 점수, 모르는 id, 중복 id 항목은 결과에서 제외"""
+    text = json.dumps([
+        {"id": 1, **_result(4), "comments": "ok"},
+        {"id": 2, "score_overall": 9, "score_instruction_following": 3, "score_truthfulness": 3},
+        {"id": 99, **_result(5)},
+        {"id": 1, **_result(1)},
+        "not an object",
+    ])
+
+    results = _parse_batch_eval_json(text, [1, 2, 3])
+
+    assert list(results) == [1]
+    assert results[1]["score_overall"] == 4
+    assert results[1]["comments"] == "ok"
+
+
+def test_parse_batch_eval_json_rejects_non_array():
+    with pytest.raises(HTTPException):
+        _parse_batch_eval_json('{"id": 1}', [1])
+    with pytest.raises(HTTPException):
+        _parse_batch_eval_json("not json", [1])
@@ -0,0 +1,89 @@
+"""
+LLM judge 결과 캐시 테스트
+"""
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app import evaluation
+from app.db import Base
+from app.judge_cache import JudgeCache
+from app.judge_executor import JudgeExecutor
+from app.models import JudgeCacheEntry, LLMLog
+
+RESULT = {
+    "score_overall": 4,
+    "score_instruction_following": 5,
+    "score_truthfulness": 4,
+    "comments": "ok",
+    "raw_judge_response": "{}",
+}
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'judge_cache.db'}")
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)
+
+
+def _cache(session_factory, rubric_version="v1"):
+    return JudgeCache(session_factory, judge_model="judge-model", rubric_version=rubric_version, max_entries=100)
+
+
+def _log(log_id: int, prompt: str = "What is 2+2?", response: str = "4") -> LLMLog:
+    return LLMLog(id=log_id, prompt=prompt, response=response)
+
+
+def test_results_are_shared_through_the_db_tier(session_factory):
+    """다른 프로세스(새 캐시 인스턴스)도 DB tier에서 결과를 읽음"""
+    key = _cache(session_factory).key_for(_log(1))
+    _cache(session_factory).put_many({key: RESULT})
+
+    assert _cache(session_factory).get_many([key]) == {key: RESULT}
+
+
+def test_key_depends_on_content_and_rubric_version(session_factory):
+    """같은 prompt/response면 로그가 달라도 같은 키, 루브릭 버전이 바뀌면 다른 키"""
+    cache = _cache(session_factory)
+
+    assert cache.key_for(_log(1)) == cache.key_for(_log(2))
+    assert cache.key_for(_log(1)) != cache.key_for(_log(1, response="5"))
+    assert cache.key_for(_log(1)) != _cache(session_factory, rubric_version="v2").key_for(_log(1))
+
+
+def test_invalidate_removes_stale_rubric_versions(session_factory):
+    """invalidate()는 현재 버전이 아닌 결과를, invalidate(version)은 해당 버전을 삭제"""
+    old, new = _cache(session_factory, "v1"), _cache(session_factory, "v2")
+    old.put_many({old.key_for(_log(1)): RESULT})
+    new.put_many({new.key_for(_log(1)): RESULT})
+
+    assert new.invalidate() == 1
+    assert new.invalidate("v2") == 1
+    assert new.get_many([new.key_for(_log(1))]) == {}
+    with session_factory() as db:
+        assert db.scalar(select(func.count()).select_from(JudgeCacheEntry)) == 0
+
+
+def test_duplicate_logs_are_judged_once(session_factory, monkeypatch):
+    """배치 안의 중복 로그는 judge 한 번, 다음 배치의 같은 내용은 캐시에서 재사용"""
+    calls = []
+
+    async def fake_judge(log):
+        calls.append(log.id)
+        return dict(RESULT)
+
+    executor = JudgeExecutor(max_concurrency=4, judge_fn=fake_judge)
+    monkeypatch.setattr(evaluation, "judge_executor", executor)
+    monkeypatch.setattr(evaluation, "judge_cache", _cache(session_factory))
+
+    try:
+        first = evaluation.evaluate_logs([_log(1), _log(2), _log(3, response="different")], "llm")
+        second = evaluation.evaluate_logs([_log(4), _log(5, response="different")], "llm")
+    finally:
+        executor.shutdown()
+
+    assert calls == [1, 3]
+    assert [outcome.evaluation.log_id for outcome in first + second] == [1, 2, 3, 4, 5]
+    assert all(outcome.evaluation.overall_score == 4 for outcome in first + second)
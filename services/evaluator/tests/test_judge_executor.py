@@ -0,0 +1,55 @@
+"""
+LLM judge 동시 실행기 테스트
+"""
+
+import asyncio
+
+from app.judge_executor import JudgeExecutor
+from app.models import LLMLog
+
+
+def _logs(n: int) -> list[LLMLog]:
+    return [LLMLog(id=i, user_id="test", prompt=f"prompt {i}", response="response") for i in range(n)]
+
+
+def test_judge_batch_keeps_order_and_isolates_errors():
+    """실패한 로그는 해당 outcome의 error로만 기록되고 나머지는 결과를 받음"""
+    async def fake_judge(log):
+        await asyncio.sleep(0.01)
+        if log.id == 2:
+            raise RuntimeError("judge failed")
+        return {"score_overall": log.id}
+
+    executor = JudgeExecutor(max_concurrency=4, judge_fn=fake_judge)
+    try:
+        outcomes = executor.judge_batch(_logs(5))
+    finally:
+        executor.shutdown()
+
+    assert [outcome.log.id for outcome in outcomes] == [0, 1, 2, 3, 4]
+    assert isinstance(outcomes[2].error, RuntimeError)
+    assert outcomes[2].result is None
+    assert [outcome.result["score_overall"] for outcome in outcomes if outcome.error is None] == [0, 1, 3, 4]
+
+
+def test_judge_batch_respects_max_concurrency():
+    """동시에 실행되는 judge 호출 수는 max_concurrency를 넘지 않음"""
+    running = 0
+    peak = 0
+
+    async def fake_judge(log):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+        return {"score_overall": 5}
+
+    executor = JudgeExecutor(max_concurrency=3, judge_fn=fake_judge)
+    try:
+        outcomes = executor.judge_batch(_logs(12))
+    finally:
+        executor.shutdown()
+
+    assert all(outcome.error is None for outcome in outcomes)
+    assert peak == 3
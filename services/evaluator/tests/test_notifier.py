@@ -0,0 +1,200 @@
+"""
+알림 dispatcher (notifier) 테스트
+"""
+
+import asyncio
+import json
+import time
+from datetime import datetime
+
+import aiosmtplib
+import httpx
+from prometheus_client import REGISTRY
+
+from app import notifier
+from app.models import LLMEvaluation, LLMLog
+from app.notifier import EmailSender, Notification, NotificationDispatcher, WebhookSender, build_digest
+
+
+def _alert(i: int) -> Notification:
+    return Notification("alert", f"alert {i}", f"message {i}", digest_line=f"log #{i}")
+
+
+def _summary() -> Notification:
+    return Notification("summary", "summary", "batch done")
+
+
+def test_alerts_are_batched_into_digests():
+    """digest_max_items개씩 묶어서 보내고, 요약 알림은 묶지 않음"""
+    sent: list[Notification] = []
+
+    async def fake_send(notification):
+        sent.append(notification)
+
+    dispatcher = NotificationDispatcher(
+        max_queue_size=100, digest_max_items=3, digest_window_seconds=0.2, senders={"slack": fake_send}
+    )
+    try:
+        for i in range(5):
+            dispatcher.submit(_alert(i))
+        dispatcher.submit(_summary())
+        assert dispatcher.flush(timeout=5)
+    finally:
+        dispatcher.shutdown()
+
+    assert [notification.notification_type for notification in sent] == ["alert", "alert", "summary"]
+    assert sent[0].message.startswith("🚨 **Low Quality Alerts (3)**")
+    assert "- log #2" in sent[0].message
+    assert sent[1].message.count("- log #") == 2
+    assert sent[2].message == "batch done"
+
+
+def test_single_alert_is_sent_as_is():
+    alert = _alert(1)
+    assert build_digest([alert]) is alert
+
+
+def test_submit_does_not_wait_for_slow_channel():
+    """느린 채널이 있어도 submit은 바로 돌아오고, 큐가 가득 차면 새 알림은 버림"""
+    delivered = 0
+
+    async def slow_send(notification):
+        nonlocal delivered
+        await asyncio.sleep(0.3)
+        delivered += 1
+
+    def dropped() -> float:
+        return REGISTRY.get_sample_value(
+            "llm_evaluator_notifications_dropped_total", {"channel": "slow", "type": "summary"}
+        ) or 0.0
+
+    dropped_before = dropped()
+    dispatcher = NotificationDispatcher(max_queue_size=3, senders={"slow": slow_send})
+    try:
+        start = time.perf_counter()
+        for _ in range(20):
+            dispatcher.submit(_summary())
+        assert time.perf_counter() - start < 0.2
+        assert dispatcher.flush(timeout=5)
+    finally:
+        dispatcher.shutdown()
+
+    # 워커가 첫 알림을 꺼낸 뒤 큐에 3개
+    assert delivered <= 4
+    assert dropped() - dropped_before == 20 - delivered
+
+
+def test_alerts_queued_during_delivery_go_into_next_digest():
+    """전송(또는 분당 제한)을 기다리는 동안 쌓인 알림은 다음 digest 하나로 묶임"""
+    sent: list[Notification] = []
+
+    async def slow_send(notification):
+        await asyncio.sleep(0.2)
+        sent.append(notification)
+
+    dispatcher = NotificationDispatcher(max_queue_size=100, digest_max_items=50, senders={"slack": slow_send})
+    try:
+        dispatcher.submit(_alert(0))
+        time.sleep(0.05)
+        for i in range(1, 6):
+            dispatcher.submit(_alert(i))
+        assert dispatcher.flush(timeout=5)
+    finally:
+        dispatcher.shutdown()
+
+    assert [notification.message.split("\n")[0] for notification in sent] == [
+        "message 0", "🚨 **Low Quality Alerts (5)**",
+    ]
+
+
+def test_shutdown_gives_up_on_rate_limited_channel():
+    sent: list[Notification] = []
+
+    async def fake_send(notification):
+        sent.append(notification)
+
+    dispatcher = NotificationDispatcher(max_queue_size=100, rate_limit_per_minute=1, senders={"slack": fake_send})
+    dispatcher.submit(_summary())
+    dispatcher.submit(_summary())
+    # 두 번째 메시지는 1분 뒤에나 보낼 수 있음
+    assert not dispatcher.flush(timeout=0.3)
+    dispatcher.shutdown(timeout=0.1)
+
+    assert len(sent) == 1
+
+
+def test_webhook_sender_reuses_client_and_truncates_for_discord():
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(204)
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            discord = WebhookSender(client, "https://discord.test/webhook", "content", max_chars=2000)
+            await discord(Notification("alert", "s", "x" * 5000))
+            await discord(Notification("alert", "s", "short"))
+
+    asyncio.run(scenario())
+
+    contents = [json.loads(request.content)["content"] for request in requests]
+    assert len(contents[0]) == 2000 and contents[0].endswith("...")
+    assert contents[1] == "short"
+
+
+def test_email_sender_reuses_connection_and_reconnects(monkeypatch):
+    """SMTP 연결은 메시지마다 열지 않고, 서버가 끊었으면 다시 연결해서 보냄"""
+    connections = []
+
+    class FakeSMTP:
+        def __init__(self, **kwargs):
+            self.is_connected = False
+            self.sent = 0
+            connections.append(self)
+
+        async def connect(self):
+            self.is_connected = True
+
+        async def login(self, username, password):
+            pass
+
+        async def send_message(self, msg):
+            if self.sent == 2:
+                self.is_connected = False
+                raise aiosmtplib.SMTPServerDisconnected("idle timeout")
+            self.sent += 1
+
+        async def quit(self):
+            self.is_connected = False
+
+    monkeypatch.setattr(notifier.aiosmtplib, "SMTP", FakeSMTP)
+    for name, value in (
+        ("smtp_host", "smtp.test"), ("smtp_username", "user"), ("smtp_password", "pw"),
+        ("smtp_from_email", "from@test"), ("smtp_to_emails", "a@test, b@test"),
+    ):
+        monkeypatch.setattr(notifier.settings, name, value)
+
+    async def scenario():
+        sender = EmailSender()
+        for i in range(3):
+            await sender(Notification("alert", f"subject {i}", "body"))
+        await sender.close()
+
+    asyncio.run(scenario())
+
+    assert [connection.sent for connection in connections] == [2, 1]
+
+
+def test_low_quality_alert_is_queued_with_digest_line(monkeypatch):
+    submitted: list[Notification] = []
+    monkeypatch.setattr(notifier.notification_dispatcher, "submit", submitted.append)
+
+    log = LLMLog(id=7, prompt="무엇을   도와드릴까요?", response="응답", created_at=datetime(2025, 1, 1))
+    evaluation = LLMEvaluation(overall_score=1, judge_model="rule-v1", label="bad", comment=None)
+    notifier.send_low_quality_alert(log, evaluation)
+    notifier.send_low_quality_alert(log, LLMEvaluation(overall_score=5, judge_model="rule-v1", label="ok"))
+
+    assert len(submitted) == 1
+    assert submitted[0].html_content is not None
+    assert submitted[0].digest_line.startswith("**1/5** log #7 (bad, rule-v1): 무엇을 도와드릴까요?")
@@ -0,0 +1,190 @@
+"""
+llm_logs 파티션 관리 / 보관 (partitions) 테스트
+"""
+
+import gzip
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, func, insert, select, text
+
+from app.db import Base
+from app.models import LLMEvaluation, LLMLog, LLMTextBlob
+from app.partitions import (
+    Partition,
+    archive_table,
+    expired_partitions,
+    list_partitions,
+    maintain_partitions,
+    period_start,
+    plan_partitions,
+)
+from app.schema_migrations import run_migrations
+from app.text_blobs import offload_rows, upsert_blobs
+
+UTC = timezone.utc
+
+
+def _read_archive(path) -> list[dict]:
+    with gzip.open(path, "rt", encoding="utf-8") as archive:
+        return [json.loads(line) for line in archive]
+
+
+def test_period_start_day_and_week():
+    value = datetime(2025, 1, 8, 15, 30, tzinfo=UTC)  # 수요일
+
+    assert period_start(value, "day") == datetime(2025, 1, 8, tzinfo=UTC)
+    assert period_start(value, "week") == datetime(2025, 1, 6, tzinfo=UTC)
+    # 다른 시간대는 UTC 기준으로
+    assert period_start(datetime(2025, 1, 8, 3, tzinfo=timezone(timedelta(hours=9))), "day") == datetime(2025, 1, 7, tzinfo=UTC)
+    with pytest.raises(ValueError):
+        period_start(value, "month")
+
+
+def test_plan_partitions_fills_gap_and_premakes():
+    """기존 파티션 끝부터 현재 기간 + premake개 기간까지 빈틈 없이"""
+    ranges = plan_partitions(datetime(2025, 1, 3, tzinfo=UTC), datetime(2025, 1, 5, 12, tzinfo=UTC), "day", premake=2)
+
+    assert ranges[0][0] == datetime(2025, 1, 3, tzinfo=UTC)
+    assert ranges[-1][1] == datetime(2025, 1, 8, tzinfo=UTC)
+    assert all(upper == next_lower for (_, upper), (next_lower, _) in zip(ranges, ranges[1:]))
+    assert len(ranges) == 5
+
+    # 이미 덮여 있으면 만들 것이 없음
+    assert plan_partitions(datetime(2025, 1, 8, tzinfo=UTC), datetime(2025, 1, 5, 12, tzinfo=UTC), "day", premake=2) == []
+
+
+def test_plan_partitions_week_starts_at_covered_boundary():
+    """legacy 경계가 주중이면 첫 주 파티션은 그 주의 남은 부분만"""
+    ranges = plan_partitions(datetime(2025, 1, 3, tzinfo=UTC), datetime(2025, 1, 3, 12, tzinfo=UTC), "week", premake=1)
+
+    assert ranges == [
+        (datetime(2025, 1, 3, tzinfo=UTC), datetime(2025, 1, 6, tzinfo=UTC)),
+        (datetime(2025, 1, 6, tzinfo=UTC), datetime(2025, 1, 13, tzinfo=UTC)),
+    ]
+
+
+def test_expired_partitions_uses_upper_bound():
+    partitions = [
+        Partition("llm_logs_legacy", None, datetime(2025, 1, 3, tzinfo=UTC)),
+        Partition("llm_logs_p20250103", datetime(2025, 1, 3, tzinfo=UTC), datetime(2025, 1, 4, tzinfo=UTC)),
+        Partition("llm_logs_p20250104", datetime(2025, 1, 4, tzinfo=UTC), datetime(2025, 1, 5, tzinfo=UTC)),
+    ]
+
+    expired = expired_partitions(partitions, datetime(2025, 1, 4, 12, tzinfo=UTC))
+
+    assert [partition.name for partition in expired] == ["llm_logs_legacy", "llm_logs_p20250103"]
+
+
+def test_archive_table_writes_logs_and_evaluations_then_drops(tmp_path):
+    """detach된 테이블의 로그/평가를 JSONL.gz로 쓰고 평가 행과 테이블을 삭제"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'archive.db'}")
+    run_migrations(engine, Base.metadata)
+    logs = [
+        {"id": i, "created_at": datetime(2025, 1, i), "prompt": f"프롬프트 {i}", "response": f"응답 {i} " * 100}
+        for i in range(1, 5)
+    ]
+    # 긴 응답은 오프로드된 상태
+    blob_rows = offload_rows(logs, 50, datetime(2025, 1, 5))
+    with engine.begin() as conn:
+        conn.execute(upsert_blobs(LLMTextBlob, "sqlite", blob_rows, datetime(2025, 1, 5)))
+        conn.execute(insert(LLMLog), logs)
+        conn.execute(insert(LLMEvaluation), [
+            {"log_id": i, "overall_score": i, "is_flagged": False, "label": "ok"} for i in (1, 2, 3)
+        ])
+        # detach된 파티션 대신 앞의 두 로그만 담은 테이블
+        conn.execute(text("CREATE TABLE llm_logs_p20250101 AS SELECT * FROM llm_logs WHERE id <= 2"))
+
+    with engine.connect() as conn:
+        archived = archive_table(conn, "llm_logs_p20250101", str(tmp_path / "archive"))
+
+    assert archived == 2
+    logs = _read_archive(tmp_path / "archive" / "llm_logs" / "llm_logs_p20250101.jsonl.gz")
+    assert [log["id"] for log in logs] == [1, 2]
+    assert logs[0]["prompt"] == "프롬프트 1"
+    # 보관 파일에는 전체 본문
+    assert logs[1]["response"] == "응답 2 " * 100
+    evaluations = _read_archive(tmp_path / "archive" / "llm_evaluations" / "llm_logs_p20250101.jsonl.gz")
+    assert sorted(evaluation["log_id"] for evaluation in evaluations) == [1, 2]
+    assert not list((tmp_path / "archive").rglob("*.tmp"))
+
+    with engine.connect() as conn:
+        remaining = conn.execute(select(LLMEvaluation.log_id).order_by(LLMEvaluation.log_id)).scalars().all()
+        assert remaining == [3]
+        assert conn.execute(
+            text("SELECT COUNT(*) FROM sqlite_master WHERE name = 'llm_logs_p20250101'")
+        ).scalar() == 0
+
+
+def test_maintain_partitions_is_noop_without_partitioned_table(tmp_path):
+    engine = create_engine("sqlite://")
+    run_migrations(engine, Base.metadata)
+
+    with engine.connect() as conn:
+        result = maintain_partitions(conn, retention_days=1, archive_dir=str(tmp_path))
+
+    assert not result.partitioned
+    assert result.created == [] and result.archived == []
+
+
+@pytest.mark.skipif(not os.getenv("TEST_POSTGRES_URL"), reason="TEST_POSTGRES_URL not set (빈 테스트용 Postgres DB)")
+def test_postgres_partitioning_retention_and_pruning(tmp_path):
+    """
+    Postgres: 기존 llm_logs가 legacy 파티션으로 전환되고, 기간 파티션 생성 / 기간 조회의 partition pruning /
+    보관 기간이 지난 파티션의 보관 후 삭제가 동작
+    """
+    engine = create_engine(os.environ["TEST_POSTGRES_URL"])
+    Base.metadata.drop_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS schema_migrations"))
+    # 마이그레이션 전에 있던 로그
+    Base.metadata.create_all(bind=engine)
+    now = datetime.now(UTC)
+    with engine.begin() as conn:
+        conn.execute(insert(LLMLog), [
+            {"created_at": now - timedelta(days=1), "prompt": "old", "response": "response"} for _ in range(3)
+        ])
+    run_migrations(engine, Base.metadata)
+
+    with engine.connect() as conn:
+        assert [partition.name for partition in list_partitions(conn)] == ["llm_logs_legacy"]
+        # 30일 뒤까지의 파티션을 만들고 그 기간에 로그를 넣음
+        result = maintain_partitions(conn, now=now + timedelta(days=30), interval="day", premake=1, retention_days=0)
+        assert result.partitioned and result.created
+        conn.execute(insert(LLMLog), [
+            {"created_at": now + timedelta(days=day), "prompt": "new", "response": "response"} for day in range(3, 31)
+        ])
+        log_id = conn.execute(select(func.max(LLMLog.id))).scalar()
+        conn.execute(insert(LLMEvaluation).values(log_id=log_id, overall_score=5, is_flagged=False, label="ok"))
+        conn.commit()
+        assert conn.execute(text("SELECT COUNT(*) FROM llm_logs_default")).scalar() == 0
+
+        # 기간 조회는 해당 기간의 파티션만 읽음
+        start = period_start(now + timedelta(days=20), "day")
+        plan = "\n".join(conn.execute(
+            text("EXPLAIN SELECT count(*) FROM llm_logs WHERE created_at >= :start"), {"start": start}
+        ).scalars())
+        assert "llm_logs_legacy" not in plan
+        assert f"llm_logs_p{start + timedelta(days=5):%Y%m%d}" in plan
+        assert f"llm_logs_p{start - timedelta(days=5):%Y%m%d}" not in plan
+
+        # 10일 보관: legacy와 앞쪽 파티션을 보관 파일로 쓰고 삭제
+        result = maintain_partitions(
+            conn, now=now + timedelta(days=30), interval="day", premake=1,
+            retention_days=10, archive_dir=str(tmp_path),
+        )
+        assert "llm_logs_legacy" in result.archived
+        assert result.archived_rows >= 3
+        assert len(_read_archive(tmp_path / "llm_logs" / "llm_logs_legacy.jsonl.gz")) == 3
+        cutoff = now + timedelta(days=20)
+        assert all(partition.upper > cutoff for partition in list_partitions(conn))
+        assert conn.execute(select(func.min(LLMLog.created_at))).scalar() >= period_start(cutoff, "day") - timedelta(days=1)
+        # 남은 로그의 평가는 유지
+        assert conn.execute(select(func.count()).select_from(LLMEvaluation)).scalar() == 1
+
+    Base.metadata.drop_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS schema_migrations"))
+    engine.dispose()
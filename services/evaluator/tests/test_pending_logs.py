@@ -0,0 +1,88 @@
+"""
+평가 대기 로그 조회 (anti-join + watermark 커서) 테스트
+"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db import Base
+from app.models import LLMLog, LLMEvaluation
+from app.schema_migrations import run_migrations
+from app.utils import PendingLogCursor, get_pending_logs
+
+BASE_TIME = datetime(2025, 1, 1)
+
+
+def _session():
+    engine = create_engine("sqlite://")
+    run_migrations(engine, Base.metadata)
+    return sessionmaker(bind=engine)()
+
+
+def _add_logs(db, count: int, status: str = "success", start: int = 0):
+    db.add_all([
+        LLMLog(
+            id=start + i + 1,
+            created_at=BASE_TIME + timedelta(minutes=start + i),
+            prompt="prompt",
+            response="response",
+            status=status,
+        )
+        for i in range(count)
+    ])
+    db.commit()
+
+
+def _evaluate(db, log_ids):
+    db.add_all([LLMEvaluation(log_id=log_id, overall_score=5, label="ok") for log_id in log_ids])
+    db.commit()
+
+
+def test_returns_oldest_unevaluated_success_logs():
+    """평가된 로그와 에러 로그는 제외하고 오래된 순으로 반환"""
+    db = _session()
+    _add_logs(db, 5)
+    _add_logs(db, 2, status="error", start=5)
+    _evaluate(db, [1, 3])
+
+    assert [log.id for log in get_pending_logs(db, limit=10)] == [2, 4, 5]
+
+
+def test_cursor_skips_evaluated_prefix_but_keeps_failed_logs():
+    """watermark는 가장 오래된 대기 로그에 머물러서 평가 실패한 로그를 넘어가지 않음"""
+    db = _session()
+    _add_logs(db, 30)
+    cursor = PendingLogCursor(lookback_seconds=0)
+
+    first = get_pending_logs(db, limit=5, cursor=cursor)
+    assert [log.id for log in first] == [1, 2, 3, 4, 5]
+    assert cursor.watermark == first[0].created_at
+
+    # log 1은 평가 실패로 남고 나머지는 평가 완료
+    _evaluate(db, [2, 3, 4, 5])
+    second = get_pending_logs(db, limit=3, cursor=cursor)
+    assert [log.id for log in second] == [1, 6, 7]
+
+    # log 1까지 평가되면 watermark가 다음 대기 로그로 이동
+    _evaluate(db, [1, 6, 7])
+    third = get_pending_logs(db, limit=3, cursor=cursor)
+    assert [log.id for log in third] == [8, 9, 10]
+    assert cursor.watermark == third[0].created_at
+
+
+def test_cursor_lookback_picks_up_late_committed_logs():
+    """watermark보다 조금 이른 created_at으로 늦게 커밋된 로그도 lookback 구간에서 찾음"""
+    db = _session()
+    _add_logs(db, 5, start=10)
+    cursor = PendingLogCursor(lookback_seconds=300)
+
+    get_pending_logs(db, limit=5, cursor=cursor)
+    _evaluate(db, [11, 12, 13, 14, 15])
+
+    # watermark(10분)보다 3분 이른 로그가 뒤늦게 커밋됨
+    db.add(LLMLog(id=100, created_at=BASE_TIME + timedelta(minutes=7), prompt="p", response="r"))
+    db.commit()
+
+    assert [log.id for log in get_pending_logs(db, limit=5, cursor=cursor)] == [100]
@@ -0,0 +1,163 @@
+"""
+Continuous 평가 파이프라인 테스트
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db import Base
+from app.models import LLMLog
+from app.pipeline import BatchResult, ContinuousEvaluator
+from app.utils import get_evaluation_lag_seconds
+
+
+def test_batch_size_grows_with_backlog_and_shrinks_when_drained():
+    """배치가 가득 차면 배치 크기를 2배로, 덜 차면 절반으로 (min/max 범위 안에서)"""
+    backlog = [1000]
+    batch_sizes = []
+    drained = threading.Event()
+
+    def run_batch(batch_size):
+        batch_sizes.append(batch_size)
+        fetched = min(batch_size, backlog[0])
+        backlog[0] -= fetched
+        if backlog[0] == 0 and fetched == 0 and batch_size == 10:
+            drained.set()
+        return BatchResult(fetched, fetched)
+
+    evaluator = ContinuousEvaluator(
+        run_batch, min_batch_size=10, max_batch_size=160, idle_min_seconds=0.01, idle_max_seconds=0.05,
+    )
+    evaluator.start()
+    try:
+        assert drained.wait(timeout=5)
+    finally:
+        evaluator.stop()
+
+    # backlog 1000: 10, 20, 40, 80, 160 x 5 (=950) → 160 (50만 남음) → 80, 40, 20, 10 (빈 배치)
+    assert batch_sizes[:11] == [10, 20, 40, 80, 160, 160, 160, 160, 160, 160, 80]
+    assert batch_sizes[-1] == 10
+    assert not evaluator.running
+
+
+def test_idle_pipeline_polls_with_backoff_and_stops_promptly():
+    """대기 로그가 없으면 idle 대기 시간을 늘려가며 polling, stop()은 대기 중에도 바로 반환"""
+    calls = []
+
+    def run_batch(batch_size):
+        calls.append(time.monotonic())
+        return BatchResult(0, 0)
+
+    evaluator = ContinuousEvaluator(
+        run_batch, min_batch_size=10, max_batch_size=100, idle_min_seconds=0.05, idle_max_seconds=0.4,
+    )
+    evaluator.start()
+    time.sleep(0.5)
+
+    start = time.monotonic()
+    evaluator.stop()
+    assert time.monotonic() - start < 1.5
+
+    gaps = [b - a for a, b in zip(calls, calls[1:])]
+    assert 3 <= len(calls) <= 6  # 0.05, 0.1, 0.2, 0.4 ... 간격
+    assert gaps == sorted(gaps)
+
+
+def test_pipeline_backs_off_when_no_log_is_evaluated():
+    """judge 장애로 가득 찬 배치를 하나도 평가하지 못하면 바로 재시도하지 않고 대기 시간을 늘려가며 기다림"""
+    calls = []
+    batch_sizes = []
+
+    def run_batch(batch_size):
+        calls.append(time.monotonic())
+        batch_sizes.append(batch_size)
+        # 실패한 로그는 다음 배치에서 다시 가져오므로 항상 가득 찬 배치
+        return BatchResult(batch_size, 0)
+
+    evaluator = ContinuousEvaluator(
+        run_batch, min_batch_size=10, max_batch_size=160, idle_min_seconds=0.05, idle_max_seconds=0.4,
+    )
+    evaluator.start()
+    time.sleep(0.5)
+    evaluator.stop()
+
+    gaps = [b - a for a, b in zip(calls, calls[1:])]
+    assert 3 <= len(calls) <= 6  # 바로 재시도했다면 수천 번
+    assert all(gap >= 0.04 for gap in gaps)
+    assert gaps == sorted(gaps)
+    # 배치 크기도 늘리지 않음
+    assert set(batch_sizes) == {10}
+
+
+class _AlwaysNotifiedListener:
+    """gateway가 계속 로그를 쓰고 있어서 wait()이 항상 NOTIFY를 받는 listener"""
+
+    connected = True
+
+    def __init__(self):
+        self.waits = 0
+
+    def connect(self):
+        pass
+
+    def wait(self, timeout):
+        self.waits += 1
+        return True
+
+    def close(self):
+        pass
+
+
+def test_pipeline_backoff_ignores_notify_while_no_log_is_evaluated():
+    """평가하지 못한 동안은 NOTIFY에 깨어나지 않고 대기 시간을 모두 기다림, 빈 배치에서만 listener 사용"""
+    calls = []
+    results = [BatchResult(0, 0)]
+
+    def run_batch(batch_size):
+        calls.append(time.monotonic())
+        return results[0]
+
+    listener = _AlwaysNotifiedListener()
+    evaluator = ContinuousEvaluator(
+        run_batch, min_batch_size=10, max_batch_size=160, idle_min_seconds=0.05, idle_max_seconds=0.4,
+        listener=listener,
+    )
+    evaluator.start()
+    try:
+        # 빈 배치: NOTIFY를 받으면 바로 다음 배치
+        time.sleep(0.1)
+        assert len(calls) > 10
+
+        results[0] = BatchResult(10, 0)
+        time.sleep(0.1)
+        start = len(calls)
+        time.sleep(0.6)
+        stalled_calls = len(calls) - start
+    finally:
+        evaluator.stop()
+
+    # 0.05, 0.1, 0.2, 0.4 ... 간격 (NOTIFY에 깨어났다면 수천 번)
+    assert 1 <= stalled_calls <= 4
+
+
+def test_evaluation_lag_is_age_of_oldest_pending_log():
+    """평가 지연 = 가장 오래된 대기 로그의 나이, 대기 로그가 없으면 0"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    assert get_evaluation_lag_seconds(db) == 0.0
+
+    now = datetime.now(timezone.utc)
+    db.add_all([
+        LLMLog(id=1, created_at=now - timedelta(minutes=10), prompt="p", response="r", status="error"),
+        LLMLog(id=2, created_at=now - timedelta(minutes=5), prompt="p", response="r"),
+        LLMLog(id=3, created_at=now - timedelta(minutes=1), prompt="p", response="r"),
+    ])
+    db.commit()
+
+    assert 299 <= get_evaluation_lag_seconds(db) <= 310
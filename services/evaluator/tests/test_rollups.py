@@ -0,0 +1,156 @@
+"""
+통계 rollup (llm_stats_hourly) 증분 갱신 테스트
+"""
+
+import math
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db import Base
+from app.models import LLMEvaluation, LLMLatencySketchHourly, LLMLog, LLMStatsHourly
+from app.rollups import LATENCY_SKETCH_GAMMA, group_hours, refresh_rollups
+from app.schema_migrations import run_migrations
+
+BASE_TIME = datetime(2025, 1, 1)
+
+
+def _session():
+    engine = create_engine("sqlite://")
+    run_migrations(engine, Base.metadata)
+    return sessionmaker(bind=engine)()
+
+
+def _add_log(db, log_id: int, created_at: datetime, model_version: str | None = "gpt-a",
+             status: str = "success", latency_ms: float | None = 100.0):
+    db.add(LLMLog(
+        id=log_id,
+        created_at=created_at,
+        prompt="prompt",
+        response="response",
+        model_version=model_version,
+        status=status,
+        latency_ms=latency_ms,
+    ))
+    db.commit()
+
+
+def _evaluate(db, log_id: int, score: int, flagged: bool = False):
+    db.add(LLMEvaluation(log_id=log_id, overall_score=score, is_flagged=flagged, label="ok"))
+    db.commit()
+
+
+def _rollups(db) -> dict:
+    return {
+        (row.bucket_start, row.model_version): row
+        for row in db.execute(select(LLMStatsHourly)).scalars()
+    }
+
+
+def test_backfill_matches_raw_aggregates():
+    """처음 실행하면 전체 기간을 (시간, model_version) 단위로 집계, 정각에 생성된 로그도 포함"""
+    db = _session()
+    _add_log(db, 1, BASE_TIME + timedelta(minutes=5), latency_ms=100.0)
+    _add_log(db, 2, BASE_TIME + timedelta(minutes=59), status="error", latency_ms=None)
+    _add_log(db, 3, BASE_TIME + timedelta(hours=1), latency_ms=300.0)  # 정각
+    _add_log(db, 4, BASE_TIME + timedelta(minutes=10), model_version=None, latency_ms=50.0)
+    _add_log(db, 5, BASE_TIME + timedelta(hours=5), latency_ms=10.0)
+    _evaluate(db, 1, 4)
+    _evaluate(db, 1, 2, flagged=True)
+    _evaluate(db, 3, 5)
+
+    assert refresh_rollups(db) == 6
+
+    rollups = _rollups(db)
+    assert set(rollups) == {
+        (BASE_TIME, "gpt-a"),
+        (BASE_TIME, ""),
+        (BASE_TIME + timedelta(hours=1), "gpt-a"),
+        (BASE_TIME + timedelta(hours=5), "gpt-a"),
+    }
+
+    first = rollups[(BASE_TIME, "gpt-a")]
+    assert (first.request_count, first.error_count, first.latency_count, first.latency_sum) == (2, 1, 1, 100.0)
+    assert (first.evaluated_count, first.evaluation_count, first.score_sum, first.flagged_count) == (1, 2, 6, 1)
+
+    second = rollups[(BASE_TIME + timedelta(hours=1), "gpt-a")]
+    assert (second.request_count, second.evaluated_count, second.score_sum) == (1, 1, 5)
+
+    totals = db.execute(
+        select(func.sum(LLMStatsHourly.request_count), func.sum(LLMStatsHourly.latency_sum))
+    ).one()
+    assert totals == (5, 460.0)
+
+
+def test_incremental_refresh_picks_up_new_logs_and_late_evaluations():
+    """watermark 이후 생성된 로그의 시간대와, 예전 로그가 나중에 평가된 시간대만 다시 집계"""
+    db = _session()
+    _add_log(db, 1, BASE_TIME)
+    _add_log(db, 2, BASE_TIME + timedelta(days=1))
+    refresh_rollups(db)
+
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    _add_log(db, 3, now)
+    _evaluate(db, 1, 3)
+
+    assert refresh_rollups(db, lookback_seconds=60) == 2
+
+    rollups = _rollups(db)
+    assert rollups[(BASE_TIME, "gpt-a")].evaluated_count == 1
+    assert rollups[(now.replace(minute=0, second=0, microsecond=0), "gpt-a")].request_count == 1
+    assert rollups[(BASE_TIME + timedelta(days=1), "gpt-a")].evaluated_count == 0
+
+    # lookback 구간 안의 변경은 다음 실행에서도 다시 집계하지만 결과는 그대로
+    assert refresh_rollups(db, lookback_seconds=60) == 2
+    assert {key: row.request_count for key, row in _rollups(db).items()} == {
+        key: row.request_count for key, row in rollups.items()
+    }
+
+
+def test_full_refresh_is_idempotent():
+    db = _session()
+    for i in range(30):
+        _add_log(db, i + 1, BASE_TIME + timedelta(minutes=17 * i))
+        _evaluate(db, i + 1, 1 + i % 5)
+
+    refresh_rollups(db)
+    before = {key: (row.request_count, row.score_sum) for key, row in _rollups(db).items()}
+    refresh_rollups(db, full=True)
+
+    assert {key: (row.request_count, row.score_sum) for key, row in _rollups(db).items()} == before
+    assert sum(count for count, _ in before.values()) == 30
+
+
+def test_latency_sketch_bins_match_latencies():
+    """지연시간은 (시간, model_version, 로그 스케일 bin) 단위 개수로 집계되고, 0 / NULL 지연시간도 처리"""
+    db = _session()
+    latencies = [0.0, 0.5, 1.0, 99.0, 100.0, 101.0, 100.0, 2500.0, 60000.0, None]
+    for i, latency_ms in enumerate(latencies):
+        _add_log(db, i + 1, BASE_TIME + timedelta(minutes=i), latency_ms=latency_ms)
+    _add_log(db, 100, BASE_TIME + timedelta(hours=1), model_version=None, latency_ms=42.0)
+
+    refresh_rollups(db)
+
+    sketch = {
+        (row.bucket_start, row.model_version, row.bin): row.count
+        for row in db.execute(select(LLMLatencySketchHourly)).scalars()
+    }
+    expected = Counter(
+        (BASE_TIME, "gpt-a", math.ceil(math.log(max(latency_ms, 0.01)) / math.log(LATENCY_SKETCH_GAMMA)))
+        for latency_ms in latencies if latency_ms is not None
+    )
+    expected[(BASE_TIME + timedelta(hours=1), "", math.ceil(math.log(42.0) / math.log(LATENCY_SKETCH_GAMMA)))] = 1
+    assert sketch == expected
+
+
+def test_group_hours_merges_contiguous_hours():
+    hours = [BASE_TIME + timedelta(hours=h) for h in (0, 1, 2, 5, 6, 30)]
+
+    assert group_hours(hours, max_hours=2) == [
+        (BASE_TIME, BASE_TIME + timedelta(hours=2)),
+        (BASE_TIME + timedelta(hours=2), BASE_TIME + timedelta(hours=3)),
+        (BASE_TIME + timedelta(hours=5), BASE_TIME + timedelta(hours=7)),
+        (BASE_TIME + timedelta(hours=30), BASE_TIME + timedelta(hours=31)),
+    ]
@@ -0,0 +1,80 @@
+"""
+배치 룰 평가 엔진 테스트
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.models import LLMLog
+from app.rule_engine import BASIC_RULES, LengthRule, Rule, RuleBatch, RuleSet
+from app.rules import basic_rule_evaluate
+
+LONG_OK = "This is a perfectly reasonable answer about Python lists."
+
+
+def test_basic_rules_batch():
+    """길이/키워드 룰 적용, 둘 다 걸리면 키워드 룰이 우선"""
+    texts = [
+        LONG_OK,
+        "short",
+        None,
+        "The request FAILED with a Traceback in the worker process.",
+        "Error!",
+        "Stack Overflow has a good answer for this question, see the link.",
+    ]
+
+    result = BASIC_RULES.evaluate_batch(texts)
+
+    assert result.label.tolist() == ["ok", "too_short", "too_short", "error_like", "error_like", "error_like"]
+    assert result.overall_score.tolist() == [5, 2, 2, 1, 1, 1]
+    assert result.is_flagged.tolist() == [False, False, False, True, True, True]
+    assert result.rule_index.tolist() == [-1, 0, 0, 1, 1, 1]
+    assert result.comments[0] == "Looks fine by basic rules."
+    assert result.comments[1] == "Response is too short (length: 5 chars)."
+    assert result.comments[2] == "Response is too short (length: 0 chars)."
+    assert result.comments[3] == "Response looks like an error message. Detected keywords: traceback, failed"
+    assert result.comments[5] == "Response looks like an error message. Detected keywords: stack overflow"
+
+
+def test_basic_rule_evaluate_matches_batch():
+    """단일 로그 API는 배치 엔진과 같은 결과"""
+    result = basic_rule_evaluate(LLMLog(id=7, response="exception raised"))
+
+    assert result.log_id == 7
+    assert result.overall_score == 1
+    assert result.is_flagged is True
+    assert result.label == "error_like"
+    assert result.judge_model == "rule-basic-v1"
+    assert result.comment == "Response looks like an error message. Detected keywords: exception"
+
+
+def test_custom_rule_plugs_into_rule_set():
+    """Rule 서브클래스로 새 룰을 추가할 수 있음"""
+    @dataclass(frozen=True)
+    class ShoutingRule(Rule):
+        def match(self, batch: RuleBatch, rows: np.ndarray) -> np.ndarray:
+            return np.array([batch.texts[row].isupper() for row in rows], dtype=bool)
+
+        def comment(self, text: str, length: int) -> str:
+            return "Response is all caps."
+
+    rules = RuleSet(rules=(
+        LengthRule(name="too_short", score=2, label="too_short", min_length=10),
+        ShoutingRule(name="shouting", score=3, label="shouting", flag=True, priority=1),
+    ))
+
+    result = rules.evaluate_batch(["THIS IS A LOUD ANSWER", "fine answer here", "NO"])
+
+    assert result.label.tolist() == ["shouting", "ok", "shouting"]
+    assert result.overall_score.tolist() == [3, 5, 3]
+    assert result.comments[0] == "Response is all caps."
+
+
+def test_keyword_rows_stay_aligned_when_lowercase_changes_length():
+    """소문자 변환으로 길이가 바뀌는 문자가 있어도 키워드가 올바른 행에 매칭됨"""
+    texts = ["İstanbul İzmir İ" * 3, LONG_OK, "İ" * 40 + " error"]
+
+    result = BASIC_RULES.evaluate_batch(texts)
+
+    assert result.label.tolist() == ["ok", "ok", "error_like"]
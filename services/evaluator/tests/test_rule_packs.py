@@ -0,0 +1,91 @@
+"""
+rule pack (설정 기반 룰 정의) 테스트
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pytest
+
+from app.rule_engine import Rule, RuleBatch
+from app.rules import RULE_TYPES, load_rule_pack, register_rule_type
+
+
+def _pack(*rules: dict, **options) -> dict:
+    return {"judge_model": "rule-pack-test", **options, "rules": list(rules)}
+
+
+def test_load_rule_pack_builds_all_rule_types():
+    rule_set = load_rule_pack(_pack(
+        {"type": "length", "name": "too_short", "score": 2, "label": "too_short", "min_length": 10},
+        {"type": "json", "name": "not_json", "score": 3, "label": "not_json"},
+        {"type": "regex", "name": "apology", "score": 4, "label": "apology", "pattern": r"\bsorry\b"},
+        {"type": "language", "name": "not_korean", "score": 3, "label": "not_korean", "scripts": ["hangul"]},
+        {"type": "pii", "name": "pii", "score": 1, "label": "pii", "flag": True, "priority": 10, "patterns": ["email"]},
+    ))
+
+    result = rule_set.evaluate_batch([
+        "{}",
+        '{"answer": "mail me at someone@example.com"}',
+        "Sorry, 답변을 드릴 수 없습니다",
+        '"정상적인 JSON 문자열 응답입니다"',
+        "This answer is written in English only",
+    ])
+
+    assert rule_set.judge_model == "rule-pack-test"
+    # 같은 priority(0) 안에서는 length → regex/language → json 순으로 평가되어 먼저 걸린 룰이 적용됨
+    assert result.label.tolist() == ["too_short", "pii", "apology", "ok", "not_korean"]
+    assert result.is_flagged.tolist() == [False, True, False, False, False]
+    assert result.comments[1] == "Response may contain personal information: email"
+
+
+def test_higher_priority_rule_wins_and_skips_decided_rows():
+    """priority가 높은 룰이 먼저 평가되고, 걸린 행은 이후 룰에서 건너뜀"""
+    evaluated_rows = []
+
+    @dataclass(frozen=True)
+    class RecordingRule(Rule):
+        def match(self, batch: RuleBatch, rows: np.ndarray) -> np.ndarray:
+            evaluated_rows.append(rows.tolist())
+            return np.ones(len(rows), dtype=bool)
+
+        def comment(self, text: str, length: int) -> str:
+            return "recorded"
+
+    rule_set = load_rule_pack(_pack(
+        {"type": "regex", "name": "secret", "score": 1, "label": "secret", "priority": 5, "pattern": "secret"},
+        {"type": "keywords", "name": "secret_keyword", "score": 2, "label": "keyword", "priority": 5,
+         "keywords": ["secret"]},
+    ))
+    # 같은 priority면 비용이 낮은 keywords 룰이 먼저 평가되어 적용됨
+    assert rule_set.evaluate_batch(["top secret"]).label.tolist() == ["keyword"]
+
+    register_rule_type("recording")(RecordingRule)
+    try:
+        rule_set = load_rule_pack(_pack(
+            {"type": "recording", "name": "fallback", "score": 3, "label": "fallback"},
+            {"type": "keywords", "name": "error_keywords", "score": 1, "label": "error_like", "priority": 1,
+             "keywords": ["error"]},
+        ))
+        result = rule_set.evaluate_batch(["an error", "fine", "error again", "also fine"])
+    finally:
+        RULE_TYPES.pop("recording")
+
+    assert result.label.tolist() == ["error_like", "fallback", "error_like", "fallback"]
+    assert evaluated_rows == [[1, 3]]
+
+
+@pytest.mark.parametrize("pack", [
+    _pack({"type": "unknown", "name": "x", "score": 1, "label": "x"}),
+    _pack({"type": "length", "name": "x", "score": 1, "label": "x", "min_lenght": 3}),
+    _pack({"type": "pii", "name": "x", "score": 1, "label": "x", "patterns": ["passport"]}),
+    _pack({"type": "regex", "name": "x", "score": 1, "label": "x", "pattern": "("}),
+    _pack(
+        {"type": "length", "name": "dup", "score": 1, "label": "x", "min_length": 3},
+        {"type": "json", "name": "dup", "score": 1, "label": "y"},
+    ),
+    _pack(unknown_option=True),
+])
+def test_invalid_rule_pack_is_rejected(pack):
+    with pytest.raises(ValueError):
+        load_rule_pack(pack)
@@ -0,0 +1,118 @@
+"""
+멀티 워커 work claiming (리스 테이블) 테스트
+"""
+
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db import Base
+from app.models import LLMLog, LLMEvaluation, LLMTextBlob, EvaluationLease
+from app.text_blobs import offload_rows, upsert_blobs
+from app.utils import pending_log_cursor
+from app.work_claim import claim_pending_logs, fetch_pending_logs, release_leases
+from benchmarks.bench_worker_scaling import count_evaluations, run_workers
+
+BASE_TIME = datetime(2025, 1, 1)
+
+
+@pytest.fixture
+def sessions(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'claim.db'}")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+
+    db = Session()
+    db.add_all([
+        LLMLog(id=i, created_at=BASE_TIME + timedelta(minutes=i), prompt="prompt", response="response")
+        for i in range(1, 11)
+    ])
+    db.commit()
+    db.close()
+    return Session
+
+
+def test_workers_claim_disjoint_logs(sessions):
+    """두 워커가 동시에 클레임해도 같은 로그를 가져가지 않음"""
+    first = claim_pending_logs(sessions(), limit=4, worker_id="worker-a", lease_seconds=60)
+    second = claim_pending_logs(sessions(), limit=4, worker_id="worker-b", lease_seconds=60)
+
+    assert [log.id for log in first] == [1, 2, 3, 4]
+    assert [log.id for log in second] == [5, 6, 7, 8]
+
+
+def test_expired_lease_is_reclaimed(sessions):
+    """만료된 리스(죽은 워커)는 다른 워커가 다시 가져감"""
+    db = sessions()
+    db.add(EvaluationLease(log_id=1, worker_id="dead-worker", leased_until=datetime(2000, 1, 1)))
+    db.add(EvaluationLease(log_id=2, worker_id="busy-worker", leased_until=datetime(2999, 1, 1)))
+    db.commit()
+
+    claimed = claim_pending_logs(sessions(), limit=2, worker_id="worker-a", lease_seconds=60)
+
+    assert [log.id for log in claimed] == [1, 3]
+    assert db.scalar(select(EvaluationLease.worker_id).where(EvaluationLease.log_id == 1)) == "worker-a"
+
+
+def test_released_failed_logs_can_be_claimed_again(sessions):
+    """리스를 해제하면 평가되지 않은 로그는 다시 클레임 대상이 되고, 평가된 로그는 제외됨"""
+    db = sessions()
+    claimed = claim_pending_logs(db, limit=3, worker_id="worker-a", lease_seconds=60)
+
+    # log 1만 평가 저장, 2/3은 평가 실패
+    db.add(LLMEvaluation(log_id=1, overall_score=5, label="ok"))
+    db.commit()
+    release_leases(db, claimed, worker_id="worker-a")
+
+    again = claim_pending_logs(sessions(), limit=3, worker_id="worker-b", lease_seconds=60)
+    assert [log.id for log in again] == [2, 3, 4]
+
+
+def test_fetch_pending_logs_returns_full_offloaded_bodies(sessions):
+    """오프로드된 응답은 전체 본문으로 채워서 평가하고, llm_logs에는 미리보기가 그대로 남음"""
+    body = "긴 응답 본문 " * 100
+    row = {"response": body}
+    used_at = datetime.now(timezone.utc)
+    db = sessions()
+    db.execute(upsert_blobs(LLMTextBlob, "sqlite", offload_rows([row], 50, used_at), used_at))
+    log = db.get(LLMLog, 3)
+    log.response, log.response_hash = row["response"], row["response_hash"]
+    db.commit()
+
+    pending_log_cursor.reset()
+    try:
+        logs = fetch_pending_logs(db, limit=5)
+    finally:
+        pending_log_cursor.reset()
+
+    assert [log.response for log in logs if log.id == 3] == [body]
+    assert not db.dirty
+    db.commit()
+    assert db.scalar(select(LLMLog.response).where(LLMLog.id == 3)) == body[:50]
+
+
+def test_multiple_worker_processes_do_not_double_evaluate(tmp_path):
+    """워커 프로세스 여러 개가 동시에 드레인해도 로그당 평가는 하나"""
+    database_url = f"sqlite:///{tmp_path / 'workers.db'}"
+
+    _, processed = run_workers(database_url, workers=3, logs=150, batch_size=10, batch_seconds=0.01)
+
+    assert sum(processed.values()) == 150
+    assert count_evaluations(database_url) == (150, 150)
+
+
+@pytest.mark.skipif(not os.getenv("TEST_POSTGRES_URL"), reason="TEST_POSTGRES_URL not set (빈 테스트용 Postgres DB)")
+def test_postgres_throughput_scales_with_workers():
+    """Postgres에서 워커 수에 비례해 처리량이 증가 (4 워커 ≥ 1 워커의 3배)"""
+    database_url = os.environ["TEST_POSTGRES_URL"]
+
+    single_elapsed, _ = run_workers(database_url, workers=1, logs=800, batch_size=20, batch_seconds=0.1)
+    assert count_evaluations(database_url) == (800, 800)
+
+    multi_elapsed, processed = run_workers(database_url, workers=4, logs=800, batch_size=20, batch_seconds=0.1)
+    assert count_evaluations(database_url) == (800, 800)
+    assert all(count > 0 for count in processed.values())
+    assert single_elapsed / multi_elapsed >= 3.0
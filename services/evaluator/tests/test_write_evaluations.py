@@ -0,0 +1,56 @@
+"""
+평가 결과 bulk insert 테스트
+"""
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db import Base
+from app.evaluation import EvaluationOutcome, write_evaluations
+from app.models import LLMLog, LLMEvaluation
+
+
+def _session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)()
+
+
+def _outcome(log_id: int, overall_score: int | None) -> EvaluationOutcome:
+    log = LLMLog(id=log_id, prompt="prompt", response="response")
+    evaluation = LLMEvaluation(
+        log_id=log_id,
+        overall_score=overall_score,
+        is_flagged=False,
+        label="ok",
+        judge_model="rule-basic-v1",
+    )
+    return EvaluationOutcome(log, evaluation, None, 0.0)
+
+
+def test_write_evaluations_inserts_all_rows_in_chunks():
+    """정상 행들은 청크 단위로 모두 저장됨"""
+    db = _session()
+
+    outcomes = write_evaluations(db, [_outcome(i, 4) for i in range(7)], chunk_size=3)
+
+    assert all(outcome.error is None for outcome in outcomes)
+    assert db.scalar(select(func.count()).select_from(LLMEvaluation)) == 7
+
+
+def test_write_evaluations_isolates_bad_rows():
+    """청크 insert가 실패하면 행 단위로 재시도해서 문제 있는 행만 실패 처리"""
+    db = _session()
+    failed_before = EvaluationOutcome(LLMLog(id=99), None, RuntimeError("judge failed"), 0.0)
+
+    outcomes = write_evaluations(
+        db,
+        [_outcome(1, 4), _outcome(2, None), failed_before, _outcome(3, 5)],  # overall_score NOT NULL 위반
+        chunk_size=10,
+    )
+
+    assert [outcome.error is None for outcome in outcomes] == [True, False, False, True]
+    assert outcomes[1].evaluation is None
+    assert outcomes[2] is failed_before
+    saved = db.scalars(select(LLMEvaluation.log_id).order_by(LLMEvaluation.log_id)).all()
+    assert saved == [1, 3]
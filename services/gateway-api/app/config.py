@@ -1,17 +1,82 @@
+from pydantic import BaseModel
 from pydantic_settings import BaseSettings
 
 
+class LLMBackendConfig(BaseModel):
+    """라우터가 사용할 OpenAI 호환 백엔드 하나 (지역 배포, 로컬 vLLM 등)."""
+    name: str
+    base_url: str
+    api_key: str | None = None  # 없으면 llm_api_key 사용
+    model: str | None = None  # 백엔드에서 부르는 모델 이름이 다르면 지정
+
+
 class Settings(BaseSettings):
     app_env: str = "local"
 
     database_url: str
+    # 시작 시 스키마 마이그레이션 적용 (false면 없는 테이블만 만들고, 마이그레이션은 python -m app.schema_migrations로 따로 실행)
+    schema_auto_migrate: bool = True
+    # async 엔진용 URL (없으면 database_url에서 asyncpg/aiosqlite URL로 변환)
+    async_database_url: str | None = None
+    async_db_pool_size: int = 20
+    async_db_max_overflow: int = 20
+
     openai_model_main: str = "gpt-5-mini"
     
     llm_api_base_url: str | None = None
     llm_api_key: str | None = None
 
+    # LLM 호출 HTTP 트랜스포트 (커넥션 풀 / 타임아웃 / 재시도)
+    llm_http_max_connections: int = 200
+    llm_http_max_keepalive_connections: int = 100
+    llm_http_keepalive_expiry_seconds: float = 30.0
+    llm_http2_enabled: bool = False
+    llm_http_connect_timeout_seconds: float = 5.0
+    llm_http_read_timeout_seconds: float = 60.0
+    # 429/5xx/연결 오류 재시도 횟수 (OpenAI SDK의 지수 백오프 + jitter 사용)
+    llm_max_retries: int = 2
+
+    # 멀티 백엔드 라우터: model_version -> 백엔드 목록 (JSON, "*"는 나머지 모든 모델)
+    # 예: LLM_BACKENDS='{"gpt-5-mini": [{"name": "us", "base_url": "https://..."}, {"name": "vllm", "base_url": "http://vllm:8000/v1"}]}'
+    llm_backends: dict[str, list[LLMBackendConfig]] = {}
+    llm_router_ewma_alpha: float = 0.3  # 지연시간 EWMA 가중치 (클수록 최근 값 반영)
+    llm_router_failure_threshold: int = 5  # 연속 실패 시 circuit open
+    llm_router_cooldown_seconds: float = 30.0  # circuit open 유지 시간 (이후 half-open)
+    llm_router_max_attempts: int = 2  # 실패 시 다른 백엔드로 재시도하는 최대 횟수
+
     log_level: str = "INFO"
 
+    # 동일 프롬프트 응답 캐시 (키: 정규화된 프롬프트 + 사용 모델)
+    response_cache_enabled: bool = False
+    response_cache_ttl_seconds: int = 300
+    response_cache_max_entries: int = 10000  # 프로세스 내 LRU 최대 개수
+    response_cache_redis_url: str | None = None  # 설정 시 Redis 공유 캐시 사용
+
+    # 동시에 들어온 동일 (프롬프트, 모델) 요청을 LLM 호출 하나로 병합
+    llm_single_flight_enabled: bool = True
+
+    # LLMLog write-behind 버퍼 (비활성화 시 요청마다 직접 INSERT)
+    log_writer_enabled: bool = True
+    log_writer_batch_size: int = 200  # flush 한 번에 쓰는 최대 로그 수
+    log_writer_flush_interval_ms: int = 500  # 배치가 덜 찼어도 flush하는 주기
+    log_writer_max_queue_size: int = 10000  # 가득 차면 /chat이 대기 (backpressure)
+    log_writer_max_retries: int = 3  # 연결 오류 / 풀 타임아웃 등으로 flush가 실패하면 배치를 다시 시도하는 횟수
+    log_writer_retry_backoff_ms: int = 200  # 첫 재시도 대기 시간 (재시도마다 2배)
+    log_notify_channel: str | None = "llm_logs_inserted"  # flush 후 Postgres NOTIFY 채널 (evaluator continuous 모드)
+    # 긴 prompt / response는 llm_logs에 앞부분만 저장하고 전체 본문은 llm_text_blobs에 (내용 해시로 중복 제거)
+    log_body_offload_enabled: bool = True
+    log_body_preview_chars: int = 200  # llm_logs에 저장하는 미리보기 길이 (목록 API도 이 길이로 자름)
+
+    # 대시보드/분석 API가 evaluator의 통계 rollup(llm_stats_hourly)을 읽음 (rollup이 없으면 원본 테이블 집계)
+    analytics_use_rollups: bool = True
+    # /api/dashboard/logs, /evaluations의 count=estimated에서 Postgres 통계가 없을 때 COUNT(*) 캐시 시간
+    dashboard_count_cache_ttl_seconds: float = 30.0
+    # /api/dashboard/summary, /models/stats 결과 캐시 (stale-while-revalidate, 0이면 캐시 안 함)
+    read_cache_ttl_seconds: float = 10.0
+    read_cache_stale_seconds: float = 60.0  # TTL이 지난 뒤에도 백그라운드 갱신 동안 이전 값으로 응답하는 시간
+    # evaluator가 평가/rollup을 쓰면 NOTIFY하는 Postgres 채널 (LISTEN해서 캐시 만료, 없으면 TTL로만)
+    stats_notify_channel: str | None = "llm_stats_changed"
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -1,4 +1,5 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 from .config import settings
@@ -13,6 +14,64 @@ SessionLocal = sessionmaker(
 
 Base = declarative_base()
 
+# async 드라이버 매핑 (동기 URL -> async URL)
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+# async 엔진은 처음 사용할 때 생성 (드라이버가 없는 환경에서도 import는 가능하도록)
+_async_engine = None
+_AsyncSessionLocal: async_sessionmaker[AsyncSession] | None = None
+
+
+def to_async_url(url: str) -> str:
+    """
+    동기 드라이버 URL(postgresql://, sqlite://)을 async 드라이버 URL로 변환.
+    이미 async 드라이버가 지정된 URL은 그대로 반환.
+    """
+    scheme, sep, rest = url.partition("://")
+    if not sep:
+        return url
+    return f"{_ASYNC_DRIVERS.get(scheme, scheme)}://{rest}"
+
+
+def get_async_engine():
+    global _async_engine, _AsyncSessionLocal
+
+    if _async_engine is None:
+        url = settings.async_database_url or to_async_url(settings.database_url)
+        engine_kwargs = {"pool_pre_ping": True}
+        if not url.startswith("sqlite"):
+            # 수천 개의 in-flight 요청이 짧게 커넥션을 빌려 쓰도록 풀 크기 설정
+            engine_kwargs["pool_size"] = settings.async_db_pool_size
+            engine_kwargs["max_overflow"] = settings.async_db_max_overflow
+
+        _async_engine = create_async_engine(url, **engine_kwargs)
+        _AsyncSessionLocal = async_sessionmaker(
+            bind=_async_engine,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+
+    return _async_engine
+
+
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    get_async_engine()
+    return _AsyncSessionLocal
+
+
+async def dispose_async_engine():
+    """앱 종료 시 async 커넥션 풀 정리."""
+    global _async_engine, _AsyncSessionLocal
+
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _AsyncSessionLocal = None
+
 
 def get_db():
     db = SessionLocal()
@@ -0,0 +1,206 @@
+"""
+LLM 호출용 HTTP 트랜스포트 모듈.
+
+OpenAI 클라이언트에 넘길 httpx 클라이언트를 Settings 기반으로 구성한다.
+(커넥션 풀 크기, keepalive, HTTP/2, connect/read 타임아웃)
+
+풀별로 다음 메트릭을 기록한다.
+- in-use: 커넥션을 점유 중인 요청 수 (max_connections 이하)
+- waiting: 커넥션이 나기를 기다리는 요청 수
+- 커넥션 재사용률: 1 - (새로 연 TCP 커넥션 수 / 요청 수)
+
+in-use/waiting은 동시 요청 수와 max_connections로 계산한 값이라
+HTTP/2 멀티플렉싱 시에는 실제 커넥션 수보다 크게 보일 수 있다.
+"""
+
+import threading
+
+from openai import DefaultAsyncHttpxClient, DefaultHttpxClient
+
+try:
+    # 최신 openai SDK는 httpx 대신 API 호환 포크인 httpx2 위에서 동작
+    import httpx2 as httpx
+except ImportError:
+    import httpx
+
+from .config import settings
+from .metrics import record_http_pool_state, record_http_pool_request
+
+# httpcore trace 이벤트: 새 TCP 커넥션 연결 완료
+_CONNECT_EVENT = "connection.connect_tcp.complete"
+
+
+def build_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.llm_http_max_connections,
+        max_keepalive_connections=settings.llm_http_max_keepalive_connections,
+        keepalive_expiry=settings.llm_http_keepalive_expiry_seconds,
+    )
+
+
+def build_timeout() -> httpx.Timeout:
+    return httpx.Timeout(
+        connect=settings.llm_http_connect_timeout_seconds,
+        read=settings.llm_http_read_timeout_seconds,
+        write=settings.llm_http_connect_timeout_seconds,
+        # 풀에서 커넥션을 기다리는 시간은 read 타임아웃과 동일하게
+        pool=settings.llm_http_read_timeout_seconds,
+    )
+
+
+class PoolStats:
+    """풀 하나의 동시 요청 수와 요청/커넥션 카운트를 추적."""
+
+    def __init__(self, pool: str, max_connections: int):
+        self.pool = pool
+        self.max_connections = max_connections
+        self.in_flight = 0
+        self.requests = 0
+        self.connections_opened = 0
+        self._lock = threading.Lock()
+
+    def request_started(self):
+        with self._lock:
+            self.in_flight += 1
+            self.requests += 1
+            self._publish(new_request=True)
+
+    def request_finished(self):
+        with self._lock:
+            self.in_flight -= 1
+            self._publish()
+
+    def connection_opened(self):
+        with self._lock:
+            self.connections_opened += 1
+            self._publish(new_connection=True)
+
+    @property
+    def reuse_ratio(self) -> float:
+        if self.requests == 0:
+            return 0.0
+        return max(0.0, 1.0 - self.connections_opened / self.requests)
+
+    def _publish(self, new_request: bool = False, new_connection: bool = False):
+        in_use = min(self.in_flight, self.max_connections)
+        waiting = max(0, self.in_flight - self.max_connections)
+        record_http_pool_state(self.pool, in_use, waiting, self.reuse_ratio)
+        if new_request or new_connection:
+            record_http_pool_request(self.pool, new_request=new_request, new_connection=new_connection)
+
+
+class _TrackedStream(httpx.SyncByteStream):
+    """응답 본문을 다 읽고 닫을 때 요청 종료를 기록하는 스트림 래퍼."""
+
+    def __init__(self, stream: httpx.SyncByteStream, on_close):
+        self._stream = stream
+        self._on_close = on_close
+
+    def __iter__(self):
+        yield from self._stream
+
+    def close(self):
+        try:
+            self._stream.close()
+        finally:
+            self._on_close()
+
+
+class _TrackedAsyncStream(httpx.AsyncByteStream):
+    def __init__(self, stream: httpx.AsyncByteStream, on_close):
+        self._stream = stream
+        self._on_close = on_close
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            self._on_close()
+
+
+def _once(fn):
+    called = False
+
+    def wrapper():
+        nonlocal called
+        if not called:
+            called = True
+            fn()
+
+    return wrapper
+
+
+class InstrumentedTransport(httpx.HTTPTransport):
+    """풀 메트릭을 기록하는 동기 httpx 트랜스포트."""
+
+    def __init__(self, pool: str, **kwargs):
+        super().__init__(**kwargs)
+        self.stats = PoolStats(pool, settings.llm_http_max_connections)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        upstream_trace = request.extensions.get("trace")
+
+        def trace(event_name, info):
+            if event_name == _CONNECT_EVENT:
+                self.stats.connection_opened()
+            if upstream_trace is not None:
+                upstream_trace(event_name, info)
+
+        request.extensions["trace"] = trace
+        finished = _once(self.stats.request_finished)
+        self.stats.request_started()
+
+        try:
+            response = super().handle_request(request)
+        except BaseException:
+            finished()
+            raise
+
+        response.stream = _TrackedStream(response.stream, finished)
+        return response
+
+
+class InstrumentedAsyncTransport(httpx.AsyncHTTPTransport):
+    """풀 메트릭을 기록하는 async httpx 트랜스포트."""
+
+    def __init__(self, pool: str, **kwargs):
+        super().__init__(**kwargs)
+        self.stats = PoolStats(pool, settings.llm_http_max_connections)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        upstream_trace = request.extensions.get("trace")
+
+        async def trace(event_name, info):
+            if event_name == _CONNECT_EVENT:
+                self.stats.connection_opened()
+            if upstream_trace is not None:
+                await upstream_trace(event_name, info)
+
+        request.extensions["trace"] = trace
+        finished = _once(self.stats.request_finished)
+        self.stats.request_started()
+
+        try:
+            response = await super().handle_async_request(request)
+        except BaseException:
+            finished()
+            raise
+
+        response.stream = _TrackedAsyncStream(response.stream, finished)
+        return response
+
+
+def create_http_client(pool: str) -> httpx.Client:
+    """OpenAI 동기 클라이언트용 httpx 클라이언트."""
+    transport = InstrumentedTransport(pool, limits=build_limits(), http2=settings.llm_http2_enabled)
+    return DefaultHttpxClient(transport=transport, timeout=build_timeout())
+
+
+def create_async_http_client(pool: str) -> httpx.AsyncClient:
+    """OpenAI async 클라이언트용 httpx 클라이언트."""
+    transport = InstrumentedAsyncTransport(pool, limits=build_limits(), http2=settings.llm_http2_enabled)
+    return DefaultAsyncHttpxClient(transport=transport, timeout=build_timeout())
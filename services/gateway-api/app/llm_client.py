@@ -1,13 +1,33 @@
+import asyncio
+import logging
+import random
 import time
+from contextlib import asynccontextmanager
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI, APIConnectionError, APIStatusError, RateLimitError
 
-from .config import settings
+from .config import settings, LLMBackendConfig
+from .http_transport import build_timeout, create_http_client, create_async_http_client
+from .metrics import record_backend_request, update_backend_state
+
+logger = logging.getLogger(__name__)
 
 # 전역 클라이언트 한 번만 생성
 client = OpenAI(
     api_key=settings.llm_api_key,
     base_url=settings.llm_api_base_url or None,
+    max_retries=settings.llm_max_retries,
+    timeout=build_timeout(),
+    http_client=create_http_client("llm"),
+)
+
+# /chat 경로용 async 클라이언트 (이벤트 루프에서 수천 개의 호출을 동시에 대기)
+async_client = AsyncOpenAI(
+    api_key=settings.llm_api_key,
+    base_url=settings.llm_api_base_url or None,
+    max_retries=settings.llm_max_retries,
+    timeout=build_timeout(),
+    http_client=create_async_http_client("llm_async"),
 )
 
 
@@ -45,3 +65,263 @@ def call_llm(prompt: str, model_version: str | None = None) -> tuple[str, float]
 
     elapsed_ms = (time.perf_counter() - start) * 1000.0
     return text, elapsed_ms
+
+
+class Backend:
+    """
+    라우터 풀에 속한 OpenAI 호환 백엔드 하나.
+    전용 클라이언트(커넥션 풀)와 라우팅 상태(EWMA 지연시간, 처리 중 요청 수, circuit)를 가진다.
+    """
+
+    def __init__(self, config: LLMBackendConfig):
+        self.name = config.name
+        self.model = config.model
+        self.client = AsyncOpenAI(
+            api_key=config.api_key or settings.llm_api_key,
+            base_url=config.base_url,
+            # 실패 시 재시도는 라우터가 다른 백엔드로 넘기는 방식으로 처리
+            max_retries=0,
+            timeout=build_timeout(),
+            http_client=create_async_http_client(f"backend:{config.name}"),
+        )
+
+        self.ewma_seconds: float | None = None
+        self.outstanding = 0
+        self.consecutive_failures = 0
+        self.open_until = 0.0  # 0이면 circuit closed
+        self.probing = False  # half-open 상태에서 시험 요청이 진행 중인지
+
+    def is_available(self, now: float) -> bool:
+        if self.open_until == 0.0:
+            return True
+        if now < self.open_until:
+            return False
+        # 쿨다운이 끝난 half-open 상태: 시험 요청 하나만 허용
+        return not self.probing
+
+    def score(self) -> float:
+        """낮을수록 우선. 아직 측정값이 없는 백엔드는 먼저 시도한다."""
+        if self.ewma_seconds is None:
+            return 0.0
+        return self.ewma_seconds * (self.outstanding + 1)
+
+
+def _is_backend_failure(error: Exception) -> bool:
+    """연결 오류, 429, 5xx만 백엔드 장애로 본다. (4xx 요청 오류는 다른 백엔드에서도 같음)"""
+    if isinstance(error, (APIConnectionError, RateLimitError)):
+        return True
+    return isinstance(error, APIStatusError) and error.status_code >= 500
+
+
+class LLMRouter:
+    """
+    model_version별 백엔드 풀에서 지연시간 기반으로 백엔드를 고르는 라우터.
+
+    - 선택: EWMA 지연시간 * (처리 중 요청 수 + 1)이 가장 작은 백엔드
+    - 장애: 연속 실패가 임계값을 넘으면 쿨다운 동안 제외 (circuit open),
+      쿨다운 후 시험 요청 하나가 성공하면 복구
+    - 재시도: 백엔드 장애로 실패하면 다른 백엔드로 최대 llm_router_max_attempts회 시도
+    """
+
+    def __init__(self, pools: dict[str, list[LLMBackendConfig]]):
+        self.pools = {
+            model: [Backend(config) for config in configs]
+            for model, configs in pools.items()
+            if configs
+        }
+
+    def backends_for(self, model: str) -> list[Backend] | None:
+        return self.pools.get(model) or self.pools.get("*")
+
+    def pick(self, backends: list[Backend], exclude: list[Backend] = ()) -> Backend:
+        now = time.monotonic()
+        candidates = [b for b in backends if b not in exclude and b.is_available(now)]
+        if not candidates:
+            candidates = [b for b in backends if b.is_available(now)]
+        if not candidates:
+            # 전부 제외된 상태면 요청을 바로 실패시키지 않고 가장 먼저 복구될 백엔드로 보냄
+            return min(backends, key=lambda b: b.open_until)
+
+        best = min(b.score() for b in candidates)
+        return random.choice([b for b in candidates if b.score() == best])
+
+    def _begin(self, backend: Backend):
+        if backend.open_until and time.monotonic() >= backend.open_until:
+            backend.probing = True
+        backend.outstanding += 1
+        update_backend_state(backend.name, backend.outstanding, circuit_open=backend.open_until > 0)
+
+    def _end(self, backend: Backend, duration_seconds: float, outcome: str):
+        """
+        outcome: 'success' | 'failure' (백엔드 장애) | 'neutral' (요청 오류, 취소)
+        """
+        backend.outstanding -= 1
+        probing, backend.probing = backend.probing, False
+
+        if outcome == "success":
+            alpha = settings.llm_router_ewma_alpha
+            if backend.ewma_seconds is None:
+                backend.ewma_seconds = duration_seconds
+            else:
+                backend.ewma_seconds = alpha * duration_seconds + (1 - alpha) * backend.ewma_seconds
+            backend.consecutive_failures = 0
+            if backend.open_until:
+                logger.info(f"LLM backend '{backend.name}' recovered")
+            backend.open_until = 0.0
+        elif outcome == "failure":
+            backend.consecutive_failures += 1
+            if probing or backend.consecutive_failures >= settings.llm_router_failure_threshold:
+                backend.open_until = time.monotonic() + settings.llm_router_cooldown_seconds
+                logger.warning(
+                    f"LLM backend '{backend.name}' ejected for {settings.llm_router_cooldown_seconds}s "
+                    f"after {backend.consecutive_failures} consecutive failures"
+                )
+
+        record_backend_request(
+            backend.name,
+            "success" if outcome == "success" else "error",
+            duration_seconds,
+            backend.ewma_seconds,
+        )
+        update_backend_state(backend.name, backend.outstanding, circuit_open=backend.open_until > 0)
+
+    @asynccontextmanager
+    async def route_to(self, backend: Backend):
+        """백엔드 하나로 단일 시도. 종료 시 결과에 따라 EWMA/circuit 상태를 갱신."""
+        self._begin(backend)
+        start = time.perf_counter()
+        outcome = "neutral"
+        try:
+            yield backend
+            outcome = "success"
+        except Exception as e:
+            outcome = "failure" if _is_backend_failure(e) else "neutral"
+            raise
+        finally:
+            self._end(backend, time.perf_counter() - start, outcome)
+
+    def route(self, model: str):
+        """백엔드를 골라 단일 시도로 사용 (스트리밍처럼 중간에 재시도할 수 없는 호출용)."""
+        return self.route_to(self.pick(self.backends_for(model)))
+
+    async def call(self, model: str, request_fn):
+        """
+        request_fn(backend)을 실행하고, 백엔드 장애면 다른 백엔드로 재시도.
+        """
+        backends = self.backends_for(model)
+        tried: list[Backend] = []
+        last_error: Exception | None = None
+
+        for attempt in range(max(1, settings.llm_router_max_attempts)):
+            backend = self.pick(backends, exclude=tried)
+            if backend in tried:
+                # 다른 후보가 없어 같은 백엔드를 다시 시도할 때는 jitter backoff
+                await asyncio.sleep(random.uniform(0, 0.5 * 2 ** attempt))
+            tried.append(backend)
+
+            try:
+                async with self.route_to(backend):
+                    return await request_fn(backend)
+            except Exception as e:
+                if not _is_backend_failure(e):
+                    raise
+                last_error = e
+                logger.warning(f"LLM backend '{backend.name}' failed (attempt {attempt + 1}): {str(e)}")
+
+        raise last_error
+
+
+# LLM_BACKENDS가 비어 있으면 라우터를 쓰지 않고 기본 클라이언트로 호출
+llm_router = LLMRouter(settings.llm_backends)
+
+
+async def call_llm_async(prompt: str, model_version: str | None = None) -> tuple[str, float]:
+    """
+    call_llm의 async 버전.
+    스레드풀 워커를 점유하지 않고 이벤트 루프에서 LLM 응답을 기다린다.
+    해당 모델에 백엔드 풀이 설정돼 있으면 라우터를 거친다.
+    """
+    model = _resolve_model(model_version)
+
+    start = time.perf_counter()
+
+    if llm_router.backends_for(model):
+        response = await llm_router.call(
+            model,
+            lambda backend: backend.client.responses.create(
+                model=backend.model or model,
+                input=prompt,
+            ),
+        )
+    else:
+        response = await async_client.responses.create(
+            model=model,
+            input=prompt,
+        )
+
+    text = response.output_text
+
+    elapsed_ms = (time.perf_counter() - start) * 1000.0
+    return text, elapsed_ms
+
+
+class LLMStream:
+    """
+    스트리밍 LLM 호출 결과.
+    async for로 텍스트 조각(delta)을 받아오고, 스트림이 끝나면
+    전체 텍스트와 TTFT/총 지연시간/출력 토큰 수를 속성으로 제공한다.
+
+        stream = stream_llm(prompt, model)
+        async for delta in stream:
+            ...
+        stream.text, stream.ttft_ms, stream.latency_ms
+    """
+
+    def __init__(self, prompt: str, model: str):
+        self.prompt = prompt
+        self.model = model
+        self.chunks: list[str] = []
+        self.ttft_ms: float | None = None
+        self.latency_ms: float | None = None
+        self.output_tokens: int | None = None
+
+    @property
+    def text(self) -> str:
+        return "".join(self.chunks)
+
+    async def __aiter__(self):
+        # 백엔드 풀이 설정된 모델이면 라우터가 고른 백엔드로 (스트림 도중 재시도는 하지 않음)
+        if llm_router.backends_for(self.model):
+            async with llm_router.route(self.model) as backend:
+                async for delta in self._relay(backend.client, backend.model or self.model):
+                    yield delta
+        else:
+            async for delta in self._relay(async_client, self.model):
+                yield delta
+
+    async def _relay(self, llm_client: AsyncOpenAI, model: str):
+        start = time.perf_counter()
+
+        stream = await llm_client.responses.create(
+            model=model,
+            input=self.prompt,
+            stream=True,
+        )
+
+        async for event in stream:
+            if event.type == "response.output_text.delta":
+                if self.ttft_ms is None:
+                    self.ttft_ms = (time.perf_counter() - start) * 1000.0
+                self.chunks.append(event.delta)
+                yield event.delta
+            elif event.type == "response.completed" and event.response.usage:
+                self.output_tokens = event.response.usage.output_tokens
+
+        self.latency_ms = (time.perf_counter() - start) * 1000.0
+
+
+def stream_llm(prompt: str, model_version: str | None = None) -> LLMStream:
+    """
+    토큰이 생성되는 대로 받아오는 스트리밍 LLM 호출.
+    """
+    return LLMStream(prompt, _resolve_model(model_version))
@@ -0,0 +1,239 @@
+"""
+LLMLog write-behind 버퍼 모듈.
+
+/chat 응답 경로에서 INSERT/commit을 기다리지 않도록 로그 row를 메모리 큐에 쌓고,
+백그라운드 태스크가 크기(batch_size) 또는 시간(flush_interval) 조건이 되면
+multi-row INSERT 한 번으로 flush 한다.
+
+- 큐는 max_queue_size로 제한되며, 가득 차면 submit()이 대기한다 (backpressure).
+- 앱 종료 시 stop()이 남은 로그를 모두 flush 한다.
+- 연결 오류 / 풀 타임아웃처럼 일시적인 실패는 배치를 max_retries번까지 backoff 하며 다시 쓰고,
+  그 밖의 실패(제약 조건 위반 등 잘못된 row)는 row 단위로 다시 써서 문제 있는 row만 버린다.
+- 실행 중이 아니면 (비활성화, 테스트 등) submit()은 바로 INSERT 한다.
+- Postgres면 flush 트랜잭션에서 NOTIFY(log_notify_channel)를 보내 evaluator에 새 로그를 알린다.
+- log_body_offload_enabled면 긴 prompt / response는 미리보기만 llm_logs에 쓰고 전체 본문은 같은 트랜잭션에서
+  llm_text_blobs에 upsert 한다 (text_blobs.py, 같은 본문은 한 번만 저장).
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import exc, func, insert, select
+
+from .config import settings
+from .db import get_async_engine
+from .models import LLMLog, LLMTextBlob
+from .metrics import (
+    record_db_query,
+    record_log_saved,
+    record_log_batch,
+    record_text_blobs_offloaded,
+    update_log_queue_depth,
+)
+from .text_blobs import offload_rows, upsert_blobs
+
+logger = logging.getLogger(__name__)
+
+# 종료 신호용 sentinel
+_STOP = object()
+
+# 배치를 그대로 다시 시도할 일시적인 오류 (DB 재시작, 연결 끊김, 풀 타임아웃, SQLite lock)
+_TRANSIENT_ERRORS = (exc.OperationalError, exc.InterfaceError, exc.TimeoutError, ConnectionError)
+
+
+class LogWriter:
+    """
+    LLMLog row를 모아서 배치로 저장하는 write-behind 버퍼.
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        flush_interval_seconds: float,
+        max_queue_size: int,
+        max_retries: int = 3,
+        retry_backoff_seconds: float = 0.2,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_queue_size = max_queue_size
+        self.max_retries = max(0, max_retries)
+        self.retry_backoff_seconds = retry_backoff_seconds
+
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self._accepting = False
+
+    @property
+    def running(self) -> bool:
+        return self._accepting and self._task is not None and not self._task.done()
+
+    async def start(self):
+        """백그라운드 flush 태스크 시작."""
+        if self.running:
+            return
+
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._accepting = True
+        self._task = asyncio.create_task(self._run(), name="llm-log-writer")
+        logger.info(
+            f"Log writer started: batch_size={self.batch_size}, "
+            f"flush_interval={self.flush_interval_seconds}s, max_queue={self.max_queue_size}"
+        )
+
+    async def stop(self):
+        """새 로그 수신을 멈추고 큐에 남은 로그를 모두 flush한 뒤 종료."""
+        if self._task is None:
+            return
+
+        self._accepting = False
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+        self._queue = None
+        logger.info("Log writer stopped")
+
+    async def submit(self, **values):
+        """
+        로그 row 하나를 버퍼에 넣는다.
+        created_at은 flush 시점이 아니라 요청 시점으로 기록한다.
+        """
+        values.setdefault("created_at", datetime.now(timezone.utc))
+
+        if not self.running:
+            await self._flush([values])
+            return
+
+        await self._queue.put(values)
+        update_log_queue_depth(self._queue.qsize())
+
+    async def _run(self):
+        while True:
+            batch, stop = await self._collect_batch()
+            if batch:
+                await self._flush(batch)
+            if stop:
+                return
+
+    async def _collect_batch(self) -> tuple[list[dict], bool]:
+        """
+        첫 row가 들어올 때까지 대기한 뒤, batch_size가 차거나
+        flush_interval이 지날 때까지 row를 모은다.
+        """
+        item = await self._queue.get()
+        if item is _STOP:
+            return [], True
+
+        batch = [item]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval_seconds
+
+        while len(batch) < self.batch_size:
+            # 이미 쌓여 있는 row는 대기 없이 가져온다
+            if self._queue.empty():
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            else:
+                item = self._queue.get_nowait()
+
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+
+        update_log_queue_depth(self._queue.qsize())
+        return batch, False
+
+    async def _flush(self, batch: list[dict]):
+        """
+        배치를 multi-row INSERT 한 번으로 저장.
+        일시적인 오류면 backoff 하며 다시 시도하고, 그 밖의 오류면 row 단위로 저장한다.
+        """
+        db_start = time.time()
+        for attempt in range(self.max_retries + 1):
+            try:
+                await self._write(batch)
+            except _TRANSIENT_ERRORS as e:
+                if attempt == self.max_retries:
+                    record_log_saved(status="error", count=len(batch))
+                    logger.error(f"Failed to flush {len(batch)} logs after {attempt + 1} attempts: {str(e)}")
+                    return
+                delay = self.retry_backoff_seconds * 2 ** attempt
+                logger.warning(f"Flush of {len(batch)} logs failed, retrying in {delay:.1f}s: {str(e)}")
+                await asyncio.sleep(delay)
+            except Exception as e:
+                logger.warning(f"Flush of {len(batch)} logs failed, retrying row by row: {str(e)}")
+                await self._flush_rows(batch)
+                return
+            else:
+                break
+
+        db_duration = time.time() - db_start
+
+        record_db_query(operation="insert", table="llm_logs", duration_seconds=db_duration)
+        record_log_saved(status="success", count=len(batch))
+        record_log_batch(len(batch))
+
+    async def _flush_rows(self, batch: list[dict]):
+        """row마다 따로 저장해서 저장에 실패하는 row만 버린다."""
+        saved = 0
+        for row in batch:
+            try:
+                await self._write([row])
+            except Exception as e:
+                record_log_saved(status="error", count=1)
+                logger.error(f"Dropped log of user_id={row.get('user_id')}: {str(e)}")
+                continue
+            saved += 1
+
+        if saved:
+            record_log_saved(status="success", count=saved)
+            record_log_batch(saved)
+
+    async def _write(self, batch: list[dict]):
+        """본문 오프로드 후 blob upsert + 로그 INSERT + NOTIFY를 한 트랜잭션으로."""
+        # 오프로드는 row를 바꾸므로, 다시 시도할 때를 위해 원본은 그대로 둠
+        rows = [dict(row) for row in batch]
+        blob_rows = []
+        if settings.log_body_offload_enabled:
+            # 해시/압축은 본문 크기에 비례하는 CPU 작업이라 이벤트 루프 밖에서 (zlib은 GIL을 놓음)
+            blob_rows = await asyncio.to_thread(
+                offload_rows, rows, settings.log_body_preview_chars, datetime.now(timezone.utc)
+            )
+
+        async with get_async_engine().begin() as conn:
+            if blob_rows:
+                await conn.execute(
+                    upsert_blobs(LLMTextBlob, conn.dialect.name, blob_rows, blob_rows[0]["last_used_at"])
+                )
+            await conn.execute(insert(LLMLog), rows)
+            await _notify_inserted(conn, len(rows))
+
+        if blob_rows:
+            record_text_blobs_offloaded(len(blob_rows), sum(len(row["data"]) for row in blob_rows))
+
+
+async def _notify_inserted(conn, count: int):
+    """
+    Postgres면 같은 트랜잭션에서 NOTIFY를 보내 evaluator의 continuous 모드를 깨운다.
+    (커밋될 때 전달되므로 evaluator는 항상 커밋된 로그를 보게 됨)
+    """
+    channel = settings.log_notify_channel
+    if not channel or conn.dialect.name != "postgresql":
+        return
+    await conn.execute(select(func.pg_notify(channel, str(count))))
+
+
+log_writer = LogWriter(
+    batch_size=settings.log_writer_batch_size,
+    flush_interval_seconds=settings.log_writer_flush_interval_ms / 1000.0,
+    max_queue_size=settings.log_writer_max_queue_size,
+    max_retries=settings.log_writer_max_retries,
+    retry_backoff_seconds=settings.log_writer_retry_backoff_ms / 1000.0,
+)
@@ -1,17 +1,22 @@
-from fastapi import FastAPI, Depends, Query, Response
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, contains_eager
 from sqlalchemy import func, select, distinct
+import json
+import logging
 import math
 import time
 from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
 
-from .db import Base, engine, get_db
-from .models import LLMLog, LLMEvaluation
+from .db import Base, engine, get_db, dispose_async_engine
+from .models import LLMLog, LLMEvaluation, LLMTextBlob
 from .schemas import (
     ChatRequest,
     ChatResponse,
     DashboardSummary,
+    LLMLogRead,
     LogListResponse,
     LogListItem,
     EvaluationListResponse,
@@ -27,19 +32,62 @@ from .schemas import (
     AlertHistoryResponse,
     AlertInfo,
 )
-from .llm_client import call_llm
+from .llm_client import call_llm_async, stream_llm
+from .log_writer import log_writer
+from .response_cache import response_cache, make_cache_key
+from .pagination import CountMode, count_rows, fetch_page
+from .read_cache import InvalidationListener, ReadCache
+from .schema_migrations import run_migrations
+from .single_flight import SingleFlight
+from .stats_queries import PERCENTILES, fetch_model_stats
+from .text_blobs import BODY_FIELDS, fetch_bodies, full_body, preview
+from .stats_rollups import daily_stats, hourly_stats, latency_percentiles, rollups_available, total_stats
 from .config import settings
 from .metrics import (
     MetricsMiddleware,
     record_llm_request,
-    record_db_query,
-    record_log_saved,
+    record_llm_coalesced,
+    record_llm_stream,
+    record_read_cache_lookup,
+    record_read_cache_refresh,
 )
 
-# 최초 실행 시 테이블 생성 (간단 버전)
-Base.metadata.create_all(bind=engine)
+logger = logging.getLogger(__name__)
 
-app = FastAPI(title="LLM Quality Observer - Gateway API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    앱 수명 주기 관리.
+    시작 시 테이블 생성/스키마 마이그레이션 후 로그 write-behind 버퍼와 요약 캐시 무효화 LISTEN 시작,
+    종료 시 남은 로그 flush 후 async DB 커넥션 풀 정리.
+    """
+    if settings.schema_auto_migrate:
+        run_migrations(engine, Base.metadata)
+    else:
+        Base.metadata.create_all(bind=engine)
+    if settings.log_writer_enabled:
+        await log_writer.start()
+    read_cache_invalidation.start()
+    yield
+    read_cache_invalidation.stop()
+    await log_writer.stop()
+    await dispose_async_engine()
+
+
+app = FastAPI(title="LLM Quality Observer - Gateway API", lifespan=lifespan)
+
+# 동시에 들어온 동일 /chat 요청 병합용
+llm_single_flight = SingleFlight()
+
+# 대시보드 요약 API 결과 캐시 (evaluator가 평가/rollup을 쓰면 NOTIFY로 만료)
+read_cache = ReadCache(
+    ttl_seconds=settings.read_cache_ttl_seconds,
+    stale_seconds=settings.read_cache_stale_seconds,
+    on_lookup=record_read_cache_lookup,
+    on_refresh=record_read_cache_refresh,
+)
+read_cache_invalidation = InvalidationListener(engine, settings.stats_notify_channel, read_cache.invalidate)
 
 # Prometheus 메트릭 미들웨어 추가
 app.add_middleware(MetricsMiddleware)
@@ -76,40 +124,71 @@ def resolve_model_version(request_model: str | None) -> str:
 
 
 @app.post("/chat", response_model=ChatResponse)
-def chat(request: ChatRequest, db: Session = Depends(get_db)):
+async def chat(request: ChatRequest):
     # 실제로 사용할 모델 이름 계산
     used_model = resolve_model_version(request.model_version)
+    use_cache = settings.response_cache_enabled and not request.bypass_cache
+
+    # 응답 캐시 조회 (hit이면 LLM 호출 없이 응답, 로그는 status="cached"로 구분)
+    if use_cache:
+        cache_start = time.perf_counter()
+        cached = await response_cache.get(request.prompt, used_model)
+        if cached is not None:
+            latency_ms = (time.perf_counter() - cache_start) * 1000.0
+            await log_writer.submit(
+                user_id=request.user_id,
+                prompt=request.prompt,
+                response=cached["response"],
+                model_version=used_model,
+                latency_ms=latency_ms,
+                status="cached",
+            )
+            return ChatResponse(
+                response=cached["response"],
+                model_version=used_model,
+                latency_ms=latency_ms,
+                cached=True,
+            )
 
     # LLM 호출 (사용할 모델 명을 넘겨줌)
+    # async 클라이언트로 호출해서 스레드풀 워커를 점유하지 않음
     llm_start = time.time()
-    response_text, latency_ms = call_llm(request.prompt, used_model)
+    coalesced = False
+    if settings.llm_single_flight_enabled and not request.bypass_cache:
+        # 같은 (프롬프트, 모델) 호출이 진행 중이면 그 결과를 공유
+        (response_text, latency_ms), coalesced = await llm_single_flight.do(
+            make_cache_key(request.prompt, used_model),
+            lambda: call_llm_async(request.prompt, used_model),
+        )
+    else:
+        response_text, latency_ms = await call_llm_async(request.prompt, used_model)
     llm_duration = time.time() - llm_start
 
-    # LLM 메트릭 기록
-    record_llm_request(
-        model=used_model,
-        status="success",
-        duration_seconds=llm_duration
-    )
+    # LLM 메트릭 기록 (병합된 요청은 upstream 호출이 없으므로 병합 카운터만 기록)
+    if coalesced:
+        # 공유받은 호출의 지연시간 대신 이 요청이 실제로 기다린 시간
+        latency_ms = llm_duration * 1000.0
+        record_llm_coalesced(used_model)
+    else:
+        record_llm_request(
+            model=used_model,
+            status="success",
+            duration_seconds=llm_duration
+        )
+
+        if use_cache:
+            await response_cache.set(request.prompt, used_model, response_text, latency_ms)
 
-    # DB 로그 저장
-    db_start = time.time()
-    log = LLMLog(
+    # DB 로그 저장 (write-behind 버퍼에 넣고 바로 응답, DB/로그 메트릭은 flush 시 기록)
+    # 병합된 요청은 status="coalesced"로 구분해서 같은 응답이 중복 평가되지 않도록 함
+    await log_writer.submit(
         user_id=request.user_id,
         prompt=request.prompt,
         response=response_text,
         model_version=used_model,
         latency_ms=latency_ms,
-        status="success",
+        status="coalesced" if coalesced else "success",
     )
-    db.add(log)
-    db.commit()
-    db.refresh(log)
-    db_duration = time.time() - db_start
-
-    # DB 메트릭 기록
-    record_db_query(operation="insert", table="llm_logs", duration_seconds=db_duration)
-    record_log_saved(status="success")
 
     # 클라이언트 응답
     return ChatResponse(
@@ -119,6 +198,90 @@ def chat(request: ChatRequest, db: Session = Depends(get_db)):
     )
 
 
+def _sse_event(data: dict, event: str | None = None) -> str:
+    """Server-Sent Events 형식의 메시지 한 개를 만든다."""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _relay_chat_stream(request: ChatRequest, used_model: str):
+    """
+    LLM 스트림의 토큰을 SSE로 그대로 전달하고,
+    스트림이 끝나면 전체 텍스트로 LLMLog를 저장한다.
+    """
+    stream = stream_llm(request.prompt, used_model)
+    llm_start = time.time()
+    status = "success"
+
+    try:
+        async for delta in stream:
+            yield _sse_event({"delta": delta})
+    except Exception as e:
+        status = "error"
+        logger.error(f"LLM stream failed: {str(e)}")
+        yield _sse_event({"detail": "LLM stream failed"}, event="error")
+
+    llm_duration = time.time() - llm_start
+    latency_ms = stream.latency_ms or llm_duration * 1000.0
+
+    # LLM 메트릭 기록 (총 지연시간 + TTFT + 생성 속도)
+    tokens = {"completion": stream.output_tokens} if stream.output_tokens else None
+    record_llm_request(
+        model=used_model,
+        status=status,
+        duration_seconds=llm_duration,
+        tokens=tokens,
+    )
+
+    ttft_seconds = stream.ttft_ms / 1000.0 if stream.ttft_ms is not None else None
+    tokens_per_second = None
+    if ttft_seconds is not None:
+        # usage가 없으면 delta 이벤트 수로 근사
+        generated = stream.output_tokens or len(stream.chunks)
+        generation_seconds = llm_duration - ttft_seconds
+        if generation_seconds > 0:
+            tokens_per_second = generated / generation_seconds
+    record_llm_stream(used_model, ttft_seconds, tokens_per_second)
+
+    # DB 로그 저장 (조합한 전체 텍스트)
+    await log_writer.submit(
+        user_id=request.user_id,
+        prompt=request.prompt,
+        response=stream.text,
+        model_version=used_model,
+        latency_ms=latency_ms,
+        status=status,
+    )
+
+    if status == "success":
+        yield _sse_event(
+            {
+                "model_version": used_model,
+                "latency_ms": latency_ms,
+                "ttft_ms": stream.ttft_ms,
+            },
+            event="done",
+        )
+
+
+@app.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """
+    스트리밍 채팅 엔드포인트 (Server-Sent Events).
+
+    - 토큰이 생성되는 대로 `data: {"delta": ...}` 이벤트로 전달
+    - 완료 시 `event: done` 이벤트로 모델/지연시간/TTFT 전달
+    - 실패 시 `event: error` 이벤트 전달 후 종료
+    """
+    used_model = resolve_model_version(request.model_version)
+
+    return StreamingResponse(
+        _relay_chat_stream(request, used_model),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # ==================== Dashboard API ====================
 
 
@@ -126,7 +289,22 @@ def chat(request: ChatRequest, db: Session = Depends(get_db)):
 def get_dashboard_summary(db: Session = Depends(get_db)):
     """
     대시보드 Overview 페이지용 전체 통계 조회.
+    evaluator의 통계 rollup이 있으면 rollup 합계로 계산 (최대 rollup 갱신 주기만큼 늦은 값).
+    결과는 read_cache_ttl_seconds 동안 캐시 (evaluator가 평가/rollup을 쓰면 만료).
     """
+    return read_cache.get("dashboard_summary", db, _dashboard_summary)
+
+
+def _dashboard_summary(db: Session) -> DashboardSummary:
+    if rollups_available(db):
+        totals = total_stats(db)
+        return DashboardSummary(
+            total_logs=totals.request_count,
+            total_evaluated=totals.evaluated_count,
+            avg_latency_ms=totals.avg_latency_ms,
+            avg_score=totals.avg_score,
+        )
+
     # 총 로그 수
     total_logs = db.query(func.count(LLMLog.id)).scalar() or 0
 
@@ -147,69 +325,106 @@ def get_dashboard_summary(db: Session = Depends(get_db)):
     )
 
 
+def _total_pages(total: int | None, page_size: int) -> int | None:
+    if total is None:
+        return None
+    return math.ceil(total / page_size) if total > 0 else 0
+
+
+def _body_previews(log: LLMLog, prefix: str = "") -> dict:
+    """로그의 prompt / response 미리보기와 잘렸는지 여부 (목록 응답용)."""
+    values = {}
+    for field, hash_field in BODY_FIELDS:
+        body, truncated = preview(getattr(log, field), getattr(log, hash_field), settings.log_body_preview_chars)
+        values[f"{prefix}{field}"] = body
+        values[f"{prefix}{field}_truncated"] = truncated
+    return values
+
+
 @app.get("/api/dashboard/logs", response_model=LogListResponse)
 def get_logs(
-    page: int = Query(1, ge=1, description="페이지 번호 (1부터 시작)"),
+    page: int = Query(1, ge=1, description="페이지 번호 (1부터 시작, cursor가 있으면 무시)"),
     page_size: int = Query(20, ge=1, le=100, description="페이지당 로그 수"),
+    cursor: str | None = Query(None, description="이전 응답의 next_cursor (keyset 페이지네이션)"),
+    count: CountMode = Query("exact", description="전체 개수 계산 방식 (exact, estimated, none)"),
     db: Session = Depends(get_db),
 ):
     """
     LLM 로그 목록 조회 (페이지네이션).
     최신 로그부터 내림차순으로 반환.
+    깊은 페이지는 page 대신 cursor(next_cursor)로 넘기면 앞의 행을 읽지 않고 바로 조회.
     """
-    # 전체 로그 수
-    total = db.query(func.count(LLMLog.id)).scalar() or 0
-
-    # 페이지네이션 계산
-    offset = (page - 1) * page_size
-    total_pages = math.ceil(total / page_size) if total > 0 else 0
-
-    # 로그 조회
-    logs = (
-        db.query(LLMLog)
-        .order_by(LLMLog.created_at.desc())
-        .offset(offset)
-        .limit(page_size)
-        .all()
-    )
-
-    log_items = [LogListItem.model_validate(log) for log in logs]
+    total = count_rows(db, LLMLog, count)
+    logs, next_cursor = fetch_page(db.query(LLMLog), LLMLog, page_size, cursor, offset=(page - 1) * page_size)
+
+    log_items = [
+        LogListItem(
+            id=log.id,
+            created_at=log.created_at,
+            user_id=log.user_id,
+            model_version=log.model_version,
+            latency_ms=log.latency_ms,
+            status=log.status,
+            **_body_previews(log),
+        )
+        for log in logs
+    ]
 
     return LogListResponse(
         logs=log_items,
         total=total,
         page=page,
         page_size=page_size,
-        total_pages=total_pages,
+        total_pages=_total_pages(total, page_size),
+        next_cursor=next_cursor,
+        total_is_estimate=count == "estimated",
+    )
+
+
+@app.get("/api/dashboard/logs/{log_id}", response_model=LLMLogRead)
+def get_log(log_id: int, db: Session = Depends(get_db)):
+    """
+    로그 상세 조회.
+    목록 API는 미리보기만 주므로, 오프로드된 긴 prompt / response는 여기서 llm_text_blobs의 전체 본문으로 채운다.
+    """
+    log = db.query(LLMLog).filter(LLMLog.id == log_id).first()
+    if log is None:
+        raise HTTPException(status_code=404, detail="Log not found")
+
+    bodies = fetch_bodies(db, LLMTextBlob, (getattr(log, hash_field) for _, hash_field in BODY_FIELDS))
+    return LLMLogRead(
+        id=log.id,
+        created_at=log.created_at,
+        user_id=log.user_id,
+        model_version=log.model_version,
+        latency_ms=log.latency_ms,
+        status=log.status,
+        **{field: full_body(getattr(log, field), getattr(log, hash_field), bodies) for field, hash_field in BODY_FIELDS},
     )
 
 
 @app.get("/api/dashboard/evaluations", response_model=EvaluationListResponse)
 def get_evaluations(
-    page: int = Query(1, ge=1, description="페이지 번호 (1부터 시작)"),
+    page: int = Query(1, ge=1, description="페이지 번호 (1부터 시작, cursor가 있으면 무시)"),
     page_size: int = Query(20, ge=1, le=100, description="페이지당 평가 수"),
+    cursor: str | None = Query(None, description="이전 응답의 next_cursor (keyset 페이지네이션)"),
+    count: CountMode = Query("exact", description="전체 개수 계산 방식 (exact, estimated, none)"),
     db: Session = Depends(get_db),
 ):
     """
     평가 결과 목록 조회 (페이지네이션).
     최신 평가부터 내림차순으로 반환, 로그 정보도 함께 포함.
+    깊은 페이지는 page 대신 cursor(next_cursor)로 넘기면 앞의 행을 읽지 않고 바로 조회.
     """
-    # 전체 평가 수
-    total = db.query(func.count(LLMEvaluation.id)).scalar() or 0
-
-    # 페이지네이션 계산
-    offset = (page - 1) * page_size
-    total_pages = math.ceil(total / page_size) if total > 0 else 0
+    total = count_rows(db, LLMEvaluation, count)
 
-    # 평가 조회 (JOIN으로 로그 정보도 함께)
-    evaluations = (
+    # 평가 조회 (JOIN으로 로그 정보도 함께, 평가마다 로그를 따로 조회하지 않음)
+    query = (
         db.query(LLMEvaluation)
         .join(LLMLog, LLMEvaluation.log_id == LLMLog.id)
-        .order_by(LLMEvaluation.created_at.desc())
-        .offset(offset)
-        .limit(page_size)
-        .all()
+        .options(contains_eager(LLMEvaluation.log))
     )
+    evaluations, next_cursor = fetch_page(query, LLMEvaluation, page_size, cursor, offset=(page - 1) * page_size)
 
     # 응답 생성 (로그 정보 포함)
     eval_items = []
@@ -226,9 +441,8 @@ def get_evaluations(
             "judge_model": evaluation.judge_model,
             "comment": evaluation.comment,
             "raw_judge_response": evaluation.raw_judge_response,
-            "log_prompt": evaluation.log.prompt if evaluation.log else None,
-            "log_response": evaluation.log.response if evaluation.log else None,
             "log_model_version": evaluation.log.model_version if evaluation.log else None,
+            **(_body_previews(evaluation.log, prefix="log_") if evaluation.log else {}),
         }
         eval_items.append(EvaluationRead(**eval_dict))
 
@@ -237,7 +451,9 @@ def get_evaluations(
         total=total,
         page=page,
         page_size=page_size,
-        total_pages=total_pages,
+        total_pages=_total_pages(total, page_size),
+        next_cursor=next_cursor,
+        total_is_estimate=count == "estimated",
     )
 
 
@@ -245,44 +461,23 @@ def get_evaluations(
 def get_model_stats(db: Session = Depends(get_db)):
     """
     모델별 통계 조회.
-    각 모델의 총 요청 수, 평균 지연시간, 평균 점수, 평가된 수를 반환.
+    각 모델의 총 요청 수, 평균 지연시간, 평균 점수, 평가된 수를 반환 (모델 수와 관계없이 쿼리 1회).
+    결과는 read_cache_ttl_seconds 동안 캐시 (evaluator가 평가/rollup을 쓰면 만료).
     """
-    # 모델별로 그룹화해서 통계 계산
-    model_stats_query = (
-        db.query(
-            LLMLog.model_version,
-            func.count(LLMLog.id).label("total_requests"),
-            func.avg(LLMLog.latency_ms).label("avg_latency_ms"),
-        )
-        .group_by(LLMLog.model_version)
-        .all()
-    )
-
-    models = []
-    for model_version, total_requests, avg_latency in model_stats_query:
-        # 해당 모델의 평가 통계
-        eval_stats = (
-            db.query(
-                func.count(distinct(LLMEvaluation.log_id)).label("total_evaluated"),
-                func.avg(LLMEvaluation.overall_score).label("avg_score"),
-            )
-            .join(LLMLog, LLMEvaluation.log_id == LLMLog.id)
-            .filter(LLMLog.model_version == model_version)
-            .first()
-        )
+    return read_cache.get("dashboard_model_stats", db, _model_stats)
 
-        total_evaluated = eval_stats.total_evaluated or 0
-        avg_score = eval_stats.avg_score
 
-        models.append(
-            ModelStats(
-                model_version=model_version or "unknown",
-                total_requests=total_requests,
-                avg_latency_ms=avg_latency,
-                avg_score=avg_score,
-                total_evaluated=total_evaluated,
-            )
+def _model_stats(db: Session) -> ModelStatsResponse:
+    models = [
+        ModelStats(
+            model_version=row.model_version or "unknown",
+            total_requests=row.total_requests,
+            avg_latency_ms=row.avg_latency_ms,
+            avg_score=row.avg_score,
+            total_evaluated=row.total_evaluated,
         )
+        for row in fetch_model_stats(db, LLMLog, LLMEvaluation)
+    ]
 
     return ModelStatsResponse(models=models)
 
@@ -295,6 +490,7 @@ def get_timeseries(
     """
     시간별 추이 데이터 조회.
     최근 N일간의 일별 통계를 반환.
+    evaluator의 통계 rollup이 있으면 시간대별 rollup을 날짜별로 더해서 계산.
     """
     from datetime import datetime, timedelta
     from sqlalchemy import cast, Date
@@ -302,7 +498,20 @@ def get_timeseries(
     # 시작 날짜 계산 (N일 전부터)
     start_date = datetime.now() - timedelta(days=days)
 
-    # 날짜별 로그 통계
+    if rollups_available(db):
+        return TimeSeriesResponse(data=[
+            TimeSeriesDataPoint(
+                date=date_str,
+                avg_score=day.avg_score,
+                avg_latency_ms=day.avg_latency_ms,
+                total_requests=day.request_count,
+                total_evaluated=day.evaluated_count,
+            )
+            for date_str, day in daily_stats(db, start_date)
+            if day.request_count > 0
+        ])
+
+    # 날짜별 로그 통계 (created_at 범위 조건이라 Postgres는 기간 안의 llm_logs 파티션만 읽음)
     log_stats = (
         db.query(
             cast(LLMLog.created_at, Date).label("date"),
@@ -360,22 +569,16 @@ def get_timeseries(
 # ==================== Analytics API (v0.6.0) ====================
 
 
-@app.get("/analytics/trends", response_model=HourlyTrendResponse)
-def get_hourly_trends(
-    hours: int = Query(24, ge=1, le=168, description="조회할 시간 (1-168시간, 최대 7일)"),
-    db: Session = Depends(get_db),
-):
+def _hourly_stats_from_logs(db: Session, start_time):
     """
-    시간대별 품질 트렌드 분석.
-    최근 N시간 동안의 시간별 통계를 반환 (에러율 포함).
-    """
-    from datetime import datetime, timedelta
-    from sqlalchemy import cast, func as sql_func, case
+    원본 테이블에서 시간별 통계 집계 (rollup이 없을 때).
 
-    # 시작 시간 계산
-    start_time = datetime.now() - timedelta(hours=hours)
+    Returns:
+        list: (시간, 요청 수, 평균 지연시간, 에러 수, {"total_evaluated", "avg_score"}) 목록 (오래된 순)
+    """
+    from sqlalchemy import func as sql_func, case
 
-    # 시간별 로그 통계 (PostgreSQL date_trunc 사용)
+    # 시간별 로그 통계 (PostgreSQL date_trunc 사용, created_at 범위 조건으로 기간 안의 파티션만 읽음)
     log_stats = (
         db.query(
             sql_func.date_trunc('hour', LLMLog.created_at).label("hour"),
@@ -412,6 +615,49 @@ def get_hourly_trends(
         for row in eval_stats_query
     }
 
+    return [
+        (
+            row.hour,
+            row.total_requests,
+            row.avg_latency_ms,
+            row.error_count,
+            eval_stats_dict.get(row.hour, {"total_evaluated": 0, "avg_score": None}),
+        )
+        for row in log_stats
+    ]
+
+
+@app.get("/analytics/trends", response_model=HourlyTrendResponse)
+def get_hourly_trends(
+    hours: int = Query(24, ge=1, le=168, description="조회할 시간 (1-168시간, 최대 7일)"),
+    db: Session = Depends(get_db),
+):
+    """
+    시간대별 품질 트렌드 분석.
+    최근 N시간 동안의 시간별 통계를 반환 (에러율 포함).
+    evaluator의 통계 rollup이 있으면 rollup으로, 없으면 원본 테이블을 집계.
+    """
+    from datetime import datetime, timedelta
+
+    # 시작 시간 계산
+    start_time = datetime.now() - timedelta(hours=hours)
+
+    if rollups_available(db):
+        # evaluator의 통계 rollup (시간대별로 미리 집계된 값)
+        hourly = [
+            (
+                bucket_start,
+                hour.request_count,
+                hour.avg_latency_ms,
+                hour.error_count,
+                {"total_evaluated": hour.evaluated_count, "avg_score": hour.avg_score},
+            )
+            for bucket_start, hour in hourly_stats(db, start_time)
+            if hour.request_count > 0
+        ]
+    else:
+        hourly = _hourly_stats_from_logs(db, start_time)
+
     # 결과 조합
     data_points = []
     total_reqs = 0
@@ -420,26 +666,25 @@ def get_hourly_trends(
     sum_scores = 0
     score_count = 0
 
-    for row in log_stats:
-        hour_str = row.hour.strftime("%Y-%m-%d %H:00:00")
-        eval_data = eval_stats_dict.get(row.hour, {"total_evaluated": 0, "avg_score": None})
+    for hour, total_requests, avg_latency_ms, error_count, eval_data in hourly:
+        hour_str = hour.strftime("%Y-%m-%d %H:00:00")
 
-        error_rate = (row.error_count / row.total_requests * 100) if row.total_requests > 0 else 0
+        error_rate = (error_count / total_requests * 100) if total_requests > 0 else 0
 
         data_points.append(
             HourlyTrendDataPoint(
                 hour=hour_str,
                 avg_score=eval_data["avg_score"],
-                avg_latency_ms=row.avg_latency_ms,
-                total_requests=row.total_requests,
+                avg_latency_ms=avg_latency_ms,
+                total_requests=total_requests,
                 total_evaluated=eval_data["total_evaluated"],
                 error_rate=error_rate,
             )
         )
 
         # 전체 통계 집계
-        total_reqs += row.total_requests
-        total_errors += row.error_count
+        total_reqs += total_requests
+        total_errors += error_count
         total_evals += eval_data["total_evaluated"]
         if eval_data["avg_score"] is not None:
             sum_scores += eval_data["avg_score"] * eval_data["total_evaluated"]
@@ -466,25 +711,17 @@ def compare_models(
     """
     모델 간 상세 성능 비교.
     지정된 기간 동안의 모델별 상세 통계를 반환 (백분위수, 품질 분포 포함).
+    모델별 집계는 쿼리 1회. 백분위수는 rollup이 있으면 지연시간 히스토그램(상대 오차 1%)에서,
+    없으면 Postgres percentile_cont로 같은 쿼리 안에서 계산 (SQLite는 지연시간을 가져와서 계산).
     """
     from datetime import datetime, timedelta
-    from sqlalchemy import case
 
     start_date = datetime.now() - timedelta(days=days)
 
-    # 모델별 기본 통계
-    model_stats_query = (
-        db.query(
-            LLMLog.model_version,
-            func.count(LLMLog.id).label("total_requests"),
-            func.sum(case((LLMLog.status == 'success', 1), else_=0)).label("success_count"),
-            func.sum(case((LLMLog.status == 'error', 1), else_=0)).label("error_count"),
-            func.avg(LLMLog.latency_ms).label("avg_latency_ms"),
-        )
-        .filter(LLMLog.created_at >= start_date)
-        .group_by(LLMLog.model_version)
-        .all()
-    )
+    use_sketch = rollups_available(db)
+    model_stats = fetch_model_stats(db, LLMLog, LLMEvaluation, since=start_date, latency_percentiles=not use_sketch)
+    if use_sketch:
+        sketch_percentiles = latency_percentiles(db, start_date, PERCENTILES)
 
     models = []
     best_latency_model = None
@@ -494,75 +731,37 @@ def compare_models(
     best_stability_model = None
     best_stability_value = 100  # 낮을수록 좋음 (에러율)
 
-    for model_stat in model_stats_query:
+    for model_stat in model_stats:
         model_version = model_stat.model_version or "unknown"
-        total_requests = model_stat.total_requests
-        success_count = model_stat.success_count
-        error_count = model_stat.error_count
-        avg_latency = model_stat.avg_latency_ms
+        error_rate = model_stat.error_rate
 
-        # 성공률 및 에러율 계산
-        success_rate = (success_count / total_requests * 100) if total_requests > 0 else 0
-        error_rate = (error_count / total_requests * 100) if total_requests > 0 else 0
+        # 백분위수 (p50, p95, p99)
+        if use_sketch:
+            latency_count, percentiles = sketch_percentiles.get(model_stat.model_version, (0, {}))
+        else:
+            latency_count = model_stat.latency_count
+            percentiles = {name: getattr(model_stat, f"{name}_latency_ms") for name in PERCENTILES}
 
-        # 백분위수 계산 (p50, p95, p99)
-        latencies = (
-            db.query(LLMLog.latency_ms)
-            .filter(
-                LLMLog.model_version == model_stat.model_version,
-                LLMLog.created_at >= start_date,
-                LLMLog.latency_ms.isnot(None)
-            )
-            .order_by(LLMLog.latency_ms)
-            .all()
-        )
-
-        latency_values = [lat[0] for lat in latencies if lat[0] is not None]
-        p50_latency = None
+        p50_latency = percentiles.get("p50") if latency_count else None
         p95_latency = None
         p99_latency = None
-
-        if latency_values:
-            import statistics
-            p50_latency = statistics.median(latency_values)
-            if len(latency_values) >= 20:  # 충분한 데이터가 있을 때만 p95, p99 계산
-                p95_latency = statistics.quantiles(latency_values, n=20)[18]  # 95th percentile
-                p99_latency = statistics.quantiles(latency_values, n=100)[98]  # 99th percentile
-
-        # 평가 통계
-        eval_stats = (
-            db.query(
-                func.count(distinct(LLMEvaluation.log_id)).label("total_evaluated"),
-                func.avg(LLMEvaluation.overall_score).label("avg_score"),
-                func.sum(case((LLMEvaluation.overall_score < 3, 1), else_=0)).label("low_quality_count"),
-                func.sum(case((LLMEvaluation.overall_score >= 4, 1), else_=0)).label("high_quality_count"),
-            )
-            .join(LLMLog, LLMEvaluation.log_id == LLMLog.id)
-            .filter(
-                LLMLog.model_version == model_stat.model_version,
-                LLMLog.created_at >= start_date
-            )
-            .first()
-        )
-
-        total_evaluated = eval_stats.total_evaluated or 0
-        avg_score = eval_stats.avg_score
-        low_quality_count = eval_stats.low_quality_count or 0
-        high_quality_count = eval_stats.high_quality_count or 0
+        if latency_count >= 20:  # 충분한 데이터가 있을 때만 p95, p99
+            p95_latency = percentiles.get("p95")
+            p99_latency = percentiles.get("p99")
 
         model_detail = ModelComparisonDetail(
             model_version=model_version,
-            total_requests=total_requests,
-            success_rate=success_rate,
+            total_requests=model_stat.total_requests,
+            success_rate=model_stat.success_rate,
             error_rate=error_rate,
-            avg_latency_ms=avg_latency,
+            avg_latency_ms=model_stat.avg_latency_ms,
             p50_latency_ms=p50_latency,
             p95_latency_ms=p95_latency,
             p99_latency_ms=p99_latency,
-            avg_score=avg_score,
-            total_evaluated=total_evaluated,
-            low_quality_count=low_quality_count,
-            high_quality_count=high_quality_count,
+            avg_score=model_stat.avg_score,
+            total_evaluated=model_stat.total_evaluated,
+            low_quality_count=model_stat.low_quality_count,
+            high_quality_count=model_stat.high_quality_count,
         )
 
         models.append(model_detail)
@@ -572,6 +771,7 @@ def compare_models(
             best_latency_value = p50_latency
             best_latency_model = model_version
 
+        avg_score = model_stat.avg_score
         if avg_score and avg_score > best_quality_value:
             best_quality_value = avg_score
             best_quality_model = model_version
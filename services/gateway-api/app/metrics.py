@@ -36,12 +36,116 @@ llm_request_duration_seconds = Histogram(
     buckets=(0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0, float('inf'))
 )
 
+llm_coalesced_requests_total = Counter(
+    'llm_gateway_llm_coalesced_requests_total',
+    'Requests served by sharing an identical in-flight LLM call',
+    ['model']
+)
+
+llm_time_to_first_token_seconds = Histogram(
+    'llm_gateway_llm_time_to_first_token_seconds',
+    'Time until the first streamed token arrives',
+    ['model'],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, float('inf'))
+)
+
+llm_tokens_per_second = Histogram(
+    'llm_gateway_llm_tokens_per_second',
+    'Streaming generation speed after the first token',
+    ['model'],
+    buckets=(1, 5, 10, 20, 50, 100, 200, 500, float('inf'))
+)
+
 llm_tokens_total = Counter(
     'llm_gateway_llm_tokens_total',
     'Total tokens processed',
     ['model', 'type']  # type: prompt, completion
 )
 
+# LLM 라우터 백엔드별 메트릭
+llm_backend_requests_total = Counter(
+    'llm_gateway_llm_backend_requests_total',
+    'LLM requests per routed backend',
+    ['backend', 'status']
+)
+
+llm_backend_request_duration_seconds = Histogram(
+    'llm_gateway_llm_backend_request_duration_seconds',
+    'LLM request latency per routed backend',
+    ['backend'],
+    buckets=(0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0, float('inf'))
+)
+
+llm_backend_ewma_latency_seconds = Gauge(
+    'llm_gateway_llm_backend_ewma_latency_seconds',
+    'EWMA latency the router uses to rank a backend',
+    ['backend']
+)
+
+llm_backend_outstanding = Gauge(
+    'llm_gateway_llm_backend_outstanding_requests',
+    'In-flight requests per routed backend',
+    ['backend']
+)
+
+llm_backend_circuit_open = Gauge(
+    'llm_gateway_llm_backend_circuit_open',
+    'Whether the backend is ejected by the circuit breaker (1=open)',
+    ['backend']
+)
+
+# LLM HTTP 커넥션 풀 메트릭
+llm_http_pool_in_use = Gauge(
+    'llm_gateway_llm_http_pool_in_use',
+    'LLM HTTP requests currently holding a pooled connection',
+    ['pool']
+)
+
+llm_http_pool_waiting = Gauge(
+    'llm_gateway_llm_http_pool_waiting',
+    'LLM HTTP requests waiting for a free pooled connection',
+    ['pool']
+)
+
+llm_http_pool_reuse_ratio = Gauge(
+    'llm_gateway_llm_http_pool_connection_reuse_ratio',
+    'Share of LLM HTTP requests served on an existing connection',
+    ['pool']
+)
+
+llm_http_requests_total = Counter(
+    'llm_gateway_llm_http_requests_total',
+    'Total LLM HTTP requests sent through the pool',
+    ['pool']
+)
+
+llm_http_connections_opened_total = Counter(
+    'llm_gateway_llm_http_connections_opened_total',
+    'Total new TCP connections opened by the pool',
+    ['pool']
+)
+
+# 응답 캐시 관련 메트릭
+response_cache_lookups_total = Counter(
+    'llm_gateway_response_cache_lookups_total',
+    'Response cache lookups',
+    ['tier', 'result']  # tier: local/shared, result: hit/miss
+)
+
+# 대시보드 요약 API 결과 캐시 메트릭 (read_cache)
+read_cache_lookups_total = Counter(
+    'llm_gateway_read_cache_lookups_total',
+    'Dashboard aggregate cache lookups',
+    ['key', 'result']  # result: hit/stale/miss
+)
+
+read_cache_refresh_duration_seconds = Histogram(
+    'llm_gateway_read_cache_refresh_duration_seconds',
+    'Time to recompute a cached dashboard aggregate (miss or background refresh)',
+    ['key', 'status'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+
 # 데이터베이스 관련 메트릭
 db_queries_total = Counter(
     'llm_gateway_db_queries_total',
@@ -62,6 +166,29 @@ logs_saved_total = Counter(
     ['status']
 )
 
+# 로그 write-behind 버퍼 메트릭
+log_writer_batch_size = Histogram(
+    'llm_gateway_log_writer_batch_size',
+    'Number of log rows written per flush',
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000)
+)
+
+log_writer_queue_depth = Gauge(
+    'llm_gateway_log_writer_queue_depth',
+    'Number of log rows waiting in the write-behind buffer'
+)
+
+# 긴 본문 오프로드 메트릭 (llm_text_blobs)
+text_blobs_offloaded_total = Counter(
+    'llm_gateway_text_blobs_offloaded_total',
+    'Distinct long prompt/response bodies upserted into llm_text_blobs'
+)
+
+text_blob_bytes_total = Counter(
+    'llm_gateway_text_blob_bytes_total',
+    'Compressed bytes of bodies upserted into llm_text_blobs (before dedup against existing blobs)'
+)
+
 # 현재 상태 게이지
 active_requests = Gauge(
     'llm_gateway_active_requests',
@@ -138,6 +265,124 @@ def record_llm_request(model: str, status: str, duration_seconds: float, tokens:
             llm_tokens_total.labels(model=model, type='completion').inc(tokens['completion'])
 
 
+def record_llm_coalesced(model: str):
+    """
+    진행 중인 동일 LLM 호출 결과를 공유받은 요청 수 기록.
+
+    Args:
+        model: 모델 이름
+    """
+    llm_coalesced_requests_total.labels(model=model).inc()
+
+
+def record_llm_stream(model: str, ttft_seconds: float | None, tokens_per_second: float | None):
+    """
+    스트리밍 LLM 요청 메트릭 기록.
+
+    Args:
+        model: 모델 이름
+        ttft_seconds: 첫 토큰까지 걸린 시간 (초), 토큰이 없으면 None
+        tokens_per_second: 첫 토큰 이후 생성 속도, 계산 불가하면 None
+    """
+    if ttft_seconds is not None:
+        llm_time_to_first_token_seconds.labels(model=model).observe(ttft_seconds)
+    if tokens_per_second is not None:
+        llm_tokens_per_second.labels(model=model).observe(tokens_per_second)
+
+
+def record_backend_request(backend: str, status: str, duration_seconds: float, ewma_seconds: float | None):
+    """
+    라우팅된 백엔드 요청 메트릭 기록.
+
+    Args:
+        backend: 백엔드 이름
+        status: 'success' or 'error'
+        duration_seconds: 요청 소요 시간 (초)
+        ewma_seconds: 갱신된 EWMA 지연시간 (초), 측정값이 없으면 None
+    """
+    llm_backend_requests_total.labels(backend=backend, status=status).inc()
+    llm_backend_request_duration_seconds.labels(backend=backend).observe(duration_seconds)
+    if ewma_seconds is not None:
+        llm_backend_ewma_latency_seconds.labels(backend=backend).set(ewma_seconds)
+
+
+def update_backend_state(backend: str, outstanding: int, circuit_open: bool):
+    """
+    백엔드의 in-flight 요청 수와 circuit 상태 업데이트.
+
+    Args:
+        backend: 백엔드 이름
+        outstanding: 처리 중인 요청 수
+        circuit_open: circuit breaker로 제외된 상태인지
+    """
+    llm_backend_outstanding.labels(backend=backend).set(outstanding)
+    llm_backend_circuit_open.labels(backend=backend).set(1 if circuit_open else 0)
+
+
+def record_http_pool_state(pool: str, in_use: int, waiting: int, reuse_ratio: float):
+    """
+    LLM HTTP 커넥션 풀 상태 기록.
+
+    Args:
+        pool: 풀 이름 ('llm', 'llm_async')
+        in_use: 커넥션을 점유 중인 요청 수
+        waiting: 커넥션을 기다리는 요청 수
+        reuse_ratio: 기존 커넥션 재사용 비율 (0~1)
+    """
+    llm_http_pool_in_use.labels(pool=pool).set(in_use)
+    llm_http_pool_waiting.labels(pool=pool).set(waiting)
+    llm_http_pool_reuse_ratio.labels(pool=pool).set(reuse_ratio)
+
+
+def record_http_pool_request(pool: str, new_request: bool = False, new_connection: bool = False):
+    """
+    LLM HTTP 요청/새 커넥션 카운트 기록.
+
+    Args:
+        pool: 풀 이름
+        new_request: 요청 하나가 시작됨
+        new_connection: 새 TCP 커넥션이 열림
+    """
+    if new_request:
+        llm_http_requests_total.labels(pool=pool).inc()
+    if new_connection:
+        llm_http_connections_opened_total.labels(pool=pool).inc()
+
+
+def record_cache_lookup(tier: str, hit: bool):
+    """
+    응답 캐시 조회 메트릭 기록.
+
+    Args:
+        tier: 'local' (프로세스 내 LRU) or 'shared' (Redis)
+        hit: 캐시 적중 여부
+    """
+    response_cache_lookups_total.labels(tier=tier, result="hit" if hit else "miss").inc()
+
+
+def record_read_cache_lookup(key: str, result: str):
+    """
+    대시보드 요약 API 결과 캐시 조회 기록.
+
+    Args:
+        key: 캐시 키 (엔드포인트)
+        result: 'hit', 'stale' (이전 값으로 응답하고 백그라운드 갱신) or 'miss'
+    """
+    read_cache_lookups_total.labels(key=key, result=result).inc()
+
+
+def record_read_cache_refresh(key: str, status: str, duration_seconds: float):
+    """
+    캐시한 집계를 다시 계산한 시간 기록.
+
+    Args:
+        key: 캐시 키 (엔드포인트)
+        status: 'success' or 'error'
+        duration_seconds: 집계 소요 시간 (초)
+    """
+    read_cache_refresh_duration_seconds.labels(key=key, status=status).observe(duration_seconds)
+
+
 def record_db_query(operation: str, table: str, duration_seconds: float):
     """
     데이터베이스 쿼리 메트릭 기록.
@@ -151,11 +396,44 @@ def record_db_query(operation: str, table: str, duration_seconds: float):
     db_query_duration_seconds.labels(operation=operation, table=table).observe(duration_seconds)
 
 
-def record_log_saved(status: str):
+def record_log_saved(status: str, count: int = 1):
     """
     로그 저장 메트릭 기록.
 
     Args:
         status: 'success' or 'error'
+        count: 저장(또는 실패)한 로그 개수
+    """
+    logs_saved_total.labels(status=status).inc(count)
+
+
+def record_log_batch(batch_size: int):
+    """
+    write-behind 버퍼 flush 한 번에 쓴 로그 개수 기록.
+
+    Args:
+        batch_size: flush된 로그 개수
+    """
+    log_writer_batch_size.observe(batch_size)
+
+
+def record_text_blobs_offloaded(count: int, compressed_bytes: int):
+    """
+    flush 한 번에 llm_text_blobs로 upsert한 본문 기록.
+
+    Args:
+        count: 배치 안에서 중복을 뺀 본문 개수
+        compressed_bytes: 압축된 본문 크기 합
+    """
+    text_blobs_offloaded_total.inc(count)
+    text_blob_bytes_total.inc(compressed_bytes)
+
+
+def update_log_queue_depth(depth: int):
+    """
+    write-behind 버퍼에 쌓인 로그 개수 업데이트.
+
+    Args:
+        depth: 현재 대기 중인 로그 개수
     """
-    logs_saved_total.labels(status=status).inc()
+    log_writer_queue_depth.set(depth)
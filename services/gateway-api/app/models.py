@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Boolean, ForeignKey, Index, LargeBinary, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
@@ -6,7 +6,23 @@ from .db import Base
 
 
 class LLMLog(Base):
+    # Postgres에서는 created_at 범위 파티션 테이블 (PK는 (id, created_at), 스키마 마이그레이션 4 / evaluator partitions.py)
     __tablename__ = "llm_logs"
+    __table_args__ = (
+        # 평가 대기 로그 조회용 partial index (status='success'인 로그를 created_at, id 순으로 스캔)
+        Index(
+            "ix_llm_logs_success_created_at_id",
+            "created_at",
+            "id",
+            postgresql_where=text("status = 'success'"),
+            sqlite_where=text("status = 'success'"),
+        ),
+        # 시간 구간 집계(rollup 갱신, 기간 필터)와 대시보드 로그 목록 keyset 페이지네이션용
+        Index("ix_llm_logs_created_at_id", "created_at", "id"),
+        # 모델별 기간 집계용
+        Index("ix_llm_logs_model_version_created_at", "model_version", "created_at"),
+        # 기존 DB에는 create_all이 인덱스를 추가하지 않으므로, 인덱스를 바꾸면 schema_migrations에도 마이그레이션 추가
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     created_at = Column(
@@ -16,8 +32,11 @@ class LLMLog(Base):
     )
 
     user_id = Column(String(128), nullable=True)
+    # 본문이 길면 앞부분(미리보기)만 저장하고 전체 본문은 llm_text_blobs에 (해시가 NULL이면 전체 본문)
     prompt = Column(Text, nullable=False)
     response = Column(Text, nullable=False)
+    prompt_hash = Column(String(64), nullable=True)
+    response_hash = Column(String(64), nullable=True)
 
     model_version = Column(String(64), nullable=True)
     latency_ms = Column(Float, nullable=True)
@@ -31,12 +50,29 @@ class LLMLog(Base):
     )
 
 
+class LLMTextBlob(Base):
+    """
+    llm_logs에서 오프로드한 긴 프롬프트/응답 본문 (내용 해시 -> zlib 압축 본문, text_blobs.py).
+    같은 본문은 한 번만 저장되고, last_used_at은 그 본문을 참조하는 로그가 마지막으로 저장된 시각 (하루 단위로 갱신).
+    """
+    __tablename__ = "llm_text_blobs"
+
+    hash = Column(String(64), primary_key=True)  # sha256 hex
+    data = Column(LargeBinary, nullable=False)
+    size = Column(Integer, nullable=False)  # 압축 전 글자 수
+    last_used_at = Column(DateTime(timezone=True), nullable=False)
+
+
 class LLMEvaluation(Base):
     """
     LLM 응답에 대한 평가 결과를 저장하는 테이블.
     Evaluator 서비스에서 생성하고, Gateway API에서는 읽기만 함.
     """
     __tablename__ = "llm_evaluations"
+    __table_args__ = (
+        # 최근 평가 조회(rollup 갱신 대상 시간대 찾기)와 대시보드 평가 목록 keyset 페이지네이션용
+        Index("ix_llm_evaluations_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     created_at = Column(
@@ -46,6 +82,7 @@ class LLMEvaluation(Base):
     )
 
     # 어떤 로그에 대한 평가인지
+    # (Postgres에서는 llm_logs가 파티션 테이블이라 DB의 FK 제약은 스키마 마이그레이션 4에서 제거됨, ORM 관계용으로만 선언)
     log_id = Column(Integer, ForeignKey("llm_logs.id"), nullable=False, index=True)
 
     # 평가 점수 (1~5 스케일)
@@ -72,3 +109,49 @@ class LLMEvaluation(Base):
 
     # N:1 관계 (여러 평가가 한 로그를 참조)
     log = relationship("LLMLog", back_populates="evaluations")
+
+
+class LLMStatsHourly(Base):
+    """
+    시간(hour) x model_version 단위로 미리 집계한 통계 (rollup).
+    evaluator의 rollup 작업이 갱신하고, Gateway API는 읽기만 함.
+    평가 통계는 평가 대상 로그의 created_at 시간대에 집계되며, 모든 컬럼은 더할 수 있는 합계/개수.
+    """
+    __tablename__ = "llm_stats_hourly"
+
+    bucket_start = Column(DateTime(timezone=True), primary_key=True)
+    model_version = Column(String(64), primary_key=True)  # NULL model_version은 ""
+
+    request_count = Column(Integer, nullable=False, default=0)
+    error_count = Column(Integer, nullable=False, default=0)
+    latency_count = Column(Integer, nullable=False, default=0)
+    latency_sum = Column(Float, nullable=False, default=0.0)
+
+    evaluated_count = Column(Integer, nullable=False, default=0)
+    evaluation_count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Integer, nullable=False, default=0)
+    flagged_count = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class LLMLatencySketchHourly(Base):
+    """
+    시간(hour) x model_version 단위 지연시간 분포 (rollup, 로그 스케일 히스토그램).
+    evaluator의 rollup 작업이 갱신하고, Gateway API는 백분위수 계산에만 읽음.
+    """
+    __tablename__ = "llm_latency_sketch_hourly"
+
+    bucket_start = Column(DateTime(timezone=True), primary_key=True)
+    model_version = Column(String(64), primary_key=True)  # NULL model_version은 ""
+    # ceil(log_gamma(latency_ms)), gamma = (1 + 0.01) / (1 - 0.01)
+    bin = Column(Integer, primary_key=True)
+    count = Column(Integer, nullable=False)
+
+
+class StatsRollupState(Base):
+    """rollup 작업의 진행 상태 (watermark). 행이 없으면 아직 rollup이 만들어지지 않은 것."""
+    __tablename__ = "llm_stats_rollup_state"
+
+    name = Column(String(64), primary_key=True)
+    watermark = Column(DateTime(timezone=True), nullable=False)
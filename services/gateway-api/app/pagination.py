@@ -0,0 +1,117 @@
+"""
+대시보드 목록 API용 keyset(cursor) 페이지네이션과 전체 개수 조회 모듈.
+
+OFFSET 페이지네이션은 깊은 페이지일수록 앞의 행을 모두 읽고 버리므로 페이지 번호에 비례해서 느려진다.
+cursor를 주면 직전 페이지 마지막 행의 (created_at, id) 바로 다음부터 (created_at, id) 인덱스를 읽으므로
+몇 번째 페이지든 page_size만큼만 읽는다.
+cursor는 (created_at, id)를 base64로 인코딩한 불투명 문자열이라 클라이언트는 응답의 next_cursor를 그대로 넘기면 된다.
+
+전체 개수(total)는 count 모드로 고른다.
+- exact: COUNT(*) (기존 동작, 요청마다 테이블 전체 스캔)
+- estimated: Postgres는 pg_class.reltuples(ANALYZE/autovacuum이 갱신하는 추정치),
+  그 외 DB나 통계가 아직 없으면 dashboard_count_cache_ttl_seconds 동안 캐시한 COUNT(*)
+- none: 개수를 세지 않음 (total / total_pages는 null)
+"""
+
+import base64
+import binascii
+import json
+import time
+from datetime import datetime
+from typing import Literal
+
+from fastapi import HTTPException
+from sqlalchemy import func, text, tuple_
+from sqlalchemy.orm import Query, Session
+
+from .config import settings
+
+CountMode = Literal["exact", "estimated", "none"]
+
+# 테이블 이름 -> (캐시한 시각, COUNT(*))
+_count_cache: dict[str, tuple[float, int]] = {}
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """(created_at, id)를 URL에 그대로 쓸 수 있는 cursor 문자열로."""
+    payload = json.dumps([created_at.isoformat(), row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """cursor 문자열을 (created_at, id)로. 형식이 맞지 않으면 ValueError."""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(payload)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise ValueError(f"invalid cursor: {cursor!r}") from e
+
+
+def fetch_page(query: Query, model, page_size: int, cursor: str | None = None,
+               offset: int = 0) -> tuple[list, str | None]:
+    """
+    최신순((created_at, id) 내림차순) 한 페이지와 다음 페이지 cursor.
+
+    cursor가 있으면 keyset 조건으로, 없으면 offset으로 시작 위치를 정한다.
+    page_size + 1개를 읽어서 다음 페이지가 있을 때만 next_cursor를 돌려준다.
+
+    Returns:
+        tuple: (행 목록, next_cursor 또는 None)
+    """
+    query = query.order_by(model.created_at.desc(), model.id.desc())
+    if cursor is not None:
+        try:
+            created_at, row_id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        # (created_at, id) < (:created_at, :id) - 복합 인덱스를 그 지점부터 역순으로 스캔
+        query = query.filter(tuple_(model.created_at, model.id) < tuple_(created_at, row_id))
+    else:
+        query = query.offset(offset)
+
+    rows = query.limit(page_size + 1).all()
+    if len(rows) <= page_size:
+        return rows, None
+    last = rows[page_size - 1]
+    return rows[:page_size], encode_cursor(last.created_at, last.id)
+
+
+def _estimated_count(db: Session, model) -> int | None:
+    """Postgres 통계의 행 수 추정치 (ANALYZE 전이면 None)."""
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+    # 파티션 테이블(llm_logs)은 부모에 통계가 없으므로 파티션들의 추정치를 더함
+    estimate = db.execute(
+        text(
+            "SELECT CASE WHEN p.relkind = 'p' THEN ("
+            "SELECT sum(c.reltuples) FILTER (WHERE c.reltuples >= 0) FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid WHERE i.inhparent = p.oid"
+            ") ELSE p.reltuples END::bigint FROM pg_class p WHERE p.oid = to_regclass(:table)"
+        ),
+        {"table": model.__tablename__},
+    ).scalar()
+    # reltuples는 한 번도 VACUUM/ANALYZE 되지 않은 테이블에서 -1
+    if estimate is None or estimate < 0:
+        return None
+    return int(estimate)
+
+
+def _cached_count(db: Session, model) -> int:
+    cached = _count_cache.get(model.__tablename__)
+    now = time.monotonic()
+    if cached is not None and now - cached[0] < settings.dashboard_count_cache_ttl_seconds:
+        return cached[1]
+    total = db.query(func.count(model.id)).scalar() or 0
+    _count_cache[model.__tablename__] = (now, total)
+    return total
+
+
+def count_rows(db: Session, model, mode: CountMode) -> int | None:
+    """count 모드에 따른 전체 행 수 (none이면 None)."""
+    if mode == "none":
+        return None
+    if mode == "estimated":
+        estimate = _estimated_count(db, model)
+        return estimate if estimate is not None else _cached_count(db, model)
+    return db.query(func.count(model.id)).scalar() or 0
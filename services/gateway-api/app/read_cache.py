@@ -0,0 +1,291 @@
+"""
+대시보드 요약 API 결과 캐시 모듈 (gateway-api / dashboard 공용).
+
+대시보드 화면과 Grafana가 같은 집계(요약, 모델별 통계)를 몇 초마다 다시 요청하므로 키(엔드포인트)별 결과를
+프로세스 안에 짧게 캐시한다 (stale-while-revalidate).
+- ttl_seconds 이내: 캐시한 값 (hit)
+- ttl_seconds가 지났지만 stale_seconds 이내: 캐시한 값을 바로 돌려주고, 키마다 하나만 백그라운드에서 다시 집계 (stale)
+- 값이 없거나 stale_seconds도 지났으면: 요청 스레드에서 집계 (miss).
+  같은 키를 동시에 요청한 다른 스레드는 집계를 따로 하지 않고 그 결과를 기다린다
+
+evaluator가 평가 배치/rollup을 쓰면 Postgres NOTIFY(stats_notify_channel)를 보내고, InvalidationListener가 받아서
+모든 키를 만료시킨다 (다음 요청은 이전 값을 받으면서 백그라운드 갱신을 시작). Postgres가 아니면 TTL로만 갱신된다.
+
+gateway-api/app/read_cache.py와 dashboard/app/read_cache.py는 같은 파일이다.
+서비스마다 Docker 빌드 컨텍스트가 달라 복사해서 쓰므로, 수정할 때는 두 파일을 함께 바꾼다
+(gateway-api의 tests/test_read_cache.py가 두 파일이 같은지 확인).
+메트릭 기록은 서비스마다 달라서 콜백(on_lookup, on_refresh)으로 받는다.
+"""
+
+import logging
+import re
+import select
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+_CHANNEL_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+# 끊긴 LISTEN 연결을 다시 시도하는 간격 (초)
+RECONNECT_INTERVAL_SECONDS = 30.0
+
+
+@dataclass
+class _Entry:
+    value: Any
+    fresh_until: float
+    stale_until: float
+
+
+class ReadCache:
+    """
+    키별 집계 결과 캐시 (stale-while-revalidate, 스레드 안전).
+
+        summary = read_cache.get("dashboard_summary", db, compute_summary)
+
+    compute(session)은 같은 인자로 몇 번 불려도 같은 결과를 내야 한다.
+    백그라운드 갱신은 요청 세션이 아니라 같은 DB에 새 세션을 열어서 실행한다.
+    ttl_seconds가 0 이하면 캐시하지 않고 항상 compute(db)를 호출한다.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        stale_seconds: float,
+        on_lookup: Callable[[str, str], None] | None = None,
+        on_refresh: Callable[[str, str, float], None] | None = None,
+        max_workers: int = 2,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.on_lookup = on_lookup
+        self.on_refresh = on_refresh
+
+        self._lock = threading.Lock()
+        self._entries: dict[str, _Entry] = {}
+        # 키 -> 진행 중인 집계 (miss 집계 또는 백그라운드 갱신)
+        self._inflight: dict[str, Future] = {}
+        # invalidate()마다 증가. 그 전에 시작한 집계 결과는 바로 stale로 저장
+        self._generation = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="read-cache")
+
+        self._lookups: dict[str, dict[str, int]] = defaultdict(lambda: {"hit": 0, "stale": 0, "miss": 0})
+        self._refreshes: dict[str, dict[str, float]] = defaultdict(
+            lambda: {"count": 0, "errors": 0, "seconds_total": 0.0, "last_seconds": 0.0}
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def get(self, key: str, db: Session, compute: Callable[[Session], Any]) -> Any:
+        if not self.enabled:
+            return compute(db)
+
+        now = time.monotonic()
+        owner = False
+        with self._lock:
+            entry = self._entries.get(key)
+            future = self._inflight.get(key)
+            if entry is not None and now < entry.fresh_until:
+                result = "hit"
+            elif entry is not None and now < entry.stale_until:
+                result = "stale"
+                if future is None:
+                    self._inflight[key] = self._executor.submit(
+                        self._refresh_in_background, key, db.get_bind(), compute, self._generation
+                    )
+            else:
+                result = "miss"
+                if future is None:
+                    owner = True
+                    future = Future()
+                    self._inflight[key] = future
+            generation = self._generation
+            self._lookups[key][result] += 1
+        if self.on_lookup is not None:
+            self.on_lookup(key, result)
+
+        if result != "miss":
+            return entry.value
+        if not owner:
+            return future.result()
+
+        try:
+            value = self._compute(key, db, compute, generation)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._forget(key, future)
+        future.set_result(value)
+        return value
+
+    def invalidate(self) -> None:
+        """모든 키를 만료 (값은 stale_seconds 동안 남아서 갱신되는 동안 그대로 응답)."""
+        with self._lock:
+            self._generation += 1
+            for entry in self._entries.values():
+                entry.fresh_until = 0.0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> dict[str, dict]:
+        """키별 조회 결과 수 / hit 비율 / 갱신 횟수와 소요 시간."""
+        with self._lock:
+            stats = {}
+            for key in sorted(set(self._lookups) | set(self._refreshes)):
+                lookups = dict(self._lookups[key])
+                total = sum(lookups.values())
+                refreshes = dict(self._refreshes[key])
+                stats[key] = {
+                    **lookups,
+                    # stale 응답도 집계 없이 응답한 것이므로 hit으로 봄
+                    "hit_ratio": round((lookups["hit"] + lookups["stale"]) / total, 4) if total else None,
+                    "refreshes": int(refreshes["count"]),
+                    "refresh_errors": int(refreshes["errors"]),
+                    "avg_refresh_seconds": (
+                        round(refreshes["seconds_total"] / refreshes["count"], 6) if refreshes["count"] else None
+                    ),
+                    "last_refresh_seconds": round(refreshes["last_seconds"], 6),
+                }
+            return stats
+
+    def _compute(self, key: str, db: Session, compute: Callable[[Session], Any], generation: int) -> Any:
+        start = time.perf_counter()
+        try:
+            value = compute(db)
+        except Exception:
+            self._record_refresh(key, "error", time.perf_counter() - start)
+            raise
+        self._record_refresh(key, "success", time.perf_counter() - start)
+
+        now = time.monotonic()
+        with self._lock:
+            fresh_until = now + self.ttl_seconds if generation == self._generation else 0.0
+            self._entries[key] = _Entry(value, fresh_until, now + self.ttl_seconds + self.stale_seconds)
+        return value
+
+    def _refresh_in_background(self, key: str, bind, compute: Callable[[Session], Any], generation: int) -> Any:
+        # submit한 스레드가 락을 잡은 채로 _inflight에 등록하므로 락을 잡은 뒤에 읽음
+        with self._lock:
+            future = self._inflight.get(key)
+        try:
+            with Session(bind=bind) as session:
+                return self._compute(key, session, compute, generation)
+        except Exception as e:
+            # 갱신에 실패해도 stale_seconds 동안은 이전 값으로 응답하고, 그 뒤에는 요청 스레드에서 다시 집계
+            # (이 갱신을 기다리던 miss 요청은 같은 예외를 받음)
+            logger.warning(f"Background refresh of cached {key} failed: {str(e)}")
+            raise
+        finally:
+            if future is not None:
+                self._forget(key, future)
+
+    def _forget(self, key: str, future: Future) -> None:
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def _record_refresh(self, key: str, status: str, seconds: float) -> None:
+        with self._lock:
+            refreshes = self._refreshes[key]
+            refreshes["count"] += 1
+            refreshes["seconds_total"] += seconds
+            refreshes["last_seconds"] = seconds
+            if status == "error":
+                refreshes["errors"] += 1
+        if self.on_refresh is not None:
+            self.on_refresh(key, status, seconds)
+
+
+class InvalidationListener:
+    """
+    evaluator가 보내는 Postgres NOTIFY를 받아 on_notify()를 호출하는 LISTEN 스레드 (psycopg2).
+    Postgres가 아니거나 채널이 없으면 시작하지 않는다. 연결이 끊기면 RECONNECT_INTERVAL_SECONDS마다 다시 연결하고,
+    그 사이 놓친 알림이 있을 수 있으므로 다시 연결하면 on_notify()를 한 번 호출한다.
+    """
+
+    def __init__(self, engine: Engine, channel: str | None, on_notify: Callable[[], None]):
+        if channel and not _CHANNEL_PATTERN.match(channel):
+            raise ValueError(f"Invalid notify channel name: {channel}")
+
+        self.engine = engine
+        self.channel = channel
+        self.on_notify = on_notify
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.channel) and self.engine.dialect.name == "postgresql"
+
+    def start(self) -> None:
+        if not self.enabled or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="read-cache-invalidation", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=5)
+        self._thread = None
+
+    def _run(self) -> None:
+        connected_before = False
+        while not self._stop.is_set():
+            raw_connection = self._connect()
+            if raw_connection is None:
+                self._stop.wait(RECONNECT_INTERVAL_SECONDS)
+                continue
+            if connected_before:
+                self.on_notify()
+            connected_before = True
+            try:
+                self._listen(raw_connection.driver_connection)
+            except Exception as e:
+                logger.warning(f"LISTEN connection on {self.channel} lost: {str(e)}")
+            finally:
+                try:
+                    # autocommit/LISTEN 상태가 남은 연결을 풀에 돌려주지 않도록 버림
+                    raw_connection.invalidate()
+                except Exception:
+                    pass
+
+    def _connect(self):
+        try:
+            raw_connection = self.engine.raw_connection()
+            pg_connection = raw_connection.driver_connection
+            pg_connection.autocommit = True
+            with pg_connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {self.channel}")
+        except Exception as e:
+            logger.warning(f"Failed to LISTEN on {self.channel}, cached results expire by TTL only: {str(e)}")
+            return None
+        logger.info(f"Listening for cache invalidation on channel {self.channel}")
+        return raw_connection
+
+    def _listen(self, pg_connection) -> None:
+        while not self._stop.is_set():
+            # stop()이 기다리지 않도록 짧게 깨어남
+            readable, _, _ = select.select([pg_connection], [], [], 1.0)
+            if not readable:
+                continue
+            pg_connection.poll()
+            if pg_connection.notifies:
+                pg_connection.notifies.clear()
+                self.on_notify()
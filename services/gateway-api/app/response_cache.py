@@ -0,0 +1,139 @@
+"""
+동일 프롬프트 응답 캐시 모듈.
+
+(정규화된 프롬프트, 실제 사용 모델) 조합을 키로 LLM 응답을 캐시한다.
+
+- 1차: 프로세스 내 LRU (TTL + 최대 개수 제한)
+- 2차: 선택적 공유 캐시 (Redis, response_cache_redis_url 설정 시)
+
+공유 캐시에 문제가 생겨도 요청은 실패하지 않고 LLM 호출로 넘어간다.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+
+from .config import settings
+from .metrics import record_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:  # 선택 의존성 (pip install ".[cache]")
+    redis_asyncio = None
+
+
+def normalize_prompt(prompt: str) -> str:
+    """앞뒤 공백 제거 + 연속 공백을 하나로 합쳐서 사소한 차이는 같은 키로 본다."""
+    return " ".join(prompt.split())
+
+
+def make_cache_key(prompt: str, model_version: str) -> str:
+    digest = hashlib.sha256(f"{model_version}\x00{normalize_prompt(prompt)}".encode("utf-8")).hexdigest()
+    return f"llm-response:{digest}"
+
+
+class LRUCache:
+    """
+    TTL이 있는 프로세스 내 LRU 캐시.
+    이벤트 루프 한 곳에서만 사용하므로 락을 두지 않는다.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> dict | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: dict, ttl_seconds: float | None = None):
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+
+class ResponseCache:
+    """
+    LRU(1차) + 공유 캐시(2차)로 구성된 LLM 응답 캐시.
+    캐시 값: {"response": str, "latency_ms": float}
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int, redis_url: str | None = None):
+        self.ttl_seconds = ttl_seconds
+        self.local = LRUCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self.shared = None
+
+        if redis_url:
+            if redis_asyncio is None:
+                logger.warning("response_cache_redis_url is set but 'redis' is not installed; using local cache only")
+            else:
+                self.shared = redis_asyncio.from_url(redis_url)
+
+    async def get(self, prompt: str, model_version: str) -> dict | None:
+        key = make_cache_key(prompt, model_version)
+
+        value = self.local.get(key)
+        record_cache_lookup("local", hit=value is not None)
+        if value is not None:
+            return value
+
+        if self.shared is None:
+            return None
+
+        try:
+            raw = await self.shared.get(key)
+        except Exception as e:
+            logger.warning(f"Shared response cache lookup failed: {str(e)}")
+            return None
+
+        record_cache_lookup("shared", hit=raw is not None)
+        if raw is None:
+            return None
+
+        value = json.loads(raw)
+        self.local.set(key, value)
+        return value
+
+    async def set(self, prompt: str, model_version: str, response: str, latency_ms: float):
+        key = make_cache_key(prompt, model_version)
+        value = {"response": response, "latency_ms": latency_ms}
+
+        self.local.set(key, value)
+
+        if self.shared is None:
+            return
+
+        try:
+            await self.shared.set(key, json.dumps(value), ex=self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"Shared response cache store failed: {str(e)}")
+
+
+response_cache = ResponseCache(
+    max_entries=settings.response_cache_max_entries,
+    ttl_seconds=settings.response_cache_ttl_seconds,
+    redis_url=settings.response_cache_redis_url,
+)
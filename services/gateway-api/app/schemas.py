@@ -7,15 +7,18 @@ class ChatRequest(BaseModel):
     prompt: str
     user_id: str | None = None
     model_version: str | None = None
+    bypass_cache: bool = False  # True면 응답 캐시/요청 병합을 건너뛰고 항상 LLM 호출
 
 
 class ChatResponse(BaseModel):
     response: str
     model_version: str | None = None
     latency_ms: float | None = None
+    cached: bool = False
 
 
 class LLMLogRead(BaseModel):
+    """로그 상세 (prompt / response는 전체 본문)"""
     id: int
     created_at: datetime
     user_id: str | None
@@ -40,7 +43,7 @@ class DashboardSummary(BaseModel):
 
 
 class LogListItem(BaseModel):
-    """로그 목록용 간략한 로그 정보"""
+    """로그 목록용 간략한 로그 정보 (prompt / response는 미리보기, 전체 본문은 /api/dashboard/logs/{id})"""
     id: int
     created_at: datetime
     user_id: str | None
@@ -49,6 +52,8 @@ class LogListItem(BaseModel):
     model_version: str | None
     latency_ms: float | None
     status: str
+    prompt_truncated: bool = False
+    response_truncated: bool = False
 
     class Config:
         from_attributes = True
@@ -57,10 +62,12 @@ class LogListItem(BaseModel):
 class LogListResponse(BaseModel):
     """로그 목록 응답 (페이지네이션 포함)"""
     logs: list[LogListItem]
-    total: int
+    total: int | None  # count=none이면 null
     page: int
     page_size: int
-    total_pages: int
+    total_pages: int | None
+    next_cursor: str | None = None  # 다음 페이지가 있으면 cursor로 넘길 값
+    total_is_estimate: bool = False  # count=estimated로 계산한 추정치인지
 
 
 class EvaluationRead(BaseModel):
@@ -77,8 +84,11 @@ class EvaluationRead(BaseModel):
     comment: str | None
     raw_judge_response: str | None = None
     # 로그 정보도 함께 포함
+    # 로그 본문은 미리보기 (잘렸으면 *_truncated가 true, 전체 본문은 /api/dashboard/logs/{log_id})
     log_prompt: str | None = None
     log_response: str | None = None
+    log_prompt_truncated: bool = False
+    log_response_truncated: bool = False
     log_model_version: str | None = None
 
     class Config:
@@ -88,10 +98,12 @@ class EvaluationRead(BaseModel):
 class EvaluationListResponse(BaseModel):
     """평가 목록 응답 (페이지네이션 포함)"""
     evaluations: list[EvaluationRead]
-    total: int
+    total: int | None  # count=none이면 null
     page: int
     page_size: int
-    total_pages: int
+    total_pages: int | None
+    next_cursor: str | None = None  # 다음 페이지가 있으면 cursor로 넘길 값
+    total_is_estimate: bool = False  # count=estimated로 계산한 추정치인지
 
 
 class ModelStats(BaseModel):
@@ -0,0 +1,52 @@
+"""
+Single-flight 요청 병합 모듈.
+
+같은 키로 동시에 들어온 호출을 upstream 호출 하나로 합치고,
+결과(또는 예외)를 기다리던 모든 호출자에게 나눠준다.
+
+upstream 호출은 별도 태스크로 실행되므로, 먼저 요청한 클라이언트가
+연결을 끊어도 나머지 대기자는 영향을 받지 않는다.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    키별로 진행 중인 호출을 하나만 유지하는 요청 병합기.
+
+        result, shared = await single_flight.do(key, lambda: call_llm_async(prompt, model))
+    """
+
+    def __init__(self):
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """
+        Returns:
+            (결과, 다른 호출의 결과를 공유받았는지 여부)
+        """
+        task = self._inflight.get(key)
+        shared = task is not None
+
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+
+        # shield: 대기자 하나가 취소돼도 공유 중인 upstream 호출은 계속 진행
+        return await asyncio.shield(task), shared
+
+    def _forget(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+        # 모든 대기자가 취소된 경우에도 "exception was never retrieved" 경고가 나지 않도록
+        if not task.cancelled():
+            task.exception()
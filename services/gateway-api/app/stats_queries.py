@@ -0,0 +1,218 @@
+"""
+모델별 통계 집계 쿼리 모듈.
+
+llm_logs / llm_evaluations를 model_version별로 집계한 값(요청 수, 성공/에러 수, 평균 지연시간,
+평가 수, 평균 점수, 점수 분포)을 쿼리 한 번으로 가져온다.
+로그 집계와 평가 집계를 각각 model_version으로 GROUP BY 한 서브쿼리를 같은 SELECT 안에서 LEFT JOIN 하므로
+모델 수와 관계없이 왕복은 한 번이고, 평가가 여러 개인 로그 때문에 요청 수가 부풀려지지 않는다.
+지연시간 백분위수(p50/p95/p99)는 Postgres에서는 같은 쿼리 안에서 percentile_cont로 계산하고,
+percentile_cont가 없는 DB(SQLite, 로컬/테스트)에서만 지연시간을 가져와서 같은 방식(선형 보간)으로 계산한다.
+
+gateway-api/app/stats_queries.py와 dashboard/app/stats_queries.py는 같은 파일이다.
+서비스마다 Docker 빌드 컨텍스트가 달라 복사해서 쓰므로, 수정할 때는 두 파일을 함께 바꾼다
+(gateway-api의 tests/test_stats_queries.py가 두 파일이 같은지 확인).
+ORM 모델(LLMLog, LLMEvaluation)은 서비스마다 따로 정의되어 있어 인자로 받는다.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import Float, Select, case, distinct, func, null, select
+from sqlalchemy.orm import Session
+
+# 성공으로 집계하는 로그 상태 (캐시/병합 응답 포함)
+SUCCESS_STATUSES = ("success", "cached", "coalesced")
+
+# 점수 분포 (overall_score 1~5)
+SCORES = (1, 2, 3, 4, 5)
+
+# 지연시간 백분위수
+PERCENTILES = {"p50": 0.5, "p95": 0.95, "p99": 0.99}
+
+
+@dataclass
+class ModelStatsRow:
+    """model_version 하나의 집계 결과."""
+    model_version: str | None
+    total_requests: int
+    success_count: int
+    error_count: int
+    avg_latency_ms: float | None
+    total_evaluated: int  # 평가된 서로 다른 로그 수
+    evaluation_count: int  # 평가 행 수
+    avg_score: float | None
+    flagged_count: int
+    score_counts: tuple[int, ...]  # 점수 1~5별 평가 수
+    latency_count: int = 0  # latency_ms가 있는 로그 수
+    # latency_percentiles=True로 조회했을 때만 채워짐
+    p50_latency_ms: float | None = None
+    p95_latency_ms: float | None = None
+    p99_latency_ms: float | None = None
+
+    @property
+    def success_rate(self) -> float:
+        return self.success_count / self.total_requests * 100 if self.total_requests else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return self.error_count / self.total_requests * 100 if self.total_requests else 0.0
+
+    @property
+    def low_quality_count(self) -> int:
+        """점수 < 3인 평가 수"""
+        return sum(self.score_counts[:2])
+
+    @property
+    def high_quality_count(self) -> int:
+        """점수 >= 4인 평가 수"""
+        return sum(self.score_counts[3:])
+
+
+def model_stats_query(log_model, evaluation_model, since: datetime | None = None,
+                      exclude_null_model: bool = False, latency_percentiles: bool = False) -> Select:
+    """
+    model_version별 통계 SELECT 하나 (요청 수 많은 순).
+
+    Args:
+        log_model: LLMLog ORM 모델
+        evaluation_model: LLMEvaluation ORM 모델
+        since: 지정하면 이 시각 이후에 생성된 로그만 집계 (평가도 로그의 created_at 기준)
+        exclude_null_model: True면 model_version이 NULL인 로그 제외
+        latency_percentiles: True면 percentile_cont로 p50/p95/p99 계산 (Postgres 전용)
+    """
+    log_filters = []
+    if since is not None:
+        log_filters.append(log_model.created_at >= since)
+    if exclude_null_model:
+        log_filters.append(log_model.model_version.isnot(None))
+
+    log_stats = (
+        select(
+            log_model.model_version.label("model_version"),
+            func.count(log_model.id).label("total_requests"),
+            func.sum(case((log_model.status.in_(SUCCESS_STATUSES), 1), else_=0)).label("success_count"),
+            func.sum(case((log_model.status == "error", 1), else_=0)).label("error_count"),
+            func.avg(log_model.latency_ms).label("avg_latency_ms"),
+            func.count(log_model.latency_ms).label("latency_count"),
+            *(
+                (func.percentile_cont(fraction).within_group(log_model.latency_ms) if latency_percentiles
+                 else null().cast(Float)).label(name)
+                for name, fraction in PERCENTILES.items()
+            ),
+        )
+        .where(*log_filters)
+        .group_by(log_model.model_version)
+        .subquery("log_stats")
+    )
+
+    score = evaluation_model.overall_score
+    eval_stats = (
+        select(
+            log_model.model_version.label("model_version"),
+            func.count(distinct(evaluation_model.log_id)).label("total_evaluated"),
+            func.count(evaluation_model.id).label("evaluation_count"),
+            func.avg(score).label("avg_score"),
+            func.sum(case((evaluation_model.is_flagged.is_(True), 1), else_=0)).label("flagged_count"),
+            *(func.sum(case((score == value, 1), else_=0)).label(f"score_{value}") for value in SCORES),
+        )
+        .join(log_model, evaluation_model.log_id == log_model.id)
+        .where(*log_filters)
+        .group_by(log_model.model_version)
+        .subquery("eval_stats")
+    )
+
+    return (
+        select(
+            log_stats,
+            eval_stats.c.total_evaluated,
+            eval_stats.c.evaluation_count,
+            eval_stats.c.avg_score,
+            eval_stats.c.flagged_count,
+            *(eval_stats.c[f"score_{value}"] for value in SCORES),
+        )
+        .select_from(log_stats)
+        # NULL model_version끼리도 매칭 (IS NOT DISTINCT FROM)
+        .outerjoin(eval_stats, log_stats.c.model_version.is_not_distinct_from(eval_stats.c.model_version))
+        .order_by(log_stats.c.total_requests.desc(), log_stats.c.model_version)
+    )
+
+
+def fetch_model_stats(db: Session, log_model, evaluation_model, since: datetime | None = None,
+                      exclude_null_model: bool = False, latency_percentiles: bool = False) -> list[ModelStatsRow]:
+    """
+    model_version별 통계 조회 (쿼리 1회, percentile_cont가 없는 DB에서 latency_percentiles=True면 2회).
+
+    Returns:
+        list[ModelStatsRow]: 요청 수 많은 순
+    """
+    in_database = latency_percentiles and db.get_bind().dialect.name == "postgresql"
+    rows = db.execute(
+        model_stats_query(log_model, evaluation_model, since, exclude_null_model, latency_percentiles=in_database)
+    ).mappings()
+    stats = [
+        ModelStatsRow(
+            model_version=row["model_version"],
+            total_requests=row["total_requests"],
+            success_count=row["success_count"] or 0,
+            error_count=row["error_count"] or 0,
+            avg_latency_ms=_float_or_none(row["avg_latency_ms"]),
+            total_evaluated=row["total_evaluated"] or 0,
+            evaluation_count=row["evaluation_count"] or 0,
+            avg_score=_float_or_none(row["avg_score"]),
+            flagged_count=row["flagged_count"] or 0,
+            score_counts=tuple(row[f"score_{value}"] or 0 for value in SCORES),
+            latency_count=row["latency_count"],
+            **{f"{name}_latency_ms": _float_or_none(row[name]) for name in PERCENTILES},
+        )
+        for row in rows
+    ]
+
+    if latency_percentiles and not in_database:
+        latencies = fetch_latencies_by_model(db, log_model, since, exclude_null_model)
+        for row in stats:
+            values = latencies.get(row.model_version, [])
+            for name, fraction in PERCENTILES.items():
+                setattr(row, f"{name}_latency_ms", percentile(values, fraction))
+
+    return stats
+
+
+def _float_or_none(value) -> float | None:
+    return float(value) if value is not None else None
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float | None:
+    """정렬된 값의 백분위수 (percentile_cont와 같은 선형 보간)."""
+    if not sorted_values:
+        return None
+    position = fraction * (len(sorted_values) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def fetch_latencies_by_model(
+    db: Session, log_model, since: datetime | None = None, exclude_null_model: bool = False
+) -> dict[str | None, list[float]]:
+    """
+    model_version별 지연시간 목록 (오름차순, 쿼리 1회).
+    percentile_cont가 없는 DB에서 백분위수를 계산할 때만 사용 (모든 행을 가져오므로 데이터가 많으면 느림).
+
+    Returns:
+        dict: model_version -> 정렬된 latency_ms 리스트
+    """
+    stmt = (
+        select(log_model.model_version, log_model.latency_ms)
+        .where(log_model.latency_ms.isnot(None))
+        .order_by(log_model.model_version, log_model.latency_ms)
+    )
+    if since is not None:
+        stmt = stmt.where(log_model.created_at >= since)
+    if exclude_null_model:
+        stmt = stmt.where(log_model.model_version.isnot(None))
+
+    latencies: dict[str | None, list[float]] = defaultdict(list)
+    for model_version, latency_ms in db.execute(stmt):
+        latencies[model_version].append(latency_ms)
+    return latencies
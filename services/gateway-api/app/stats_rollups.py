@@ -0,0 +1,158 @@
+"""
+통계 rollup(llm_stats_hourly) 조회 모듈.
+
+evaluator의 rollup 작업이 (시간, model_version) 단위로 미리 집계해 둔 행을 더해서
+대시보드/분석 API 응답을 만든다. 원본 테이블 전체를 COUNT / AVG 하지 않으므로 응답 시간이 데이터 양과 무관하다.
+
+- rollup은 evaluator가 stats_rollup_interval_seconds(기본 60초)마다 갱신하므로 최근 데이터는 그만큼 늦게 반영된다.
+- 기간 필터는 시간 단위: 시작 시각이 속한 시간대부터 포함한다.
+- rollup이 아직 만들어지지 않았거나(state 행 없음) analytics_use_rollups=false면
+  rollups_available()이 False를 반환하고, API는 원본 테이블 집계로 대체한다.
+- 지연시간 백분위수는 llm_latency_sketch_hourly(로그 스케일 히스토그램)의 bin 개수를 더해서 계산하며,
+  상대 오차는 1% 이내다.
+"""
+
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .models import LLMLatencySketchHourly, LLMStatsHourly, StatsRollupState
+
+# evaluator rollups.ROLLUP_NAME과 같아야 함 (rollup 정의가 바뀔 때 버전이 올라감)
+ROLLUP_NAME = "llm_stats_hourly:v2"
+
+# evaluator rollups.LATENCY_SKETCH_GAMMA와 같아야 함 (상대 오차 1%)
+LATENCY_SKETCH_GAMMA = (1 + 0.01) / (1 - 0.01)
+
+
+@dataclass
+class RollupTotals:
+    """여러 rollup 행을 더한 합계/개수와, 그로부터 계산한 평균/비율."""
+    request_count: int = 0
+    error_count: int = 0
+    latency_count: int = 0
+    latency_sum: float = 0.0
+    evaluated_count: int = 0
+    evaluation_count: int = 0
+    score_sum: int = 0
+    flagged_count: int = 0
+
+    @property
+    def avg_latency_ms(self) -> float | None:
+        return self.latency_sum / self.latency_count if self.latency_count else None
+
+    @property
+    def avg_score(self) -> float | None:
+        return self.score_sum / self.evaluation_count if self.evaluation_count else None
+
+
+_SUM_COLUMNS = (
+    func.coalesce(func.sum(LLMStatsHourly.request_count), 0),
+    func.coalesce(func.sum(LLMStatsHourly.error_count), 0),
+    func.coalesce(func.sum(LLMStatsHourly.latency_count), 0),
+    func.coalesce(func.sum(LLMStatsHourly.latency_sum), 0.0),
+    func.coalesce(func.sum(LLMStatsHourly.evaluated_count), 0),
+    func.coalesce(func.sum(LLMStatsHourly.evaluation_count), 0),
+    func.coalesce(func.sum(LLMStatsHourly.score_sum), 0),
+    func.coalesce(func.sum(LLMStatsHourly.flagged_count), 0),
+)
+
+
+def _totals(values) -> RollupTotals:
+    return RollupTotals(*(value if isinstance(value, float) else int(value) for value in values))
+
+
+def rollups_available(db: Session) -> bool:
+    """rollup을 읽어도 되는지 (설정이 켜져 있고 evaluator가 rollup을 한 번 이상 만들었는지)."""
+    if not settings.analytics_use_rollups:
+        return False
+    return db.get(StatsRollupState, ROLLUP_NAME) is not None
+
+
+def total_stats(db: Session) -> RollupTotals:
+    """전체 기간 합계."""
+    return _totals(db.execute(select(*_SUM_COLUMNS)).one())
+
+
+def hourly_stats(db: Session, start: datetime) -> list[tuple[datetime, RollupTotals]]:
+    """start가 속한 시간대 이후의 시간대별 합계 (모든 model_version을 더함, 오래된 순)."""
+    start_hour = start.replace(minute=0, second=0, microsecond=0)
+    rows = db.execute(
+        select(LLMStatsHourly.bucket_start, *_SUM_COLUMNS)
+        .where(LLMStatsHourly.bucket_start >= start_hour)
+        .group_by(LLMStatsHourly.bucket_start)
+        .order_by(LLMStatsHourly.bucket_start)
+    ).all()
+    return [(row[0], _totals(row[1:])) for row in rows]
+
+
+def daily_stats(db: Session, start: datetime) -> list[tuple[str, RollupTotals]]:
+    """start가 속한 시간대 이후의 일별 합계 (날짜 문자열 'YYYY-MM-DD', 오래된 순)."""
+    days: dict[str, RollupTotals] = {}
+    for bucket_start, hour in hourly_stats(db, start):
+        day = days.setdefault(bucket_start.date().isoformat(), RollupTotals())
+        day.request_count += hour.request_count
+        day.error_count += hour.error_count
+        day.latency_count += hour.latency_count
+        day.latency_sum += hour.latency_sum
+        day.evaluated_count += hour.evaluated_count
+        day.evaluation_count += hour.evaluation_count
+        day.score_sum += hour.score_sum
+        day.flagged_count += hour.flagged_count
+    return list(days.items())
+
+
+def sketch_bin_value(bin_index: int) -> float:
+    """bin (gamma^(i-1), gamma^i] 의 대표값. 구간 안의 어떤 값과도 상대 오차가 1% 이내."""
+    return 2 * LATENCY_SKETCH_GAMMA ** bin_index / (LATENCY_SKETCH_GAMMA + 1)
+
+
+def sketch_quantile(bins: list[tuple[int, int]], total: int, fraction: float) -> float | None:
+    """
+    (bin, 개수) 목록(bin 오름차순)에서 백분위수.
+    percentile_cont처럼 0부터 센 순위 fraction * (total - 1)의 값이 들어 있는 bin의 대표값.
+    """
+    if total == 0:
+        return None
+    rank = fraction * (total - 1)
+    seen = 0
+    for bin_index, count in bins:
+        seen += count
+        if seen > rank:
+            return sketch_bin_value(bin_index)
+    return sketch_bin_value(bins[-1][0])
+
+
+def latency_percentiles(db: Session, start: datetime,
+                        fractions: dict[str, float]) -> dict[str | None, tuple[int, dict[str, float | None]]]:
+    """
+    start가 속한 시간대 이후의 model_version별 지연시간 백분위수 (쿼리 1회).
+
+    Returns:
+        dict: model_version(NULL은 None) -> (지연시간 개수, {이름: 백분위수})
+    """
+    start_hour = start.replace(minute=0, second=0, microsecond=0)
+    rows = db.execute(
+        select(LLMLatencySketchHourly.model_version, LLMLatencySketchHourly.bin,
+               func.sum(LLMLatencySketchHourly.count))
+        .where(LLMLatencySketchHourly.bucket_start >= start_hour)
+        .group_by(LLMLatencySketchHourly.model_version, LLMLatencySketchHourly.bin)
+        .order_by(LLMLatencySketchHourly.model_version, LLMLatencySketchHourly.bin)
+    ).all()
+
+    bins_by_model: dict[str, list[tuple[int, int]]] = {}
+    for model_version, bin_index, count in rows:
+        bins_by_model.setdefault(model_version, []).append((bin_index, int(count)))
+
+    percentiles = {}
+    for model_version, bins in bins_by_model.items():
+        total = sum(count for _, count in bins)
+        percentiles[model_version or None] = (
+            total,
+            {name: sketch_quantile(bins, total, fraction) for name, fraction in fractions.items()},
+        )
+    return percentiles
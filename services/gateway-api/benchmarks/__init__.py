@@ -0,0 +1 @@
+# Gateway API benchmarks
@@ -0,0 +1,99 @@
+"""
+/chat 경로 동시성 벤치마크.
+
+로컬 stub LLM 서버(고정 지연)를 띄운 뒤 동일한 개수의 동시 요청을
+1) 기존 방식: sync call_llm을 Starlette 스레드풀에서 실행 (sync def 엔드포인트와 동일)
+2) async 방식: call_llm_async를 이벤트 루프에서 직접 await
+3) 엔드투엔드: async /chat 엔드포인트 (ASGI, SQLite + aiosqlite, write-behind 로그 버퍼)
+으로 보내고 처리량과 유효 동시성(= 요청 수 * 지연 / 소요시간)을 비교한다.
+
+    cd services/gateway-api
+    python -m benchmarks.bench_chat_concurrency --requests 1000 --delay 1.0
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+PORT = 9100
+
+
+def _configure_env(port: int, max_connections: int) -> None:
+    # app.config가 import 시점에 Settings를 읽으므로 import 전에 환경변수 설정
+    db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{db_path}")
+    os.environ["LLM_API_BASE_URL"] = f"http://127.0.0.1:{port}/v1"
+    os.environ.setdefault("LLM_API_KEY", "stub-key")
+    os.environ["LLM_HTTP_MAX_CONNECTIONS"] = str(max_connections)
+    os.environ["LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS"] = str(max_connections)
+
+
+async def _run(label: str, n: int, delay: float, make_call) -> None:
+    start = time.perf_counter()
+    results = await asyncio.gather(*(make_call(i) for i in range(n)), return_exceptions=True)
+    elapsed = time.perf_counter() - start
+
+    errors = sum(1 for r in results if isinstance(r, Exception))
+    print(
+        f"{label:<28} requests={n:<6} errors={errors:<4} "
+        f"elapsed={elapsed:7.2f}s throughput={n / elapsed:8.1f} req/s "
+        f"effective_concurrency={n * delay / elapsed:7.1f}"
+    )
+
+
+async def main(n: int, delay: float, skip_sync: bool) -> None:
+    from starlette.concurrency import run_in_threadpool
+    import httpx
+
+    from app.llm_client import call_llm, call_llm_async
+    from app.log_writer import log_writer
+    from app.main import app
+
+    from app.llm_client import async_client
+
+    # 요청마다 다른 프롬프트 (single-flight 병합 없이 순수 동시성만 측정)
+    def prompt(i: int) -> str:
+        return f"What is the capital of France? ({i})"
+
+    if not skip_sync:
+        await _run(
+            "sync call_llm (threadpool)", n, delay,
+            lambda i: run_in_threadpool(call_llm, prompt(i)),
+        )
+
+    await _run("async call_llm_async", n, delay, lambda i: call_llm_async(prompt(i)))
+
+    # ASGITransport는 lifespan을 실행하지 않으므로 write-behind 버퍼를 직접 시작
+    await log_writer.start()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://gateway", timeout=None) as client:
+        await _run(
+            "async /chat (end-to-end)", n, delay,
+            lambda i: client.post("/chat", json={"prompt": prompt(i), "user_id": f"bench-{i}"}),
+        )
+    await log_writer.stop()
+
+    stats = async_client._client._transport.stats
+    print(
+        f"async pool: requests={stats.requests} connections_opened={stats.connections_opened} "
+        f"reuse_ratio={stats.reuse_ratio:.2f}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gateway /chat concurrency benchmark")
+    parser.add_argument("--requests", type=int, default=1000, help="동시 요청 수")
+    parser.add_argument("--delay", type=float, default=1.0, help="stub LLM 응답 지연 (초)")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--skip-sync", action="store_true", help="스레드풀 기준선 측정 생략")
+    parser.add_argument("--max-connections", type=int, default=1000, help="LLM HTTP 커넥션 풀 크기")
+    args = parser.parse_args()
+
+    _configure_env(args.port, args.max_connections)
+
+    from benchmarks.stub_llm_server import StubServer
+
+    with StubServer(port=args.port, delay_seconds=args.delay):
+        asyncio.run(main(args.requests, args.delay, args.skip_sync))
@@ -0,0 +1,162 @@
+"""
+모델별 통계 엔드포인트 쿼리 수 / 응답 시간 벤치마크.
+
+합성 llm_logs / llm_evaluations(기본 100만 행, 모델 20개, 최근 7일)를 만든 뒤
+1) 기존 방식: 모델별로 GROUP BY 한 번 + 모델마다 평가 통계 / 지연시간 쿼리 (N+1)
+2) stats_queries: 로그/평가 집계를 한 SELECT로 (compare-models는 Postgres에서 percentile_cont,
+   SQLite에서는 지연시간 쿼리 1회 추가. rollup 히스토그램 경로는 evaluator의 bench_dashboard_rollups 참고)
+의 쿼리 수와 응답 시간을 비교한다.
+
+DATABASE_URL을 주면 해당 DB(예: 빈 Postgres)에 테이블을 만들어 측정하고, 없으면 임시 SQLite 파일을 사용한다.
+
+    cd services/gateway-api
+    python -m benchmarks.bench_model_stats --rows 1000000 --models 20
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+def _configure_env() -> None:
+    # app.config가 import 시점에 Settings를 읽으므로 import 전에 환경변수 설정
+    if "DATABASE_URL" not in os.environ:
+        db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+        os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ.setdefault("LLM_API_KEY", "stub-key")
+    # 캐시된 응답이 아니라 집계 쿼리 자체를 측정
+    os.environ["READ_CACHE_TTL_SECONDS"] = "0"
+
+
+def _populate(engine, rows: int, models: int, chunk: int = 50_000) -> None:
+    from sqlalchemy import insert, text
+
+    from app.models import LLMEvaluation, LLMLog
+
+    rng = random.Random(0)
+    now = datetime.now()
+
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        for offset in range(1, rows + 1, chunk):
+            ids = range(offset, min(offset + chunk, rows + 1))
+            conn.execute(insert(LLMLog), [
+                {
+                    "id": i,
+                    "created_at": now - timedelta(seconds=rng.uniform(0, 6 * 86400)),
+                    "prompt": "synthetic prompt",
+                    "response": "synthetic response",
+                    "model_version": f"model-{i % models}",
+                    "latency_ms": rng.lognormvariate(6.5, 0.5),
+                    "status": "error" if rng.random() < 0.03 else "success",
+                }
+                for i in ids
+            ])
+            conn.execute(insert(LLMEvaluation), [
+                {"log_id": i, "overall_score": rng.randint(1, 5), "label": "ok", "is_flagged": False}
+                for i in ids if i % 3 != 0
+            ])
+        conn.execute(text("ANALYZE"))
+    print(f"populated {rows} logs across {models} models in {time.perf_counter() - start:.1f}s")
+
+
+def _legacy_model_stats(db):
+    """기존 get_model_stats (모델마다 평가 통계 쿼리)."""
+    from sqlalchemy import distinct, func
+
+    from app.models import LLMEvaluation, LLMLog
+
+    results = []
+    for model_version, total_requests, avg_latency in (
+        db.query(LLMLog.model_version, func.count(LLMLog.id), func.avg(LLMLog.latency_ms))
+        .group_by(LLMLog.model_version)
+        .all()
+    ):
+        eval_stats = (
+            db.query(func.count(distinct(LLMEvaluation.log_id)), func.avg(LLMEvaluation.overall_score))
+            .join(LLMLog, LLMEvaluation.log_id == LLMLog.id)
+            .filter(LLMLog.model_version == model_version)
+            .first()
+        )
+        results.append((model_version, total_requests, avg_latency, *eval_stats))
+    return results
+
+
+def _legacy_compare_models(db, days: int = 7):
+    """기존 compare_models (모델마다 지연시간 전체 조회 + 평가 통계 쿼리)."""
+    from sqlalchemy import case, distinct, func
+
+    from app.models import LLMEvaluation, LLMLog
+
+    start_date = datetime.now() - timedelta(days=days)
+    results = []
+    for model_version, total_requests in (
+        db.query(LLMLog.model_version, func.count(LLMLog.id))
+        .filter(LLMLog.created_at >= start_date)
+        .group_by(LLMLog.model_version)
+        .all()
+    ):
+        latencies = [
+            row[0] for row in
+            db.query(LLMLog.latency_ms)
+            .filter(LLMLog.model_version == model_version, LLMLog.created_at >= start_date, LLMLog.latency_ms.isnot(None))
+            .order_by(LLMLog.latency_ms)
+            .all()
+        ]
+        p50 = statistics.median(latencies) if latencies else None
+        eval_stats = (
+            db.query(
+                func.count(distinct(LLMEvaluation.log_id)),
+                func.avg(LLMEvaluation.overall_score),
+                func.sum(case((LLMEvaluation.overall_score < 3, 1), else_=0)),
+            )
+            .join(LLMLog, LLMEvaluation.log_id == LLMLog.id)
+            .filter(LLMLog.model_version == model_version, LLMLog.created_at >= start_date)
+            .first()
+        )
+        results.append((model_version, total_requests, p50, *eval_stats))
+    return results
+
+
+def _measure(label: str, fn, queries: list, repeat: int) -> None:
+    samples = []
+    for _ in range(repeat):
+        queries.clear()
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    print(f"{label:<40} queries={len(queries):<4} median={statistics.median(samples):9.1f}ms min={min(samples):9.1f}ms")
+
+
+def main(rows: int, models: int, repeat: int) -> None:
+    from sqlalchemy import event
+
+    from app.db import Base, SessionLocal, engine
+    from app.main import compare_models, get_model_stats
+
+    Base.metadata.create_all(bind=engine)
+    _populate(engine, rows, models)
+
+    queries: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: queries.append(args[2]))
+
+    with SessionLocal() as db:
+        _measure("models/stats (legacy N+1)", lambda: _legacy_model_stats(db), queries, repeat)
+        _measure("models/stats (stats_queries)", lambda: get_model_stats(db=db), queries, repeat)
+        _measure("compare-models (legacy N+1)", lambda: _legacy_compare_models(db), queries, repeat)
+        _measure("compare-models (stats_queries)", lambda: compare_models(days=7, db=db), queries, repeat)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Model stats query benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--models", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    _configure_env()
+    main(args.rows, args.models, args.repeat)
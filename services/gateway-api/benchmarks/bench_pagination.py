@@ -0,0 +1,106 @@
+"""
+대시보드 로그 목록 페이지네이션 벤치마크 (OFFSET vs keyset cursor, COUNT 모드).
+
+합성 llm_logs(기본 100만 행)를 만든 뒤 /api/dashboard/logs 핸들러를
+1) page=N (OFFSET) 2) 같은 위치의 cursor 로 호출해서 페이지 깊이별 응답 시간을 비교하고,
+count=exact / estimated / none의 차이를 잰다.
+
+DATABASE_URL을 주면 해당 DB(예: 빈 Postgres)에 테이블을 만들어 측정하고, 없으면 임시 SQLite 파일을 사용한다.
+
+    cd services/gateway-api
+    python -m benchmarks.bench_pagination --rows 1000000
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+def _configure_env() -> None:
+    # app.config가 import 시점에 Settings를 읽으므로 import 전에 환경변수 설정
+    if "DATABASE_URL" not in os.environ:
+        db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+        os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ.setdefault("LLM_API_KEY", "stub-key")
+
+
+def _populate(engine, rows: int, chunk: int = 50_000) -> None:
+    from sqlalchemy import insert, text
+
+    from app.models import LLMLog
+
+    now = datetime.now()
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        for offset in range(1, rows + 1, chunk):
+            conn.execute(insert(LLMLog), [
+                {
+                    "id": i,
+                    # 초 단위로 겹치는 created_at (id로 동률 구분)
+                    "created_at": now - timedelta(seconds=(rows - i) // 4),
+                    "prompt": "synthetic prompt",
+                    "response": "synthetic response",
+                    "model_version": "gpt-5-mini",
+                    "latency_ms": 500.0,
+                    "status": "success",
+                }
+                for i in range(offset, min(offset + chunk, rows + 1))
+            ])
+        conn.execute(text("ANALYZE"))
+    print(f"populated {rows} logs in {time.perf_counter() - start:.1f}s")
+
+
+def _median_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return statistics.median(samples)
+
+
+def main(rows: int, page_size: int, repeat: int) -> None:
+    from app.db import Base, SessionLocal, engine
+    from app.main import get_logs
+    from app.models import LLMLog
+    from app.pagination import encode_cursor
+
+    Base.metadata.create_all(bind=engine)
+    _populate(engine, rows)
+
+    with SessionLocal() as db:
+        print(f"\n{'page':>8} {'offset (count=none)':>20} {'cursor (count=none)':>20}")
+        for page in (1, 10, 1_000, rows // page_size // 2, rows // page_size):
+            # page의 첫 행 바로 앞 행에서 시작하는 cursor
+            skip = (page - 1) * page_size
+            cursor = None
+            if skip:
+                previous = (
+                    db.query(LLMLog)
+                    .order_by(LLMLog.created_at.desc(), LLMLog.id.desc())
+                    .offset(skip - 1)
+                    .first()
+                )
+                cursor = encode_cursor(previous.created_at, previous.id)
+            offset_ms = _median_ms(lambda: get_logs(page=page, page_size=page_size, cursor=None, count="none", db=db), repeat)
+            cursor_ms = _median_ms(lambda: get_logs(page=1, page_size=page_size, cursor=cursor, count="none", db=db), repeat)
+            print(f"{page:>8} {offset_ms:18.1f}ms {cursor_ms:18.1f}ms")
+
+        print(f"\n{'count mode':<12} {'median':>10}")
+        for mode in ("exact", "estimated", "none"):
+            ms = _median_ms(lambda: get_logs(page=1, page_size=page_size, cursor=None, count=mode, db=db), repeat)
+            print(f"{mode:<12} {ms:8.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dashboard pagination benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    _configure_env()
+    main(args.rows, args.page_size, args.repeat)
@@ -0,0 +1,165 @@
+"""
+긴 프롬프트/응답 본문 저장 방식 벤치마크 (llm_logs에 전체 본문 vs 미리보기 + llm_text_blobs).
+
+같은 합성 로그를 두 SQLite 파일에 저장해서 테이블 크기, 행 폭, 대시보드 로그 목록과 llm_logs를 훑는 집계의
+응답 시간을 비교한다.
+- 프롬프트: 긴 템플릿 프롬프트 풀에서 그대로 반복되는 요청(--repeat-ratio)과 템플릿 + 고유 질문
+- 응답: 글자 수가 로그 정규 분포 (중앙값 약 700자, 긴 꼬리)
+
+    cd services/gateway-api
+    python -m benchmarks.bench_text_storage --rows 100000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+
+def _configure_env() -> None:
+    # app.config가 import 시점에 Settings를 읽으므로 import 전에 환경변수 설정
+    if "DATABASE_URL" not in os.environ:
+        db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+        os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ.setdefault("LLM_API_KEY", "stub-key")
+
+
+def _text(rng: random.Random, words: list[str], chars: int) -> str:
+    parts, length = [], 0
+    while length < chars:
+        word = rng.choice(words)
+        parts.append(word)
+        length += len(word) + 1
+    return " ".join(parts)[:chars]
+
+
+def _synthetic_logs(rows: int, repeat_ratio: float, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    words = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 9))) for _ in range(3000)]
+    templates = [_text(rng, words, rng.randint(1500, 6000)) for _ in range(50)]
+    canned = [f"{rng.choice(templates)}\n\n{_text(rng, words, 120)}" for _ in range(200)]
+
+    now = datetime.now(timezone.utc)
+    logs = []
+    for i in range(1, rows + 1):
+        if rng.random() < repeat_ratio:
+            prompt = rng.choice(canned)
+        else:
+            prompt = f"{rng.choice(templates)}\n\n{_text(rng, words, rng.randint(40, 400))}"
+        logs.append({
+            "id": i,
+            "created_at": now - timedelta(seconds=rows - i),
+            "prompt": prompt,
+            "response": _text(rng, words, max(1, int(rng.lognormvariate(6.55, 0.9)))),
+            "model_version": f"model-{i % 5}",
+            "latency_ms": rng.lognormvariate(6.5, 0.5),
+            "status": "success",
+        })
+    return logs
+
+
+def _populate(engine, logs: list[dict], offload: bool, preview_chars: int, chunk: int = 5_000) -> None:
+    from sqlalchemy import insert, text
+
+    from app.models import LLMLog, LLMTextBlob
+    from app.text_blobs import offload_rows, upsert_blobs
+
+    with engine.begin() as conn:
+        for offset in range(0, len(logs), chunk):
+            batch = [dict(log) for log in logs[offset:offset + chunk]]
+            if offload:
+                used_at = datetime.now(timezone.utc)
+                blob_rows = offload_rows(batch, preview_chars, used_at)
+                if blob_rows:
+                    conn.execute(upsert_blobs(LLMTextBlob, conn.dialect.name, blob_rows, used_at))
+            conn.execute(insert(LLMLog), batch)
+        conn.execute(text("ANALYZE"))
+    with engine.connect() as conn:
+        conn.execute(text("VACUUM"))
+
+
+def _table_bytes(engine, table: str) -> int:
+    from sqlalchemy import text
+
+    with engine.connect() as conn:
+        # dbstat: 테이블 b-tree 페이지 (TOAST가 없는 SQLite는 본문도 같은 페이지/overflow 페이지에 있음)
+        return conn.execute(text("SELECT COALESCE(SUM(pgsize), 0) FROM dbstat WHERE name = :table"), {"table": table}).scalar()
+
+
+def _median_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return statistics.median(samples)
+
+
+def main(rows: int, repeat_ratio: float, repeat: int) -> None:
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.orm import sessionmaker
+
+    from app.config import settings
+    from app.db import Base
+    from app.main import get_logs
+    from app.schema_migrations import run_migrations
+
+    start = time.perf_counter()
+    logs = _synthetic_logs(rows, repeat_ratio)
+    prompt_chars = sum(len(log["prompt"]) for log in logs)
+    response_chars = sum(len(log["response"]) for log in logs)
+    print(
+        f"generated {rows} logs in {time.perf_counter() - start:.1f}s "
+        f"(avg prompt {prompt_chars / rows:.0f} chars, avg response {response_chars / rows:.0f} chars)"
+    )
+
+    directory = tempfile.mkdtemp()
+    results = {}
+    for name, offload in (("inline", False), ("offloaded", True)):
+        engine = create_engine(f"sqlite:///{os.path.join(directory, f'{name}.db')}")
+        run_migrations(engine, Base.metadata)
+        start = time.perf_counter()
+        _populate(engine, logs, offload, settings.log_body_preview_chars)
+        insert_s = time.perf_counter() - start
+
+        logs_bytes = _table_bytes(engine, "llm_logs")
+        blob_bytes = _table_bytes(engine, "llm_text_blobs")
+        with engine.connect() as conn:
+            blobs = conn.execute(text("SELECT COUNT(*) FROM llm_text_blobs")).scalar()
+
+        with sessionmaker(bind=engine)() as db:
+            page_ms = _median_ms(lambda: get_logs(page=1, page_size=20, cursor=None, count="none", db=db), repeat)
+            deep_ms = _median_ms(lambda: get_logs(page=rows // 40, page_size=20, cursor=None, count="none", db=db), repeat)
+            # llm_logs를 훑는 집계 (rollup이 없을 때의 모델별 통계와 같은 형태)
+            scan_ms = _median_ms(
+                lambda: db.execute(text(
+                    "SELECT model_version, COUNT(*), AVG(latency_ms) FROM llm_logs GROUP BY model_version"
+                )).all(),
+                repeat,
+            )
+        engine.dispose()
+        results[name] = (insert_s, logs_bytes, blob_bytes, blobs, page_ms, deep_ms, scan_ms)
+
+    print(
+        f"\n{'storage':<10} {'insert':>8} {'llm_logs':>10} {'row':>8} {'blobs':>10} {'#blobs':>8} "
+        f"{'page 1':>8} {'page mid':>9} {'scan agg':>9}"
+    )
+    for name, (insert_s, logs_bytes, blob_bytes, blobs, page_ms, deep_ms, scan_ms) in results.items():
+        print(
+            f"{name:<10} {insert_s:7.1f}s {logs_bytes / 2**20:8.1f}MB {logs_bytes / rows:7.0f}B "
+            f"{blob_bytes / 2**20:8.1f}MB {blobs:>8} {page_ms:6.1f}ms {deep_ms:7.1f}ms {scan_ms:7.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prompt/response body storage benchmark")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat-ratio", type=float, default=0.3, help="그대로 반복되는 프롬프트 비율")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    _configure_env()
+    main(args.rows, args.repeat_ratio, args.repeat)
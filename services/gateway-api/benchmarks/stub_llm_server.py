@@ -0,0 +1,143 @@
+"""
+부하 테스트용 OpenAI 호환 stub LLM 서버.
+
+`POST /v1/responses`에 대해 설정된 지연 후 고정 응답을 반환한다.
+`stream: true` 요청에는 단어 단위 delta 이벤트를 SSE로 흘려보낸다.
+error_rate를 주면 그 비율만큼 503을 반환한다 (라우터/circuit breaker 테스트용).
+실제 모델 없이 gateway의 동시성/지연 특성만 측정하기 위해 사용.
+
+    python -m benchmarks.stub_llm_server --port 9100 --delay 1.0
+"""
+
+import argparse
+import asyncio
+import itertools
+import multiprocessing
+import random
+import socket
+import time
+
+import json
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+_ids = itertools.count(1)
+
+
+def _response_body(model: str, text: str) -> dict:
+    """Responses API 형식의 최소 응답 본문."""
+    n = next(_ids)
+    return {
+        "id": f"resp_{n}",
+        "object": "response",
+        "created_at": int(time.time()),
+        "model": model,
+        "status": "completed",
+        "output": [
+            {
+                "type": "message",
+                "id": f"msg_{n}",
+                "role": "assistant",
+                "status": "completed",
+                "content": [{"type": "output_text", "text": text, "annotations": []}],
+            }
+        ],
+        "parallel_tool_calls": False,
+        "tool_choice": "auto",
+        "tools": [],
+    }
+
+
+async def _stream_events(model: str, text: str, delay_seconds: float, token_interval_seconds: float):
+    """Responses API 스트리밍 이벤트 (delta ... completed)."""
+    await asyncio.sleep(delay_seconds)
+
+    words = text.split(" ")
+    for i, word in enumerate(words):
+        delta = word if i == 0 else f" {word}"
+        event = {"type": "response.output_text.delta", "item_id": "msg_stream", "output_index": 0,
+                 "content_index": 0, "delta": delta, "sequence_number": i}
+        yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        await asyncio.sleep(token_interval_seconds)
+
+    body = _response_body(model, text)
+    body["usage"] = {"input_tokens": 0, "output_tokens": len(words), "total_tokens": len(words)}
+    event = {"type": "response.completed", "response": body, "sequence_number": len(words)}
+    yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+def create_app(
+    delay_seconds: float = 1.0,
+    text: str = "This is a stub response from the benchmark server.",
+    token_interval_seconds: float = 0.01,
+    error_rate: float = 0.0,
+) -> FastAPI:
+    app = FastAPI(title="Stub LLM Server")
+
+    @app.post("/v1/responses")
+    async def responses(request: Request):
+        body = await request.json()
+        model = body.get("model", "stub-model")
+
+        if error_rate and random.random() < error_rate:
+            return JSONResponse(status_code=503, content={"error": {"message": "stub overloaded"}})
+
+        if body.get("stream"):
+            return StreamingResponse(
+                _stream_events(model, text, delay_seconds, token_interval_seconds),
+                media_type="text/event-stream",
+            )
+
+        await asyncio.sleep(delay_seconds)
+        return _response_body(model, text)
+
+    return app
+
+
+def _serve(port: int, app_kwargs: dict) -> None:
+    uvicorn.run(create_app(**app_kwargs), host="127.0.0.1", port=port, log_level="warning", backlog=4096, timeout_keep_alive=75)
+
+
+class StubServer:
+    """
+    별도 프로세스에서 uvicorn으로 stub 서버를 띄우는 헬퍼.
+    (벤치마크 클라이언트와 GIL을 공유하지 않도록 프로세스 분리)
+
+        with StubServer(port=9100, delay_seconds=0.5) as server:
+            ...  # LLM_API_BASE_URL=server.base_url
+    """
+
+    def __init__(self, port: int = 9100, **app_kwargs):
+        self.port = port
+        self._process = multiprocessing.Process(target=_serve, args=(port, app_kwargs), daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/v1"
+
+    def __enter__(self):
+        self._process.start()
+        deadline = time.time() + 10
+        while time.time() < deadline:
+            try:
+                with socket.create_connection(("127.0.0.1", self.port), timeout=0.2):
+                    return self
+            except OSError:
+                time.sleep(0.05)
+        raise RuntimeError(f"Stub LLM server did not start on port {self.port}")
+
+    def __exit__(self, *exc):
+        self._process.terminate()
+        self._process.join(timeout=5)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stub OpenAI-compatible LLM server")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--delay", type=float, default=1.0, help="응답 지연 (초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="503 응답 비율 (0~1)")
+    args = parser.parse_args()
+
+    _serve(args.port, {"delay_seconds": args.delay, "error_rate": args.error_rate})
@@ -0,0 +1,46 @@
+"""
+/chat/stream SSE 엔드포인트 테스트
+"""
+
+from fastapi.testclient import TestClient
+
+import app.main as main
+from app.llm_client import LLMStream
+
+client = TestClient(main.app)
+
+
+class FakeStream(LLMStream):
+    """실제 API 대신 고정 토큰을 흘려보내는 스트림"""
+
+    async def __aiter__(self):
+        self.ttft_ms = 5.0
+        for delta in ["Hello", ", ", "world"]:
+            self.chunks.append(delta)
+            yield delta
+        self.output_tokens = 3
+        self.latency_ms = 10.0
+
+
+def test_chat_stream_relays_deltas_and_logs_full_text(monkeypatch):
+    """delta 이벤트를 순서대로 전달하고, 전체 텍스트로 로그를 저장"""
+    submitted = []
+
+    async def fake_submit(**values):
+        submitted.append(values)
+
+    monkeypatch.setattr(main, "stream_llm", lambda prompt, model: FakeStream(prompt, model))
+    monkeypatch.setattr(main.log_writer, "submit", fake_submit)
+
+    response = client.post("/chat/stream", json={"prompt": "hi", "model_version": "test-model"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    body = response.text
+    assert body.index('"Hello"') < body.index('", "') < body.index('"world"')
+    assert "event: done" in body
+
+    assert len(submitted) == 1
+    assert submitted[0]["response"] == "Hello, world"
+    assert submitted[0]["model_version"] == "test-model"
+    assert submitted[0]["status"] == "success"
@@ -0,0 +1,70 @@
+"""
+멀티 백엔드 LLM 라우터 테스트 (로컬 stub 서버 사용)
+"""
+
+import asyncio
+
+import pytest
+
+from app import llm_client
+from app.config import LLMBackendConfig
+from app.llm_client import LLMRouter
+from benchmarks.stub_llm_server import StubServer
+
+
+@pytest.fixture
+def router_settings(monkeypatch):
+    monkeypatch.setattr(llm_client.settings, "llm_router_failure_threshold", 2)
+    monkeypatch.setattr(llm_client.settings, "llm_router_cooldown_seconds", 60.0)
+    monkeypatch.setattr(llm_client.settings, "llm_router_max_attempts", 2)
+
+
+def _call(router: LLMRouter, model: str) -> str:
+    async def request(backend):
+        response = await backend.client.responses.create(model=backend.model or model, input="hi")
+        return response.output_text
+
+    return router.call(model, request)
+
+
+def test_router_prefers_lower_latency_backend(router_settings):
+    """EWMA 지연시간이 낮은 백엔드로 대부분의 요청을 보냄"""
+    with StubServer(port=9121, delay_seconds=0.01, text="fast") as fast, \
+            StubServer(port=9122, delay_seconds=0.3, text="slow") as slow:
+        router = LLMRouter({
+            "test-model": [
+                LLMBackendConfig(name="fast", base_url=fast.base_url, api_key="stub"),
+                LLMBackendConfig(name="slow", base_url=slow.base_url, api_key="stub"),
+            ]
+        })
+
+        async def scenario():
+            return [await _call(router, "test-model") for _ in range(20)]
+
+        results = asyncio.run(scenario())
+
+    assert results.count("fast") >= 17
+
+
+def test_router_fails_over_and_ejects_failing_backend(router_settings):
+    """503을 반환하는 백엔드는 다른 백엔드로 재시도되고, 연속 실패 후 제외됨"""
+    with StubServer(port=9123, delay_seconds=0.0, text="healthy") as healthy, \
+            StubServer(port=9124, delay_seconds=0.0, error_rate=1.0) as broken:
+        router = LLMRouter({
+            "*": [
+                LLMBackendConfig(name="healthy", base_url=healthy.base_url, api_key="stub"),
+                LLMBackendConfig(name="broken", base_url=broken.base_url, api_key="stub"),
+            ]
+        })
+        healthy_backend, broken_backend = router.pools["*"]
+        # 측정값이 없는 백엔드를 먼저 시도하므로, broken이 먼저 선택되도록 설정
+        healthy_backend.ewma_seconds = 0.5
+
+        async def scenario():
+            return [await _call(router, "any-model") for _ in range(5)]
+
+        results = asyncio.run(scenario())
+
+    assert results == ["healthy"] * 5
+    assert broken_backend.open_until > 0
+    assert broken_backend.outstanding == 0
@@ -0,0 +1,119 @@
+"""
+LLMLog write-behind 버퍼 테스트
+"""
+
+import asyncio
+import uuid
+
+from sqlalchemy import func
+from sqlalchemy.exc import OperationalError
+
+from app.db import Base, SessionLocal, dispose_async_engine, engine
+from app.log_writer import LogWriter
+from app.models import LLMLog
+from app.schema_migrations import run_migrations
+
+
+def setup_module():
+    # 서비스 시작 시(lifespan)와 같이 테이블 생성
+    run_migrations(engine, Base.metadata)
+
+
+def _count_logs(user_id: str) -> int:
+    with SessionLocal() as db:
+        return db.query(func.count(LLMLog.id)).filter(LLMLog.user_id == user_id).scalar()
+
+
+def test_log_writer_flushes_batches_and_remaining_rows_on_stop():
+    """batch_size 단위로 flush하고, 종료 시 남은 row도 모두 저장"""
+    writer = LogWriter(batch_size=10, flush_interval_seconds=60, max_queue_size=100)
+    user_id = f"log-writer-batch-{uuid.uuid4()}"
+
+    async def scenario():
+        await writer.start()
+        for i in range(25):
+            await writer.submit(
+                user_id=user_id,
+                prompt=f"prompt {i}",
+                response="response",
+                model_version="test-model",
+                latency_ms=1.0,
+                status="success",
+            )
+        await writer.stop()
+        await dispose_async_engine()
+
+    asyncio.run(scenario())
+
+    assert _count_logs(user_id) == 25
+
+
+def test_log_writer_writes_directly_when_not_running():
+    """시작하지 않은 writer는 바로 INSERT"""
+    writer = LogWriter(batch_size=10, flush_interval_seconds=60, max_queue_size=100)
+    user_id = f"log-writer-direct-{uuid.uuid4()}"
+
+    async def scenario():
+        await writer.submit(
+            user_id=user_id,
+            prompt="prompt",
+            response="response",
+            model_version="test-model",
+            latency_ms=1.0,
+            status="success",
+        )
+        await dispose_async_engine()
+
+    asyncio.run(scenario())
+
+    assert _count_logs(user_id) == 1
+
+
+def test_log_writer_retries_batch_after_transient_failure():
+    """첫 flush가 연결 오류로 실패해도 배치를 다시 써서 로그를 잃지 않음"""
+    writer = LogWriter(batch_size=10, flush_interval_seconds=60, max_queue_size=100, retry_backoff_seconds=0.01)
+    user_id = f"log-writer-retry-{uuid.uuid4()}"
+    write = writer._write
+    attempts = 0
+
+    async def flaky_write(batch):
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise OperationalError("INSERT INTO llm_logs", {}, ConnectionResetError("connection reset"))
+        await write(batch)
+
+    writer._write = flaky_write
+
+    async def scenario():
+        await writer.start()
+        for i in range(5):
+            await writer.submit(user_id=user_id, prompt=f"prompt {i}", response="response", status="success")
+        await writer.stop()
+        await dispose_async_engine()
+
+    asyncio.run(scenario())
+
+    assert attempts == 2
+    assert _count_logs(user_id) == 5
+
+
+def test_log_writer_drops_only_bad_rows():
+    """제약 조건 위반이나 오프로드할 수 없는 row만 버리고 같은 배치의 나머지는 저장"""
+    writer = LogWriter(batch_size=10, flush_interval_seconds=60, max_queue_size=100)
+    user_id = f"log-writer-bad-row-{uuid.uuid4()}"
+
+    async def scenario():
+        await writer.start()
+        await writer.submit(user_id=user_id, prompt="prompt", response="response", status="success")
+        # response NOT NULL 위반
+        await writer.submit(user_id=user_id, prompt="prompt", response=None, status="success")
+        # 문자열이 아닌 본문 (오프로드 단계에서 실패)
+        await writer.submit(user_id=user_id, prompt=12345, response="response", status="success")
+        await writer.submit(user_id=user_id, prompt="prompt", response="response", status="success")
+        await writer.stop()
+        await dispose_async_engine()
+
+    asyncio.run(scenario())
+
+    assert _count_logs(user_id) == 2
@@ -0,0 +1,128 @@
+"""
+대시보드 목록 API keyset(cursor) 페이지네이션 테스트
+"""
+
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import pagination
+from app.db import Base, get_db
+from app.main import app
+from app.models import LLMEvaluation, LLMLog
+from app.pagination import decode_cursor, encode_cursor
+
+engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+TestingSession = sessionmaker(bind=engine)
+
+BASE_TIME = datetime(2025, 1, 1)
+
+
+def _override_get_db():
+    db = TestingSession()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _client(logs: int = 25) -> TestClient:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    pagination._count_cache.clear()
+    with TestingSession() as db:
+        for i in range(1, logs + 1):
+            # 3개씩 같은 created_at (정렬 동률은 id로 구분)
+            created_at = BASE_TIME + timedelta(minutes=i // 3)
+            db.add(LLMLog(id=i, created_at=created_at, prompt=f"p{i}", response="r", status="success"))
+            db.add(LLMEvaluation(id=i, created_at=created_at, log_id=i, overall_score=1 + i % 5, label="ok"))
+        db.commit()
+    app.dependency_overrides[get_db] = _override_get_db
+    return TestClient(app)
+
+
+def _walk(client: TestClient, path: str, key: str, page_size: int) -> list[int]:
+    ids = []
+    body = client.get(path, params={"page_size": page_size}).json()
+    while True:
+        ids.extend(item["id"] for item in body[key])
+        if body["next_cursor"] is None:
+            return ids
+        body = client.get(path, params={"page_size": page_size, "cursor": body["next_cursor"]}).json()
+
+
+def test_cursor_pages_match_offset_order_without_gaps():
+    client = _client()
+    try:
+        for path, key in (("/api/dashboard/logs", "logs"), ("/api/dashboard/evaluations", "evaluations")):
+            by_cursor = _walk(client, path, key, page_size=10)
+            by_offset = [
+                item["id"]
+                for page in (1, 2, 3)
+                for item in client.get(path, params={"page": page, "page_size": 10}).json()[key]
+            ]
+            assert by_cursor == by_offset == list(range(25, 0, -1))
+
+        evaluation = client.get("/api/dashboard/evaluations", params={"page_size": 1}).json()["evaluations"][0]
+        assert evaluation["log_prompt"] == "p25"
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_offset_response_keeps_totals_and_last_page_has_no_cursor():
+    client = _client()
+    try:
+        body = client.get("/api/dashboard/logs", params={"page": 3, "page_size": 10}).json()
+        assert (body["total"], body["total_pages"], body["total_is_estimate"]) == (25, 3, False)
+        assert len(body["logs"]) == 5
+        assert body["next_cursor"] is None
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_count_modes():
+    client = _client()
+    try:
+        body = client.get("/api/dashboard/logs", params={"count": "none"}).json()
+        assert (body["total"], body["total_pages"]) == (None, None)
+
+        # Postgres가 아니면 COUNT(*)를 캐시해서 사용 (TTL 안에서는 새 로그가 반영되지 않음)
+        assert client.get("/api/dashboard/logs", params={"count": "estimated"}).json()["total"] == 25
+        with TestingSession() as db:
+            db.add(LLMLog(prompt="p", response="r", status="success"))
+            db.commit()
+        body = client.get("/api/dashboard/logs", params={"count": "estimated"}).json()
+        assert (body["total"], body["total_is_estimate"]) == (25, True)
+        assert client.get("/api/dashboard/logs").json()["total"] == 26
+
+        assert client.get("/api/dashboard/logs", params={"count": "approximate"}).status_code == 422
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_invalid_cursor_returns_400():
+    client = _client(logs=1)
+    try:
+        for cursor in ("not-a-cursor", encode_cursor(BASE_TIME, 1)[:-3], "W10"):
+            assert client.get("/api/dashboard/logs", params={"cursor": cursor}).status_code == 400
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_cursor_roundtrip_and_index_scan():
+    assert decode_cursor(encode_cursor(BASE_TIME, 42)) == (BASE_TIME, 42)
+
+    _client(logs=1)
+    app.dependency_overrides.clear()
+    with engine.connect() as conn:
+        plan = " ".join(
+            str(row[-1]) for row in conn.execute(text(
+                "EXPLAIN QUERY PLAN SELECT id FROM llm_logs "
+                "WHERE (created_at, id) < ('2025-01-01 00:00:00', 1) ORDER BY created_at DESC, id DESC LIMIT 21"
+            ))
+        )
+    assert "ix_llm_logs_created_at_id" in plan
+    assert "TEMP B-TREE" not in plan
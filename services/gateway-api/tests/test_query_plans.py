@@ -0,0 +1,144 @@
+"""
+핫 엔드포인트 쿼리 플랜 회귀 테스트.
+
+마이그레이션으로 만든 DB에 큰 데이터셋을 넣고 ANALYZE 한 뒤, 엔드포인트가 실행한 SQL을 그대로 EXPLAIN 해서
+llm_logs / llm_evaluations를 인덱스 없이 전체 스캔하지 않는지 확인한다.
+기본은 SQLite(EXPLAIN QUERY PLAN), TEST_POSTGRES_URL(빈 테스트용 Postgres DB)을 주면 Postgres(EXPLAIN)도 확인.
+"""
+
+import os
+import random
+import re
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, insert, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db import Base, get_db
+from app.main import app
+from app.models import LLMEvaluation, LLMLog
+from app.schema_migrations import run_migrations
+
+ROWS = 20_000
+MODELS = 10
+DAYS = 60
+
+# 전체 데이터를 읽을 수밖에 없는 요청(전체 기간 집계, COUNT(*))은 제외하고 기간/페이지로 범위가 정해진 요청만
+HOT_REQUESTS = [
+    ("/api/dashboard/logs", {"count": "none"}),
+    ("/api/dashboard/logs", {"count": "none", "cursor": "CURSOR:logs"}),
+    ("/api/dashboard/evaluations", {"count": "none"}),
+    ("/api/dashboard/evaluations", {"count": "none", "cursor": "CURSOR:evaluations"}),
+    ("/analytics/compare-models", {"days": 1}),
+]
+
+# SQLite: "SCAN llm_logs" (USING INDEX 없이), Postgres: "Seq Scan on llm_logs" / 파티션 "Seq Scan on llm_logs_legacy"
+# (비어 있는 default 파티션은 제외)
+FULL_SCAN = re.compile(
+    r"\bSCAN (llm_logs|llm_evaluations)\b(?! USING)|Seq Scan on (llm_logs|llm_evaluations)(?!_default\b)(_\w+)?\b"
+)
+
+
+def _engines():
+    yield pytest.param("sqlite", id="sqlite")
+    yield pytest.param(
+        "postgresql",
+        id="postgresql",
+        marks=pytest.mark.skipif(not os.getenv("TEST_POSTGRES_URL"), reason="TEST_POSTGRES_URL not set (빈 테스트용 Postgres DB)"),
+    )
+
+
+def _seed(engine) -> None:
+    rng = random.Random(0)
+    now = datetime.now()
+    with engine.begin() as conn:
+        conn.execute(insert(LLMLog), [
+            {
+                "id": i,
+                "created_at": now - timedelta(seconds=DAYS * 86400 * (1 - i / ROWS)),
+                "prompt": "synthetic prompt",
+                "response": "synthetic response",
+                "model_version": f"model-{i % MODELS}",
+                "latency_ms": rng.lognormvariate(6.5, 0.5),
+                "status": "error" if i % 30 == 0 else "success",
+            }
+            for i in range(1, ROWS + 1)
+        ])
+        conn.execute(insert(LLMEvaluation), [
+            {
+                "id": i,
+                "created_at": now - timedelta(seconds=DAYS * 86400 * (1 - i / ROWS)) + timedelta(seconds=30),
+                "log_id": i,
+                "overall_score": 1 + i % 5,
+                "label": "ok",
+                "is_flagged": False,
+            }
+            for i in range(1, ROWS + 1, 2)
+        ])
+        conn.execute(text("ANALYZE"))
+
+
+@pytest.fixture(params=list(_engines()))
+def database(request):
+    if request.param == "sqlite":
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    else:
+        engine = create_engine(os.environ["TEST_POSTGRES_URL"])
+        Base.metadata.drop_all(bind=engine)
+        with engine.begin() as conn:
+            conn.execute(text("DROP TABLE IF EXISTS schema_migrations"))
+    run_migrations(engine, Base.metadata)
+    _seed(engine)
+    yield engine
+    engine.dispose()
+
+
+def _explain(engine, statement: str, parameters) -> str:
+    prefix = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(prefix + statement, parameters).all()
+    return "\n".join(str(row[-1]) for row in rows)
+
+
+def test_hot_endpoints_use_indexes(database):
+    session = sessionmaker(bind=database)
+    statements: list[tuple[str, object]] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    def _override_get_db():
+        db = session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = _override_get_db
+    client = TestClient(app)
+    cursors = {}
+    for path, key in (("/api/dashboard/logs", "logs"), ("/api/dashboard/evaluations", "evaluations")):
+        # 몇 페이지 뒤의 cursor
+        body = client.get(path, params={"count": "none", "page": 50}).json()
+        cursors[f"CURSOR:{key}"] = body["next_cursor"]
+
+    event.listen(database, "before_cursor_execute", _record)
+    try:
+        for path, params in HOT_REQUESTS:
+            params = {name: cursors.get(value, value) for name, value in params.items()}
+            assert client.get(path, params=params).status_code == 200
+    finally:
+        event.remove(database, "before_cursor_execute", _record)
+        app.dependency_overrides.clear()
+
+    plans = [
+        (statement, _explain(database, statement, parameters))
+        for statement, parameters in statements
+        if "llm_logs" in statement or "llm_evaluations" in statement
+    ]
+    assert plans
+    for statement, plan in plans:
+        assert not FULL_SCAN.search(plan), f"full table scan:\n{statement}\n{plan}"
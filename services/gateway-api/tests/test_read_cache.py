@@ -0,0 +1,163 @@
+"""
+대시보드 요약 API 결과 캐시 (read_cache) 테스트
+"""
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.read_cache import InvalidationListener, ReadCache
+
+engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+
+
+class _Counter:
+    """호출 횟수를 세고, gate가 열릴 때까지 기다렸다가 현재 value를 반환하는 compute."""
+
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+        self.gate = threading.Event()
+        self.gate.set()
+        self.started = threading.Event()
+
+    def __call__(self, db: Session):
+        self.calls += 1
+        self.started.set()
+        assert self.gate.wait(5)
+        return self.value
+
+
+def _wait_until(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_hit_then_stale_serves_old_value_with_single_refresh():
+    lookups = []
+    refreshes = []
+    cache = ReadCache(
+        ttl_seconds=0.05,
+        stale_seconds=60,
+        on_lookup=lambda key, result: lookups.append(result),
+        on_refresh=lambda key, status, seconds: refreshes.append(status),
+    )
+    compute = _Counter("v1")
+
+    with Session(bind=engine) as db:
+        assert cache.get("summary", db, compute) == "v1"
+        assert cache.get("summary", db, compute) == "v1"
+        assert compute.calls == 1
+
+        time.sleep(0.06)
+        compute.value = "v2"
+        compute.gate.clear()
+        compute.started.clear()
+        # 갱신이 끝나기 전의 요청은 모두 이전 값을 바로 받고, 갱신은 하나만
+        assert [cache.get("summary", db, compute) for _ in range(5)] == ["v1"] * 5
+        assert compute.started.wait(5)
+        compute.gate.set()
+        _wait_until(lambda: cache.stats()["summary"]["refreshes"] == 2)
+
+        assert cache.get("summary", db, compute) == "v2"
+        assert compute.calls == 2
+
+    assert lookups == ["miss", "hit"] + ["stale"] * 5 + ["hit"]
+    assert refreshes == ["success", "success"]
+    stats = cache.stats()["summary"]
+    assert (stats["hit"], stats["stale"], stats["miss"]) == (2, 5, 1)
+    assert stats["hit_ratio"] == 0.875
+
+
+def test_concurrent_misses_compute_once():
+    cache = ReadCache(ttl_seconds=60, stale_seconds=60)
+    compute = _Counter({"total_logs": 3})
+    compute.gate.clear()
+    results = []
+
+    def _get():
+        with Session(bind=engine) as db:
+            results.append(cache.get("summary", db, compute))
+
+    threads = [threading.Thread(target=_get) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    assert compute.started.wait(5)
+    _wait_until(lambda: sum(cache.stats()["summary"][result] for result in ("hit", "miss")) == 8)
+    compute.gate.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert compute.calls == 1
+    assert results == [{"total_logs": 3}] * 8
+
+
+def test_failed_miss_is_raised_and_not_cached():
+    cache = ReadCache(ttl_seconds=60, stale_seconds=60)
+
+    def _fail(db):
+        raise RuntimeError("db down")
+
+    with Session(bind=engine) as db:
+        with pytest.raises(RuntimeError):
+            cache.get("summary", db, _fail)
+        assert cache.get("summary", db, _Counter("ok")) == "ok"
+
+    assert cache.stats()["summary"]["refresh_errors"] == 1
+
+
+def test_invalidate_marks_entries_stale():
+    """evaluator NOTIFY를 받으면 다음 요청은 이전 값을 받으면서 백그라운드 갱신을 시작"""
+    cache = ReadCache(ttl_seconds=60, stale_seconds=60)
+    compute = _Counter("v1")
+
+    with Session(bind=engine) as db:
+        cache.get("summary", db, compute)
+        compute.value = "v2"
+        cache.invalidate()
+
+        assert cache.get("summary", db, compute) == "v1"
+        _wait_until(lambda: cache.stats()["summary"]["refreshes"] == 2)
+        assert cache.get("summary", db, compute) == "v2"
+
+        # clear()는 값도 지움
+        cache.clear()
+        compute.value = "v3"
+        assert cache.get("summary", db, compute) == "v3"
+
+
+def test_zero_ttl_disables_cache():
+    cache = ReadCache(ttl_seconds=0, stale_seconds=60)
+    compute = _Counter("v")
+
+    with Session(bind=engine) as db:
+        for _ in range(3):
+            cache.get("summary", db, compute)
+
+    assert compute.calls == 3
+    assert cache.stats() == {}
+
+
+def test_invalidation_listener_requires_postgres():
+    listener = InvalidationListener(engine, "llm_stats_changed", lambda: None)
+    listener.start()
+
+    assert not listener.enabled
+    assert listener._thread is None
+    with pytest.raises(ValueError):
+        InvalidationListener(engine, "bad channel; DROP TABLE", lambda: None)
+
+
+def test_service_copies_are_identical():
+    """dashboard 서비스의 read_cache.py는 같은 파일의 복사본이어야 함"""
+    services = Path(__file__).resolve().parents[2]
+    gateway_copy = (services / "gateway-api" / "app" / "read_cache.py").read_text(encoding="utf-8")
+
+    assert (services / "dashboard" / "app" / "read_cache.py").read_text(encoding="utf-8") == gateway_copy
@@ -0,0 +1,65 @@
+"""
+응답 캐시 테스트
+"""
+
+import time
+
+from fastapi.testclient import TestClient
+
+import app.main as main
+from app.response_cache import LRUCache, ResponseCache, make_cache_key
+
+client = TestClient(main.app)
+
+
+def test_cache_key_ignores_whitespace_but_not_model():
+    """공백 차이는 같은 키, 모델이 다르면 다른 키"""
+    assert make_cache_key("  hello   world ", "m1") == make_cache_key("hello world", "m1")
+    assert make_cache_key("hello world", "m1") != make_cache_key("hello world", "m2")
+
+
+def test_lru_cache_evicts_least_recently_used_and_expired():
+    """최대 개수 초과 시 가장 오래 안 쓴 항목 제거, TTL 지나면 만료"""
+    cache = LRUCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", {"v": 1})
+    cache.set("b", {"v": 2})
+    cache.get("a")
+    cache.set("c", {"v": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": 1}
+    assert cache.get("c") == {"v": 3}
+
+    cache.set("short", {"v": 4}, ttl_seconds=0.01)
+    time.sleep(0.02)
+    assert cache.get("short") is None
+
+
+def test_chat_serves_cache_hit_and_logs_cached_status(monkeypatch):
+    """두 번째 동일 요청은 LLM 호출 없이 캐시에서 응답, 로그는 status='cached'"""
+    calls = []
+    submitted = []
+
+    async def fake_call_llm_async(prompt, model_version=None):
+        calls.append(prompt)
+        return "cached answer", 123.0
+
+    async def fake_submit(**values):
+        submitted.append(values)
+
+    monkeypatch.setattr(main.settings, "response_cache_enabled", True)
+    monkeypatch.setattr(main, "response_cache", ResponseCache(max_entries=10, ttl_seconds=60))
+    monkeypatch.setattr(main, "call_llm_async", fake_call_llm_async)
+    monkeypatch.setattr(main.log_writer, "submit", fake_submit)
+
+    payload = {"prompt": "What is 2+2?", "model_version": "test-model"}
+    first = client.post("/chat", json=payload).json()
+    second = client.post("/chat", json=payload).json()
+    bypassed = client.post("/chat", json={**payload, "bypass_cache": True}).json()
+
+    assert len(calls) == 2
+    assert first["cached"] is False
+    assert second["cached"] is True
+    assert second["response"] == "cached answer"
+    assert bypassed["cached"] is False
+    assert [row["status"] for row in submitted] == ["success", "cached", "success"]
@@ -0,0 +1,89 @@
+"""
+스키마 마이그레이션 (schema_migrations) 테스트
+"""
+
+from pathlib import Path
+
+from sqlalchemy import create_engine, inspect, text
+
+from app.db import Base
+from app.schema_migrations import MIGRATIONS, run_migrations
+
+
+def _index_names(engine, table: str) -> set[str]:
+    return {index["name"] for index in inspect(engine).get_indexes(table)}
+
+
+def test_fresh_database_records_all_migrations():
+    engine = create_engine("sqlite://")
+
+    assert run_migrations(engine, Base.metadata) == [migration.version for migration in MIGRATIONS]
+    assert run_migrations(engine, Base.metadata) == []
+
+    with engine.connect() as conn:
+        versions = conn.execute(text("SELECT version FROM schema_migrations ORDER BY version")).scalars().all()
+    assert versions == [migration.version for migration in MIGRATIONS]
+    assert {"ix_llm_logs_created_at_id", "ix_llm_logs_model_version_created_at"} <= _index_names(engine, "llm_logs")
+
+
+def test_existing_database_gets_new_indexes():
+    """create_all로 예전에 만든 DB(단일 컬럼 created_at 인덱스만 있음)에도 새 인덱스를 추가하고 예전 인덱스는 제거"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        for name in (
+            "ix_llm_logs_created_at_id",
+            "ix_llm_logs_success_created_at_id",
+            "ix_llm_logs_model_version_created_at",
+            "ix_llm_evaluations_created_at_id",
+        ):
+            conn.execute(text(f"DROP INDEX {name}"))
+        conn.execute(text("CREATE INDEX ix_llm_logs_created_at ON llm_logs (created_at)"))
+        conn.execute(text("CREATE INDEX ix_llm_evaluations_created_at ON llm_evaluations (created_at)"))
+        conn.execute(text("INSERT INTO llm_logs (prompt, response, status, created_at) VALUES ('p', 'r', 'success', '2025-01-01')"))
+
+    run_migrations(engine, Base.metadata)
+
+    log_indexes = _index_names(engine, "llm_logs")
+    assert {
+        "ix_llm_logs_created_at_id",
+        "ix_llm_logs_success_created_at_id",
+        "ix_llm_logs_model_version_created_at",
+    } <= log_indexes
+    assert "ix_llm_logs_created_at" not in log_indexes
+    assert _index_names(engine, "llm_evaluations") >= {"ix_llm_evaluations_created_at_id"}
+    assert "ix_llm_evaluations_created_at" not in _index_names(engine, "llm_evaluations")
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM llm_logs")).scalar() == 1
+
+
+def test_existing_llm_logs_gets_body_hash_columns():
+    """본문 해시 컬럼이 없던 llm_logs에 컬럼을 추가 (기존 로그는 그대로)"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE llm_text_blobs"))
+        conn.execute(text("ALTER TABLE llm_logs DROP COLUMN prompt_hash"))
+        conn.execute(text("ALTER TABLE llm_logs DROP COLUMN response_hash"))
+        conn.execute(text("INSERT INTO llm_logs (prompt, response, status, created_at) VALUES ('p', 'r', 'success', '2025-01-01')"))
+
+    run_migrations(engine, Base.metadata)
+
+    columns = {column["name"] for column in inspect(engine).get_columns("llm_logs")}
+    assert {"prompt_hash", "response_hash"} <= columns
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT prompt, prompt_hash FROM llm_logs")).one() == ("p", None)
+
+
+def test_migration_versions_are_ordered_and_unique():
+    versions = [migration.version for migration in MIGRATIONS]
+    assert versions == sorted(set(versions))
+
+
+def test_service_copies_are_identical():
+    """evaluator / dashboard 서비스의 schema_migrations.py는 같은 파일의 복사본이어야 함"""
+    services = Path(__file__).resolve().parents[2]
+    gateway_copy = (services / "gateway-api" / "app" / "schema_migrations.py").read_text(encoding="utf-8")
+
+    for service in ("evaluator", "dashboard"):
+        assert (services / service / "app" / "schema_migrations.py").read_text(encoding="utf-8") == gateway_copy
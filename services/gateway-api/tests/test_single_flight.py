@@ -0,0 +1,54 @@
+"""
+Single-flight 요청 병합 테스트
+"""
+
+import asyncio
+
+import pytest
+
+from app.single_flight import SingleFlight
+
+
+def test_concurrent_identical_calls_share_one_upstream_call():
+    """동시에 들어온 같은 키 호출은 upstream 한 번만 실행"""
+    single_flight = SingleFlight()
+    calls = []
+
+    async def upstream():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "answer"
+
+    async def scenario():
+        return await asyncio.gather(*(single_flight.do("key", upstream) for _ in range(10)))
+
+    results = asyncio.run(scenario())
+
+    assert len(calls) == 1
+    assert [value for value, _ in results] == ["answer"] * 10
+    assert sum(1 for _, shared in results if shared) == 9
+    assert len(single_flight) == 0
+
+
+def test_errors_are_fanned_out_and_next_call_retries():
+    """upstream 예외는 모든 대기자에게 전달되고, 이후 호출은 새로 실행"""
+    single_flight = SingleFlight()
+    calls = []
+
+    async def failing():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    async def scenario():
+        results = await asyncio.gather(
+            *(single_flight.do("key", failing) for _ in range(3)),
+            return_exceptions=True,
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+        with pytest.raises(RuntimeError):
+            await single_flight.do("key", failing)
+
+    asyncio.run(scenario())
+
+    assert len(calls) == 2
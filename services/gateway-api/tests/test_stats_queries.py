@@ -0,0 +1,135 @@
+"""
+모델별 통계 집계 쿼리 (stats_queries) 테스트
+"""
+
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db import Base, get_db
+from app.main import app, read_cache
+from app.models import LLMEvaluation, LLMLog
+from app.stats_queries import fetch_latencies_by_model, fetch_model_stats
+
+engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+TestingSession = sessionmaker(bind=engine)
+
+queries: list[str] = []
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    queries.append(statement)
+
+
+def _override_get_db():
+    db = TestingSession()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _seed(models: int = 3, logs_per_model: int = 30):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with TestingSession() as db:
+        log_id = 0
+        for m in range(models):
+            for i in range(logs_per_model):
+                log_id += 1
+                db.add(LLMLog(
+                    id=log_id,
+                    prompt="p",
+                    response="r",
+                    model_version=f"model-{m}",
+                    status="error" if i % 10 == 0 else ("cached" if i % 10 == 1 else "success"),
+                    latency_ms=float(100 * (m + 1) + i),
+                ))
+                if i % 2 == 0:
+                    db.add(LLMEvaluation(log_id=log_id, overall_score=1 + i % 5, is_flagged=i % 5 == 0, label="ok"))
+        db.commit()
+    read_cache.clear()
+
+
+def test_fetch_model_stats_counts_logs_once_and_groups_null_model():
+    """평가가 여러 개인 로그도 요청 수는 한 번만 세고, model_version이 NULL인 로그도 평가까지 집계"""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with TestingSession() as db:
+        db.add_all([
+            LLMLog(id=1, prompt="p", response="r", model_version="a", status="success", latency_ms=100.0),
+            LLMLog(id=2, prompt="p", response="r", model_version="a", status="error", latency_ms=None),
+            LLMLog(id=3, prompt="p", response="r", model_version=None, status="coalesced", latency_ms=50.0),
+        ])
+        db.add_all([
+            LLMEvaluation(log_id=1, overall_score=5, label="ok"),
+            LLMEvaluation(log_id=1, overall_score=2, is_flagged=True, label="ok"),
+            LLMEvaluation(log_id=3, overall_score=4, label="ok"),
+        ])
+        db.commit()
+
+        rows = {row.model_version: row for row in fetch_model_stats(db, LLMLog, LLMEvaluation)}
+
+        a = rows["a"]
+        assert (a.total_requests, a.success_count, a.error_count, a.avg_latency_ms) == (2, 1, 1, 100.0)
+        assert (a.total_evaluated, a.evaluation_count, a.avg_score, a.flagged_count) == (1, 2, 3.5, 1)
+        assert a.score_counts == (0, 1, 0, 0, 1)
+        assert (a.low_quality_count, a.high_quality_count) == (1, 1)
+
+        unknown = rows[None]
+        assert (unknown.total_requests, unknown.success_count, unknown.total_evaluated, unknown.avg_score) == (1, 1, 1, 4.0)
+
+        assert [row.model_version for row in fetch_model_stats(db, LLMLog, LLMEvaluation, exclude_null_model=True)] == ["a"]
+        # 백분위수 fallback (SQLite)도 NULL 모델 지연시간은 가져오지 않음
+        assert fetch_latencies_by_model(db, LLMLog, exclude_null_model=True) == {"a": [100.0]}
+
+
+def test_model_endpoints_issue_constant_query_count():
+    """모델 수가 늘어도 모델별 통계 엔드포인트의 쿼리 수는 그대로 (N+1 회귀 방지)"""
+    app.dependency_overrides[get_db] = _override_get_db
+    client = TestClient(app)
+    try:
+        counts = {}
+        for models in (2, 8):
+            _seed(models=models)
+            for path in ("/api/dashboard/models/stats", "/analytics/compare-models"):
+                queries.clear()
+                response = client.get(path)
+                assert response.status_code == 200
+                assert len(response.json()["models"]) == models
+                counts[(path, models)] = len(queries)
+
+        assert counts[("/api/dashboard/models/stats", 2)] == counts[("/api/dashboard/models/stats", 8)] == 1
+        # rollup 상태 확인 + 모델별 집계 + 지연시간 (SQLite에는 percentile_cont가 없음)
+        assert counts[("/analytics/compare-models", 2)] == counts[("/analytics/compare-models", 8)] == 3
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_compare_models_values():
+    _seed(models=2)
+    app.dependency_overrides[get_db] = _override_get_db
+    try:
+        body = TestClient(app).get("/analytics/compare-models").json()
+    finally:
+        app.dependency_overrides.clear()
+
+    first = {model["model_version"]: model for model in body["models"]}["model-0"]
+    assert first["total_requests"] == 30
+    assert first["error_rate"] == 10.0
+    assert first["success_rate"] == 90.0  # cached도 성공으로 집계
+    assert first["total_evaluated"] == 15
+    assert first["p50_latency_ms"] == 114.5
+    assert body["best_model_by_latency"] == "model-0"
+
+
+def test_dashboard_copy_is_identical():
+    """dashboard 서비스의 stats_queries.py는 같은 파일의 복사본이어야 함"""
+    gateway_copy = Path(__file__).resolve().parents[1] / "app" / "stats_queries.py"
+    dashboard_copy = Path(__file__).resolve().parents[2] / "dashboard" / "app" / "stats_queries.py"
+
+    assert dashboard_copy.read_text(encoding="utf-8") == gateway_copy.read_text(encoding="utf-8")
@@ -0,0 +1,168 @@
+"""
+통계 rollup 기반 대시보드/분석 API 테스트
+"""
+
+import math
+import random
+from collections import Counter
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db import Base, get_db
+from app.main import app, read_cache
+from app.models import LLMEvaluation, LLMLatencySketchHourly, LLMLog, LLMStatsHourly, StatsRollupState
+from app.stats_queries import PERCENTILES, percentile
+from app.stats_rollups import LATENCY_SKETCH_GAMMA, ROLLUP_NAME, latency_percentiles
+
+engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+TestingSession = sessionmaker(bind=engine)
+
+
+def _override_get_db():
+    db = TestingSession()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _client() -> TestClient:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    read_cache.clear()
+    app.dependency_overrides[get_db] = _override_get_db
+    return TestClient(app)
+
+
+def _hour(hours_ago: int) -> datetime:
+    return (datetime.now() - timedelta(hours=hours_ago)).replace(minute=0, second=0, microsecond=0)
+
+
+def _add_rollups(db):
+    db.add_all([
+        LLMStatsHourly(
+            bucket_start=_hour(2), model_version="gpt-a",
+            request_count=10, error_count=1, latency_count=9, latency_sum=900.0,
+            evaluated_count=4, evaluation_count=4, score_sum=16, flagged_count=1,
+        ),
+        LLMStatsHourly(
+            bucket_start=_hour(2), model_version="",
+            request_count=5, error_count=0, latency_count=5, latency_sum=1000.0,
+            evaluated_count=0, evaluation_count=0, score_sum=0, flagged_count=0,
+        ),
+        LLMStatsHourly(
+            bucket_start=_hour(100), model_version="gpt-a",
+            request_count=5, error_count=5, latency_count=0, latency_sum=0.0,
+            evaluated_count=2, evaluation_count=2, score_sum=4, flagged_count=0,
+        ),
+        StatsRollupState(name=ROLLUP_NAME, watermark=datetime.now()),
+    ])
+    db.commit()
+
+
+def test_endpoints_read_rollups_when_available():
+    client = _client()
+    try:
+        with TestingSession() as db:
+            # rollup이 있으면 원본 테이블은 읽지 않음
+            db.add(LLMLog(prompt="p", response="r", status="success"))
+            db.commit()
+            _add_rollups(db)
+
+        summary = client.get("/api/dashboard/summary").json()
+        assert summary["total_logs"] == 20
+        assert summary["total_evaluated"] == 6
+        assert summary["avg_latency_ms"] == 1900.0 / 14
+        assert summary["avg_score"] == 20 / 6
+
+        trends = client.get("/analytics/trends", params={"hours": 24}).json()
+        assert [point["total_requests"] for point in trends["data"]] == [15]
+        assert trends["data"][0]["error_rate"] == 1 / 15 * 100
+        assert trends["data"][0]["avg_score"] == 4.0
+        assert trends["summary"]["total_evaluated"] == 4
+
+        timeseries = client.get("/api/dashboard/timeseries", params={"days": 7}).json()
+        assert sum(point["total_requests"] for point in timeseries["data"]) == 20
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_summary_falls_back_to_raw_tables_without_rollups():
+    client = _client()
+    try:
+        with TestingSession() as db:
+            db.add_all([
+                LLMLog(id=1, prompt="p", response="r", status="success", latency_ms=100.0),
+                LLMLog(id=2, prompt="p", response="r", status="success", latency_ms=300.0),
+            ])
+            db.add(LLMEvaluation(log_id=1, overall_score=4, label="ok"))
+            db.commit()
+
+        summary = client.get("/api/dashboard/summary").json()
+        assert summary == {"total_logs": 2, "total_evaluated": 1, "avg_latency_ms": 200.0, "avg_score": 4.0}
+    finally:
+        app.dependency_overrides.clear()
+
+
+def _sketch_rows(bucket_start: datetime, model_version: str, latencies: list[float]) -> list[LLMLatencySketchHourly]:
+    """evaluator rollup과 같은 방식으로 지연시간을 bin 개수로 집계"""
+    bins = Counter(math.ceil(math.log(latency_ms) / math.log(LATENCY_SKETCH_GAMMA)) for latency_ms in latencies)
+    return [
+        LLMLatencySketchHourly(bucket_start=bucket_start, model_version=model_version, bin=bin_index, count=count)
+        for bin_index, count in bins.items()
+    ]
+
+
+def test_sketch_percentiles_within_relative_accuracy():
+    """여러 시간대의 히스토그램을 합쳐 계산한 백분위수가 정확한 값과 상대 오차 1% 이내"""
+    rng = random.Random(0)
+    hours = {
+        _hour(h): [rng.lognormvariate(6.5, 0.8) for _ in range(2000)]
+        for h in range(1, 6)
+    }
+    _client()
+    with TestingSession() as db:
+        for bucket_start, latencies in hours.items():
+            db.add_all(_sketch_rows(bucket_start, "gpt-a", latencies))
+        db.add_all(_sketch_rows(_hour(1), "", [50.0] * 30))
+        db.add_all(_sketch_rows(_hour(100), "gpt-a", [1.0e6] * 100))  # 기간 밖
+        db.commit()
+
+        result = latency_percentiles(db, _hour(5), PERCENTILES)
+
+    app.dependency_overrides.clear()
+    exact = sorted(latency for latencies in hours.values() for latency in latencies)
+    count, estimates = result["gpt-a"]
+    assert count == len(exact)
+    for name, fraction in PERCENTILES.items():
+        assert abs(estimates[name] - percentile(exact, fraction)) / percentile(exact, fraction) <= 0.01
+
+    assert result[None][0] == 30
+    assert abs(result[None][1]["p99"] - 50.0) / 50.0 <= 0.01
+
+
+def test_compare_models_reads_latency_sketch_when_rollups_available():
+    client = _client()
+    try:
+        with TestingSession() as db:
+            db.add_all([
+                LLMLog(id=i + 1, prompt="p", response="r", model_version="gpt-a", status="success",
+                       latency_ms=float(100 + i))
+                for i in range(40)
+            ])
+            db.commit()
+            # 원본 로그와 다른 분포를 넣어서 rollup에서 읽었는지 확인
+            db.add_all(_sketch_rows(_hour(1), "gpt-a", [1000.0] * 40))
+            db.add(StatsRollupState(name=ROLLUP_NAME, watermark=datetime.now()))
+            db.commit()
+
+        model = client.get("/analytics/compare-models").json()["models"][0]
+        assert model["total_requests"] == 40
+        for name in ("p50_latency_ms", "p95_latency_ms", "p99_latency_ms"):
+            assert abs(model[name] - 1000.0) / 1000.0 <= 0.01
+    finally:
+        app.dependency_overrides.clear()
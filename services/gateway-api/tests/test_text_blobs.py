@@ -0,0 +1,178 @@
+"""
+긴 프롬프트/응답 본문 오프로드 (text_blobs) 테스트
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db import Base, SessionLocal, dispose_async_engine, engine, get_db
+from app.log_writer import LogWriter
+from app.main import app
+from app.models import LLMEvaluation, LLMLog, LLMTextBlob
+from app.schema_migrations import run_migrations
+from app.text_blobs import (
+    TOUCH_INTERVAL,
+    backfill_log_bodies,
+    content_hash,
+    delete_unused_blobs,
+    offload_rows,
+    preview,
+    split_body,
+    upsert_blobs,
+)
+
+UTC = timezone.utc
+LONG_PROMPT = "시스템 프롬프트: 아래 문서를 요약하세요.\n" + "문서 내용 " * 200
+
+
+def setup_module():
+    run_migrations(engine, Base.metadata)
+
+
+def test_split_body_keeps_short_bodies_inline():
+    assert split_body("short", 10) == ("short", None)
+    assert split_body("0123456789abc", 10) == ("0123456789", content_hash("0123456789abc"))
+
+    assert preview("0123456789", "hash", 10) == ("0123456789", True)
+    # 오프로드 이전에 저장된 긴 본문도 목록에서는 잘라서 보여줌
+    assert preview("0123456789abc", None, 10) == ("0123456789", True)
+    assert preview("short", None, 10) == ("short", False)
+
+
+def test_offload_rows_dedups_bodies_within_batch():
+    rows = [
+        {"prompt": LONG_PROMPT, "response": "ok"},
+        {"prompt": LONG_PROMPT, "response": "x" * 300},
+    ]
+
+    blobs = offload_rows(rows, 100, datetime.now(UTC))
+
+    assert [blob["hash"] for blob in blobs] == sorted({content_hash(LONG_PROMPT), content_hash("x" * 300)})
+    assert rows[0]["prompt"] == LONG_PROMPT[:100]
+    assert rows[0]["prompt_hash"] == rows[1]["prompt_hash"] == content_hash(LONG_PROMPT)
+    assert rows[0]["response"] == "ok" and rows[0]["response_hash"] is None
+    assert all(len(blob["data"]) < blob["size"] for blob in blobs)
+
+
+def test_log_writer_stores_repeated_long_prompt_once():
+    """같은 긴 프롬프트는 여러 로그가 blob 하나를 참조"""
+    writer = LogWriter(batch_size=10, flush_interval_seconds=60, max_queue_size=100)
+    user_id = f"text-blob-{uuid.uuid4()}"
+    prompt = f"{user_id}\n{LONG_PROMPT}"
+
+    async def scenario():
+        await writer.start()
+        for i in range(5):
+            await writer.submit(user_id=user_id, prompt=prompt, response=f"response {i}", status="success")
+        await writer.stop()
+        # 다음 배치에서 같은 본문이 또 들어와도 새로 저장하지 않음
+        await writer.submit(user_id=user_id, prompt=prompt, response="response", status="success")
+        await dispose_async_engine()
+
+    asyncio.run(scenario())
+
+    with SessionLocal() as db:
+        logs = db.query(LLMLog).filter(LLMLog.user_id == user_id).all()
+        assert len(logs) == 6
+        assert {log.prompt_hash for log in logs} == {content_hash(prompt)}
+        assert all(len(log.prompt) < len(prompt) for log in logs)
+        assert all(log.response_hash is None for log in logs)
+        assert db.query(func.count()).select_from(LLMTextBlob).filter(LLMTextBlob.hash == content_hash(prompt)).scalar() == 1
+
+
+def test_upsert_touches_last_used_at_at_most_once_per_interval():
+    test_engine = create_engine("sqlite://")
+    run_migrations(test_engine, Base.metadata)
+    first = datetime(2025, 1, 1, tzinfo=UTC)
+    blob_rows = offload_rows([{"prompt": LONG_PROMPT}], 100, first)
+
+    def last_used_at(conn):
+        return conn.execute(select(LLMTextBlob.last_used_at)).scalar()
+
+    with test_engine.begin() as conn:
+        conn.execute(upsert_blobs(LLMTextBlob, "sqlite", blob_rows, first))
+        for used_at in (first + timedelta(hours=1), first + TOUCH_INTERVAL + timedelta(hours=1)):
+            for row in blob_rows:
+                row["last_used_at"] = used_at
+            conn.execute(upsert_blobs(LLMTextBlob, "sqlite", blob_rows, used_at))
+            if used_at < first + TOUCH_INTERVAL:
+                assert last_used_at(conn) == first.replace(tzinfo=None)
+        assert last_used_at(conn) == (first + TOUCH_INTERVAL + timedelta(hours=1)).replace(tzinfo=None)
+
+        # 가장 오래된 로그보다 TOUCH_INTERVAL 이상 전에 쓰인 blob만 삭제
+        assert delete_unused_blobs(conn, LLMTextBlob, first + 2 * TOUCH_INTERVAL) == 0
+        assert delete_unused_blobs(conn, LLMTextBlob, first + 3 * TOUCH_INTERVAL) == 1
+
+
+def test_backfill_offloads_existing_long_bodies():
+    test_engine = create_engine("sqlite://")
+    run_migrations(test_engine, Base.metadata)
+    with test_engine.begin() as conn:
+        conn.execute(insert(LLMLog), [
+            {"id": i, "prompt": LONG_PROMPT if i % 2 else "short", "response": "r" * (50 + i * 40), "status": "success"}
+            for i in range(1, 8)
+        ])
+
+    with test_engine.connect() as conn:
+        assert backfill_log_bodies(conn, LLMLog, LLMTextBlob, preview_chars=100, batch_size=3) == 7
+        # 다시 실행하면 변환할 로그가 없음
+        assert backfill_log_bodies(conn, LLMLog, LLMTextBlob, preview_chars=100) == 0
+
+        rows = conn.execute(select(LLMLog).order_by(LLMLog.id)).mappings().all()
+        assert rows[0]["prompt_hash"] == content_hash(LONG_PROMPT) and rows[0]["response_hash"] is None
+        assert rows[1]["prompt"] == "short" and rows[1]["response_hash"] == content_hash("r" * 130)
+        assert all(len(row["prompt"]) <= 100 and len(row["response"]) <= 100 for row in rows)
+        # 중복 프롬프트는 하나, 100자 넘는 응답 6개
+        assert conn.execute(select(func.count()).select_from(LLMTextBlob)).scalar() == 1 + 6
+
+
+def test_dashboard_lists_previews_and_detail_returns_full_body():
+    test_engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    run_migrations(test_engine, Base.metadata)
+    session = sessionmaker(bind=test_engine)
+    now = datetime.now(UTC)
+    rows = [{"id": 1, "created_at": now, "prompt": LONG_PROMPT, "response": "short response", "status": "success"}]
+    blob_rows = offload_rows(rows, 200, now)
+    with test_engine.begin() as conn:
+        conn.execute(upsert_blobs(LLMTextBlob, "sqlite", blob_rows, now))
+        conn.execute(insert(LLMLog), rows)
+        conn.execute(insert(LLMEvaluation).values(log_id=1, overall_score=5, label="ok", is_flagged=False))
+
+    def _override_get_db():
+        db = session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = _override_get_db
+    try:
+        client = TestClient(app)
+        item = client.get("/api/dashboard/logs").json()["logs"][0]
+        assert item["prompt"] == LONG_PROMPT[:200] and item["prompt_truncated"]
+        assert item["response"] == "short response" and not item["response_truncated"]
+
+        evaluation = client.get("/api/dashboard/evaluations").json()["evaluations"][0]
+        assert evaluation["log_prompt"] == LONG_PROMPT[:200] and evaluation["log_prompt_truncated"]
+
+        detail = client.get("/api/dashboard/logs/1").json()
+        assert detail["prompt"] == LONG_PROMPT
+        assert detail["response"] == "short response"
+        assert client.get("/api/dashboard/logs/2").status_code == 404
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_service_copies_are_identical():
+    """evaluator 서비스의 text_blobs.py는 같은 파일의 복사본이어야 함"""
+    services = Path(__file__).resolve().parents[2]
+    gateway_copy = (services / "gateway-api" / "app" / "text_blobs.py").read_text(encoding="utf-8")
+
+    assert (services / "evaluator" / "app" / "text_blobs.py").read_text(encoding="utf-8") == gateway_copy
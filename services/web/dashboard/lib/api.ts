@@ -1,5 +1,6 @@
 import type {
   DashboardSummary,
+  LogDetail,
   LogListResponse,
   EvaluationListResponse,
   ModelStatsResponse,
@@ -38,6 +39,13 @@ export async function getLogs(
   )
 }
 
+/**
+ * Get a single LLM log with full prompt/response bodies
+ */
+export async function getLog(id: number): Promise<LogDetail> {
+  return fetchAPI<LogDetail>(`/api/dashboard/logs/${id}`)
+}
+
 /**
  * Get paginated list of evaluations
  */
@@ -16,14 +16,21 @@ export interface LogItem {
   model_version: string | null
   latency_ms: number | null
   status: string
+  // prompt / response are previews; full bodies come from getLog(id)
+  prompt_truncated: boolean
+  response_truncated: boolean
 }
 
+export type LogDetail = Omit<LogItem, "prompt_truncated" | "response_truncated">
+
 export interface LogListResponse {
   logs: LogItem[]
   total: number
   page: number
   page_size: number
   total_pages: number
+  next_cursor: string | null
+  total_is_estimate: boolean
 }
 
 export interface EvaluationItem {
@@ -40,6 +47,8 @@ export interface EvaluationItem {
   raw_judge_response: string | null
   log_prompt: string | null
   log_response: string | null
+  log_prompt_truncated: boolean
+  log_response_truncated: boolean
   log_model_version: string | null
 }
 
@@ -49,6 +58,8 @@ export interface EvaluationListResponse {
   page: number
   page_size: number
   total_pages: number
+  next_cursor: string | null
+  total_is_estimate: boolean
 }
 
 export interface ModelStats {